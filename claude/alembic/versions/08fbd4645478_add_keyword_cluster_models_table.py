@@ -0,0 +1,43 @@
+"""Add keyword_cluster_models table for incremental clustering
+
+Revision ID: 08fbd4645478
+Revises: bcba88882fbc
+Create Date: 2026-10-19 11:03:27.281904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '08fbd4645478'
+down_revision: Union[str, None] = 'bcba88882fbc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('keyword_cluster_models',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('brand_id', sa.Integer(), nullable=False),
+    sa.Column('backend', sa.String(length=50), nullable=False, comment='벡터화 백엔드'),
+    sa.Column('n_clusters', sa.Integer(), nullable=False, comment='최대 클러스터 수'),
+    sa.Column('dim', sa.Integer(), nullable=False, comment='벡터 차원'),
+    sa.Column('centroids', sa.LargeBinary(), nullable=True, comment='클러스터 중심점'),
+    sa.Column('counts', sa.LargeBinary(), nullable=True, comment='클러스터별 누적 샘플 수'),
+    sa.Column('n_samples', sa.Integer(), nullable=False, comment='누적 학습 키워드 수'),
+    sa.Column('keyword_map', sa.JSON(), nullable=True, comment='정규화 키워드 → 클러스터 ID'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['brand_id'], ['brands.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('brand_id')
+    )
+    op.create_index(op.f('ix_keyword_cluster_models_id'), 'keyword_cluster_models', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_keyword_cluster_models_id'), table_name='keyword_cluster_models')
+    op.drop_table('keyword_cluster_models')
@@ -0,0 +1,37 @@
+"""Add composite indexes for hot queries
+
+Revision ID: 3f6c8a1d9e57
+Revises: 9b4d2e7f1a63
+Create Date: 2026-10-19 17:41:36.208154
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6c8a1d9e57'
+down_revision: Union[str, None] = '9b4d2e7f1a63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_brand_kpis_brand_id_measurement_date', 'brand_kpis', ['brand_id', 'measurement_date'], unique=False, postgresql_include=['value', 'popularity_index'])
+    op.drop_index(op.f('ix_brand_kpis_brand_id'), table_name='brand_kpis')
+    op.create_index('ix_brands_user_id_status_updated_at', 'brands', ['user_id', 'status', 'updated_at'], unique=False)
+    op.drop_index(op.f('ix_brands_user_id'), table_name='brands')
+    op.create_index('ix_brand_insights_user_id_created_at', 'brand_insights', ['user_id', 'created_at'], unique=False)
+    op.create_index(op.f('ix_design_projects_user_id'), 'design_projects', ['user_id'], unique=False)
+    op.create_index('ix_campaign_tracking_campaign_id_tracking_date', 'campaign_tracking', ['campaign_id', 'tracking_date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_campaign_tracking_campaign_id_tracking_date', table_name='campaign_tracking')
+    op.drop_index(op.f('ix_design_projects_user_id'), table_name='design_projects')
+    op.drop_index('ix_brand_insights_user_id_created_at', table_name='brand_insights')
+    op.create_index(op.f('ix_brands_user_id'), 'brands', ['user_id'], unique=False)
+    op.drop_index('ix_brands_user_id_status_updated_at', table_name='brands')
+    op.create_index(op.f('ix_brand_kpis_brand_id'), 'brand_kpis', ['brand_id'], unique=False)
+    op.drop_index('ix_brand_kpis_brand_id_measurement_date', table_name='brand_kpis')
@@ -0,0 +1,40 @@
+"""Add keyword_dendrograms table for compact hierarchical clustering output
+
+Revision ID: 5c1e9a7d3b24
+Revises: 08fbd4645478
+Create Date: 2026-10-19 13:41:09.527310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e9a7d3b24'
+down_revision: Union[str, None] = '08fbd4645478'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('keyword_dendrograms',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('insight_id', sa.Integer(), nullable=False),
+    sa.Column('method', sa.String(length=20), nullable=False, comment='linkage 방법'),
+    sa.Column('num_keywords', sa.Integer(), nullable=False, comment='전체 키워드 수'),
+    sa.Column('num_leaves', sa.Integer(), nullable=False, comment='리프 수 (사전 클러스터링 후)'),
+    sa.Column('leaves', sa.JSON(), nullable=False, comment='리프 목록'),
+    sa.Column('merges', sa.LargeBinary(), nullable=False, comment='압축 linkage 행렬'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['insight_id'], ['brand_insights.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('insight_id')
+    )
+    op.create_index(op.f('ix_keyword_dendrograms_id'), 'keyword_dendrograms', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_keyword_dendrograms_id'), table_name='keyword_dendrograms')
+    op.drop_table('keyword_dendrograms')
@@ -0,0 +1,71 @@
+"""Add brand search indexes (pg_trgm / full-text, SQLite FTS5)
+
+Revision ID: 9b4d2e7f1a63
+Revises: e3a8f1c6d092
+Create Date: 2026-10-19 16:05:12.417930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b4d2e7f1a63'
+down_revision: Union[str, None] = 'e3a8f1c6d092'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_DOCUMENT = (
+    "to_tsvector('simple', coalesce(brand_name, '') || ' ' || coalesce(slogan, '') || ' ' || "
+    "coalesce(description, '') || ' ' || coalesce(keywords::jsonb::text, ''))"
+)
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute("CREATE INDEX IF NOT EXISTS ix_brands_brand_name_trgm ON brands USING gin (brand_name gin_trgm_ops)")
+        op.execute(f"CREATE INDEX IF NOT EXISTS ix_brands_search_document ON brands USING gin (({SEARCH_DOCUMENT}))")
+    elif dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS brands_fts USING fts5("
+            "brand_name, slogan, description, keywords, tokenize='trigram')"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS brands_fts_ai AFTER INSERT ON brands BEGIN "
+            "INSERT INTO brands_fts(rowid, brand_name, slogan, description, keywords) "
+            "VALUES (new.id, new.brand_name, new.slogan, new.description, "
+            "(SELECT group_concat(value, ' ') FROM json_each(new.keywords))); END"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS brands_fts_ad AFTER DELETE ON brands BEGIN "
+            "DELETE FROM brands_fts WHERE rowid = old.id; END"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS brands_fts_au AFTER UPDATE ON brands BEGIN "
+            "DELETE FROM brands_fts WHERE rowid = old.id; "
+            "INSERT INTO brands_fts(rowid, brand_name, slogan, description, keywords) "
+            "VALUES (new.id, new.brand_name, new.slogan, new.description, "
+            "(SELECT group_concat(value, ' ') FROM json_each(new.keywords))); END"
+        )
+        # index existing rows
+        op.execute(
+            "INSERT INTO brands_fts(rowid, brand_name, slogan, description, keywords) "
+            "SELECT id, brand_name, slogan, description, "
+            "(SELECT group_concat(value, ' ') FROM json_each(brands.keywords)) FROM brands"
+        )
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_brands_search_document")
+        op.execute("DROP INDEX IF EXISTS ix_brands_brand_name_trgm")
+    elif dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS brands_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS brands_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS brands_fts_ai")
+        op.execute("DROP TABLE IF EXISTS brands_fts")
@@ -0,0 +1,29 @@
+"""Campaign report generation (brand lookup index, one report per campaign-month)
+
+Revision ID: a7d2c4e8b915
+Revises: c81e4b5a2f90
+Create Date: 2026-10-19 21:04:51.318270
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d2c4e8b915'
+down_revision: Union[str, None] = 'c81e4b5a2f90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_campaigns_brand_id'), 'campaigns', ['brand_id'], unique=False)
+    with op.batch_alter_table('campaign_reports') as batch_op:
+        batch_op.create_unique_constraint('uq_campaign_reports_campaign_id_report_month', ['campaign_id', 'report_month'])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('campaign_reports') as batch_op:
+        batch_op.drop_constraint('uq_campaign_reports_campaign_id_report_month', type_='unique')
+    op.drop_index(op.f('ix_campaigns_brand_id'), table_name='campaigns')
@@ -0,0 +1,37 @@
+"""Add keyword_vectors cache table
+
+Revision ID: bcba88882fbc
+Revises: a20fed5e3788
+Create Date: 2026-10-19 10:12:41.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'bcba88882fbc'
+down_revision: Union[str, None] = 'a20fed5e3788'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('keyword_vectors',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('backend', sa.String(length=50), nullable=False, comment='벡터화 백엔드'),
+    sa.Column('keyword', sa.String(length=200), nullable=False, comment='정규화된 키워드'),
+    sa.Column('dim', sa.Integer(), nullable=False, comment='벡터 차원'),
+    sa.Column('vector', sa.LargeBinary(), nullable=False, comment='float32 벡터 바이트'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('backend', 'keyword', name='uq_keyword_vectors_backend_keyword')
+    )
+    op.create_index(op.f('ix_keyword_vectors_id'), 'keyword_vectors', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_keyword_vectors_id'), table_name='keyword_vectors')
+    op.drop_table('keyword_vectors')
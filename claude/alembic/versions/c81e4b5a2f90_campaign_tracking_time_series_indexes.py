@@ -0,0 +1,31 @@
+"""Campaign tracking time-series indexes (upsert key, BRIN on tracking_date)
+
+Revision ID: c81e4b5a2f90
+Revises: 3f6c8a1d9e57
+Create Date: 2026-10-19 18:32:07.554102
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81e4b5a2f90'
+down_revision: Union[str, None] = '3f6c8a1d9e57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_campaign_tracking_campaign_id_tracking_date', table_name='campaign_tracking')
+    with op.batch_alter_table('campaign_tracking') as batch_op:
+        batch_op.create_unique_constraint('uq_campaign_tracking_campaign_id_tracking_date', ['campaign_id', 'tracking_date'])
+    op.create_index('ix_campaign_tracking_tracking_date', 'campaign_tracking', ['tracking_date'], unique=False, postgresql_using='brin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_campaign_tracking_tracking_date', table_name='campaign_tracking')
+    with op.batch_alter_table('campaign_tracking') as batch_op:
+        batch_op.drop_constraint('uq_campaign_tracking_campaign_id_tracking_date', type_='unique')
+    op.create_index('ix_campaign_tracking_campaign_id_tracking_date', 'campaign_tracking', ['campaign_id', 'tracking_date'], unique=False)
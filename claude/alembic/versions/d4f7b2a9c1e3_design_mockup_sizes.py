@@ -0,0 +1,28 @@
+"""Design mockup sizes (per-size image URLs, gallery lookup index)
+
+Revision ID: d4f7b2a9c1e3
+Revises: a7d2c4e8b915
+Create Date: 2026-10-19 23:12:40.512093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f7b2a9c1e3'
+down_revision: Union[str, None] = 'a7d2c4e8b915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('design_mockups', sa.Column('thumbnail_urls', sa.JSON(), nullable=True, comment='크기별 이미지 URL (large/medium/thumbnail)'))
+    op.create_index(op.f('ix_design_mockups_design_result_id'), 'design_mockups', ['design_result_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_design_mockups_design_result_id'), table_name='design_mockups')
+    op.drop_column('design_mockups', 'thumbnail_urls')
@@ -0,0 +1,45 @@
+"""Add key phrase corpus document-frequency tables
+
+Revision ID: e3a8f1c6d092
+Revises: 5c1e9a7d3b24
+Create Date: 2026-10-19 14:22:51.803446
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a8f1c6d092'
+down_revision: Union[str, None] = '5c1e9a7d3b24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('key_phrase_documents',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('source', sa.String(length=50), nullable=False, comment='문서 출처'),
+    sa.Column('source_id', sa.Integer(), nullable=False, comment='원본 레코드 ID'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('source', 'source_id', name='uq_key_phrase_documents_source')
+    )
+    op.create_index(op.f('ix_key_phrase_documents_id'), 'key_phrase_documents', ['id'], unique=False)
+    op.create_table('key_phrase_terms',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('term', sa.String(length=200), nullable=False, comment='1-gram / 2-gram 구문'),
+    sa.Column('doc_freq', sa.Integer(), nullable=False, comment='구문이 등장한 문서 수'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('term')
+    )
+    op.create_index(op.f('ix_key_phrase_terms_id'), 'key_phrase_terms', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_key_phrase_terms_id'), table_name='key_phrase_terms')
+    op.drop_table('key_phrase_terms')
+    op.drop_index(op.f('ix_key_phrase_documents_id'), table_name='key_phrase_documents')
+    op.drop_table('key_phrase_documents')
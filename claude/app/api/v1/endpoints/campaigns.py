@@ -0,0 +1,301 @@
+"""
+Campaign API Endpoints (Back3)
+캠페인 추적 데이터 적재 및 성과 지표 조회
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import get_db, get_current_user
+from app.core.analytics_executor import AnalyticsTimeoutError
+from app.models.user import User
+from app.models.campaign import Campaign, CampaignReport
+from app.schemas.campaign import (
+    CampaignTrackingBulkCreate, CampaignTrackingBulkResponse, CampaignMetricsSeriesResponse,
+    CampaignReportResponse, CampaignExportStatusResponse
+)
+from app.schemas.insight import ReportExportRequest, ReportExportStatusResponse
+from app.services.campaign_metrics_service import campaign_metrics_service, to_utc
+from app.services.campaign_report_service import campaign_report_service
+from app.services.campaign_export_service import campaign_export_service, export_file_name, CONTENT_TYPES
+from app.services.gpt_service import gpt_service
+from app.services.report_pdf_service import report_pdf_service
+from app.services.registry import services
+
+REPORT_MONTH_PATTERN = "^\\d{4}-(0[1-9]|1[0-2])$"
+EXPORT_FORMAT_PATTERN = "^(csv|xlsx)$"
+
+router = APIRouter()
+
+
+async def _get_owned_campaign(db: AsyncSession, campaign_id: int, user: User) -> Campaign:
+    campaign = await db.get(Campaign, campaign_id)
+    if not campaign or campaign.user_id != user.id:
+        raise HTTPException(status_code=404, detail="캠페인을 찾을 수 없습니다")
+    return campaign
+
+
+def _resolve_range(start: Optional[datetime], end: Optional[datetime]) -> Tuple[datetime, datetime]:
+    """조회 기간 (UTC, 기본: 최근 30일)"""
+    end = to_utc(end) if end else datetime.now(timezone.utc)
+    start = to_utc(start) if start else end - timedelta(days=30)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="시작일은 종료일보다 이전이어야 합니다")
+    return start, end
+
+
+@router.post(
+    "/campaigns/{campaign_id}/tracking",
+    response_model=CampaignTrackingBulkResponse,
+    status_code=201
+)
+async def ingest_campaign_tracking(
+    campaign_id: int,
+    payload: CampaignTrackingBulkCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    캠페인 추적 데이터 일괄 적재
+
+    - 같은 날짜의 데이터는 덮어씀
+    - ctr / cpc / roas는 저장된 지표로부터 서버에서 계산
+    """
+    await _get_owned_campaign(db, campaign_id, current_user)
+
+    ingested = await campaign_metrics_service.ingest(db, [
+        {"campaign_id": campaign_id, **point.model_dump()} for point in payload.points
+    ])
+    return CampaignTrackingBulkResponse(campaign_id=campaign_id, ingested=ingested)
+
+
+@router.get("/campaigns/{campaign_id}/metrics", response_model=CampaignMetricsSeriesResponse)
+async def get_campaign_metrics(
+    campaign_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    granularity: str = Query("day", pattern="^(day|week|month)$"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    캠페인 성과 지표 시계열 (차트용)
+
+    - 일 / 주 / 월 단위 집계는 데이터베이스에서 수행
+    - 기본 기간: 최근 30일
+    """
+    await _get_owned_campaign(db, campaign_id, current_user)
+
+    start, end = _resolve_range(start, end)
+
+    buckets = await campaign_metrics_service.get_series(db, [campaign_id], start, end, granularity)
+    return CampaignMetricsSeriesResponse(
+        campaign_id=campaign_id,
+        granularity=granularity,
+        start=start,
+        end=end,
+        buckets=buckets
+    )
+
+
+@router.get("/campaigns/{campaign_id}/tracking/export")
+async def download_campaign_tracking(
+    campaign_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    format: str = Query("csv", pattern=EXPORT_FORMAT_PATTERN),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    캠페인 추적 데이터 직접 다운로드 (CSV / Excel)
+
+    - 서버 측 커서로 스트리밍하여 행 수와 관계없이 일정한 메모리 사용
+    - 기본 기간: 최근 30일
+    """
+    await _get_owned_campaign(db, campaign_id, current_user)
+
+    start, end = _resolve_range(start, end)
+    if format == "csv":
+        body = campaign_export_service.stream_csv([campaign_id], start, end)
+    else:
+        body = campaign_export_service.stream_file([campaign_id], start, end, format)
+    file_name = export_file_name([campaign_id], start, end, format)
+    return StreamingResponse(
+        body,
+        media_type=CONTENT_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{file_name}"'}
+    )
+
+
+async def _get_report(db: AsyncSession, campaign_id: int, report_month: str) -> CampaignReport:
+    result = await db.execute(
+        select(CampaignReport).where(
+            CampaignReport.campaign_id == campaign_id,
+            CampaignReport.report_month == report_month
+        )
+    )
+    report = result.scalar_one_or_none()
+    if not report:
+        raise HTTPException(status_code=404, detail="리포트를 찾을 수 없습니다")
+    return report
+
+
+@router.post("/campaigns/{campaign_id}/reports", response_model=CampaignReportResponse, status_code=201)
+async def generate_campaign_report(
+    campaign_id: int,
+    report_month: str = Query(..., pattern=REPORT_MONTH_PATTERN, description="YYYY-MM 형식"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    월간 캠페인 리포트 생성 / 재생성
+
+    - 같은 브랜드의 해당 월 캠페인 리포트를 함께 갱신 (상위 캠페인 / 채널 성과 공유)
+    """
+    campaign = await _get_owned_campaign(db, campaign_id, current_user)
+
+    await campaign_report_service.build_brand_month(db, campaign.brand_id, report_month)
+    return await _get_report(db, campaign_id, report_month)
+
+
+@router.get("/campaigns/{campaign_id}/reports/{report_month}", response_model=CampaignReportResponse)
+async def get_campaign_report(
+    campaign_id: int,
+    report_month: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """월간 캠페인 리포트 조회"""
+    await _get_owned_campaign(db, campaign_id, current_user)
+    return await _get_report(db, campaign_id, report_month)
+
+
+@router.post("/campaigns/{campaign_id}/reports/{report_month}/predictions", response_model=CampaignReportResponse)
+async def predict_campaign_report(
+    campaign_id: int,
+    report_month: str,
+    narrate: bool = False,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    다음 달 성과 예측 (ai_predictions) 갱신
+
+    - 예측 수치는 통계 모델로 계산
+    - narrate=true: GPT가 예측 수치를 요약 (ai_summary / ai_recommendations)
+    """
+    campaign = await _get_owned_campaign(db, campaign_id, current_user)
+    report = await _get_report(db, campaign_id, report_month)
+
+    try:
+        await services.campaign_forecast.campaign_forecast_service.predict_reports(
+            db, report_month, campaign_ids=[campaign_id]
+        )
+    except AnalyticsTimeoutError:
+        raise HTTPException(status_code=504, detail="성과 예측 시간이 초과되었습니다")
+    await db.refresh(report)
+
+    if narrate:
+        narration = await gpt_service.narrate_campaign_forecast(
+            campaign_name=campaign.campaign_name,
+            report_month=report_month,
+            predictions=report.ai_predictions
+        )
+        if not narration["success"]:
+            raise HTTPException(
+                status_code=500,
+                detail=f"예측 요약 생성 실패: {narration.get('error', 'Unknown error')}"
+            )
+        report.ai_summary = narration["data"].get("summary")
+        report.ai_recommendations = narration["data"].get("recommendations", [])
+        await db.commit()
+        await db.refresh(report)
+
+    return report
+
+
+@router.post(
+    "/campaigns/{campaign_id}/reports/{report_month}/export",
+    response_model=ReportExportStatusResponse,
+    status_code=202
+)
+async def export_campaign_report_pdf(
+    campaign_id: int,
+    report_month: str,
+    export_request: ReportExportRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    월간 캠페인 리포트 PDF 내보내기
+
+    - 렌더링은 백그라운드에서 진행 (GET으로 상태 조회)
+    - 내용이 바뀌지 않은 리포트는 기존 PDF를 바로 반환
+    """
+    await _get_owned_campaign(db, campaign_id, current_user)
+    report = await _get_report(db, campaign_id, report_month)
+    return await report_pdf_service.start_export(db, "campaign", report, export_request.model_dump())
+
+
+@router.get(
+    "/campaigns/{campaign_id}/reports/{report_month}/export",
+    response_model=ReportExportStatusResponse
+)
+async def get_campaign_report_export_status(
+    campaign_id: int,
+    report_month: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """월간 캠페인 리포트 PDF 내보내기 상태 조회"""
+    await _get_owned_campaign(db, campaign_id, current_user)
+    report = await _get_report(db, campaign_id, report_month)
+
+    status = await report_pdf_service.get_status("campaign", report.id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="내보내기 작업을 찾을 수 없습니다")
+    return status
+
+
+@router.post(
+    "/campaigns/{campaign_id}/reports/{report_month}/excel",
+    response_model=CampaignExportStatusResponse,
+    status_code=202
+)
+async def export_campaign_report_excel(
+    campaign_id: int,
+    report_month: str,
+    format: str = Query("xlsx", pattern=EXPORT_FORMAT_PATTERN),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    월간 리포트 기간의 추적 데이터 내보내기 (백그라운드, 완료 시 excel_url 저장)
+    """
+    await _get_owned_campaign(db, campaign_id, current_user)
+    report = await _get_report(db, campaign_id, report_month)
+    return await campaign_export_service.start_report_export(report, format)
+
+
+@router.get(
+    "/campaigns/{campaign_id}/reports/{report_month}/excel",
+    response_model=CampaignExportStatusResponse
+)
+async def get_campaign_report_excel_status(
+    campaign_id: int,
+    report_month: str,
+    format: str = Query("xlsx", pattern=EXPORT_FORMAT_PATTERN),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """월간 리포트 추적 데이터 내보내기 상태 조회"""
+    await _get_owned_campaign(db, campaign_id, current_user)
+    report = await _get_report(db, campaign_id, report_month)
+
+    status = await campaign_export_service.get_status(report.id, format)
+    if status is None:
+        raise HTTPException(status_code=404, detail="내보내기 작업을 찾을 수 없습니다")
+    return status
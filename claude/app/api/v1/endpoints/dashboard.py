@@ -2,27 +2,52 @@
 Dashboard API Endpoints
 Main dashboard, brand shortcuts, user status, and search
 """
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, desc
 from app.api.deps import get_db, get_current_user
 from app.models.user import User
-from app.models.brand import Brand, BrandKPI
+from app.models.brand import Brand
 from app.schemas.dashboard import (
     DashboardResponse,
     BrandShortcut,
     UserStatus,
     AIRecommendation,
     BrandSearchRequest,
-    BrandSearchResponse
+    BrandSearchResponse,
+    AISuggestionsResponse,
+    AutocompleteSuggestion,
+    AutocompleteResponse
 )
 from app.services.gpt_service import gpt_service
+from app.services.gpt_scheduler import GPTPriority
 from app.services.kpi_service import kpi_service
+from app.services.brand_search_service import brand_search_service
+from app.services.brand_autocomplete import brand_autocomplete
+from app.services.search_suggestion_service import search_suggestion_service
 
 router = APIRouter()
 
 
+async def _brand_shortcuts(db: AsyncSession, brands: List[Brand]) -> List[BrandShortcut]:
+    """Build shortcut cards with cached latest KPI / trend snapshots"""
+    snapshots = await kpi_service.get_brand_snapshots(db, [brand.id for brand in brands])
+
+    return [
+        BrandShortcut(
+            id=brand.id,
+            brand_name=brand.brand_name,
+            category=brand.category,
+            logo_url=brand.logo_url,
+            latest_kpi=snapshots[brand.id]["latest_kpi"],
+            kpi_trend=snapshots[brand.id]["kpi_trend"],
+            updated_at=brand.updated_at
+        )
+        for brand in brands
+    ]
+
+
 @router.get("/", response_model=DashboardResponse, summary="Get Main Dashboard")
 async def get_dashboard(
     current_user: User = Depends(get_current_user),
@@ -43,28 +68,7 @@ async def get_dashboard(
     brands_result = await db.execute(brands_query)
     brands = brands_result.scalars().all()
 
-    brand_shortcuts = []
-    for brand in brands:
-        # Get latest KPI for each brand
-        kpi_query = select(BrandKPI).where(
-            BrandKPI.brand_id == brand.id
-        ).order_by(desc(BrandKPI.measurement_date)).limit(1)
-
-        kpi_result = await db.execute(kpi_query)
-        latest_kpi = kpi_result.scalar_one_or_none()
-
-        # Calculate KPI trend using KPI service
-        kpi_trend = await kpi_service.get_kpi_trend(db, brand.id, "popularity_index", 30)
-
-        brand_shortcuts.append(BrandShortcut(
-            id=brand.id,
-            brand_name=brand.brand_name,
-            category=brand.category,
-            logo_url=brand.logo_url,
-            latest_kpi=latest_kpi.value if latest_kpi else None,
-            kpi_trend=kpi_trend,
-            updated_at=brand.updated_at
-        ))
+    brand_shortcuts = await _brand_shortcuts(db, brands)
 
     # Get user status
     total_brands_query = select(func.count(Brand.id)).where(
@@ -98,7 +102,8 @@ async def get_dashboard(
             gpt_result = await gpt_service.recommend_brands(
                 industry=category,
                 target_audience="제조업 브랜드 담당자",
-                limit=1
+                limit=1,
+                priority=GPTPriority.INTERACTIVE
             )
 
             if gpt_result["success"] and gpt_result["data"]:
@@ -154,27 +159,7 @@ async def get_brand_shortcuts(
     brands_result = await db.execute(brands_query)
     brands = brands_result.scalars().all()
 
-    shortcuts = []
-    for brand in brands:
-        kpi_query = select(BrandKPI).where(
-            BrandKPI.brand_id == brand.id
-        ).order_by(desc(BrandKPI.measurement_date)).limit(1)
-
-        kpi_result = await db.execute(kpi_query)
-        latest_kpi = kpi_result.scalar_one_or_none()
-
-        # Calculate KPI trend using KPI service
-        kpi_trend = await kpi_service.get_kpi_trend(db, brand.id, "popularity_index", 30)
-
-        shortcuts.append(BrandShortcut(
-            id=brand.id,
-            brand_name=brand.brand_name,
-            category=brand.category,
-            logo_url=brand.logo_url,
-            latest_kpi=latest_kpi.value if latest_kpi else None,
-            kpi_trend=kpi_trend,
-            updated_at=brand.updated_at
-        ))
+    shortcuts = await _brand_shortcuts(db, brands)
 
     return shortcuts
 
@@ -205,104 +190,102 @@ async def get_user_status(
     )
 
 
-@router.post("/search/brands", response_model=BrandSearchResponse, summary="Search Brands with AI Recommendations")
-async def search_brands(
-    search_request: BrandSearchRequest,
+@router.get("/search/autocomplete", response_model=AutocompleteResponse, summary="Brand Search Autocomplete")
+async def autocomplete_brands(
+    q: str = Query(..., min_length=1, max_length=100, description="Text typed so far"),
+    limit: int = Query(10, ge=1, le=20),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
-) -> BrandSearchResponse:
+) -> AutocompleteResponse:
     """
-    Search brands with AI-powered recommendations
+    Type-ahead suggestions over the user's brand names, categories and keywords
+
+    Served from an in-memory index (no GPT call, no DB query once the index is built).
 
     Args:
-        search_request: Search query and filters
+        q: Text typed so far
+        limit: Maximum number of suggestions (default: 10)
 
     Returns:
-        BrandSearchResponse: Search results with AI suggestions
+        AutocompleteResponse: Suggestions ordered by match quality
     """
-    # Build search query
-    query = select(Brand).where(Brand.user_id == current_user.id)
+    suggestions = await brand_autocomplete.suggest(db, current_user.id, q, limit)
 
-    # Apply search filter
-    if search_request.query:
-        query = query.where(
-            Brand.brand_name.ilike(f"%{search_request.query}%")
-        )
+    return AutocompleteResponse(
+        query=q,
+        suggestions=[AutocompleteSuggestion(**suggestion) for suggestion in suggestions]
+    )
 
-    # Apply category filter
-    if search_request.category:
-        query = query.where(Brand.category == search_request.category)
 
-    # Apply limit and ordering
-    query = query.order_by(desc(Brand.updated_at)).limit(search_request.limit)
+@router.get("/search/suggestions", response_model=AISuggestionsResponse, summary="AI Search Suggestions")
+async def get_search_suggestions(
+    query: str = Query(..., min_length=1, max_length=200),
+    category: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+) -> AISuggestionsResponse:
+    """
+    AI brand suggestions for a search query
 
-    # Execute query
-    result = await db.execute(query)
-    brands = result.scalars().all()
+    Fetched after the search results are shown. Results are cached per query,
+    and requests superseded by a newer one from the same user (still typing)
+    return immediately with `superseded=true` and no suggestions.
 
-    # Get total count
-    count_query = select(func.count(Brand.id)).where(Brand.user_id == current_user.id)
-    if search_request.query:
-        count_query = count_query.where(
-            Brand.brand_name.ilike(f"%{search_request.query}%")
-        )
-    count_result = await db.execute(count_query)
-    total_count = count_result.scalar()
+    Args:
+        query: Search query
+        category: Optional category filter
 
-    # Convert to shortcuts
-    shortcuts = []
-    for brand in brands:
-        kpi_query = select(BrandKPI).where(
-            BrandKPI.brand_id == brand.id
-        ).order_by(desc(BrandKPI.measurement_date)).limit(1)
+    Returns:
+        AISuggestionsResponse: AI suggestions for the query
+    """
+    result = await search_suggestion_service.suggest(current_user.id, query, category)
+
+    return AISuggestionsResponse(
+        query=query,
+        category=category,
+        suggestions=[AIRecommendation(**suggestion) for suggestion in result["suggestions"]],
+        cached=result["cached"],
+        superseded=result["superseded"]
+    )
 
-        kpi_result = await db.execute(kpi_query)
-        latest_kpi = kpi_result.scalar_one_or_none()
 
-        # Calculate KPI trend using KPI service
-        kpi_trend = await kpi_service.get_kpi_trend(db, brand.id, "popularity_index", 30)
+@router.post("/search/brands", response_model=BrandSearchResponse, summary="Search Brands with AI Recommendations")
+async def search_brands(
+    search_request: BrandSearchRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> BrandSearchResponse:
+    """
+    Search brands (AI suggestions only when include_ai_suggestions is set)
 
-        shortcuts.append(BrandShortcut(
-            id=brand.id,
-            brand_name=brand.brand_name,
-            category=brand.category,
-            logo_url=brand.logo_url,
-            latest_kpi=latest_kpi.value if latest_kpi else None,
-            kpi_trend=kpi_trend,
-            updated_at=brand.updated_at
-        ))
+    Args:
+        search_request: Search query and filters
 
-    # AI suggestions using GPT API
-    ai_suggestions = []
+    Returns:
+        BrandSearchResponse: Search results, optionally with AI suggestions
+    """
+    # Indexed, relevance-ranked search; total count comes from the same query
+    results, total_count = await brand_search_service.search(
+        db,
+        user_id=current_user.id,
+        query=search_request.query,
+        category=search_request.category,
+        limit=search_request.limit
+    )
+    brands = [brand for brand, _ in results]
 
-    # Generate AI suggestions based on search query
-    if search_request.query or search_request.category:
-        gpt_result = await gpt_service.recommend_brands(
-            industry=search_request.category or "일반",
-            keywords=[search_request.query] if search_request.query else None,
-            limit=3
+    # Convert to shortcuts
+    shortcuts = await _brand_shortcuts(db, brands)
+
+    # AI suggestions are fetched separately (GET /search/suggestions) unless requested inline
+    ai_suggestions = None
+    if search_request.include_ai_suggestions:
+        result = await search_suggestion_service.suggest(
+            current_user.id,
+            search_request.query,
+            search_request.category,
+            debounce=False
         )
-
-        if gpt_result["success"] and gpt_result["data"]:
-            recommendations = gpt_result["data"].get("recommendations", [])
-            for rec in recommendations:
-                ai_suggestions.append(AIRecommendation(
-                    brand_name=rec.get("brand_name", "AI 추천 브랜드"),
-                    category=rec.get("target_audience", search_request.category or "일반"),
-                    reason=rec.get("concept", "AI 기반 추천"),
-                    confidence_score=0.8
-                ))
-
-    # Default suggestion if GPT fails
-    if not ai_suggestions:
-        ai_suggestions = [
-            AIRecommendation(
-                brand_name=f"{search_request.query} 관련 브랜드" if search_request.query else "추천 브랜드",
-                category=search_request.category or "일반",
-                reason="검색어 기반 추천",
-                confidence_score=0.6
-            )
-        ]
+        ai_suggestions = [AIRecommendation(**suggestion) for suggestion in result["suggestions"]]
 
     return BrandSearchResponse(
         brands=shortcuts,
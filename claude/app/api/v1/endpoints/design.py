@@ -2,15 +2,27 @@
 Design Studio API Endpoints (Back3)
 디자인 스튜디오 Ideogram API 연동
 """
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 from app.api.deps import get_db, get_current_user
 from app.models.user import User
-from app.models.design import DesignProject, DesignResult
+from app.models.design import DesignProject, DesignResult, ShortformProject
 from app.models.brand import Brand
-from app.schemas.design import DesignProjectCreate, DesignProjectResponse, IdeogramGenerateRequest
+from app.schemas.design import (
+    DesignProjectCreate, DesignProjectResponse, IdeogramGenerateRequest,
+    DesignMockupCreate, DesignMockupResponse, ColorPaletteRequest, ColorPaletteResponse,
+    ShortformProjectCreate, ShortformProjectResponse
+)
 from app.services.ideogram_service import IdeogramService
+from app.core.analytics_executor import analytics_executor, AnalyticsTimeoutError
+from app.core.config import settings
+from app.services.mockup_service import mockup_service
+from app.services.registry import services
+from app.services.storyboard_service import storyboard_service
 
 router = APIRouter()
 
@@ -208,3 +220,225 @@ async def regenerate_design_images(
             status_code=500,
             detail=f"이미지 재생성 실패: {result.get('error', 'Unknown error')}"
         )
+
+
+# ========================================
+# Design Mockups
+# ========================================
+
+@router.post(
+    "/design-projects/{project_id}/results/{result_id}/mockups",
+    response_model=List[DesignMockupResponse],
+    status_code=201
+)
+async def create_design_mockups(
+    project_id: int,
+    result_id: int,
+    mockup_data: DesignMockupCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    디자인 목업 생성 (패키지 / 명함 / 포스터)
+
+    - 디자인 이미지를 산업별 템플릿에 합성하고 크기별(대 / 중 / 썸네일) 이미지 저장
+    - 같은 이미지 / 템플릿 / 크기는 캐시된 결과 재사용
+    """
+    project = await db.get(DesignProject, project_id)
+    if not project or project.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="프로젝트를 찾을 수 없습니다")
+
+    design = await db.get(DesignResult, result_id)
+    if not design or design.project_id != project_id:
+        raise HTTPException(status_code=404, detail="디자인 결과를 찾을 수 없습니다")
+
+    try:
+        return await mockup_service.create_mockups(db, design, mockup_data.mockup_types, mockup_data.industry_tab)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"목업 생성 실패: {str(e)}")
+
+
+@router.get("/design-projects/{project_id}/mockups", response_model=List[DesignMockupResponse])
+async def list_design_mockups(
+    project_id: int,
+    industry_tab: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    목업 갤러리 (저장된 이미지 URL만 조회, 합성하지 않음)
+    """
+    project = await db.get(DesignProject, project_id)
+    if not project or project.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="프로젝트를 찾을 수 없습니다")
+
+    result_ids = (await db.execute(
+        select(DesignResult.id).where(DesignResult.project_id == project_id)
+    )).scalars().all()
+    return await mockup_service.list_mockups(db, result_ids, industry_tab)
+
+
+# ========================================
+# Color Palettes
+# ========================================
+
+@router.post("/color-palettes", response_model=List[ColorPaletteResponse])
+async def suggest_color_palettes(
+    palette_request: ColorPaletteRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    배색 제안 (기준 색 여러 개 × 배색 규칙을 한 번에 계산)
+
+    - complementary / analogous / triadic
+    - 팔레트별 대비 / WCAG 접근성 점수 (기준 색별 점수 높은 순)
+    """
+    return services.color_palette.suggest_palettes(
+        palette_request.base_colors, palette_request.schemes, palette_request.num_colors
+    )
+
+
+async def _extract_palette(image_bytes: bytes, num_colors: int) -> dict:
+    try:
+        return await analytics_executor.run(services.color_palette.extract_palette, image_bytes, num_colors)
+    except AnalyticsTimeoutError:
+        raise HTTPException(status_code=504, detail="팔레트 추출 시간이 초과되었습니다")
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"팔레트 추출 실패: {str(e)}")
+
+
+async def _read_upload(file: UploadFile, max_bytes: int) -> bytes:
+    """업로드 파일 읽기 (제한 + 1바이트까지만 읽고, 넘으면 413)"""
+    if file.size is None or file.size <= max_bytes:
+        data = await file.read(max_bytes + 1)
+        if len(data) <= max_bytes:
+            return data
+    raise HTTPException(status_code=413, detail=f"파일 크기가 제한({max_bytes} bytes)을 초과했습니다")
+
+
+@router.post("/color-palettes/extract", response_model=ColorPaletteResponse)
+async def extract_color_palette(
+    file: UploadFile = File(...),
+    num_colors: int = Query(5, ge=2, le=10),
+    current_user: User = Depends(get_current_user)
+):
+    """업로드한 이미지의 대표색 팔레트 추출 (k-means, 최대 PALETTE_UPLOAD_MAX_BYTES)"""
+    image_bytes = await _read_upload(file, settings.PALETTE_UPLOAD_MAX_BYTES)
+    return await _extract_palette(image_bytes, num_colors)
+
+
+@router.post("/design-projects/{project_id}/results/{result_id}/palette", response_model=ColorPaletteResponse)
+async def extract_design_palette(
+    project_id: int,
+    result_id: int,
+    num_colors: int = Query(5, ge=2, le=10),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """생성된 디자인 이미지의 대표색 팔레트 추출"""
+    project = await db.get(DesignProject, project_id)
+    if not project or project.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="프로젝트를 찾을 수 없습니다")
+
+    design = await db.get(DesignResult, result_id)
+    if not design or design.project_id != project_id:
+        raise HTTPException(status_code=404, detail="디자인 결과를 찾을 수 없습니다")
+
+    try:
+        image_bytes = await mockup_service.fetch_image(design.image_url)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"이미지 다운로드 실패: {str(e)}")
+    return await _extract_palette(image_bytes, num_colors)
+
+
+# ========================================
+# Shortform Storyboard
+# ========================================
+
+async def _get_owned_shortform(db: AsyncSession, project_id: int, user: User) -> ShortformProject:
+    project = await db.get(ShortformProject, project_id)
+    if not project or project.user_id != user.id:
+        raise HTTPException(status_code=404, detail="프로젝트를 찾을 수 없습니다")
+    return project
+
+
+async def _get_owned_brand(db: AsyncSession, brand_id: int, user: User) -> Brand:
+    """현재 사용자 소유 브랜드 조회"""
+    brand = await db.get(Brand, brand_id)
+    if not brand or brand.user_id != user.id:
+        raise HTTPException(status_code=404, detail="브랜드를 찾을 수 없습니다")
+    return brand
+
+
+@router.post("/shortform-projects", response_model=ShortformProjectResponse, status_code=201)
+async def create_shortform_project(
+    project_data: ShortformProjectCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """숏폼 프로젝트 생성 (본인 브랜드만)"""
+    await _get_owned_brand(db, project_data.brand_id, current_user)
+    project = ShortformProject(user_id=current_user.id, **project_data.model_dump())
+    db.add(project)
+    await db.commit()
+
+    result = await db.execute(
+        select(ShortformProject).options(selectinload(ShortformProject.frames))
+        .where(ShortformProject.id == project.id)
+    )
+    return result.scalar_one()
+
+
+@router.get("/shortform-projects/{project_id}", response_model=ShortformProjectResponse)
+async def get_shortform_project(
+    project_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """숏폼 프로젝트 상세 조회 (스토리보드 프레임 포함)"""
+    await _get_owned_shortform(db, project_id, current_user)
+    result = await db.execute(
+        select(ShortformProject).options(selectinload(ShortformProject.frames))
+        .where(ShortformProject.id == project_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one()
+
+
+@router.post("/shortform-projects/{project_id}/storyboard")
+async def generate_storyboard(
+    project_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    스토리보드 생성 (NDJSON 스트리밍)
+
+    - 스크립트를 컷 수만큼 분할하고 프레임별 프롬프트 생성 (기존 프레임은 교체)
+    - 프레임 이미지를 동시에 생성하여 완료되는 순서대로 전송
+    - 이벤트: storyboard → frame (프레임별) → done
+    """
+    project = await _get_owned_shortform(db, project_id, current_user)
+    if not project.script_text:
+        raise HTTPException(status_code=400, detail="스크립트가 없습니다")
+
+    return StreamingResponse(storyboard_service.generate_stream(project_id), media_type="application/x-ndjson")
+
+
+@router.post("/shortform-projects/{project_id}/storyboard/retry")
+async def retry_storyboard_frames(
+    project_id: int,
+    frame_ids: Optional[List[int]] = Query(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    이미지 생성에 실패한 프레임만 다시 생성 (NDJSON 스트리밍)
+
+    - frame_ids를 지정하면 그중 이미지가 없는 프레임만
+    - 이벤트: retry → frame (프레임별) → done
+    """
+    await _get_owned_shortform(db, project_id, current_user)
+    return StreamingResponse(
+        storyboard_service.retry_stream(project_id, frame_ids), media_type="application/x-ndjson"
+    )
@@ -2,25 +2,61 @@
 Brand Insight API Endpoints (Back2)
 브랜드 인사이트 GPT 연동 API
 """
+import logging
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
 from typing import List, Optional
 from app.api.deps import get_db, get_current_user
+from app.core.analytics_executor import AnalyticsTimeoutError
 from app.models.user import User
+from app.models.brand import Brand
 from app.models.insight import BrandInsight, InsightResult, InsightType
+from app.models.keyword import KeywordDendrogram
 from app.schemas.insight import (
     BrandInsightCreate,
     BrandInsightResponse,
-    BrandInsightListResponse
+    BrandInsightListResponse,
+    KeywordClusterMapResponse,
+    KeywordAssignmentResponse,
+    SimilarKeywordsResponse,
+    KeywordDendrogramResponse,
+    KeyPhrasesResponse
 )
 from app.services.gpt_service import GPTService
-from app.services.keyword_clustering_service import KeywordClusteringService
+# 분석 서비스(numpy / scikit-learn / scipy)는 첫 사용 시 로드
+from app.services.registry import services
 import json
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
+async def _absorb_keywords(db: AsyncSession, brand_id: Optional[int], keywords: List[str], index: bool) -> None:
+    """
+    브랜드 증분 클러스터링 모델 / 플랫폼 키워드 코퍼스 인덱스에 새 키워드 반영
+
+    인사이트가 이미 저장된 뒤 호출되므로 실패(분석 시간 초과 등)해도 인사이트 응답은 유지합니다.
+    """
+    try:
+        incremental = services.incremental_clustering.incremental_clustering_service
+        if brand_id and keywords and incremental.supported:
+            await incremental.absorb(db, brand_id, keywords)
+        if index and keywords:
+            await services.keyword_clustering.KeywordClusteringService().index_keywords_async(keywords)
+    except Exception as e:
+        logger.warning(f"Keyword index update failed (brand {brand_id}, {len(keywords)} keywords): {e}")
+
+
+async def _add_to_key_phrase_corpus(db: AsyncSession, insight: BrandInsight) -> None:
+    """핵심 구문 코퍼스 문서 빈도 반영 (실패해도 저장된 인사이트 응답은 유지)"""
+    try:
+        await services.key_phrases.key_phrase_engine.add_insight(db, insight)
+    except Exception as e:
+        logger.warning(f"Key phrase corpus update failed (insight {insight.id}): {e}")
+
+
 @router.post("/insights", response_model=BrandInsightResponse, status_code=201)
 async def create_brand_insight(
     insight_data: BrandInsightCreate,
@@ -34,6 +70,9 @@ async def create_brand_insight(
     """
     gpt_service = GPTService()
 
+    # 다른 사용자의 브랜드 정보 / 클러스터 모델에 접근하지 않도록 소유 확인
+    brand = await _get_owned_brand(db, insight_data.brand_id, current_user) if insight_data.brand_id else None
+
     # GPT를 활용한 시장 분석
     if insight_data.insight_type == InsightType.MARKET_ANALYSIS:
         # 시장 분석 요청
@@ -74,22 +113,43 @@ async def create_brand_insight(
         await db.commit()
         await db.refresh(insight)
 
+        # 브랜드 증분 클러스터링 모델 흡수 및 플랫폼 키워드 코퍼스 유사도 인덱스 추가
+        await _absorb_keywords(db, insight_data.brand_id, insight.keywords or [], index=True)
+
+        # 핵심 구문 코퍼스 문서 빈도 반영
+        await _add_to_key_phrase_corpus(db, insight)
+
         return insight
 
     elif insight_data.insight_type == InsightType.KEYWORD_CLUSTERING:
-        # 키워드 생성
-        keywords = await gpt_service.generate_keywords(
-            prompt=insight_data.prompt,
-            num_keywords=20
+        # 키워드 생성 (브랜드 정보가 있으면 함께 전달)
+        keyword_result = await gpt_service.generate_keywords(
+            brand_name=brand.brand_name if brand else "신규 브랜드",
+            industry=(brand.industry or brand.category or "제조업") if brand else "제조업",
+            description=insight_data.prompt,
+            limit=20
         )
+        keywords = [
+            item["keyword"]
+            for item in (keyword_result.get("data") or {}).get("keywords", [])
+            if isinstance(item, dict) and item.get("keyword")
+        ]
 
         # 키워드 클러스터링 (Back2 Day 2 - scipy)
-        clustering_service = KeywordClusteringService()
-        clustering_result = clustering_service.cluster_keywords(
-            keywords=keywords,
-            num_clusters=min(5, len(keywords) // 3),
-            method="kmeans"
-        )
+        clustering_service = services.keyword_clustering.KeywordClusteringService()
+
+        # 이전에 임베딩한 키워드 벡터는 DB 캐시에서 재사용
+        await clustering_service.vector_cache.load(db, clustering_service.vectorizer, keywords)
+        try:
+            clustering_result = await clustering_service.cluster_keywords_async(
+                keywords=keywords,
+                num_clusters=min(5, len(keywords) // 3),
+                method=insight_data.clustering_method
+            )
+            await clustering_service.index_keywords_async(keywords)
+        except AnalyticsTimeoutError:
+            raise HTTPException(status_code=504, detail="키워드 분석 시간이 초과되었습니다")
+        await clustering_service.vector_cache.persist(db)
 
         insight = BrandInsight(
             user_id=current_user.id,
@@ -105,9 +165,29 @@ async def create_brand_insight(
         )
 
         db.add(insight)
+
+        # 덴드로그램은 인사이트 JSON과 분리 저장 (요청 시에만 로드)
+        dendrogram = clustering_service.dendrogram
+        if dendrogram:
+            await db.flush()
+            db.add(KeywordDendrogram(
+                insight_id=insight.id,
+                method=dendrogram["method"],
+                num_keywords=dendrogram["num_keywords"],
+                num_leaves=len(dendrogram["leaves"]),
+                leaves=dendrogram["leaves"],
+                merges=dendrogram["merges"]
+            ))
+
         await db.commit()
         await db.refresh(insight)
 
+        # 브랜드 증분 클러스터링 모델에 새 키워드 흡수 (코퍼스 인덱스는 위에서 추가)
+        await _absorb_keywords(db, insight_data.brand_id, keywords, index=False)
+
+        # 핵심 구문 코퍼스 문서 빈도 반영
+        await _add_to_key_phrase_corpus(db, insight)
+
         return insight
 
     else:
@@ -123,6 +203,9 @@ async def create_brand_insight(
         await db.commit()
         await db.refresh(insight)
 
+        # 핵심 구문 코퍼스 문서 빈도 반영
+        await _add_to_key_phrase_corpus(db, insight)
+
         return insight
 
 
@@ -137,23 +220,19 @@ async def list_insights(
     """
     브랜드 인사이트 목록 조회
     """
-    query = select(BrandInsight).where(BrandInsight.user_id == current_user.id)
-
+    filters = [BrandInsight.user_id == current_user.id]
     if brand_id:
-        query = query.where(BrandInsight.brand_id == brand_id)
+        filters.append(BrandInsight.brand_id == brand_id)
 
-    query = query.order_by(BrandInsight.created_at.desc())
+    query = select(BrandInsight).where(*filters).order_by(BrandInsight.created_at.desc())
 
     # 페이지네이션
     offset = (page - 1) * page_size
     result = await db.execute(query.offset(offset).limit(page_size))
     insights = result.scalars().all()
 
-    # 전체 개수
-    count_result = await db.execute(
-        select(BrandInsight).where(BrandInsight.user_id == current_user.id)
-    )
-    total = len(count_result.scalars().all())
+    # 전체 개수 (행을 로드하지 않고 인덱스로 계산)
+    total = await db.scalar(select(func.count()).select_from(BrandInsight).where(*filters))
 
     return {
         "total": total,
@@ -163,6 +242,35 @@ async def list_insights(
     }
 
 
+@router.get("/insights/keywords/similar", response_model=SimilarKeywordsResponse)
+async def find_similar_keywords(
+    keywords: List[str] = Query(..., description="기준 키워드 (여러 개 반복 가능)"),
+    top_n: int = Query(5, ge=1, le=50),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    플랫폼 키워드 코퍼스에서 유사 키워드 배치 검색
+
+    인사이트로 누적된 키워드 유사도 인덱스를 사용합니다 (재학습 없음).
+    """
+    clustering_service = services.keyword_clustering.KeywordClusteringService()
+    try:
+        results = await clustering_service.find_similar_in_corpus_async(keywords, top_n=top_n)
+    except AnalyticsTimeoutError:
+        raise HTTPException(status_code=504, detail="키워드 분석 시간이 초과되었습니다")
+
+    return {
+        "vectorizer": clustering_service.vectorizer.name,
+        "results": {
+            keyword: [
+                {"keyword": similar, "similarity": similarity}
+                for similar, similarity in similar_keywords
+            ]
+            for keyword, similar_keywords in results.items()
+        }
+    }
+
+
 @router.get("/insights/{insight_id}", response_model=BrandInsightResponse)
 async def get_insight(
     insight_id: int,
@@ -178,3 +286,114 @@ async def get_insight(
         raise HTTPException(status_code=404, detail="인사이트를 찾을 수 없습니다")
 
     return insight
+
+
+@router.get("/insights/{insight_id}/dendrogram", response_model=KeywordDendrogramResponse)
+async def get_insight_dendrogram(
+    insight_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    인사이트 계층적 클러스터링 덴드로그램 조회
+
+    merges는 scipy linkage 형식 ([자식1, 자식2, 높이, 크기])이며 리프 ID는 leaves 순서입니다.
+    """
+    insight = await db.get(BrandInsight, insight_id)
+    if not insight or insight.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="인사이트를 찾을 수 없습니다")
+
+    result = await db.execute(
+        select(KeywordDendrogram).where(KeywordDendrogram.insight_id == insight_id)
+    )
+    dendrogram = result.scalar_one_or_none()
+    if not dendrogram:
+        raise HTTPException(status_code=404, detail="덴드로그램 데이터가 없습니다")
+
+    return {
+        "insight_id": insight_id,
+        "method": dendrogram.method,
+        "num_keywords": dendrogram.num_keywords,
+        "num_leaves": dendrogram.num_leaves,
+        "leaves": dendrogram.leaves,
+        "merges": services.keyword_clustering.decode_linkage(
+            dendrogram.merges, dendrogram.num_leaves
+        ).tolist()
+    }
+
+
+@router.get("/insights/{insight_id}/key-phrases", response_model=KeyPhrasesResponse)
+async def get_insight_key_phrases(
+    insight_id: int,
+    top_n: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    인사이트 핵심 구문 추출 (플랫폼 전체 코퍼스 IDF 기준)
+    """
+    insight = await db.get(BrandInsight, insight_id)
+    if not insight or insight.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="인사이트를 찾을 수 없습니다")
+
+    key_phrase_engine = services.key_phrases.key_phrase_engine
+    text = services.key_phrases.insight_document(insight)["text"]
+    try:
+        phrases = await key_phrase_engine.extract(db, [text], top_n=top_n)
+    except AnalyticsTimeoutError:
+        raise HTTPException(status_code=504, detail="키워드 분석 시간이 초과되었습니다")
+
+    return {
+        "insight_id": insight_id,
+        "corpus_documents": key_phrase_engine.n_docs,
+        "key_phrases": [{"phrase": phrase, "score": score} for phrase, score in phrases[0]]
+    }
+
+
+async def _get_owned_brand(db: AsyncSession, brand_id: int, user: User) -> Brand:
+    """현재 사용자 소유 브랜드 조회"""
+    brand = await db.get(Brand, brand_id)
+    if not brand or brand.user_id != user.id:
+        raise HTTPException(status_code=404, detail="브랜드를 찾을 수 없습니다")
+    return brand
+
+
+@router.get("/brands/{brand_id}/keyword-clusters", response_model=KeywordClusterMapResponse)
+async def get_brand_keyword_clusters(
+    brand_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    브랜드 전체 키워드 클러스터 맵 조회
+
+    인사이트 이력 전체로 학습된 증분 클러스터링 결과를 재계산 없이 반환합니다.
+    """
+    await _get_owned_brand(db, brand_id, current_user)
+
+    clustering_service = services.incremental_clustering.incremental_clustering_service
+    keyword_map = await clustering_service.get_keyword_map(db, brand_id)
+    if keyword_map is None:
+        raise HTTPException(status_code=404, detail="키워드 클러스터링 데이터가 없습니다")
+
+    return keyword_map
+
+
+@router.get("/brands/{brand_id}/keyword-clusters/assign", response_model=KeywordAssignmentResponse)
+async def assign_keyword_cluster(
+    brand_id: int,
+    keyword: str = Query(..., min_length=1, max_length=200),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    키워드가 속하는 브랜드 키워드 클러스터 조회 (재학습 없음)
+    """
+    await _get_owned_brand(db, brand_id, current_user)
+
+    clustering_service = services.incremental_clustering.incremental_clustering_service
+    assignment = await clustering_service.assign(db, brand_id, keyword)
+    if assignment is None:
+        raise HTTPException(status_code=404, detail="키워드 클러스터링 데이터가 없습니다")
+
+    return assignment
@@ -0,0 +1,114 @@
+"""
+Brand Report API Endpoints (Back2)
+브랜드 진단 리포트 채점 / AI 분석 / PDF 내보내기
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import get_db, get_current_user
+from app.models.user import User
+from app.models.insight import BrandDiagnostic, BrandReport
+from app.schemas.insight import (
+    DiagnosticScoreResponse, ReportAnalysisStatusResponse, ReportExportRequest, ReportExportStatusResponse
+)
+from app.services.registry import services
+from app.services.report_analysis_service import report_analysis_service
+from app.services.report_pdf_service import report_pdf_service
+
+router = APIRouter()
+
+
+async def _get_owned_report(db: AsyncSession, report_id: int, user: User) -> BrandReport:
+    report = await db.get(BrandReport, report_id)
+    if not report or report.user_id != user.id:
+        raise HTTPException(status_code=404, detail="리포트를 찾을 수 없습니다")
+    return report
+
+
+@router.post("/reports/{report_id}/score", response_model=DiagnosticScoreResponse)
+async def score_report(
+    report_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    리포트 진단 채점
+
+    - 5개 섹션 점수(section_score)와 종합 점수(overall_score)를 함께 계산해 저장
+    - 레이더 차트 데이터를 리포트 섹션에 저장
+    """
+    await _get_owned_report(db, report_id, current_user)
+    result = await services.diagnostic_scoring.diagnostic_scoring_service.score_report(db, report_id)
+    return {"report_id": report_id, **result}
+
+
+async def _analysis_response(db: AsyncSession, report: BrandReport, status: dict) -> dict:
+    """작업 상태 + 현재까지 저장된 섹션 분석 / 요약"""
+    diagnostics = (await db.execute(
+        select(BrandDiagnostic).where(BrandDiagnostic.report_id == report.id).order_by(BrandDiagnostic.id)
+    )).scalars().all()
+    return {**status, "ai_summary": report.ai_summary, "diagnostics": diagnostics}
+
+
+@router.post("/reports/{report_id}/analysis", response_model=ReportAnalysisStatusResponse, status_code=202)
+async def analyze_report(
+    report_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    리포트 AI 분석 시작
+
+    - 5개 섹션 분석을 동시에 실행한 뒤 종합 요약 생성 (백그라운드)
+    - 섹션 분석은 끝나는 대로 저장되므로 GET으로 부분 결과 조회 가능
+    """
+    report = await _get_owned_report(db, report_id, current_user)
+    status = await report_analysis_service.start_analysis(report_id)
+    return await _analysis_response(db, report, status)
+
+
+@router.get("/reports/{report_id}/analysis", response_model=ReportAnalysisStatusResponse)
+async def get_report_analysis(
+    report_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """리포트 AI 분석 상태 및 현재까지의 결과 조회"""
+    report = await _get_owned_report(db, report_id, current_user)
+
+    status = await report_analysis_service.get_status(report_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="분석 작업을 찾을 수 없습니다")
+    return await _analysis_response(db, report, status)
+
+
+@router.post("/reports/{report_id}/export", response_model=ReportExportStatusResponse, status_code=202)
+async def export_report_pdf(
+    report_id: int,
+    export_request: ReportExportRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    리포트 PDF 내보내기
+
+    - 렌더링은 백그라운드에서 진행 (GET으로 상태 조회)
+    - 내용이 바뀌지 않은 리포트는 기존 PDF를 바로 반환
+    """
+    report = await _get_owned_report(db, report_id, current_user)
+    return await report_pdf_service.start_export(db, "brand", report, export_request.model_dump())
+
+
+@router.get("/reports/{report_id}/export", response_model=ReportExportStatusResponse)
+async def get_report_export_status(
+    report_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """리포트 PDF 내보내기 상태 조회"""
+    await _get_owned_report(db, report_id, current_user)
+
+    status = await report_pdf_service.get_status("brand", report_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="내보내기 작업을 찾을 수 없습니다")
+    return status
@@ -3,7 +3,7 @@ API v1 Router
 Combines all v1 endpoints
 """
 from fastapi import APIRouter
-from app.api.v1.endpoints import dashboard, auth, insights, design
+from app.api.v1.endpoints import dashboard, auth, insights, design, campaigns, reports
 
 api_router = APIRouter()
 
@@ -26,11 +26,20 @@ api_router.include_router(
     tags=["Brand Insights"]
 )
 
+# Back2: Brand Reports
+api_router.include_router(
+    reports.router,
+    tags=["Brand Reports"]
+)
+
 # Back3: Design Studio
 api_router.include_router(
     design.router,
     tags=["Design Studio"]
 )
 
-# Back3: Campaigns (추후 추가 예정)
-# api_router.include_router(campaigns.router, tags=["Campaigns"])
+# Back3: Campaigns
+api_router.include_router(
+    campaigns.router,
+    tags=["Campaigns"]
+)
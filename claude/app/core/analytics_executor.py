@@ -0,0 +1,179 @@
+"""
+ArtNex Analytics Executor
+CPU-bound analytics (clustering, key-phrase extraction, similarity search) off the event loop
+"""
+import asyncio
+import functools
+import logging
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class AnalyticsTimeoutError(Exception):
+    """Raised when an analytics task does not finish within its timeout"""
+
+
+def _warm_worker() -> None:
+    """Worker initializer: import numeric libraries once per process"""
+    import scipy.cluster.hierarchy  # noqa: F401
+    import sklearn.cluster  # noqa: F401
+    import sklearn.decomposition  # noqa: F401
+    import sklearn.feature_extraction.text  # noqa: F401
+    from app.services.keyword_vectorizer import get_vectorizer
+
+    get_vectorizer()
+
+
+def _ping() -> bool:
+    return True
+
+
+class AnalyticsExecutor:
+    """
+    Analytics task executor
+
+    Features:
+    - Process pool with warm workers (sklearn/scipy preloaded) for stateless tasks
+    - Single-thread lane for numeric work on in-process state (e.g. the corpus index)
+    - Per-task timeouts and queue-depth metrics
+    - `max_workers=0` runs process tasks in a thread instead (tests, tiny deployments)
+    """
+
+    def __init__(self, max_workers: int = 2, timeout: float = 30.0):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._pool: Optional[Executor] = None
+        self._local: Optional[ThreadPoolExecutor] = None
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.in_flight = 0
+        self.local_in_flight = 0
+        self._busy_seconds = 0.0
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.max_workers > 0:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    # fork is unsafe with the event loop and driver threads already running
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_warm_worker
+                )
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="analytics")
+        return self._pool
+
+    def _get_local(self) -> ThreadPoolExecutor:
+        if self._local is None:
+            self._local = ThreadPoolExecutor(max_workers=1, thread_name_prefix="analytics-local")
+        return self._local
+
+    async def start(self) -> None:
+        """Spawn and warm all workers up front so the first request does not pay for it"""
+        if self.max_workers <= 0:
+            return
+        pool = self._get_pool()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(pool, _ping) for _ in range(self.max_workers)
+        ))
+        logger.info(f"Analytics executor ready ({self.max_workers} workers)")
+
+    async def _submit(
+        self,
+        executor: Executor,
+        call: Callable[[], Any],
+        timeout: Optional[float]
+    ) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(executor, call)
+        started = time.monotonic()
+        self.submitted += 1
+        try:
+            result = await asyncio.wait_for(future, timeout or self.timeout)
+        except asyncio.TimeoutError:
+            # queued tasks are cancelled; a task already running finishes in its worker
+            self.timeouts += 1
+            raise AnalyticsTimeoutError(
+                f"Analytics task {getattr(call, 'func', call).__name__} timed out"
+            )
+        except BrokenProcessPool:
+            # a worker died; build a fresh pool on the next call
+            self.failed += 1
+            self._pool = None
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self._busy_seconds += time.monotonic() - started
+        self.completed += 1
+        return result
+
+    async def run(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Run a stateless task in the process pool
+
+        `fn` and its arguments must be picklable (module-level functions, plain data).
+        """
+        self.in_flight += 1
+        try:
+            return await self._submit(self._get_pool(), functools.partial(fn, *args, **kwargs), timeout)
+        finally:
+            self.in_flight -= 1
+
+    async def run_local(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Run a task that touches in-process state on the dedicated analytics thread
+
+        Tasks on this lane run one at a time, but concurrently with the event loop:
+        state the loop also touches must be guarded by the structure that owns it.
+        NumPy releases the GIL for the heavy parts, so the event loop keeps serving requests.
+        """
+        self.local_in_flight += 1
+        try:
+            return await self._submit(self._get_local(), functools.partial(fn, *args, **kwargs), timeout)
+        finally:
+            self.local_in_flight -= 1
+
+    def shutdown(self) -> None:
+        """Stop workers (pending tasks are cancelled)"""
+        for executor in (self._pool, self._local):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+        self._local = None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Executor counters and current queue depth"""
+        capacity = max(self.max_workers, 1)
+        finished = self.completed + self.failed + self.timeouts
+        return {
+            "workers": self.max_workers,
+            "mode": "process" if self.max_workers > 0 else "thread",
+            "in_flight": self.in_flight,
+            "queue_depth": max(0, self.in_flight - capacity),
+            "local_in_flight": self.local_in_flight,
+            "local_queue_depth": max(0, self.local_in_flight - 1),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "avg_latency_ms": round(self._busy_seconds / finished * 1000, 2) if finished else 0.0,
+        }
+
+
+# Singleton instance
+analytics_executor = AnalyticsExecutor(
+    max_workers=settings.ANALYTICS_WORKERS,
+    timeout=settings.ANALYTICS_TIMEOUT_SECONDS
+)
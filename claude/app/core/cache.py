@@ -0,0 +1,446 @@
+"""
+ArtNex Cache
+Shared async cache (Redis or in-process memory) with namespacing, TTL and stampede protection
+"""
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import math
+import random
+import secrets
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Sentinel for "not in cache" (None is a cacheable value)
+MISSING = object()
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not cacheable")
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, default=_json_default).encode("utf-8")
+
+
+def _loads(raw: bytes) -> Any:
+    return json.loads(raw)
+
+
+class CacheBackend:
+    """Raw byte storage used by `Cache`"""
+
+    name = "base"
+
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float]) -> None:
+        raise NotImplementedError
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        """Set only if the key does not exist (used for locks)"""
+        raise NotImplementedError
+
+    async def delete(self, keys: List[str]) -> None:
+        raise NotImplementedError
+
+    async def delete_if(self, key: str, value: bytes) -> bool:
+        """Delete only if the key still holds `value` (releasing a lock this caller owns)"""
+        raise NotImplementedError
+
+    async def incr(self, key: str) -> int:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process LRU backend (tests, single-worker deployments, Redis fallback)"""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Optional[float], bytes]]" = OrderedDict()
+
+    def _get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        return [self._get(key) for key in keys]
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float]) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        if self._get(key) is not None:
+            return False
+        await self.set(key, value, ttl)
+        return True
+
+    async def delete(self, keys: List[str]) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def delete_if(self, key: str, value: bytes) -> bool:
+        if self._get(key) != value:
+            return False
+        del self._entries[key]
+        return True
+
+    async def incr(self, key: str) -> int:
+        value = int(self._get(key) or 0) + 1
+        entry = self._entries.get(key)
+        self._entries[key] = (entry[0] if entry else None, str(value).encode())
+        self._entries.move_to_end(key)
+        return value
+
+
+class RedisCacheBackend(CacheBackend):
+    """Redis backend shared by all API workers"""
+
+    name = "redis"
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+
+        self._client = redis.from_url(url, socket_connect_timeout=1, socket_timeout=1)
+
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        if not keys:
+            return []
+        return await self._client.mget(keys)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float]) -> None:
+        await self._client.set(key, value, px=int(ttl * 1000) if ttl else None)
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        return bool(await self._client.set(key, value, px=int(ttl * 1000), nx=True))
+
+    async def delete(self, keys: List[str]) -> None:
+        if keys:
+            await self._client.delete(*keys)
+
+    # Compare-and-delete in one round trip so a lock that expired and was
+    # taken by another worker is never released by the previous owner
+    _DELETE_IF_SCRIPT = """
+    if redis.call("get", KEYS[1]) == ARGV[1] then
+        return redis.call("del", KEYS[1])
+    end
+    return 0
+    """
+
+    async def delete_if(self, key: str, value: bytes) -> bool:
+        return bool(await self._client.eval(self._DELETE_IF_SCRIPT, 1, key, value))
+
+    async def incr(self, key: str) -> int:
+        return int(await self._client.incr(key))
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class Cache:
+    """
+    Namespaced cache on top of a backend
+
+    Features:
+    - get / set / get_many / set_many / delete with per-call TTL
+    - get_or_set with stampede protection: probabilistic early refresh (XFetch)
+      plus a short-lived lock so only one worker recomputes a missing key
+    - Backend failures degrade to cache misses; the backend is skipped for
+      `retry_after` seconds so a Redis outage does not add latency to every call
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        namespace: str = "",
+        prefix: str = "artnex",
+        default_ttl: float = 300,
+        retry_after: float = 30
+    ):
+        self.backend = backend
+        self.namespace = namespace
+        self.prefix = prefix
+        self.default_ttl = default_ttl
+        self.retry_after = retry_after
+        self._state = {"down_until": 0.0}
+        self._metrics = {"hits": 0, "misses": 0, "sets": 0, "early_refreshes": 0, "lock_waits": 0, "errors": 0}
+
+    def namespaced(self, namespace: str) -> "Cache":
+        """Child cache sharing the backend, health state and metrics"""
+        child = Cache(self.backend, namespace, self.prefix, self.default_ttl, self.retry_after)
+        child._state = self._state
+        child._metrics = self._metrics
+        return child
+
+    def _key(self, key: str) -> str:
+        parts = [self.prefix, self.namespace, key] if self.namespace else [self.prefix, key]
+        return ":".join(parts)
+
+    async def _call(self, operation: Callable[[], Awaitable[Any]], default: Any) -> Any:
+        if time.monotonic() < self._state["down_until"]:
+            return default
+        try:
+            return await operation()
+        except Exception as e:
+            self._metrics["errors"] += 1
+            self._state["down_until"] = time.monotonic() + self.retry_after
+            logger.warning(f"Cache backend '{self.backend.name}' unavailable, bypassing for {self.retry_after}s: {e}")
+            return default
+
+    # Entries are stored as {"v": value, "d": recompute seconds, "e": expiry epoch}
+    # so readers can decide on an early refresh without a second round trip.
+
+    def _decode(self, raw: Optional[bytes]) -> Tuple[Any, Optional[dict]]:
+        if raw is None:
+            self._metrics["misses"] += 1
+            return MISSING, None
+        try:
+            envelope = _loads(raw)
+        except ValueError:
+            self._metrics["misses"] += 1
+            return MISSING, None
+        self._metrics["hits"] += 1
+        if not isinstance(envelope, dict) or "v" not in envelope:
+            # raw value written by incr()
+            return envelope, None
+        return envelope["v"], envelope
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        """Cached value or `default`"""
+        raws = await self._call(lambda: self.backend.get_many([self._key(key)]), [None])
+        value, _ = self._decode(raws[0])
+        return default if value is MISSING else value
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Cached values for the keys that are present (single round trip)"""
+        keys = list(keys)
+        raws = await self._call(lambda: self.backend.get_many([self._key(k) for k in keys]), [None] * len(keys))
+        result = {}
+        for key, raw in zip(keys, raws):
+            value, _ = self._decode(raw)
+            if value is not MISSING:
+                result[key] = value
+        return result
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None, compute_time: float = 0.0) -> None:
+        """Store a JSON-serializable value"""
+        ttl = self.default_ttl if ttl is None else ttl
+        envelope = {"v": value, "d": compute_time, "e": time.time() + ttl if ttl else None}
+        try:
+            raw = _dumps(envelope)
+        except TypeError as e:
+            logger.warning(f"Skipping cache write for '{self._key(key)}': {e}")
+            return
+        self._metrics["sets"] += 1
+        await self._call(lambda: self.backend.set(self._key(key), raw, ttl), None)
+
+    async def set_many(self, items: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        for key, value in items.items():
+            await self.set(key, value, ttl)
+
+    async def delete(self, *keys: str) -> None:
+        await self._call(lambda: self.backend.delete([self._key(k) for k in keys]), None)
+
+    async def incr(self, key: str) -> Optional[int]:
+        """Atomic counter (None if the backend is unavailable)"""
+        return await self._call(lambda: self.backend.incr(self._key(key)), None)
+
+    async def acquire_lock(self, key: str, ttl: float) -> Optional[bytes]:
+        """
+        Take the short-lived lock on `key` (expires after `ttl` seconds)
+
+        Returns:
+            Token to release the lock with, or None if another worker holds it.
+            An unavailable backend counts as acquired.
+        """
+        token = secrets.token_hex(16).encode()
+        acquired = await self._call(lambda: self.backend.add(self._key(f"{key}:lock"), token, ttl), True)
+        return token if acquired else None
+
+    async def release_lock(self, key: str, token: bytes) -> None:
+        """Release the lock on `key` if `token` still owns it"""
+        await self._call(lambda: self.backend.delete_if(self._key(f"{key}:lock"), token), False)
+
+    @staticmethod
+    def _should_refresh_early(envelope: dict, beta: float) -> bool:
+        """XFetch: refresh with probability rising as expiry approaches, scaled by recompute cost"""
+        expires_at, delta = envelope.get("e"), envelope.get("d") or 0.0
+        if expires_at is None or delta <= 0 or beta <= 0:
+            return False
+        return time.time() - delta * beta * math.log(random.random() or 1e-12) >= expires_at
+
+    async def get_or_set(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+        beta: float = 1.0,
+        lock_timeout: float = 10.0,
+        lock_wait: float = 5.0,
+        cache_if: Optional[Callable[[Any], bool]] = None
+    ) -> Any:
+        """
+        Return the cached value, computing and storing it on a miss
+
+        Args:
+            key: Cache key within the namespace
+            loader: Coroutine factory that computes the value
+            ttl: Time to live in seconds (default: cache default)
+            beta: XFetch aggressiveness (0 disables early refresh)
+            lock_timeout: Recompute lock lifetime in seconds
+            lock_wait: How long a miss waits for another worker's recompute
+            cache_if: Predicate deciding whether a computed value is stored
+        """
+        raws = await self._call(lambda: self.backend.get_many([self._key(key)]), [None])
+        value, envelope = self._decode(raws[0])
+        # Unique per caller so only the worker that took the lock releases it
+        token = secrets.token_hex(16).encode()
+        if value is not MISSING:
+            if not self._should_refresh_early(envelope, beta):
+                return value
+            # Early refresh: only one worker recomputes, the rest keep serving the current value
+            self._metrics["early_refreshes"] += 1
+            if not await self._call(lambda: self.backend.add(self._key(f"{key}:lock"), token, lock_timeout), True):
+                return value
+            return await self._compute(key, loader, ttl, cache_if, token)
+
+        acquired = await self._call(lambda: self.backend.add(self._key(f"{key}:lock"), token, lock_timeout), True)
+        if not acquired:
+            # Another worker is computing this key; wait briefly for its result
+            self._metrics["lock_waits"] += 1
+            deadline = time.monotonic() + lock_wait
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+                raws = await self._call(lambda: self.backend.get_many([self._key(key)]), [None])
+                if raws[0] is not None:
+                    value, _ = self._decode(raws[0])
+                    if value is not MISSING:
+                        return value
+            # The other worker is still computing: compute without the lock and leave it in place
+            token = None
+        return await self._compute(key, loader, ttl, cache_if, token)
+
+    async def _compute(self, key, loader, ttl, cache_if, token: Optional[bytes]) -> Any:
+        started = time.monotonic()
+        try:
+            value = await loader()
+            if cache_if is None or cache_if(value):
+                await self.set(key, value, ttl, compute_time=time.monotonic() - started)
+            return value
+        finally:
+            if token is not None:
+                await self.release_lock(key, token)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        lookups = self._metrics["hits"] + self._metrics["misses"]
+        return {
+            "backend": self.backend.name,
+            "available": time.monotonic() >= self._state["down_until"],
+            **self._metrics,
+            "hit_rate": round(self._metrics["hits"] / lookups, 3) if lookups else 0.0,
+        }
+
+
+def make_call_key(
+    func: Callable,
+    args: tuple,
+    kwargs: dict,
+    exclude: Iterable[str] = ()
+) -> str:
+    """
+    Normalized key for a function call
+
+    The same call gets the same key regardless of positional / keyword
+    arguments or omitted defaults. `self` is left out of the key.
+    """
+    bound = inspect.signature(func).bind(*args, **kwargs)
+    bound.apply_defaults()
+    arguments = {
+        name: value for name, value in bound.arguments.items()
+        if name != "self" and name not in exclude
+    }
+    return f"{func.__qualname__}:{json.dumps(arguments, sort_keys=True, ensure_ascii=False, default=str)}"
+
+
+def cached(
+    namespace: str,
+    ttl: Optional[float] = None,
+    exclude: Iterable[str] = (),
+    cache_if: Optional[Callable[[Any], bool]] = None,
+    beta: float = 1.0
+):
+    """
+    Cache decorator for async service methods
+
+    The key is derived from the bound call arguments (ignoring `self` and `exclude`),
+    hashed so long prompts do not produce oversized keys.
+
+    Args:
+        namespace: Cache namespace (e.g. "gpt", "kpi")
+        ttl: Time to live in seconds
+        exclude: Argument names left out of the key
+        cache_if: Predicate deciding whether a result is stored (e.g. only successes)
+        beta: XFetch early-refresh aggressiveness (0 disables)
+    """
+    exclude = tuple(exclude)
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            call_key = make_call_key(func, args, kwargs, exclude)
+            digest = hashlib.sha256(call_key.encode("utf-8")).hexdigest()[:32]
+            return await cache.namespaced(namespace).get_or_set(
+                f"{func.__qualname__}:{digest}",
+                lambda: func(*args, **kwargs),
+                ttl=ttl,
+                beta=beta,
+                cache_if=cache_if
+            )
+
+        return wrapper
+
+    return decorator
+
+
+def create_backend() -> CacheBackend:
+    """Backend from settings (CACHE_BACKEND=redis|memory)"""
+    if settings.CACHE_BACKEND == "redis":
+        return RedisCacheBackend(settings.REDIS_URL)
+    return MemoryCacheBackend()
+
+
+# Singleton instance
+cache = Cache(create_backend(), default_ttl=settings.CACHE_DEFAULT_TTL)
@@ -2,7 +2,7 @@
 ArtNex Application Configuration
 Environment variables and settings management
 """
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings
 from pydantic import field_validator
 
@@ -28,6 +28,40 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str
     IDEOGRAM_API_KEY: str
 
+    # GPT rate limits (per API key)
+    GPT_TOKENS_PER_MINUTE: int = 30000
+    GPT_REQUESTS_PER_MINUTE: int = 500
+    GPT_MAX_RETRIES: int = 3
+
+    # Keyword analytics
+    KEYWORD_VECTORIZER_BACKEND: str = "hashing"  # tfidf, hashing, embedding
+    KEYWORD_EMBEDDING_PATH: Optional[str] = None  # .npz with `words` and `vectors`
+    KEYWORD_INDEX_DIR: Optional[str] = None  # directory for persisted corpus similarity indexes
+    KEYWORD_INDEX_LSH_THRESHOLD: int = 20000  # switch to LSH at this corpus size
+    KEYWORD_DENDROGRAM_MAX_LEAVES: int = 500  # pre-cluster above this many keywords
+    KEYWORD_SVD_COMPONENTS: int = 64
+
+    # Analytics executor (0 workers = run in a thread instead of a process pool)
+    ANALYTICS_WORKERS: int = 2
+    ANALYTICS_TIMEOUT_SECONDS: float = 30.0
+    SERVICE_WARMUP: bool = True  # import analytics services in the background after startup
+
+    # Cache
+    CACHE_BACKEND: str = "redis"  # redis, memory
+    CACHE_DEFAULT_TTL: int = 300
+    GPT_CACHE_TTL: int = 86400
+    KPI_CACHE_TTL: int = 3600
+    AUTOCOMPLETE_MAX_AGE_SECONDS: float = 60.0
+    SEARCH_SUGGESTION_DEBOUNCE_MS: int = 300
+    SEARCH_SUGGESTION_CACHE_TTL: int = 3600
+    CAMPAIGN_REPORT_CONCURRENCY: int = 4  # brands processed in parallel by the monthly report batch
+    REPORT_RENDER_TIMEOUT_SECONDS: float = 120.0
+    STORYBOARD_RENDER_CONCURRENCY: int = 4  # frame images requested from Ideogram at once
+    PALETTE_UPLOAD_MAX_BYTES: int = 10 * 1024 * 1024  # larger uploads to /color-palettes/extract get 413
+    REPORT_ANALYSIS_DEADLINE_SECONDS: float = 90.0
+    REPORT_ANALYSIS_TOKEN_BUDGET: int = 8000  # prompt + completion tokens per diagnostic report analysis
+    DIAGNOSTIC_SECTION_WEIGHTS: Dict[str, float] = {}  # per-section weight for overall_score, default 1.0; rescore with python -m app.services.diagnostic_scoring_service
+
     # AWS
     AWS_ACCESS_KEY_ID: str
     AWS_SECRET_ACCESS_KEY: str
@@ -2,6 +2,7 @@
 ArtNex FastAPI Main Application
 MVP Version 1.0
 """
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -40,12 +41,32 @@ async def startup_event():
     logger.info("📝 API Documentation: http://localhost:8000/docs")
     logger.info("📚 ReDoc: http://localhost:8000/redoc")
 
+    from app.core.analytics_executor import analytics_executor
+    await analytics_executor.start()
+
+    # 분석 서비스(numpy / scikit-learn / scipy)는 요청 처리를 막지 않도록 백그라운드에서 로드
+    if settings.SERVICE_WARMUP:
+        from app.services.registry import services
+        app.state.warmup_task = asyncio.create_task(services.warm_up())
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """애플리케이션 종료 시 실행"""
     logger.info("👋 ArtNex API Server Shutting Down...")
 
+    from app.core.analytics_executor import analytics_executor
+    analytics_executor.shutdown()
+
+    from app.core.cache import cache
+    await cache.backend.close()
+
+    from app.services.registry import services
+    if services.is_loaded("keyword_index"):
+        saved = services.keyword_index.keyword_corpus_index.save()
+        if saved:
+            logger.info(f"💾 Saved {saved} keyword similarity index(es)")
+
 
 @app.get("/", tags=["Root"])
 async def root():
@@ -69,6 +90,30 @@ async def health_check():
     }
 
 
+@app.get("/health/metrics", tags=["Health"])
+async def service_metrics():
+    """외부 API 호출 예산 및 서비스 메트릭"""
+    from app.services.gpt_scheduler import gpt_scheduler
+    from app.services.single_flight import get_all_metrics
+    from app.services.registry import services
+    from app.core.analytics_executor import analytics_executor
+    from app.core.cache import cache
+    from app.services.brand_autocomplete import brand_autocomplete
+
+    return {
+        "gpt_scheduler": gpt_scheduler.get_metrics(),
+        "single_flight": get_all_metrics(),
+        "keyword_index": (
+            services.keyword_index.keyword_corpus_index.get_metrics()
+            if services.is_loaded("keyword_index") else {}
+        ),
+        "analytics_executor": analytics_executor.get_metrics(),
+        "services": services.get_metrics(),
+        "cache": cache.get_metrics(),
+        "autocomplete": brand_autocomplete.get_metrics()
+    }
+
+
 # API 라우터 등록
 from app.api.v1.router import api_router
 from app.core.config import settings
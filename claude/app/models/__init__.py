@@ -16,6 +16,13 @@ from app.models.insight import (
     InsightType,
     DiagnosticSection
 )
+from app.models.keyword import (
+    KeywordVector,
+    KeywordClusterModel,
+    KeywordDendrogram,
+    KeyPhraseDocument,
+    KeyPhraseTerm
+)
 
 # Back3 models (Design & Campaign)
 from app.models.design import (
@@ -48,6 +55,11 @@ __all__ = [
     "ReportSection",
     "InsightType",
     "DiagnosticSection",
+    "KeywordVector",
+    "KeywordClusterModel",
+    "KeywordDendrogram",
+    "KeyPhraseDocument",
+    "KeyPhraseTerm",
     # Back3
     "DesignProject",
     "DesignResult",
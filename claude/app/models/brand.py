@@ -3,7 +3,7 @@ Brand and Brand KPI Models
 Core brand management tables
 """
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, JSON, DDL, Index, event
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
@@ -14,9 +14,13 @@ class Brand(Base):
     ERD Reference: Brands table
     """
     __tablename__ = "brands"
+    __table_args__ = (
+        # dashboard cards / shortcuts: a user's active brands, most recently updated first
+        Index("ix_brands_user_id_status_updated_at", "user_id", "status", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     brand_name = Column(String(200), nullable=False, index=True)
     category = Column(String(100), nullable=True, index=True)
     industry = Column(String(100), nullable=True)
@@ -60,9 +64,16 @@ class BrandKPI(Base):
     ERD Reference: Brand_KPIs table
     """
     __tablename__ = "brand_kpis"
+    __table_args__ = (
+        # latest KPI / trend window per brand; covering on PostgreSQL
+        Index(
+            "ix_brand_kpis_brand_id_measurement_date", "brand_id", "measurement_date",
+            postgresql_include=["value", "popularity_index"]
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    brand_id = Column(Integer, ForeignKey("brands.id", ondelete="CASCADE"), nullable=False, index=True)
+    brand_id = Column(Integer, ForeignKey("brands.id", ondelete="CASCADE"), nullable=False)
 
     # KPI metrics
     kpi_type = Column(String(100), nullable=False, index=True)  # followers, engagement_rate, popularity_index, etc.
@@ -90,3 +101,44 @@ class BrandKPI(Base):
 
     def __repr__(self) -> str:
         return f"<BrandKPI(id={self.id}, brand_id={self.brand_id}, kpi_type='{self.kpi_type}', value={self.value})>"
+
+
+# Brand search indexes (see app/services/brand_search_service.py)
+# PostgreSQL: trigram index on brand_name plus a full-text index over the descriptive columns.
+# The search query must use BRAND_SEARCH_DOCUMENT verbatim for the expression index to apply.
+BRAND_SEARCH_DOCUMENT = (
+    "to_tsvector('simple', coalesce(brand_name, '') || ' ' || coalesce(slogan, '') || ' ' || "
+    "coalesce(description, '') || ' ' || coalesce(keywords::jsonb::text, ''))"
+)
+
+POSTGRES_SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_brands_brand_name_trgm ON brands USING gin (brand_name gin_trgm_ops)",
+    f"CREATE INDEX IF NOT EXISTS ix_brands_search_document ON brands USING gin (({BRAND_SEARCH_DOCUMENT}))",
+]
+
+# SQLite (tests, local development): FTS5 table kept in sync by triggers.
+# Keywords are indexed as decoded text (JSON stores non-ASCII text as \uXXXX escapes).
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS brands_fts USING fts5("
+    "brand_name, slogan, description, keywords, tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS brands_fts_ai AFTER INSERT ON brands BEGIN "
+    "INSERT INTO brands_fts(rowid, brand_name, slogan, description, keywords) "
+    "VALUES (new.id, new.brand_name, new.slogan, new.description, "
+    "(SELECT group_concat(value, ' ') FROM json_each(new.keywords))); END",
+    "CREATE TRIGGER IF NOT EXISTS brands_fts_ad AFTER DELETE ON brands BEGIN "
+    "DELETE FROM brands_fts WHERE rowid = old.id; END",
+    "CREATE TRIGGER IF NOT EXISTS brands_fts_au AFTER UPDATE ON brands BEGIN "
+    "DELETE FROM brands_fts WHERE rowid = old.id; "
+    "INSERT INTO brands_fts(rowid, brand_name, slogan, description, keywords) "
+    "VALUES (new.id, new.brand_name, new.slogan, new.description, "
+    "(SELECT group_concat(value, ' ') FROM json_each(new.keywords))); END",
+]
+
+for _statement in POSTGRES_SEARCH_DDL:
+    event.listen(Brand.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+for _statement in SQLITE_SEARCH_DDL:
+    event.listen(Brand.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(
+    Brand.__table__, "before_drop", DDL("DROP TABLE IF EXISTS brands_fts").execute_if(dialect="sqlite")
+)
@@ -2,7 +2,7 @@
 Campaign Models (Back3)
 캠페인 관리 및 캠페인 리포트 관련 데이터베이스 모델
 """
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, ForeignKey, JSON, Enum, Boolean, Numeric
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, ForeignKey, JSON, Enum, Boolean, Numeric, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -32,7 +32,7 @@ class Campaign(Base):
     __tablename__ = "campaigns"
 
     id = Column(Integer, primary_key=True, index=True)
-    brand_id = Column(Integer, ForeignKey("brands.id", ondelete="CASCADE"), nullable=False)
+    brand_id = Column(Integer, ForeignKey("brands.id", ondelete="CASCADE"), nullable=False, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
 
     # 캠페인 기본 정보
@@ -69,8 +69,14 @@ class Campaign(Base):
 
 
 class CampaignTracking(Base):
-    """캠페인 추적 데이터 테이블"""
+    """캠페인 추적 데이터 테이블 (캠페인 × 날짜당 한 행, ctr / cpc / roas는 적재 시 SQL에서 계산)"""
     __tablename__ = "campaign_tracking"
+    __table_args__ = (
+        # upsert 키 겸 캠페인별 구간 조회 인덱스
+        UniqueConstraint("campaign_id", "tracking_date", name="uq_campaign_tracking_campaign_id_tracking_date"),
+        # 날짜순으로 적재되는 시계열이므로 PostgreSQL에서는 작은 BRIN 인덱스로 전체 구간 조회
+        Index("ix_campaign_tracking_tracking_date", "tracking_date", postgresql_using="brin"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     campaign_id = Column(Integer, ForeignKey("campaigns.id", ondelete="CASCADE"), nullable=False)
@@ -103,8 +109,11 @@ class CampaignTracking(Base):
 
 
 class CampaignReport(Base):
-    """캠페인 리포트 테이블"""
+    """캠페인 리포트 테이블 (캠페인 × 월당 한 행)"""
     __tablename__ = "campaign_reports"
+    __table_args__ = (
+        UniqueConstraint("campaign_id", "report_month", name="uq_campaign_reports_campaign_id_report_month"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     campaign_id = Column(Integer, ForeignKey("campaigns.id", ondelete="CASCADE"), nullable=False)
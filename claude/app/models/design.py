@@ -22,7 +22,7 @@ class DesignProject(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     brand_id = Column(Integer, ForeignKey("brands.id", ondelete="CASCADE"), nullable=False)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
 
     # 프로젝트 정보
     project_name = Column(String(200), nullable=False)
@@ -76,11 +76,12 @@ class DesignMockup(Base):
     __tablename__ = "design_mockups"
 
     id = Column(Integer, primary_key=True, index=True)
-    design_result_id = Column(Integer, ForeignKey("design_results.id", ondelete="CASCADE"), nullable=False)
+    design_result_id = Column(Integer, ForeignKey("design_results.id", ondelete="CASCADE"), nullable=False, index=True)
 
     # 목업 정보
     mockup_type = Column(String(100), comment="목업 유형 (패키지/명함/포스터 등)")
     mockup_url = Column(String(500), comment="목업 이미지 URL")
+    thumbnail_urls = Column(JSON, comment="크기별 이미지 URL (large/medium/thumbnail)")
     industry_tab = Column(String(100), comment="산업별 탭")
 
     # 메타데이터
@@ -2,7 +2,7 @@
 Brand Insight Models (Back2)
 브랜드 인사이트 및 리포트 관련 데이터베이스 모델
 """
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, ForeignKey, JSON, Enum
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, ForeignKey, JSON, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -30,6 +30,9 @@ class DiagnosticSection(str, enum.Enum):
 class BrandInsight(Base):
     """브랜드 인사이트 테이블"""
     __tablename__ = "brand_insights"
+    __table_args__ = (
+        Index("ix_brand_insights_user_id_created_at", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
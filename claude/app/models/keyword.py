@@ -0,0 +1,99 @@
+"""
+Keyword Analytics Models (Back2)
+키워드 벡터 캐시, 증분 클러스터링 모델, 덴드로그램, 핵심 구문 코퍼스 등 키워드 분석 관련 데이터베이스 모델
+"""
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary, UniqueConstraint, ForeignKey, JSON
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class KeywordVector(Base):
+    """키워드 벡터 캐시 테이블 (정규화된 키워드 → 임베딩)"""
+    __tablename__ = "keyword_vectors"
+    __table_args__ = (
+        UniqueConstraint("backend", "keyword", name="uq_keyword_vectors_backend_keyword"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # 벡터화 백엔드 (hashing / embedding 등) 및 정규화된 키워드
+    backend = Column(String(50), nullable=False, comment="벡터화 백엔드")
+    keyword = Column(String(200), nullable=False, comment="정규화된 키워드")
+
+    # float32 벡터 (little-endian raw bytes)
+    dim = Column(Integer, nullable=False, comment="벡터 차원")
+    vector = Column(LargeBinary, nullable=False, comment="float32 벡터 바이트")
+
+    # 메타데이터
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class KeywordClusterModel(Base):
+    """브랜드별 증분 키워드 클러스터링 모델 테이블 (온라인 K-Means 상태)"""
+    __tablename__ = "keyword_cluster_models"
+
+    id = Column(Integer, primary_key=True, index=True)
+    brand_id = Column(Integer, ForeignKey("brands.id", ondelete="CASCADE"), nullable=False, unique=True)
+
+    # 모델 설정
+    backend = Column(String(50), nullable=False, comment="벡터화 백엔드")
+    n_clusters = Column(Integer, nullable=False, comment="최대 클러스터 수")
+    dim = Column(Integer, nullable=False, comment="벡터 차원")
+
+    # 모델 상태 (float32 중심점 / int64 클러스터별 누적 샘플 수, raw bytes)
+    centroids = Column(LargeBinary, nullable=True, comment="클러스터 중심점")
+    counts = Column(LargeBinary, nullable=True, comment="클러스터별 누적 샘플 수")
+    n_samples = Column(Integer, default=0, nullable=False, comment="누적 학습 키워드 수")
+
+    # 키워드 → 클러스터 매핑 (재계산 없이 조회)
+    keyword_map = Column(JSON, comment="정규화 키워드 → 클러스터 ID")
+
+    # 메타데이터
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+
+class KeywordDendrogram(Base):
+    """인사이트 계층적 클러스터링 덴드로그램 테이블 (요청 시에만 로드)"""
+    __tablename__ = "keyword_dendrograms"
+
+    id = Column(Integer, primary_key=True, index=True)
+    insight_id = Column(Integer, ForeignKey("brand_insights.id", ondelete="CASCADE"), nullable=False, unique=True)
+
+    # 덴드로그램 설정
+    method = Column(String(20), nullable=False, comment="linkage 방법")
+    num_keywords = Column(Integer, nullable=False, comment="전체 키워드 수")
+    num_leaves = Column(Integer, nullable=False, comment="리프 수 (사전 클러스터링 후)")
+
+    # 리프 (대표 키워드, 포함 키워드 수) 및 zlib 압축 linkage (int32 자식 / float32 높이 / int32 크기)
+    leaves = Column(JSON, nullable=False, comment="리프 목록")
+    merges = Column(LargeBinary, nullable=False, comment="압축 linkage 행렬")
+
+    # 메타데이터
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class KeyPhraseDocument(Base):
+    """핵심 구문 코퍼스에 반영된 문서 테이블 (문서 수 및 중복 반영 방지)"""
+    __tablename__ = "key_phrase_documents"
+    __table_args__ = (
+        UniqueConstraint("source", "source_id", name="uq_key_phrase_documents_source"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # 문서 출처 (insight / report / shortform) 및 원본 ID
+    source = Column(String(50), nullable=False, comment="문서 출처")
+    source_id = Column(Integer, nullable=False, comment="원본 레코드 ID")
+
+    # 메타데이터
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class KeyPhraseTerm(Base):
+    """핵심 구문 코퍼스 문서 빈도 테이블 (IDF 계산용)"""
+    __tablename__ = "key_phrase_terms"
+
+    id = Column(Integer, primary_key=True, index=True)
+    term = Column(String(200), nullable=False, unique=True, comment="1-gram / 2-gram 구문")
+    doc_freq = Column(Integer, nullable=False, default=0, comment="구문이 등장한 문서 수")
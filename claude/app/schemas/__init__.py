@@ -8,7 +8,8 @@ from app.schemas.dashboard import DashboardResponse, BrandShortcut, UserStatus
 from app.schemas.insight import (
     BrandInsightCreate, BrandInsightResponse, BrandInsightListResponse,
     BrandReportCreate, BrandReportResponse, BrandReportUpdate,
-    BrandDiagnosticCreate, ReportExportRequest, ReportExportResponse
+    BrandDiagnosticCreate, ReportExportRequest, ReportExportResponse, ReportExportStatusResponse,
+    DiagnosticScoreResponse, ReportAnalysisStatusResponse
 )
 
 # Back3 schemas (Design & Campaign)
@@ -29,7 +30,8 @@ __all__ = [
     # Back2
     "BrandInsightCreate", "BrandInsightResponse", "BrandInsightListResponse",
     "BrandReportCreate", "BrandReportResponse", "BrandReportUpdate",
-    "BrandDiagnosticCreate", "ReportExportRequest", "ReportExportResponse",
+    "BrandDiagnosticCreate", "ReportExportRequest", "ReportExportResponse", "ReportExportStatusResponse",
+    "DiagnosticScoreResponse", "ReportAnalysisStatusResponse",
     # Back3
     "DesignProjectCreate", "DesignProjectResponse", "DesignProjectUpdate",
     "ShortformProjectCreate", "ShortformProjectResponse", "IdeogramGenerateRequest",
@@ -92,6 +92,65 @@ class CampaignTrackingCreate(BaseModel):
     cost: Decimal = Field(default=0, ge=0)
 
 
+class CampaignTrackingPoint(BaseModel):
+    """캠페인 추적 데이터 포인트 (일괄 적재용, ctr / cpc / roas는 서버에서 계산)"""
+    tracking_date: datetime
+    impressions: int = Field(default=0, ge=0)
+    clicks: int = Field(default=0, ge=0)
+    conversions: int = Field(default=0, ge=0)
+    revenue: Decimal = Field(default=0, ge=0)
+    cost: Decimal = Field(default=0, ge=0)
+    likes: int = Field(default=0, ge=0)
+    shares: int = Field(default=0, ge=0)
+    comments: int = Field(default=0, ge=0)
+
+
+class CampaignTrackingBulkCreate(BaseModel):
+    """캠페인 추적 데이터 일괄 적재 요청"""
+    points: List[CampaignTrackingPoint] = Field(..., min_length=1, max_length=10000)
+
+
+class CampaignTrackingBulkResponse(BaseModel):
+    """캠페인 추적 데이터 일괄 적재 응답"""
+    campaign_id: int
+    ingested: int
+
+
+class CampaignMetricsBucket(BaseModel):
+    """집계 구간별 캠페인 지표"""
+    bucket: str = Field(..., description="구간 시작일 (YYYY-MM-DD)")
+    impressions: float
+    clicks: float
+    conversions: float
+    revenue: float
+    cost: float
+    likes: float
+    shares: float
+    comments: float
+    ctr: Optional[float]
+    cpc: Optional[float]
+    roas: Optional[float]
+
+
+class CampaignMetricsSeriesResponse(BaseModel):
+    """캠페인 지표 시계열 응답"""
+    campaign_id: int
+    granularity: str
+    start: datetime
+    end: datetime
+    buckets: List[CampaignMetricsBucket]
+
+
+class CampaignExportStatusResponse(BaseModel):
+    """캠페인 추적 데이터 내보내기 작업 상태"""
+    status: str = Field(..., description="running / done / failed")
+    file_url: Optional[str] = None
+    file_size: Optional[int] = None
+    rows: Optional[int] = None
+    generated_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+
 # ========================================
 # Campaign Report Schemas
 # ========================================
@@ -55,6 +55,8 @@ class BrandSearchRequest(BaseModel):
     query: str = Field(..., min_length=1, max_length=200)
     category: Optional[str] = None
     limit: int = Field(10, ge=1, le=50)
+    # AI suggestions are served by GET /dashboard/search/suggestions unless requested inline
+    include_ai_suggestions: bool = False
 
 
 class BrandSearchResponse(BaseModel):
@@ -62,3 +64,25 @@ class BrandSearchResponse(BaseModel):
     brands: List[BrandShortcut]
     ai_suggestions: Optional[List[AIRecommendation]] = None
     total_count: int
+
+
+class AISuggestionsResponse(BaseModel):
+    """Schema for AI search suggestions response"""
+    query: str
+    category: Optional[str] = None
+    suggestions: List[AIRecommendation]
+    cached: bool = False
+    superseded: bool = False  # a newer request from the same user replaced this one
+
+
+class AutocompleteSuggestion(BaseModel):
+    """Schema for a type-ahead suggestion"""
+    text: str
+    type: str = Field(..., pattern="^(brand|category|keyword)$")
+    brand_id: Optional[int] = None
+
+
+class AutocompleteResponse(BaseModel):
+    """Schema for brand autocomplete response"""
+    query: str
+    suggestions: List[AutocompleteSuggestion]
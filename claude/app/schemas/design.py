@@ -66,6 +66,79 @@ class DesignProjectResponse(BaseModel):
         from_attributes = True
 
 
+class DesignMockupCreate(BaseModel):
+    """디자인 목업 생성 요청"""
+    mockup_types: List[str] = Field(
+        default=["package", "business_card", "poster"], min_length=1, max_length=3,
+        description="package / business_card / poster"
+    )
+    industry_tab: str = Field(default="general", pattern="^(beauty|food|fashion|tech|general)$")
+
+    @validator('mockup_types')
+    def validate_mockup_types(cls, v):
+        unknown = [t for t in v if t not in ("package", "business_card", "poster")]
+        if unknown:
+            raise ValueError(f"Unsupported mockup type: {', '.join(unknown)}")
+        return v
+
+
+class DesignMockupResponse(BaseModel):
+    """디자인 목업 응답"""
+    id: int
+    design_result_id: int
+    mockup_type: Optional[str]
+    mockup_url: Optional[str]
+    thumbnail_urls: Optional[Dict[str, str]]
+    industry_tab: Optional[str]
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+# ========================================
+# Color Palette Schemas
+# ========================================
+
+class ColorPaletteRequest(BaseModel):
+    """배색 제안 요청 (기준 색 여러 개 일괄)"""
+    base_colors: List[str] = Field(..., min_length=1, max_length=50)
+    schemes: List[str] = Field(default=["complementary", "analogous", "triadic"], min_length=1)
+    num_colors: int = Field(default=5, ge=2, le=5)
+
+    @validator('base_colors', each_item=True)
+    def validate_hex(cls, v):
+        import re
+        if not re.fullmatch(r"#?([0-9a-fA-F]{3}|[0-9a-fA-F]{6})", v.strip()):
+            raise ValueError(f"Invalid hex color: {v}")
+        return v.strip()
+
+    @validator('schemes', each_item=True)
+    def validate_scheme(cls, v):
+        if v not in ("complementary", "analogous", "triadic"):
+            raise ValueError(f"Unsupported palette scheme: {v}")
+        return v
+
+
+class PaletteColorResponse(BaseModel):
+    """팔레트 색상 (글자색 대비 / WCAG 등급)"""
+    hex: str
+    text_color: str
+    text_contrast: float
+    wcag: str = Field(..., description="AAA / AA / AA-large / fail")
+    share: Optional[float] = Field(None, description="이미지 내 비중 (추출 팔레트)")
+
+
+class ColorPaletteResponse(BaseModel):
+    """컬러 팔레트 + 접근성 점수"""
+    base_color: Optional[str] = None
+    scheme: Optional[str] = None
+    colors: List[PaletteColorResponse]
+    aa_pairs: int = Field(..., description="WCAG AA(4.5:1) 이상 색 쌍 수")
+    min_delta_e: float = Field(..., description="가장 비슷한 두 색의 색차 (CIE76)")
+    accessibility_score: float = Field(..., ge=0, le=100)
+
+
 class IdeogramGenerateRequest(BaseModel):
     """Ideogram 이미지 생성 요청"""
     project_id: int
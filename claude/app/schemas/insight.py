@@ -37,6 +37,11 @@ class BrandInsightCreate(BaseModel):
     brand_id: Optional[int] = None
     prompt: str = Field(..., min_length=10, max_length=5000, description="분석 프롬프트")
     insight_type: InsightType = Field(default=InsightType.MARKET_ANALYSIS)
+    clustering_method: str = Field(
+        default="kmeans",
+        pattern="^(kmeans|hierarchical)$",
+        description="키워드 클러스터링 방법 (keyword_clustering 유형)"
+    )
 
     @validator('prompt')
     def validate_prompt(cls, v):
@@ -72,6 +77,72 @@ class BrandInsightListResponse(BaseModel):
     insights: List[BrandInsightResponse]
 
 
+class KeywordClusterGroup(BaseModel):
+    """브랜드 키워드 클러스터"""
+    cluster_id: int
+    keywords: List[str]
+    size: int
+    total_samples: int
+
+
+class KeywordClusterMapResponse(BaseModel):
+    """브랜드 전체 키워드 클러스터 맵 응답"""
+    brand_id: int
+    backend: str
+    n_clusters: int
+    n_samples: int
+    clusters: List[KeywordClusterGroup]
+    updated_at: Optional[datetime]
+
+
+class KeywordAssignmentResponse(BaseModel):
+    """키워드 클러스터 할당 응답"""
+    keyword: str
+    cluster_id: int
+    known: bool = Field(..., description="이미 학습된 키워드 여부")
+
+
+class SimilarKeyword(BaseModel):
+    """유사 키워드"""
+    keyword: str
+    similarity: float
+
+
+class SimilarKeywordsResponse(BaseModel):
+    """유사 키워드 배치 검색 응답"""
+    vectorizer: str
+    results: Dict[str, List[SimilarKeyword]] = Field(..., description="정규화 키워드별 유사 키워드")
+
+
+class DendrogramLeaf(BaseModel):
+    """덴드로그램 리프 (사전 클러스터링 시 대표 키워드)"""
+    label: str
+    size: int
+
+
+class KeywordDendrogramResponse(BaseModel):
+    """계층적 클러스터링 덴드로그램 응답"""
+    insight_id: int
+    method: str
+    num_keywords: int
+    num_leaves: int
+    leaves: List[DendrogramLeaf]
+    merges: List[List[float]] = Field(..., description="scipy linkage 행렬")
+
+
+class KeyPhrase(BaseModel):
+    """핵심 구문"""
+    phrase: str
+    score: float
+
+
+class KeyPhrasesResponse(BaseModel):
+    """인사이트 핵심 구문 응답"""
+    insight_id: int
+    corpus_documents: int = Field(..., description="IDF 계산에 사용된 코퍼스 문서 수")
+    key_phrases: List[KeyPhrase]
+
+
 # ========================================
 # Brand Report Schemas
 # ========================================
@@ -190,3 +261,35 @@ class ReportExportResponse(BaseModel):
     pdf_url: str
     file_size: Optional[int]
     generated_at: datetime
+
+
+class ReportExportStatusResponse(BaseModel):
+    """리포트 PDF 내보내기 작업 상태"""
+    status: str = Field(..., description="rendering / done / failed")
+    content_hash: Optional[str] = None
+    pdf_url: Optional[str] = None
+    file_size: Optional[int] = None
+    generated_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+
+class DiagnosticScoreResponse(BaseModel):
+    """브랜드 진단 채점 결과"""
+    report_id: int
+    overall_score: Optional[float] = Field(None, description="섹션 가중 평균 (0-100)")
+    section_scores: Dict[str, Optional[float]] = Field(..., description="섹션별 점수 (응답 없는 섹션은 null)")
+    chart_data: Dict[str, Any] = Field(..., description="레이더 차트 데이터")
+
+
+class ReportAnalysisStatusResponse(BaseModel):
+    """리포트 AI 분석 작업 상태 (완료된 섹션은 진행 중에도 포함)"""
+    status: str = Field(..., description="running / done / partial / failed")
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    completed_sections: List[str] = []
+    failed_sections: Dict[str, str] = {}
+    tokens_used: int = 0
+    summary_generated: bool = False
+    error: Optional[str] = None
+    ai_summary: Optional[str] = None
+    diagnostics: List[BrandDiagnosticResponse] = []
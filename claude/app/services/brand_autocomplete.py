@@ -0,0 +1,218 @@
+"""
+Brand Autocomplete
+Per-user in-memory prefix / n-gram index for type-ahead brand search
+"""
+import bisect
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.brand import Brand
+from app.services.single_flight import get_group
+
+# Suggestion types, in display priority order for equal match quality
+SUGGESTION_TYPES = ("brand", "category", "keyword")
+
+
+def normalize(text: str) -> str:
+    """Case- and whitespace-insensitive form used for matching"""
+    return " ".join(text.casefold().split())
+
+
+def _bigrams(text: str) -> Set[str]:
+    text = text.replace(" ", "")
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class BrandAutocompleteIndex:
+    """
+    Immutable autocomplete index for one user's brands
+
+    Every suggestion is reachable by the prefix of its text or of any word in it
+    (sorted key array + bisect), and by infix through a character-bigram index.
+    Prefix matches rank above infix matches.
+    """
+
+    def __init__(self, suggestions: List[Dict]):
+        self.suggestions = suggestions
+        self._normalized = [normalize(s["text"]) for s in suggestions]
+
+        keys: List[Tuple[str, int]] = []
+        self._bigrams: Dict[str, Set[int]] = {}
+        for idx, text in enumerate(self._normalized):
+            words = text.split(" ")
+            # the full text and every word-start suffix, so "코스" finds "그린비건 코스메틱"
+            keys.extend((" ".join(words[i:]), idx) for i in range(len(words)))
+            for gram in _bigrams(text):
+                self._bigrams.setdefault(gram, set()).add(idx)
+        keys.sort()
+        self._keys = [key for key, _ in keys]
+        self._key_ids = [idx for _, idx in keys]
+        self.built_at = time.monotonic()
+
+    @classmethod
+    def from_brands(cls, brands: List[Tuple[int, str, Optional[str], Optional[list]]]) -> "BrandAutocompleteIndex":
+        """
+        Build from (id, brand_name, category, keywords) rows
+
+        Categories and keywords are deduplicated across brands and weighted by
+        the number of brands using them.
+        """
+        suggestions: List[Dict] = []
+        shared: Dict[Tuple[str, str], Dict] = {}
+        for brand_id, brand_name, category, keywords in brands:
+            suggestions.append({"text": brand_name, "type": "brand", "brand_id": brand_id, "weight": 1})
+            terms = [("category", category)] + [("keyword", k) for k in (keywords or []) if isinstance(k, str)]
+            for kind, term in terms:
+                if not term or not term.strip():
+                    continue
+                key = (kind, normalize(term))
+                if key not in shared:
+                    shared[key] = {"text": term.strip(), "type": kind, "brand_id": None, "weight": 0}
+                    suggestions.append(shared[key])
+                shared[key]["weight"] += 1
+        return cls(suggestions)
+
+    def lookup(self, query: str, limit: int = 10) -> List[Dict]:
+        """
+        Suggestions for a partial query
+
+        Args:
+            query: Text typed so far
+            limit: Maximum number of suggestions
+
+        Returns:
+            Suggestions ordered by match quality, type, weight and text
+        """
+        query = normalize(query)
+        if not query:
+            return []
+
+        matches: Dict[int, int] = {}
+        start = bisect.bisect_left(self._keys, query)
+        for pos in range(start, len(self._keys)):
+            if not self._keys[pos].startswith(query):
+                break
+            idx = self._key_ids[pos]
+            # 0: whole text starts with the query, 1: a later word does
+            rank = 0 if self._normalized[idx].startswith(query) else 1
+            matches[idx] = min(rank, matches.get(idx, rank))
+
+        grams = _bigrams(query)
+        if grams:
+            candidates = set.intersection(*(self._bigrams.get(gram, set()) for gram in grams))
+            for idx in candidates:
+                if idx not in matches and query in self._normalized[idx]:
+                    matches[idx] = 2
+
+        ordered = sorted(matches, key=lambda idx: (
+            matches[idx],
+            SUGGESTION_TYPES.index(self.suggestions[idx]["type"]),
+            -self.suggestions[idx]["weight"],
+            self._normalized[idx]
+        ))
+        return [self.suggestions[idx] for idx in ordered[:limit]]
+
+
+class BrandAutocompleteService:
+    """
+    Per-user autocomplete indexes built from the brands table
+
+    Features:
+    - Lazy build per user (one query), concurrent builds coalesced
+    - Invalidation on brand writes in this process (ORM commit hook)
+    - Rebuild after `max_age` seconds to pick up writes from other workers
+    - LRU bound on the number of cached users
+    """
+
+    def __init__(self, max_users: int = 10_000, max_age: float = 60.0):
+        self.max_users = max_users
+        self.max_age = max_age
+        self._indexes: "OrderedDict[int, BrandAutocompleteIndex]" = OrderedDict()
+        self._versions: Dict[int, int] = {}
+        self._metrics = {"lookups": 0, "builds": 0, "invalidations": 0}
+
+    def invalidate(self, user_ids) -> None:
+        """Drop the indexes of users whose brands changed"""
+        for user_id in set(user_ids):
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+            self._indexes.pop(user_id, None)
+            self._metrics["invalidations"] += 1
+
+    async def _load(self, db: AsyncSession, user_id: int) -> BrandAutocompleteIndex:
+        result = await db.execute(
+            select(Brand.id, Brand.brand_name, Brand.category, Brand.keywords)
+            .where(Brand.user_id == user_id, Brand.status == "active")
+        )
+        self._metrics["builds"] += 1
+        return BrandAutocompleteIndex.from_brands(result.all())
+
+    async def _build(self, db: AsyncSession, user_id: int) -> None:
+        version = self._versions.get(user_id, 0)
+        index = await self._load(db, user_id)
+
+        # a write committed while we were reading invalidates this build
+        if self._versions.get(user_id, 0) == version:
+            self._indexes[user_id] = index
+            self._indexes.move_to_end(user_id)
+            while len(self._indexes) > self.max_users:
+                self._indexes.popitem(last=False)
+
+    async def get_index(self, db: AsyncSession, user_id: int) -> BrandAutocompleteIndex:
+        """The user's index, building it if missing or older than `max_age`"""
+        index = self._indexes.get(user_id)
+        if index is None or time.monotonic() - index.built_at > self.max_age:
+            await get_group("autocomplete").do(f"build:{user_id}", lambda: self._build(db, user_id))
+            index = self._indexes.get(user_id)
+            if index is None:
+                # invalidated mid-build; serve a fresh unpublished index
+                return await self._load(db, user_id)
+        self._indexes.move_to_end(user_id)
+        return index
+
+    async def suggest(self, db: AsyncSession, user_id: int, query: str, limit: int = 10) -> List[Dict]:
+        """
+        Type-ahead suggestions for a user's brands, categories and keywords
+
+        Args:
+            db: Database session (used only when the index must be built)
+            user_id: User ID
+            query: Text typed so far
+            limit: Maximum number of suggestions
+
+        Returns:
+            List of {"text", "type", "brand_id", "weight"}
+        """
+        self._metrics["lookups"] += 1
+        index = await self.get_index(db, user_id)
+        return index.lookup(query, limit)
+
+    def get_metrics(self) -> Dict:
+        return {**self._metrics, "users": len(self._indexes)}
+
+
+# Singleton instance
+brand_autocomplete = BrandAutocompleteService(max_age=settings.AUTOCOMPLETE_MAX_AGE_SECONDS)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_brand_writes(session: Session, flush_context) -> None:
+    user_ids = session.info.setdefault("autocomplete_user_ids", set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Brand) and obj.user_id is not None:
+            user_ids.add(obj.user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session) -> None:
+    user_ids = session.info.pop("autocomplete_user_ids", None)
+    if user_ids:
+        brand_autocomplete.invalidate(user_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session) -> None:
+    session.info.pop("autocomplete_user_ids", None)
@@ -0,0 +1,122 @@
+"""
+Brand Search Service
+Indexed, relevance-ranked brand search (PostgreSQL pg_trgm + full-text, SQLite FTS5)
+"""
+from typing import List, Optional, Tuple
+from sqlalchemy import select, func, desc, or_, literal, literal_column, table, column
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.brand import Brand, BRAND_SEARCH_DOCUMENT
+
+# FTS5 trigram tokens need at least three characters
+MIN_FTS_TOKEN_LENGTH = 3
+
+brands_fts = table("brands_fts", column("rowid"))
+
+
+def _like_pattern(query: str) -> str:
+    """Substring LIKE pattern with wildcards in the user query escaped"""
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _fts5_query(query: str) -> str:
+    """User query → FTS5 MATCH expression (every token as a quoted phrase, AND-ed)"""
+    return " ".join('"' + token.replace('"', '""') + '"' for token in query.split())
+
+
+class BrandSearchService:
+    """
+    Brand search over name, slogan, description and keywords
+
+    Features:
+    - PostgreSQL: trigram similarity / substring match on brand_name and
+      full-text match on the descriptive columns, both GIN-indexed
+    - SQLite: FTS5 trigram index with BM25 ranking (tests, local development)
+    - Relevance ranking and exact total count in the same query (window function)
+    """
+
+    @staticmethod
+    async def search(
+        db: AsyncSession,
+        user_id: int,
+        query: str,
+        category: Optional[str] = None,
+        limit: int = 10
+    ) -> Tuple[List[Tuple[Brand, float]], int]:
+        """
+        Search a user's brands
+
+        Args:
+            db: Database session
+            user_id: Owner of the brands
+            query: Search text
+            category: Optional exact category filter
+            limit: Maximum number of results
+
+        Returns:
+            ((brand, relevance score) list ordered by relevance, total match count)
+        """
+        query = query.strip()
+        dialect = db.bind.dialect.name
+
+        if dialect == "postgresql":
+            stmt = BrandSearchService._postgres_query(query)
+        elif dialect == "sqlite":
+            stmt = BrandSearchService._sqlite_query(query)
+        else:
+            raise ValueError(f"Unsupported dialect for brand search: {dialect}")
+
+        stmt = stmt.where(Brand.user_id == user_id)
+        if category:
+            stmt = stmt.where(Brand.category == category)
+        stmt = stmt.order_by(desc("score"), desc(Brand.updated_at)).limit(limit)
+
+        result = await db.execute(stmt)
+        rows = result.all()
+        total = rows[0].total if rows else 0
+        return [(row.Brand, float(row.score or 0.0)) for row in rows], total
+
+    @staticmethod
+    def _postgres_query(query: str):
+        document = literal_column(BRAND_SEARCH_DOCUMENT)
+        tsquery = func.plainto_tsquery("simple", query)
+        score = func.greatest(
+            func.similarity(Brand.brand_name, query),
+            func.ts_rank_cd(document, tsquery)
+        ).label("score")
+
+        return select(Brand, score, func.count().over().label("total")).where(or_(
+            Brand.brand_name.ilike(_like_pattern(query), escape="\\"),
+            Brand.brand_name.op("%")(query),
+            document.op("@@")(tsquery)
+        ))
+
+    @staticmethod
+    def _sqlite_query(query: str):
+        total = func.count().over().label("total")
+
+        if min((len(token) for token in query.split()), default=0) < MIN_FTS_TOKEN_LENGTH:
+            # Too short for the trigram index: plain substring match, unranked
+            pattern = _like_pattern(query)
+            return select(Brand, literal(0.0).label("score"), total).where(or_(
+                Brand.brand_name.ilike(pattern, escape="\\"),
+                Brand.slogan.ilike(pattern, escape="\\"),
+                Brand.description.ilike(pattern, escape="\\")
+            ))
+
+        fts = literal_column("brands_fts")
+        # bm25() is lower-is-better and only usable in a plain FTS query, so rank in a subquery;
+        # brand_name matches are weighted above the other columns
+        matches = (
+            select(brands_fts.c.rowid.label("brand_id"), (-func.bm25(fts, 10.0, 2.0, 1.0, 1.0)).label("score"))
+            .where(fts.op("MATCH")(_fts5_query(query)))
+            .subquery()
+        )
+        return (
+            select(Brand, matches.c.score.label("score"), total)
+            .join(matches, matches.c.brand_id == Brand.id)
+        )
+
+
+# Singleton instance
+brand_search_service = BrandSearchService()
@@ -0,0 +1,300 @@
+"""
+Campaign Export Service (Back3)
+캠페인 추적 데이터 Excel / CSV 내보내기 (서버 측 커서 스트리밍, 상수 메모리)
+"""
+import asyncio
+import csv
+import io
+import logging
+import os
+import tempfile
+from datetime import datetime
+from decimal import Decimal
+from typing import AsyncIterator, Dict, List, Optional, Sequence
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import cache
+from app.models.campaign import Campaign, CampaignReport, CampaignTracking
+from app.services.s3_service import s3_service
+
+logger = logging.getLogger(__name__)
+
+export_cache = cache.namespaced("campaign_export")
+
+EXPORT_FORMATS = ("csv", "xlsx")
+
+CONTENT_TYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+# (헤더, 컬럼)
+EXPORT_COLUMNS = (
+    ("date", CampaignTracking.tracking_date),
+    ("campaign_id", CampaignTracking.campaign_id),
+    ("campaign_name", Campaign.campaign_name),
+    ("impressions", CampaignTracking.impressions),
+    ("clicks", CampaignTracking.clicks),
+    ("conversions", CampaignTracking.conversions),
+    ("revenue", CampaignTracking.revenue),
+    ("cost", CampaignTracking.cost),
+    ("ctr", CampaignTracking.ctr),
+    ("cpc", CampaignTracking.cpc),
+    ("roas", CampaignTracking.roas),
+    ("likes", CampaignTracking.likes),
+    ("shares", CampaignTracking.shares),
+    ("comments", CampaignTracking.comments),
+)
+EXPORT_HEADER = [name for name, _ in EXPORT_COLUMNS]
+
+# Excel 시트당 최대 행 수 1,048,576 - 헤더 1행
+XLSX_SHEET_ROWS = 1_048_575
+
+
+def _cell(value):
+    """DB 값 → 스프레드시트 셀 값 (Excel은 타임존 / Decimal 미지원)"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.replace(tzinfo=None)
+    return value
+
+
+def export_file_name(campaign_ids: Sequence[int], start: datetime, end: datetime, fmt: str) -> str:
+    campaigns = "-".join(str(campaign_id) for campaign_id in campaign_ids[:3])
+    return f"campaign_{campaigns}_{start:%Y%m%d}_{end:%Y%m%d}.{fmt}"
+
+
+class CampaignExportService:
+    """
+    캠페인 추적 데이터 내보내기 서비스
+
+    기능:
+    - 서버 측 커서(yield_per)로 `batch_size`행씩 스트리밍 조회
+    - CSV: 배치 단위 청크로 바로 응답 (StreamingResponse)
+    - Excel: write-only 워크북 (행을 메모리에 보관하지 않음) → 임시 파일,
+      시트 행 수 제한을 넘으면 헤더를 반복한 새 시트로 이어 씀
+    - 백그라운드 작업: 임시 파일 → S3 멀티파트 업로드 → CampaignReport.excel_url 저장 (xlsx)
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 5000,
+        status_ttl: float = 86400,
+        session_factory=None,
+        sheet_rows: int = XLSX_SHEET_ROWS
+    ):
+        self.batch_size = batch_size
+        self.sheet_rows = sheet_rows
+        self.status_ttl = status_ttl
+        self.session_factory = session_factory
+        self._tasks: set = set()
+
+    def _sessions(self):
+        if self.session_factory is not None:
+            return self.session_factory
+        from app.core.database import AsyncSessionLocal
+        return AsyncSessionLocal
+
+    async def iter_batches(
+        self,
+        db: AsyncSession,
+        campaign_ids: Sequence[int],
+        start: datetime,
+        end: datetime
+    ) -> AsyncIterator[List[tuple]]:
+        """[start, end) 추적 데이터를 캠페인 / 날짜 순으로 `batch_size`행씩"""
+        query = (
+            select(*(column for _, column in EXPORT_COLUMNS))
+            .join(Campaign, Campaign.id == CampaignTracking.campaign_id)
+            .where(
+                CampaignTracking.campaign_id.in_(campaign_ids),
+                CampaignTracking.tracking_date >= start,
+                CampaignTracking.tracking_date < end
+            )
+            .order_by(CampaignTracking.campaign_id, CampaignTracking.tracking_date)
+            .execution_options(yield_per=self.batch_size)
+        )
+        result = await db.stream(query)
+        async for partition in result.partitions():
+            yield [tuple(_cell(value) for value in row) for row in partition]
+
+    async def stream_csv(
+        self,
+        campaign_ids: Sequence[int],
+        start: datetime,
+        end: datetime
+    ) -> AsyncIterator[bytes]:
+        """
+        CSV 바이트 청크 (직접 다운로드용)
+
+        응답을 보내는 동안 요청 세션이 닫히므로 자체 세션을 사용합니다.
+        """
+        # Excel에서 한글이 깨지지 않도록 UTF-8 BOM
+        yield self._csv_chunk([EXPORT_HEADER], bom=True)
+        async with self._sessions()() as db:
+            async for batch in self.iter_batches(db, campaign_ids, start, end):
+                yield self._csv_chunk(batch)
+
+    @staticmethod
+    def _csv_chunk(rows: List, bom: bool = False) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return ("\ufeff" if bom else "").encode("utf-8") + buffer.getvalue().encode("utf-8")
+
+    async def write_file(
+        self,
+        db: AsyncSession,
+        campaign_ids: Sequence[int],
+        start: datetime,
+        end: datetime,
+        fmt: str,
+        path: str
+    ) -> int:
+        """
+        내보내기 파일 작성
+
+        Returns:
+            데이터 행 수
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {fmt}")
+
+        rows = 0
+        if fmt == "csv":
+            with open(path, "wb") as stream:
+                stream.write(self._csv_chunk([EXPORT_HEADER], bom=True))
+                async for batch in self.iter_batches(db, campaign_ids, start, end):
+                    stream.write(self._csv_chunk(batch))
+                    rows += len(batch)
+            return rows
+
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+        sheets: List[list] = []  # [시트, 데이터 행 수]
+        self._append_rows(workbook, sheets, [])
+        async for batch in self.iter_batches(db, campaign_ids, start, end):
+            # openpyxl 행 직렬화는 CPU 작업이므로 이벤트 루프 밖에서
+            await asyncio.to_thread(self._append_rows, workbook, sheets, batch)
+            rows += len(batch)
+        await asyncio.to_thread(workbook.save, path)
+        return rows
+
+    def _append_rows(self, workbook, sheets: List[list], batch: List[tuple]) -> None:
+        """배치를 마지막 시트에 추가 (`sheet_rows`행을 넘으면 tracking_2, tracking_3, ... 새 시트)"""
+        if not sheets:
+            sheets.append([self._new_sheet(workbook, "tracking"), 0])
+        for row in batch:
+            if sheets[-1][1] >= self.sheet_rows:
+                sheets.append([self._new_sheet(workbook, f"tracking_{len(sheets) + 1}"), 0])
+            sheets[-1][0].append(row)
+            sheets[-1][1] += 1
+
+    @staticmethod
+    def _new_sheet(workbook, title: str):
+        sheet = workbook.create_sheet(title)
+        sheet.append(EXPORT_HEADER)
+        return sheet
+
+    async def stream_file(
+        self,
+        campaign_ids: Sequence[int],
+        start: datetime,
+        end: datetime,
+        fmt: str,
+        chunk_size: int = 64 * 1024
+    ) -> AsyncIterator[bytes]:
+        """Excel 직접 다운로드: 임시 파일 작성 후 청크 단위 전송, 전송 후 삭제"""
+        fd, path = tempfile.mkstemp(suffix=f".{fmt}", prefix="campaign_export_")
+        os.close(fd)
+        try:
+            async with self._sessions()() as db:
+                await self.write_file(db, campaign_ids, start, end, fmt, path)
+            with open(path, "rb") as stream:
+                while chunk := stream.read(chunk_size):
+                    yield chunk
+        finally:
+            os.unlink(path)
+
+    async def export_to_s3(
+        self,
+        db: AsyncSession,
+        campaign_ids: Sequence[int],
+        start: datetime,
+        end: datetime,
+        fmt: str
+    ) -> Dict:
+        """
+        파일 작성 후 S3 업로드
+
+        Returns:
+            {"file_url", "file_size", "rows"}
+        """
+        fd, path = tempfile.mkstemp(suffix=f".{fmt}", prefix="campaign_export_")
+        os.close(fd)
+        try:
+            rows = await self.write_file(db, campaign_ids, start, end, fmt, path)
+            s3_key = f"exports/{datetime.utcnow():%Y%m%d_%H%M%S}_{export_file_name(campaign_ids, start, end, fmt)}"
+            with open(path, "rb") as stream:
+                upload = await s3_service.upload_stream(stream, s3_key, CONTENT_TYPES[fmt])
+        finally:
+            os.unlink(path)
+
+        if not upload.get("success"):
+            raise RuntimeError(upload.get("error", "Export upload failed"))
+        return {"file_url": upload["file_url"], "file_size": upload["file_size"], "rows": rows}
+
+    @staticmethod
+    def _status_key(report_id: int, fmt: str) -> str:
+        return f"status:{report_id}:{fmt}"
+
+    async def get_status(self, report_id: int, fmt: str) -> Optional[Dict]:
+        """리포트 내보내기 작업 상태 (없으면 None)"""
+        return await export_cache.get(self._status_key(report_id, fmt))
+
+    async def _export_report(self, report_id: int, campaign_id: int, start: datetime, end: datetime, fmt: str) -> None:
+        """백그라운드 작업: 파일 작성 → 업로드 → excel_url 저장 (xlsx) → 상태 갱신"""
+        key = self._status_key(report_id, fmt)
+        try:
+            async with self._sessions()() as db:
+                result = await self.export_to_s3(db, [campaign_id], start, end, fmt)
+                # CSV는 상태(file_url)로만 제공, 리포트의 Excel URL은 xlsx일 때만 갱신
+                if fmt == "xlsx":
+                    await db.execute(
+                        update(CampaignReport).where(CampaignReport.id == report_id).values(excel_url=result["file_url"])
+                    )
+                    await db.commit()
+            await export_cache.set(key, {
+                "status": "done", **result, "generated_at": datetime.utcnow().isoformat()
+            }, ttl=self.status_ttl)
+        except Exception as e:
+            logger.error(f"Campaign export failed (report {report_id}, {fmt}): {e}")
+            await export_cache.set(key, {"status": "failed", "error": str(e)}, ttl=self.status_ttl)
+
+    async def start_report_export(self, report: CampaignReport, fmt: str = "xlsx") -> Dict:
+        """
+        월간 리포트 기간의 추적 데이터 내보내기 시작 (백그라운드)
+
+        Args:
+            report: CampaignReport
+            fmt: csv / xlsx
+
+        Returns:
+            작업 상태 ({"status": "running"})
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {fmt}")
+
+        status = {"status": "running"}
+        await export_cache.set(self._status_key(report.id, fmt), status, ttl=self.status_ttl)
+        task = asyncio.create_task(
+            self._export_report(report.id, report.campaign_id, report.start_date, report.end_date, fmt)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return status
+
+
+# Singleton instance
+campaign_export_service = CampaignExportService()
@@ -0,0 +1,317 @@
+"""
+Campaign Forecast Service (Back3)
+캠페인 성과 예측 (지수평활 / 선형 추세 + 주간 계절성, 캠페인 전체를 행렬 연산으로 일괄 처리)
+
+모든 모델은 (캠페인 수 × 일수) 행렬 하나를 입력으로 받으며, 캠페인마다 Python 루프를 돌지 않습니다.
+GPT는 계산된 숫자를 설명하는 데만 사용합니다.
+"""
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.analytics_executor import analytics_executor
+from app.models.campaign import Campaign, CampaignReport, CampaignTracking
+from app.services.campaign_metrics_service import time_bucket
+from app.services.campaign_report_service import month_range
+
+METHODS = ("naive", "holt", "seasonal_trend")
+SEASON_LENGTH = 7
+
+# Holt 파라미터 격자 (캠페인별로 1-step 오차가 가장 작은 조합 선택)
+HOLT_ALPHAS = (0.1, 0.3, 0.5, 0.8)
+HOLT_BETAS = (0.01, 0.1, 0.3)
+
+FORECAST_METRICS = ("revenue", "cost", "conversions")
+
+
+def holt_forecast(Y: np.ndarray, horizon: int) -> np.ndarray:
+    """
+    Holt 선형 지수평활 (캠페인 × 파라미터 격자를 한 번에 갱신)
+
+    Args:
+        Y: (n, T) 일별 시계열, T >= 2
+        horizon: 예측 일수
+
+    Returns:
+        (n, horizon) 예측값
+    """
+    n, length = Y.shape
+    grid = np.array([(a, b) for a in HOLT_ALPHAS for b in HOLT_BETAS])
+    alpha = grid[:, 0:1]
+    alpha_beta = (grid[:, 0] * grid[:, 1])[:, None]
+
+    level = np.broadcast_to(Y[:, 0], (len(grid), n)).copy()
+    trend = np.broadcast_to(Y[:, 1] - Y[:, 0], (len(grid), n)).copy()
+    sse = np.zeros((len(grid), n))
+    for t in range(1, length):
+        # 오차 보정형: l_t = l + b + αe, b_t = b + αβe
+        error = Y[:, t] - (level + trend)
+        sse += error * error
+        level += trend + alpha * error
+        trend += alpha_beta * error
+
+    best = np.argmin(sse, axis=0)
+    columns = np.arange(n)
+    steps = np.arange(1, horizon + 1)
+    return level[best, columns][:, None] + trend[best, columns][:, None] * steps
+
+
+def _seasonal_design(start: int, length: int) -> np.ndarray:
+    """[절편, 추세, 요일 더미 6개] 설계 행렬 (start: 첫 날의 주 내 위치)"""
+    t = np.arange(start, start + length)
+    weekday = t % SEASON_LENGTH
+    dummies = (weekday[:, None] == np.arange(1, SEASON_LENGTH)).astype(float)
+    return np.column_stack([np.ones(length), t / SEASON_LENGTH, dummies])
+
+
+def seasonal_trend_forecast(Y: np.ndarray, horizon: int, weekday_offset: int = 0) -> np.ndarray:
+    """
+    선형 추세 + 주간 계절성 회귀 (모든 캠페인을 한 번의 최소제곱으로 적합)
+
+    Args:
+        Y: (n, T) 일별 시계열
+        horizon: 예측 일수
+        weekday_offset: 첫 날의 요일 (월요일 0)
+
+    Returns:
+        (n, horizon) 예측값
+    """
+    length = Y.shape[1]
+    X = _seasonal_design(weekday_offset, length)
+    coefficients, *_ = np.linalg.lstsq(X, Y.T, rcond=None)
+    return (_seasonal_design(weekday_offset + length, horizon) @ coefficients).T
+
+
+def _candidates(Y: np.ndarray, horizon: int, weekday_offset: int) -> np.ndarray:
+    """(모델 수, n, horizon) 후보 예측 (METHODS 순서, 데이터가 부족한 모델은 naive로 대체)"""
+    length = Y.shape[1]
+    naive = np.repeat(Y[:, -1:], horizon, axis=1)
+    holt = holt_forecast(Y, horizon) if length >= 2 else naive
+    seasonal = (
+        seasonal_trend_forecast(Y, horizon, weekday_offset)
+        if length >= 2 * SEASON_LENGTH else holt
+    )
+    return np.stack([naive, holt, seasonal])
+
+
+def forecast_batch(Y: np.ndarray, horizon: int, weekday_offset: int = 0) -> Dict[str, np.ndarray]:
+    """
+    캠페인별 모델 선택 + 예측 + 예측 구간
+
+    마지막 구간을 검증용으로 남겨 두고 모든 모델을 적합한 뒤, 캠페인마다 검증 MAE가
+    가장 작은 모델을 골라 전체 기간으로 다시 적합합니다.
+
+    Args:
+        Y: (n, T) 일별 시계열 (결측일은 0)
+        horizon: 예측 일수
+        weekday_offset: 첫 날의 요일 (월요일 0)
+
+    Returns:
+        {"forecast", "lower", "upper": (n, horizon), "method": (n,) METHODS 인덱스}
+    """
+    Y = np.asarray(Y, dtype=float)
+    n, length = Y.shape
+    if length == 0:
+        zeros = np.zeros((n, horizon))
+        return {"forecast": zeros, "lower": zeros, "upper": zeros, "method": np.zeros(n, dtype=int)}
+
+    holdout = min(horizon, length // 4)
+    if holdout > 0:
+        validation = _candidates(Y[:, :-holdout], holdout, weekday_offset)
+        errors = np.abs(validation - Y[:, -holdout:])
+        method = np.argmin(errors.mean(axis=2), axis=0)
+        rmse = np.sqrt((errors[method, np.arange(n)] ** 2).mean(axis=1))
+    else:
+        method = np.zeros(n, dtype=int)
+        rmse = np.zeros(n)
+
+    forecast = _candidates(Y, horizon, weekday_offset)[method, np.arange(n)]
+    forecast = np.clip(forecast, 0, None)
+    # 예측 구간은 선택된 모델의 검증 RMSE 기준 (~95%)
+    half_width = 1.96 * rmse[:, None]
+    return {
+        "forecast": forecast,
+        "lower": np.clip(forecast - half_width, 0, None),
+        "upper": forecast + half_width,
+        "method": method,
+    }
+
+
+def summarize_forecasts(
+    results: Dict[str, Dict[str, np.ndarray]],
+    campaign_ids: Sequence[int],
+    horizon_start: date
+) -> Dict[int, Dict]:
+    """지표별 예측 행렬 → 캠페인별 ai_predictions JSON"""
+    summaries = {}
+    for row, campaign_id in enumerate(campaign_ids):
+        metrics = {}
+        for metric, result in results.items():
+            daily = result["forecast"][row]
+            metrics[metric] = {
+                "method": METHODS[int(result["method"][row])],
+                "total": round(float(daily.sum()), 2),
+                "lower_total": round(float(result["lower"][row].sum()), 2),
+                "upper_total": round(float(result["upper"][row].sum()), 2),
+                "daily": [round(float(value), 2) for value in daily],
+            }
+        revenue = metrics.get("revenue", {}).get("total")
+        cost = metrics.get("cost", {}).get("total")
+        summaries[campaign_id] = {
+            "horizon_start": horizon_start.isoformat(),
+            "horizon_days": len(next(iter(results.values()))["forecast"][row]) if results else 0,
+            "metrics": metrics,
+            "roas": round(revenue / cost, 4) if revenue is not None and cost else None,
+        }
+    return summaries
+
+
+def _as_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+class CampaignForecastService:
+    """
+    캠페인 성과 예측 서비스
+
+    기능:
+    - 일별 시계열을 한 번의 GROUP BY 쿼리로 (캠페인 × 일수) 행렬로 적재
+    - Holt 지수평활 / 추세 + 주간 계절성 회귀를 캠페인 전체에 일괄 적합 (분석 워커에서 실행)
+    - 캠페인별 모델 자동 선택 및 예측 구간
+    - CampaignReport.ai_predictions 일괄 갱신
+    """
+
+    def __init__(self, history_days: int = 90):
+        self.history_days = history_days
+
+    @staticmethod
+    async def load_daily_matrix(
+        db: AsyncSession,
+        campaign_ids: Sequence[int],
+        start: datetime,
+        end: datetime,
+        metrics: Sequence[str] = FORECAST_METRICS
+    ) -> Dict[str, np.ndarray]:
+        """
+        [start, end) 일별 합계 → 지표별 (캠페인 수 × 일수) 행렬 (데이터 없는 날은 0)
+        """
+        days = (end - start).days
+        matrices = {metric: np.zeros((len(campaign_ids), days)) for metric in metrics}
+        if not campaign_ids or days <= 0:
+            return matrices
+
+        bucket = time_bucket(db.bind.dialect.name, "day").label("day")
+        result = await db.execute(
+            select(
+                CampaignTracking.campaign_id,
+                bucket,
+                *(func.sum(getattr(CampaignTracking, metric)).label(metric) for metric in metrics)
+            )
+            .where(
+                CampaignTracking.campaign_id.in_(campaign_ids),
+                CampaignTracking.tracking_date >= start,
+                CampaignTracking.tracking_date < end
+            )
+            .group_by(CampaignTracking.campaign_id, bucket)
+        )
+        rows = result.all()
+        if not rows:
+            return matrices
+
+        position = {campaign_id: i for i, campaign_id in enumerate(campaign_ids)}
+        first_day = start.date()
+        row_index = np.array([position[row.campaign_id] for row in rows])
+        day_index = np.array([(_as_date(row.day) - first_day).days for row in rows])
+        for metric in metrics:
+            values = np.array([float(getattr(row, metric) or 0) for row in rows])
+            matrices[metric][row_index, day_index] = values
+        return matrices
+
+    async def forecast_campaigns(
+        self,
+        db: AsyncSession,
+        campaign_ids: Sequence[int],
+        as_of: datetime,
+        horizon: int = 30,
+        metrics: Sequence[str] = FORECAST_METRICS
+    ) -> Dict[int, Dict]:
+        """
+        캠페인별 성과 예측
+
+        Args:
+            db: 데이터베이스 세션
+            campaign_ids: 캠페인 ID 리스트
+            as_of: 예측 시작 시각 (이전 `history_days`일을 학습에 사용)
+            horizon: 예측 일수
+            metrics: 예측할 지표
+
+        Returns:
+            {campaign_id: ai_predictions 형식 예측}
+        """
+        campaign_ids = list(campaign_ids)
+        if not campaign_ids:
+            return {}
+
+        start = as_of - timedelta(days=self.history_days)
+        matrices = await self.load_daily_matrix(db, campaign_ids, start, as_of, metrics)
+        weekday_offset = start.weekday()
+        results = {
+            metric: await analytics_executor.run(forecast_batch, matrix, horizon, weekday_offset)
+            for metric, matrix in matrices.items()
+        }
+        return summarize_forecasts(results, campaign_ids, as_of.date())
+
+    async def predict_reports(
+        self,
+        db: AsyncSession,
+        report_month: str,
+        brand_id: Optional[int] = None,
+        campaign_ids: Optional[Sequence[int]] = None
+    ) -> int:
+        """
+        월간 리포트의 ai_predictions 갱신 (다음 달 일별 예측)
+
+        Args:
+            db: 데이터베이스 세션
+            report_month: 리포트 월 (YYYY-MM)
+            brand_id: 특정 브랜드 리포트만 (옵션)
+            campaign_ids: 특정 캠페인 리포트만 (옵션)
+
+        Returns:
+            갱신된 리포트 수
+        """
+        query = select(CampaignReport.id, CampaignReport.campaign_id).where(
+            CampaignReport.report_month == report_month
+        )
+        if brand_id is not None:
+            query = query.join(Campaign, Campaign.id == CampaignReport.campaign_id).where(
+                Campaign.brand_id == brand_id
+            )
+        if campaign_ids is not None:
+            query = query.where(CampaignReport.campaign_id.in_(campaign_ids))
+        reports: List[Tuple[int, int]] = (await db.execute(query)).all()
+        if not reports:
+            return 0
+
+        _, month_end = month_range(report_month)
+        _, next_month_end = month_range(month_end.strftime("%Y-%m"))
+        predictions = await self.forecast_campaigns(
+            db, [campaign_id for _, campaign_id in reports], month_end,
+            horizon=(next_month_end - month_end).days
+        )
+
+        await db.execute(update(CampaignReport), [
+            {"id": report_id, "ai_predictions": predictions[campaign_id]}
+            for report_id, campaign_id in reports
+        ])
+        await db.commit()
+        return len(reports)
+
+
+# Singleton instance
+campaign_forecast_service = CampaignForecastService()
@@ -0,0 +1,217 @@
+"""
+Campaign Metrics Service (Back3)
+캠페인 추적 시계열 적재 및 서버 측 다운샘플링 조회
+"""
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from sqlalchemy import Float, and_, cast, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.campaign import CampaignTracking
+
+GRANULARITIES = ("day", "week", "month")
+
+# 적재 가능한 원시 지표 (ctr / cpc / roas는 SQL에서 계산)
+RAW_METRICS = ("impressions", "clicks", "conversions", "revenue", "cost", "likes", "shares", "comments")
+
+
+def derived_metrics(impressions, clicks, revenue, cost) -> Dict:
+    """
+    원시 지표(컬럼 또는 합계 식) → 파생 지표 SQL 식
+
+    행 단위 저장과 구간 집계 모두 같은 식을 사용하므로, 집계 구간의 CTR은
+    행별 CTR의 평균이 아니라 합계 기준으로 계산됩니다.
+    """
+    return {
+        "ctr": cast(clicks, Float) / func.nullif(impressions, 0),
+        "cpc": cast(cost, Float) / func.nullif(clicks, 0),
+        "roas": cast(revenue, Float) / func.nullif(cost, 0),
+    }
+
+
+def time_bucket(dialect: str, granularity: str):
+    """추적 날짜 → 구간 시작일 SQL 식"""
+    column = CampaignTracking.tracking_date
+    if dialect == "postgresql":
+        return func.date_trunc(granularity, column)
+    if dialect == "sqlite":
+        if granularity == "day":
+            return func.date(column)
+        if granularity == "week":
+            # 월요일 시작 (ISO 주)
+            return func.date(column, "weekday 0", "-6 days")
+        return func.strftime("%Y-%m-01", column)
+    raise ValueError(f"Unsupported dialect for campaign metrics: {dialect}")
+
+
+def to_utc(value: datetime) -> datetime:
+    """추적 시각 → UTC aware datetime (naive 값은 UTC로 간주)"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _to_number(value):
+    return float(value) if value is not None else None
+
+
+class CampaignMetricsService:
+    """
+    캠페인 추적 시계열 서비스
+
+    `campaign_tracking`은 캠페인 × 날짜당 한 행이며, PostgreSQL에서는 적재 순서와
+    날짜가 일치하므로 tracking_date BRIN 인덱스로 구간 조회를 처리합니다.
+
+    기능:
+    - 추적 데이터 일괄 upsert (캠페인 / 날짜 기준, 청크 단위)
+    - ctr / cpc / roas를 저장된 원시 지표로부터 SQL에서 재계산
+    - 일 / 주 / 월 다운샘플링 구간 집계 (원시 행을 Python으로 옮기지 않음)
+    """
+
+    def __init__(self, chunk_size: int = 1000):
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def _insert(db: AsyncSession):
+        dialect = db.bind.dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            raise ValueError(f"Unsupported dialect for campaign metrics: {dialect}")
+        return insert
+
+    async def ingest(self, db: AsyncSession, points: List[Dict]) -> int:
+        """
+        추적 데이터 일괄 적재 (같은 캠페인 / 날짜는 덮어씀)
+
+        Args:
+            db: 데이터베이스 세션
+            points: {"campaign_id", "tracking_date", 원시 지표...} 리스트 (naive 시각은 UTC로 간주)
+
+        Returns:
+            적재된 행 수
+        """
+        if not points:
+            return 0
+
+        # 같은 캠페인 / 날짜가 한 배치에 여러 번 오면 마지막 값 사용
+        # (한 INSERT ... ON CONFLICT 문에 같은 키가 두 번 들어가면 PostgreSQL이 거부)
+        deduped: Dict[tuple, Dict] = {}
+        for point in points:
+            tracking_date = to_utc(point["tracking_date"])
+            deduped[(point["campaign_id"], tracking_date)] = {
+                "campaign_id": point["campaign_id"],
+                "tracking_date": tracking_date,
+                **{metric: point.get(metric) or 0 for metric in RAW_METRICS},
+            }
+        rows = list(deduped.values())
+
+        insert = self._insert(db)
+        for start in range(0, len(rows), self.chunk_size):
+            stmt = insert(CampaignTracking).values(rows[start:start + self.chunk_size])
+            await db.execute(stmt.on_conflict_do_update(
+                index_elements=["campaign_id", "tracking_date"],
+                set_={metric: getattr(stmt.excluded, metric) for metric in RAW_METRICS}
+            ))
+
+        # 파생 지표는 저장된 원시 지표로부터 한 번에 계산
+        campaign_ids = {row["campaign_id"] for row in rows}
+        dates = [row["tracking_date"] for row in rows]
+        await db.execute(
+            update(CampaignTracking)
+            .where(
+                CampaignTracking.campaign_id.in_(campaign_ids),
+                CampaignTracking.tracking_date.between(min(dates), max(dates))
+            )
+            .values(derived_metrics(
+                CampaignTracking.impressions,
+                CampaignTracking.clicks,
+                CampaignTracking.revenue,
+                CampaignTracking.cost
+            ))
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return len(rows)
+
+    async def get_series(
+        self,
+        db: AsyncSession,
+        campaign_ids: List[int],
+        start: datetime,
+        end: datetime,
+        granularity: str = "day"
+    ) -> List[Dict]:
+        """
+        구간별 집계 시계열 (여러 캠페인 합산)
+
+        Args:
+            db: 데이터베이스 세션
+            campaign_ids: 캠페인 ID 리스트
+            start: 시작 시각 (포함)
+            end: 종료 시각 (미포함)
+            granularity: day / week / month
+
+        Returns:
+            구간 시작일 순 {"bucket", 원시 지표 합계, ctr, cpc, roas} 리스트
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unsupported granularity: {granularity}")
+        if not campaign_ids:
+            return []
+
+        bucket = time_bucket(db.bind.dialect.name, granularity).label("bucket")
+        sums = {metric: func.sum(getattr(CampaignTracking, metric)) for metric in RAW_METRICS}
+        derived = derived_metrics(sums["impressions"], sums["clicks"], sums["revenue"], sums["cost"])
+
+        result = await db.execute(
+            select(
+                bucket,
+                *(expr.label(name) for name, expr in sums.items()),
+                *(expr.label(name) for name, expr in derived.items())
+            )
+            .where(
+                CampaignTracking.campaign_id.in_(campaign_ids),
+                and_(CampaignTracking.tracking_date >= start, CampaignTracking.tracking_date < end)
+            )
+            .group_by(bucket)
+            .order_by(bucket)
+        )
+
+        series = []
+        for row in result.mappings():
+            point = {name: _to_number(row[name]) for name in (*RAW_METRICS, *derived)}
+            bucket_value = row["bucket"]
+            point["bucket"] = (
+                bucket_value.date().isoformat() if isinstance(bucket_value, datetime) else str(bucket_value)
+            )
+            series.append(point)
+        return series
+
+    async def get_totals(
+        self,
+        db: AsyncSession,
+        campaign_ids: List[int],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Dict:
+        """기간 전체 합계 및 파생 지표"""
+        sums = {metric: func.sum(getattr(CampaignTracking, metric)) for metric in RAW_METRICS}
+        derived = derived_metrics(sums["impressions"], sums["clicks"], sums["revenue"], sums["cost"])
+
+        query = select(
+            *(expr.label(name) for name, expr in sums.items()),
+            *(expr.label(name) for name, expr in derived.items())
+        ).where(CampaignTracking.campaign_id.in_(campaign_ids))
+        if start is not None:
+            query = query.where(CampaignTracking.tracking_date >= start)
+        if end is not None:
+            query = query.where(CampaignTracking.tracking_date < end)
+
+        row = (await db.execute(query)).mappings().one()
+        return {name: _to_number(row[name]) for name in (*RAW_METRICS, *derived)}
+
+
+# Singleton instance
+campaign_metrics_service = CampaignMetricsService()
@@ -0,0 +1,302 @@
+"""
+Campaign Report Service (Back3)
+브랜드별 월간 캠페인 리포트 생성 (SQL 집계 + 윈도 함수 순위)
+
+사용법 (매월 배치):
+    python -m app.services.campaign_report_service --month 2024-01
+"""
+import argparse
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.core.config import settings
+from app.models.campaign import Campaign, CampaignReport, CampaignTracking
+from app.services.campaign_metrics_service import derived_metrics
+from app.services.registry import services
+
+logger = logging.getLogger(__name__)
+
+# 리포트에 집계하는 원시 지표
+REPORT_METRICS = ("impressions", "clicks", "conversions", "revenue", "cost", "likes", "shares", "comments")
+SOCIAL_METRICS = ("likes", "shares", "comments")
+
+
+def month_range(report_month: str) -> Tuple[datetime, datetime]:
+    """'YYYY-MM' → (월 시작, 다음 달 시작)"""
+    start = datetime.strptime(report_month, "%Y-%m")
+    if start.month == 12:
+        return start, start.replace(year=start.year + 1, month=1)
+    return start, start.replace(month=start.month + 1)
+
+
+def previous_month(now: Optional[datetime] = None) -> str:
+    """배치 기본 대상 월 (지난달)"""
+    now = now or datetime.utcnow()
+    if now.month == 1:
+        return f"{now.year - 1}-12"
+    return f"{now.year}-{now.month - 1:02d}"
+
+
+def _number(value) -> Optional[float]:
+    return round(float(value), 4) if value is not None else None
+
+
+def _ratio(numerator, denominator) -> Optional[float]:
+    return round(numerator / denominator, 4) if denominator else None
+
+
+class CampaignReportService:
+    """
+    월간 캠페인 리포트 생성 서비스
+
+    기능:
+    - 브랜드 × 월 단위로 한 번의 쿼리: 캠페인별 합계(GROUP BY) + 브랜드 / 채널 합계와
+      매출 순위(윈도 함수)를 데이터베이스에서 계산
+    - 캠페인별 CampaignReport upsert (캠페인 / 월 기준, 재생성 시 덮어씀)
+    - 전체 브랜드 월간 배치 (브랜드별 세션, 동시 실행 수 제한, 다음 달 성과 예측 포함)
+    """
+
+    def __init__(self, concurrency: int = 4, top_n: int = 5):
+        self.concurrency = concurrency
+        self.top_n = top_n
+
+    @staticmethod
+    def _insert(db: AsyncSession):
+        dialect = db.bind.dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            raise ValueError(f"Unsupported dialect for campaign reports: {dialect}")
+        return insert
+
+    @staticmethod
+    def _brand_month_query(brand_id: int, start: datetime, end: datetime):
+        """캠페인별 합계 + 브랜드 / 채널 합계 + 매출 순위 (한 번의 쿼리)"""
+        per_campaign = (
+            select(
+                Campaign.id.label("campaign_id"),
+                Campaign.campaign_name,
+                Campaign.campaign_type,
+                *(func.sum(getattr(CampaignTracking, metric)).label(metric) for metric in REPORT_METRICS)
+            )
+            .join(CampaignTracking, CampaignTracking.campaign_id == Campaign.id)
+            .where(
+                Campaign.brand_id == brand_id,
+                CampaignTracking.tracking_date >= start,
+                CampaignTracking.tracking_date < end
+            )
+            .group_by(Campaign.id, Campaign.campaign_name, Campaign.campaign_type)
+            .subquery()
+        )
+        c = per_campaign.c
+        derived = derived_metrics(c.impressions, c.clicks, c.revenue, c.cost)
+
+        return select(
+            *c,
+            *(expr.label(name) for name, expr in derived.items()),
+            func.row_number().over(order_by=(c.revenue.desc(), c.campaign_id)).label("revenue_rank"),
+            *(func.sum(c[metric]).over().label(f"brand_{metric}") for metric in REPORT_METRICS),
+            *(
+                func.sum(c[metric]).over(partition_by=c.campaign_type).label(f"channel_{metric}")
+                for metric in ("impressions", "clicks", "conversions", "revenue", "cost")
+            )
+        ).order_by(c.campaign_id)
+
+    def _shape(self, rows: List) -> Dict:
+        """쿼리 결과 → 브랜드 공통 항목 (상위 캠페인 / 채널별 성과)"""
+        top_campaigns = [
+            {
+                "rank": row.revenue_rank,
+                "campaign_id": row.campaign_id,
+                "campaign_name": row.campaign_name,
+                "campaign_type": row.campaign_type.value,
+                "revenue": _number(row.revenue),
+                "cost": _number(row.cost),
+                "conversions": row.conversions,
+                "roas": _number(row.roas),
+            }
+            for row in sorted(rows, key=lambda r: r.revenue_rank)
+            if row.revenue_rank <= self.top_n
+        ]
+
+        channel_performance = {}
+        for row in rows:
+            channel = row.campaign_type.value
+            if channel in channel_performance:
+                continue
+            impressions, clicks = row.channel_impressions or 0, row.channel_clicks or 0
+            revenue, cost = float(row.channel_revenue or 0), float(row.channel_cost or 0)
+            channel_performance[channel] = {
+                "impressions": impressions,
+                "clicks": clicks,
+                "conversions": row.channel_conversions,
+                "revenue": round(revenue, 2),
+                "cost": round(cost, 2),
+                "ctr": _ratio(clicks, impressions),
+                "roas": _ratio(revenue, cost),
+                "revenue_share": _ratio(revenue, float(row.brand_revenue or 0)),
+            }
+
+        return {"top_campaigns": top_campaigns, "channel_performance": channel_performance}
+
+    @staticmethod
+    def _social_performance(row) -> Dict:
+        engagements = sum(getattr(row, metric) or 0 for metric in SOCIAL_METRICS)
+        brand_engagements = sum(getattr(row, f"brand_{metric}") or 0 for metric in SOCIAL_METRICS)
+        return {
+            **{metric: getattr(row, metric) or 0 for metric in SOCIAL_METRICS},
+            "engagements": engagements,
+            "engagement_rate": _ratio(engagements, row.impressions or 0),
+            "brand_engagement_share": _ratio(engagements, brand_engagements),
+        }
+
+    async def build_brand_month(self, db: AsyncSession, brand_id: int, report_month: str) -> int:
+        """
+        브랜드의 월간 캠페인 리포트 생성 / 갱신
+
+        Args:
+            db: 데이터베이스 세션
+            brand_id: 브랜드 ID
+            report_month: 리포트 월 (YYYY-MM)
+
+        Returns:
+            생성 / 갱신된 리포트 수 (해당 월 추적 데이터가 있는 캠페인 수)
+        """
+        start, end = month_range(report_month)
+        rows = (await db.execute(self._brand_month_query(brand_id, start, end))).all()
+        if not rows:
+            return 0
+
+        shared = self._shape(rows)
+        values = [
+            {
+                "campaign_id": row.campaign_id,
+                "report_month": report_month,
+                "start_date": start,
+                "end_date": end,
+                "total_revenue": round(float(row.revenue or 0), 2),
+                "total_cost": round(float(row.cost or 0), 2),
+                "total_sales": row.conversions or 0,
+                "top_campaigns": shared["top_campaigns"],
+                "channel_performance": shared["channel_performance"],
+                "social_performance": self._social_performance(row),
+            }
+            for row in rows
+        ]
+
+        insert = self._insert(db)
+        stmt = insert(CampaignReport).values(values)
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=["campaign_id", "report_month"],
+            set_={
+                **{
+                    name: getattr(stmt.excluded, name)
+                    for name in (
+                        "start_date", "end_date", "total_revenue", "total_cost", "total_sales",
+                        "top_campaigns", "channel_performance", "social_performance"
+                    )
+                },
+                "updated_at": func.now(),
+            }
+        ))
+        await db.commit()
+        return len(values)
+
+    async def brands_with_activity(self, db: AsyncSession, report_month: str) -> List[int]:
+        """해당 월 추적 데이터가 있는 브랜드 ID 목록"""
+        start, end = month_range(report_month)
+        result = await db.execute(
+            select(Campaign.brand_id)
+            .join(CampaignTracking, CampaignTracking.campaign_id == Campaign.id)
+            .where(CampaignTracking.tracking_date >= start, CampaignTracking.tracking_date < end)
+            .distinct()
+            .order_by(Campaign.brand_id)
+        )
+        return list(result.scalars().all())
+
+    async def generate_month(
+        self,
+        report_month: str,
+        session_factory: Optional[async_sessionmaker] = None,
+        forecast: bool = True
+    ) -> Dict:
+        """
+        전체 브랜드 월간 리포트 배치
+
+        브랜드마다 별도 세션에서 실행하며, 동시에 `concurrency`개 브랜드까지 처리합니다.
+        한 브랜드의 실패는 다른 브랜드에 영향을 주지 않습니다.
+
+        Args:
+            report_month: 리포트 월 (YYYY-MM)
+            session_factory: 세션 팩토리 (기본: 앱 데이터베이스)
+            forecast: 리포트 생성 후 ai_predictions 갱신 여부
+
+        Returns:
+            {"report_month", "brands", "reports", "failed": [brand_id, ...]}
+        """
+        if session_factory is None:
+            from app.core.database import AsyncSessionLocal
+            session_factory = AsyncSessionLocal
+
+        async with session_factory() as db:
+            brand_ids = await self.brands_with_activity(db, report_month)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(brand_id: int) -> int:
+            async with semaphore:
+                async with session_factory() as db:
+                    built = await self.build_brand_month(db, brand_id, report_month)
+                    if built and forecast:
+                        await services.campaign_forecast.campaign_forecast_service.predict_reports(
+                            db, report_month, brand_id=brand_id
+                        )
+                    return built
+
+        results = await asyncio.gather(*(run(brand_id) for brand_id in brand_ids), return_exceptions=True)
+
+        failed = []
+        reports = 0
+        for brand_id, result in zip(brand_ids, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Campaign report failed (brand {brand_id}, {report_month}): {result}")
+                failed.append(brand_id)
+            else:
+                reports += result
+
+        logger.info(
+            f"Campaign reports for {report_month}: {reports} report(s), "
+            f"{len(brand_ids) - len(failed)}/{len(brand_ids)} brand(s)"
+        )
+        return {"report_month": report_month, "brands": len(brand_ids), "reports": reports, "failed": failed}
+
+
+# Singleton instance
+campaign_report_service = CampaignReportService(concurrency=settings.CAMPAIGN_REPORT_CONCURRENCY)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="월간 캠페인 리포트 배치")
+    parser.add_argument("--month", default=None, help="리포트 월 YYYY-MM (기본: 지난달)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    async def run() -> Dict:
+        from app.core.database import close_db
+        try:
+            return await campaign_report_service.generate_month(args.month or previous_month())
+        finally:
+            await close_db()
+
+    summary = asyncio.run(run())
+    raise SystemExit(1 if summary["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+"""
+Color Palette Engine (Back3)
+컬러 팔레트 엔진 (HSL / LAB 변환, 배색 생성, 이미지 대표색 추출, 대비 / 접근성 점수)
+
+모든 변환은 (색 수 × 3) 배열 단위로 처리하므로 여러 기준 색을 한 번에 계산할 수 있습니다.
+"""
+import io
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+
+SCHEMES = ("complementary", "analogous", "triadic")
+
+# 배색 규칙: (색조 회전(도), 명도 변화(%p), 채도 변화(%p)), 기준 색 포함
+SCHEME_OFFSETS = {
+    "complementary": ((0, 0, 0), (180, 0, 0), (0, 20, 0), (0, -20, 0), (0, 0, -30)),
+    "analogous": ((0, 0, 0), (30, 0, 0), (-30, 0, 0), (0, 20, 0), (0, -20, 0)),
+    "triadic": ((0, 0, 0), (120, 0, 0), (240, 0, 0), (0, 20, 0), (0, -20, 0)),
+}
+
+# WCAG 2.x 대비 기준
+WCAG_AA = 4.5
+WCAG_AA_LARGE = 3.0
+WCAG_AAA = 7.0
+
+# D65 기준 백색점
+_WHITE_D65 = np.array([0.95047, 1.0, 1.08883])
+_RGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+
+
+def hex_to_rgb(colors: Sequence[str]) -> np.ndarray:
+    """
+    hex 색상 → (n, 3) RGB (0~1)
+
+    '#RRGGBB', 'RRGGBB', '#RGB' 형식을 받습니다.
+
+    Raises:
+        ValueError: 형식이 잘못된 색상
+    """
+    values = []
+    for color in colors:
+        code = color.strip().lstrip("#")
+        if len(code) == 3:
+            code = "".join(c * 2 for c in code)
+        if len(code) != 6:
+            raise ValueError(f"Invalid hex color: {color}")
+        try:
+            values.append([int(code[i:i + 2], 16) for i in (0, 2, 4)])
+        except ValueError:
+            raise ValueError(f"Invalid hex color: {color}")
+    return np.array(values, dtype=float).reshape(-1, 3) / 255.0
+
+
+def rgb_to_hex(rgb: np.ndarray) -> List[str]:
+    """(..., 3) RGB (0~1) → hex 리스트 (평탄화)"""
+    values = np.clip(np.rint(np.asarray(rgb).reshape(-1, 3) * 255), 0, 255).astype(int)
+    return [f"#{r:02X}{g:02X}{b:02X}" for r, g, b in values]
+
+
+def rgb_to_hsl(rgb: np.ndarray) -> np.ndarray:
+    """(..., 3) RGB (0~1) → HSL (H: 0~360, S / L: 0~1)"""
+    rgb = np.asarray(rgb, dtype=float)
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    high = rgb.max(axis=-1)
+    low = rgb.min(axis=-1)
+    chroma = high - low
+    lightness = (high + low) / 2
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        saturation = np.where(chroma == 0, 0.0, chroma / (1 - np.abs(2 * lightness - 1)))
+        safe = np.where(chroma == 0, 1.0, chroma)
+        hue = np.select(
+            [chroma == 0, high == r, high == g],
+            [0.0, ((g - b) / safe) % 6, (b - r) / safe + 2],
+            (r - g) / safe + 4
+        ) * 60
+    return np.stack([hue % 360, np.clip(saturation, 0, 1), lightness], axis=-1)
+
+
+def hsl_to_rgb(hsl: np.ndarray) -> np.ndarray:
+    """(..., 3) HSL → RGB (0~1)"""
+    hsl = np.asarray(hsl, dtype=float)
+    h, s, l = hsl[..., 0] % 360, hsl[..., 1], hsl[..., 2]
+    chroma = (1 - np.abs(2 * l - 1)) * s
+    # f(n) = l - a·max(-1, min(k-3, 9-k, 1)),  k = (n + h/30) mod 12
+    k = (np.array([0, 8, 4]) + h[..., None] / 30) % 12
+    a = (chroma / 2)[..., None]
+    return l[..., None] - a * np.clip(np.minimum(k - 3, 9 - k), -1, 1)
+
+
+def _linear(rgb: np.ndarray) -> np.ndarray:
+    rgb = np.asarray(rgb, dtype=float)
+    return np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+
+
+def rgb_to_lab(rgb: np.ndarray) -> np.ndarray:
+    """(..., 3) sRGB (0~1) → CIE LAB (D65)"""
+    xyz = _linear(rgb) @ _RGB_TO_XYZ.T / _WHITE_D65
+    epsilon, kappa = 216 / 24389, 24389 / 27
+    f = np.where(xyz > epsilon, np.cbrt(xyz), (kappa * xyz + 16) / 116)
+    return np.stack([
+        116 * f[..., 1] - 16,
+        500 * (f[..., 0] - f[..., 1]),
+        200 * (f[..., 1] - f[..., 2]),
+    ], axis=-1)
+
+
+def delta_e(lab_a: np.ndarray, lab_b: np.ndarray) -> np.ndarray:
+    """CIE76 색차 (브로드캐스팅)"""
+    return np.sqrt(((np.asarray(lab_a) - np.asarray(lab_b)) ** 2).sum(axis=-1))
+
+
+def relative_luminance(rgb: np.ndarray) -> np.ndarray:
+    """WCAG 상대 휘도"""
+    return _linear(rgb) @ np.array([0.2126, 0.7152, 0.0722])
+
+
+def contrast_ratio(rgb_a: np.ndarray, rgb_b: np.ndarray) -> np.ndarray:
+    """WCAG 대비율 (1~21, 브로드캐스팅)"""
+    la, lb = relative_luminance(rgb_a), relative_luminance(rgb_b)
+    return (np.maximum(la, lb) + 0.05) / (np.minimum(la, lb) + 0.05)
+
+
+def adjust_hsl(
+    rgb: np.ndarray,
+    hue: float = 0.0,
+    saturation: float = 0.0,
+    lightness: float = 0.0
+) -> np.ndarray:
+    """
+    색조 회전(도) / 채도·명도 변화(%p) 적용
+
+    Args:
+        rgb: (..., 3) RGB (0~1)
+
+    Returns:
+        (..., 3) RGB
+    """
+    hsl = rgb_to_hsl(rgb)
+    hsl[..., 0] = (hsl[..., 0] + hue) % 360
+    hsl[..., 1] = np.clip(hsl[..., 1] + saturation / 100, 0, 1)
+    hsl[..., 2] = np.clip(hsl[..., 2] + lightness / 100, 0, 1)
+    return hsl_to_rgb(hsl)
+
+
+def generate_schemes(base_colors: Sequence[str], scheme: str = "complementary", num_colors: int = 5) -> np.ndarray:
+    """
+    기준 색 여러 개의 배색을 한 번에 생성
+
+    Args:
+        base_colors: 기준 hex 색상 (n개)
+        scheme: complementary / analogous / triadic
+        num_colors: 배색 색 수 (최대 5)
+
+    Returns:
+        (n, num_colors, 3) RGB
+    """
+    if scheme not in SCHEME_OFFSETS:
+        raise ValueError(f"Unsupported palette scheme: {scheme}")
+    offsets = np.array(SCHEME_OFFSETS[scheme][:num_colors], dtype=float)
+
+    hsl = rgb_to_hsl(hex_to_rgb(base_colors))[:, None, :].repeat(len(offsets), axis=1)
+    hsl[..., 0] = (hsl[..., 0] + offsets[:, 0]) % 360
+    hsl[..., 2] = np.clip(hsl[..., 2] + offsets[:, 1] / 100, 0, 1)
+    hsl[..., 1] = np.clip(hsl[..., 1] + offsets[:, 2] / 100, 0, 1)
+    return hsl_to_rgb(hsl)
+
+
+def score_palettes(palettes: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    팔레트 대비 / 접근성 점수 (팔레트 여러 개 일괄)
+
+    Args:
+        palettes: (n, k, 3) RGB
+
+    Returns:
+        {
+            "contrast": (n, k, k) 색 쌍 대비율,
+            "text_color": (n, k) 0=검정 / 1=흰색 (각 색을 배경으로 쓸 때 더 잘 읽히는 글자색),
+            "text_contrast": (n, k) 해당 글자색과의 대비율,
+            "aa_pairs": (n,) WCAG AA(4.5:1)를 만족하는 색 쌍 수,
+            "min_delta_e": (n,) 가장 비슷한 두 색의 색차 (구분성),
+            "score": (n,) 접근성 점수 0~100
+        }
+    """
+    palettes = np.asarray(palettes, dtype=float)
+    n, k, _ = palettes.shape
+    contrast = contrast_ratio(palettes[:, :, None, :], palettes[:, None, :, :])
+
+    black_white = np.array([[0.0, 0.0, 0.0], [1.0, 1.0, 1.0]])
+    text = contrast_ratio(palettes[:, :, None, :], black_white)
+    text_color = text.argmax(axis=-1)
+    text_contrast = text.max(axis=-1)
+
+    upper = np.triu(np.ones((k, k), dtype=bool), 1)
+    pair_contrast = contrast[:, upper]
+    aa_pairs = (pair_contrast >= WCAG_AA).sum(axis=1)
+
+    lab = rgb_to_lab(palettes)
+    distances = delta_e(lab[:, :, None, :], lab[:, None, :, :])[:, upper]
+    min_delta_e = distances.min(axis=1) if distances.shape[1] else np.zeros(n)
+
+    # 글자 가독성 50 + 색 쌍 대비 30 + 구분성 20
+    readable = (text_contrast >= WCAG_AA).mean(axis=1)
+    best_pair = (pair_contrast.max(axis=1) / WCAG_AAA).clip(0, 1) if pair_contrast.shape[1] else np.zeros(n)
+    distinct = (min_delta_e / 20).clip(0, 1)
+    score = np.round(50 * readable + 30 * best_pair + 20 * distinct, 1)
+
+    return {
+        "contrast": contrast,
+        "text_color": text_color,
+        "text_contrast": text_contrast,
+        "aa_pairs": aa_pairs,
+        "min_delta_e": min_delta_e,
+        "score": score,
+    }
+
+
+def _wcag_level(ratio: float) -> str:
+    if ratio >= WCAG_AAA:
+        return "AAA"
+    if ratio >= WCAG_AA:
+        return "AA"
+    if ratio >= WCAG_AA_LARGE:
+        return "AA-large"
+    return "fail"
+
+
+def describe_palettes(palettes: np.ndarray, shares: Optional[np.ndarray] = None) -> List[Dict]:
+    """팔레트 배열 + 점수 → API 응답 형식"""
+    scores = score_palettes(palettes)
+    results = []
+    for i, palette in enumerate(palettes):
+        colors = []
+        for j, hex_code in enumerate(rgb_to_hex(palette)):
+            ratio = float(scores["text_contrast"][i, j])
+            color = {
+                "hex": hex_code,
+                "text_color": "#FFFFFF" if scores["text_color"][i, j] else "#000000",
+                "text_contrast": round(ratio, 2),
+                "wcag": _wcag_level(ratio),
+            }
+            if shares is not None:
+                color["share"] = round(float(shares[i, j]), 4)
+            colors.append(color)
+        results.append({
+            "colors": colors,
+            "aa_pairs": int(scores["aa_pairs"][i]),
+            "min_delta_e": round(float(scores["min_delta_e"][i]), 2),
+            "accessibility_score": float(scores["score"][i]),
+        })
+    return results
+
+
+def suggest_palettes(
+    base_colors: Sequence[str],
+    schemes: Sequence[str] = SCHEMES,
+    num_colors: int = 5
+) -> List[Dict]:
+    """
+    브랜드 전체 배색 제안 (기준 색 × 배색 규칙을 한 번에 생성 / 채점)
+
+    Returns:
+        [{"base_color", "scheme", "colors", "aa_pairs", "min_delta_e", "accessibility_score"}, ...]
+        기준 색별로 접근성 점수가 높은 순
+    """
+    results = []
+    for scheme in schemes:
+        described = describe_palettes(generate_schemes(base_colors, scheme, num_colors))
+        for base_color, palette in zip(base_colors, described):
+            results.append({"base_color": base_color, "scheme": scheme, **palette})
+
+    order = {base: i for i, base in enumerate(base_colors)}
+    return sorted(results, key=lambda p: (order[p["base_color"]], -p["accessibility_score"]))
+
+
+def kmeans(points: np.ndarray, k: int, iterations: int = 20, seed: int = 0) -> tuple:
+    """
+    k-means (k-means++ 초기화, 거리 계산은 행렬 연산)
+
+    Returns:
+        ((k, d) 중심, (n,) 군집 번호)
+    """
+    rng = np.random.default_rng(seed)
+    n = len(points)
+    k = min(k, n)
+    centers = [points[rng.integers(n)]]
+    for _ in range(1, k):
+        distance = ((points[:, None, :] - np.array(centers)[None]) ** 2).sum(axis=-1).min(axis=1)
+        total = distance.sum()
+        centers.append(points[rng.choice(n, p=distance / total)] if total > 0 else points[rng.integers(n)])
+    centers = np.array(centers)
+
+    labels = np.zeros(n, dtype=int)
+    for _ in range(iterations):
+        distance = ((points[:, None, :] - centers[None]) ** 2).sum(axis=-1)
+        new_labels = distance.argmin(axis=1)
+        counts = np.bincount(new_labels, minlength=k)
+        sums = np.zeros_like(centers)
+        np.add.at(sums, new_labels, points)
+        # 빈 군집은 기존 중심 유지
+        centers = np.where(counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], centers)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+    return centers, labels
+
+
+def extract_palette(image_bytes: bytes, num_colors: int = 5, sample_size: int = 64) -> List[Dict]:
+    """
+    이미지 대표색 추출 (분석 워커 프로세스에서 실행)
+
+    `sample_size` × `sample_size` 이하로 줄인 픽셀을 LAB 공간에서 k-means로 묶고,
+    비중이 큰 군집 순으로 반환합니다 (투명 픽셀 제외).
+
+    Returns:
+        describe_palettes 형식 팔레트 1개 (색마다 share 포함)
+    """
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(image_bytes))
+    image.draft("RGB", (sample_size * 2, sample_size * 2))
+    image = image.convert("RGBA")
+    image.thumbnail((sample_size, sample_size))
+
+    pixels = np.asarray(image, dtype=float).reshape(-1, 4)
+    pixels = pixels[pixels[:, 3] > 127, :3] / 255.0
+    if len(pixels) == 0:
+        raise ValueError("Image has no opaque pixels")
+
+    centers, labels = kmeans(rgb_to_lab(pixels), num_colors)
+    shares = np.bincount(labels, minlength=len(centers)) / len(labels)
+    order = np.argsort(-shares)
+    # 중심은 군집 평균 RGB로 표시 (LAB → RGB 역변환 없이 원래 색 범위 유지)
+    rgb_centers = np.array([
+        pixels[labels == c].mean(axis=0) if (labels == c).any() else np.zeros(3) for c in order
+    ])
+    keep = shares[order] > 0
+    return describe_palettes(rgb_centers[keep][None], shares[order][keep][None])[0]
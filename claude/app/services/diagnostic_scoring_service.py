@@ -0,0 +1,273 @@
+"""
+Diagnostic Scoring Service (Back2)
+브랜드 진단 5개 섹션 점수 / 종합 점수 계산 (여러 리포트를 배열 연산으로 일괄 처리)
+"""
+import argparse
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.analytics_executor import analytics_executor
+from app.core.config import settings
+from app.models.insight import BrandDiagnostic, BrandReport, DiagnosticSection, ReportSection
+
+logger = logging.getLogger(__name__)
+
+SECTIONS = tuple(DiagnosticSection)
+
+# 5점 척도
+SCALE_MIN, SCALE_MAX = 1.0, 5.0
+
+# 레이더 차트를 저장하는 ReportSection
+RADAR_SECTION_NAME = "diagnostic_scores"
+
+SECTION_LABELS = {
+    DiagnosticSection.MARKET: "시장",
+    DiagnosticSection.COMPETITOR: "경쟁사",
+    DiagnosticSection.MANUFACTURING: "제조",
+    DiagnosticSection.BRAND: "브랜드",
+    DiagnosticSection.MARKETING: "마케팅",
+}
+
+
+def parse_answers(questions_answers: Optional[Dict[str, Any]]) -> List[Tuple[float, float]]:
+    """
+    질문-응답 JSON → (응답값, 문항 가중치) 리스트
+
+    응답은 숫자(문자열 포함) 또는 {"answer" | "score" | "value": 숫자, "weight": 숫자} 형식이며,
+    숫자가 아닌 응답은 채점에서 제외하고 척도 밖의 값은 1~5로 자릅니다.
+    """
+    parsed = []
+    for answer in (questions_answers or {}).values():
+        weight = 1.0
+        if isinstance(answer, dict):
+            weight = answer.get("weight", 1.0)
+            answer = next((answer[key] for key in ("answer", "score", "value") if key in answer), None)
+        try:
+            value, weight = float(answer), float(weight)
+        except (TypeError, ValueError):
+            continue
+        if np.isfinite(value) and weight > 0:
+            parsed.append((min(max(value, SCALE_MIN), SCALE_MAX), weight))
+    return parsed
+
+
+def build_answer_tensor(reports: Sequence[Dict[DiagnosticSection, Dict]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    리포트별 {섹션: 질문-응답} → (리포트 × 섹션 × 문항) 응답 / 가중치 배열 (빈 칸은 가중치 0)
+    """
+    parsed = [[parse_answers(report.get(section)) for section in SECTIONS] for report in reports]
+    max_questions = max((len(answers) for row in parsed for answers in row), default=0)
+    values = np.zeros((len(reports), len(SECTIONS), max(max_questions, 1)))
+    weights = np.zeros_like(values)
+    for i, row in enumerate(parsed):
+        for j, answers in enumerate(row):
+            if answers:
+                values[i, j, :len(answers)], weights[i, j, :len(answers)] = zip(*answers)
+    return values, weights
+
+
+def score_batch(values: np.ndarray, weights: np.ndarray, section_weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    섹션 / 종합 점수 일괄 계산
+
+    Args:
+        values: (n, 5, q) 응답값 (1~5)
+        weights: (n, 5, q) 문항 가중치 (빈 칸 0)
+        section_weights: (5,) 섹션 가중치
+
+    Returns:
+        ((n, 5) 섹션 점수 0~100, 응답 없는 섹션은 NaN), (n,) 종합 점수 (응답 섹션만 가중 평균, 없으면 NaN)
+    """
+    normalized = (values - SCALE_MIN) / (SCALE_MAX - SCALE_MIN)
+    answered = weights.sum(axis=2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        section_scores = np.where(answered > 0, (normalized * weights).sum(axis=2) / answered * 100, np.nan)
+
+        present = ~np.isnan(section_scores)
+        effective = np.where(present, section_weights, 0.0)
+        total_weight = effective.sum(axis=1)
+        overall = np.where(
+            total_weight > 0,
+            np.nansum(section_scores * effective, axis=1) / total_weight,
+            np.nan
+        )
+    return section_scores, overall
+
+
+def radar_chart_data(section_scores: Sequence[float]) -> Dict:
+    """섹션 점수 → ReportSection.chart_data 레이더 차트"""
+    return {
+        "type": "radar",
+        "labels": [SECTION_LABELS[section] for section in SECTIONS],
+        "sections": [section.value for section in SECTIONS],
+        "max": 100,
+        "datasets": [{
+            "label": "진단 점수",
+            "data": [None if np.isnan(score) else round(float(score), 1) for score in section_scores],
+        }],
+    }
+
+
+def _score(value: float) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), 1)
+
+
+class DiagnosticScoringService:
+    """
+    브랜드 진단 채점 서비스
+
+    기능:
+    - 5점 척도 응답 → 섹션 점수 (0~100, 문항 가중치 지원)
+    - 섹션 가중 평균 → BrandReport.overall_score
+    - 레이더 차트 데이터 → ReportSection.chart_data (채점 결과로 바로 생성)
+    - 가중치 변경 시 전체 리포트 일괄 재채점 (배치 단위 배열 연산, 일괄 UPDATE)
+    """
+
+    def __init__(self, section_weights: Optional[Dict[str, float]] = None, batch_size: int = 500):
+        self.section_weights = section_weights or {}
+        self.batch_size = batch_size
+
+    def _weight_vector(self) -> np.ndarray:
+        return np.array([float(self.section_weights.get(section.value, 1.0)) for section in SECTIONS])
+
+    def score(self, reports: Sequence[Dict[DiagnosticSection, Dict]]) -> Tuple[np.ndarray, np.ndarray]:
+        """리포트별 {섹션: 질문-응답} → (섹션 점수, 종합 점수)"""
+        values, weights = build_answer_tensor(reports)
+        return score_batch(values, weights, self._weight_vector())
+
+    async def _load(self, db: AsyncSession, report_ids: Sequence[int]) -> Dict[int, List[BrandDiagnostic]]:
+        result = await db.execute(
+            select(BrandDiagnostic).where(BrandDiagnostic.report_id.in_(report_ids)).order_by(BrandDiagnostic.id)
+        )
+        by_report: Dict[int, List[BrandDiagnostic]] = {report_id: [] for report_id in report_ids}
+        for diagnostic in result.scalars():
+            by_report[diagnostic.report_id].append(diagnostic)
+        return by_report
+
+    async def _apply(
+        self,
+        db: AsyncSession,
+        by_report: Dict[int, List[BrandDiagnostic]],
+        offload: bool
+    ) -> Dict[int, Dict]:
+        """채점 후 진단 / 리포트 / 레이더 섹션 일괄 갱신 (커밋은 호출자)"""
+        report_ids = list(by_report)
+        answers = [
+            {diagnostic.section: diagnostic.questions_answers for diagnostic in by_report[report_id]}
+            for report_id in report_ids
+        ]
+        values, weights = build_answer_tensor(answers)
+        weight_vector = self._weight_vector()
+        if offload:
+            section_scores, overall = await analytics_executor.run(score_batch, values, weights, weight_vector)
+        else:
+            section_scores, overall = score_batch(values, weights, weight_vector)
+
+        column = {section: j for j, section in enumerate(SECTIONS)}
+        diagnostic_rows = [
+            {"id": diagnostic.id, "section_score": _score(section_scores[i, column[diagnostic.section]])}
+            for i, report_id in enumerate(report_ids) for diagnostic in by_report[report_id]
+        ]
+        if diagnostic_rows:
+            await db.execute(update(BrandDiagnostic), diagnostic_rows)
+        await db.execute(update(BrandReport), [
+            {"id": report_id, "overall_score": _score(overall[i])} for i, report_id in enumerate(report_ids)
+        ])
+
+        charts = {report_id: radar_chart_data(section_scores[i]) for i, report_id in enumerate(report_ids)}
+        existing = dict((await db.execute(
+            select(ReportSection.report_id, ReportSection.id).where(
+                ReportSection.report_id.in_(report_ids),
+                ReportSection.section_name == RADAR_SECTION_NAME
+            )
+        )).all())
+        if existing:
+            await db.execute(update(ReportSection), [
+                {"id": section_id, "chart_data": charts[report_id]} for report_id, section_id in existing.items()
+            ])
+        missing = [report_id for report_id in report_ids if report_id not in existing]
+        if missing:
+            await db.execute(insert(ReportSection), [
+                {"report_id": report_id, "section_name": RADAR_SECTION_NAME, "section_order": 0,
+                 "chart_data": charts[report_id]}
+                for report_id in missing
+            ])
+
+        return {
+            report_id: {
+                "overall_score": _score(overall[i]),
+                "section_scores": {
+                    section.value: _score(section_scores[i, j]) for j, section in enumerate(SECTIONS)
+                },
+                "chart_data": charts[report_id],
+            }
+            for i, report_id in enumerate(report_ids)
+        }
+
+    async def score_report(self, db: AsyncSession, report_id: int) -> Dict:
+        """
+        리포트 한 건 채점 및 저장
+
+        Returns:
+            {"overall_score", "section_scores", "chart_data"}
+        """
+        by_report = await self._load(db, [report_id])
+        result = await self._apply(db, by_report, offload=False)
+        await db.commit()
+        return result[report_id]
+
+    async def rescore_all(self, db: AsyncSession, report_ids: Optional[Sequence[int]] = None) -> int:
+        """
+        전체(또는 지정) 리포트 재채점 (설정된 섹션 가중치 변경 시)
+
+        리포트 ID 순으로 `batch_size`개씩 읽고, 배치마다 한 번의 배열 연산과
+        일괄 UPDATE로 저장합니다.
+
+        Returns:
+            재채점한 리포트 수
+        """
+        rescored = 0
+        last_id = 0
+        while True:
+            query = select(BrandReport.id).where(BrandReport.id > last_id).order_by(BrandReport.id).limit(self.batch_size)
+            if report_ids is not None:
+                query = query.where(BrandReport.id.in_(report_ids))
+            batch = list((await db.execute(query)).scalars())
+            if not batch:
+                break
+
+            await self._apply(db, await self._load(db, batch), offload=True)
+            await db.commit()
+            rescored += len(batch)
+            last_id = batch[-1]
+        return rescored
+
+
+# Singleton instance
+diagnostic_scoring_service = DiagnosticScoringService(section_weights=settings.DIAGNOSTIC_SECTION_WEIGHTS)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="브랜드 진단 리포트 일괄 재채점 (DIAGNOSTIC_SECTION_WEIGHTS 변경 후)")
+    parser.add_argument("--report-id", type=int, action="append", dest="report_ids", help="재채점할 리포트 ID (반복 가능, 기본: 전체)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    async def run() -> int:
+        from app.core.database import AsyncSessionLocal, close_db
+        try:
+            async with AsyncSessionLocal() as db:
+                return await diagnostic_scoring_service.rescore_all(db, report_ids=args.report_ids)
+        finally:
+            await close_db()
+
+    rescored = asyncio.run(run())
+    logger.info(f"Diagnostic reports rescored: {rescored}")
+
+
+if __name__ == "__main__":
+    main()
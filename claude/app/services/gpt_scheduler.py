@@ -0,0 +1,359 @@
+"""
+GPT Request Scheduler
+Client-side token-budget and rate-limit scheduling for OpenAI calls
+"""
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from enum import IntEnum
+from typing import Awaitable, Callable, Dict, List, Optional, Union
+from app.core.config import settings
+
+
+class GPTPriority(IntEnum):
+    """Request priority (lower value is dispatched first)"""
+    INTERACTIVE = 0  # Dashboard / search requests waiting on a user
+    DEFAULT = 5
+    BACKGROUND = 10  # Batch jobs, report generation
+
+
+class SharedPriority:
+    """
+    Priority of one upstream request shared by coalesced callers
+
+    A caller that joins an in-flight request raises it to its own priority,
+    so an interactive caller never waits in the background queue behind
+    the job that happened to start the request.
+    """
+
+    def __init__(self, priority: int):
+        self.value = int(priority)
+        self._listeners: List[Callable[[], Awaitable[None]]] = []
+
+    def subscribe(self, listener: Callable[[], Awaitable[None]]) -> Callable[[], None]:
+        """Call `listener` whenever the priority is raised; returns an unsubscribe function"""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    async def raise_to(self, priority: int) -> None:
+        """Raise to `priority` if it is more urgent (lower) than the current value"""
+        if int(priority) < self.value:
+            self.value = int(priority)
+            for listener in list(self._listeners):
+                await listener()
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text without a tokenizer
+
+    Hangul and other non-ASCII characters are roughly one token each,
+    while ASCII text averages about four characters per token.
+
+    Args:
+        text: Text to estimate
+
+    Returns:
+        Estimated token count
+    """
+    if not text:
+        return 0
+
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    non_ascii_chars = len(text) - ascii_chars
+    return non_ascii_chars + (ascii_chars + 3) // 4
+
+
+def estimate_message_tokens(messages: List[Dict[str, str]]) -> int:
+    """
+    Estimate prompt tokens for a chat completion message list
+
+    Args:
+        messages: Chat messages ({"role": ..., "content": ...})
+
+    Returns:
+        Estimated prompt token count including per-message overhead
+    """
+    # ~4 tokens of framing per message plus 3 for the reply primer
+    return sum(estimate_tokens(m.get("content", "")) + 4 for m in messages) + 3
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at capacity / 60 per second
+
+    Used for both requests-per-minute and tokens-per-minute budgets.
+    """
+
+    def __init__(self, capacity: int, refill_per_second: float):
+        self.capacity = float(capacity)
+        self.refill_per_second = refill_per_second
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self.updated_at
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+        self.updated_at = now
+
+    def time_until(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available (0 if available now)"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_per_second
+
+    def consume(self, amount: float) -> None:
+        """Take `amount` tokens (callers check time_until first)"""
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def refund(self, amount: float) -> None:
+        """Give back tokens that were reserved but not used"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+    @property
+    def available(self) -> float:
+        self._refill()
+        return self.tokens
+
+
+class GPTRequestScheduler:
+    """
+    Rate-limit aware scheduler shared by all GPTService instances
+
+    Features:
+    - Prompt token estimation before sending
+    - TPM / RPM budgets enforced with token buckets
+    - Priority queue (interactive requests before background jobs)
+    - Jittered backoff honoring Retry-After on 429 responses
+    - Budget usage metrics
+    """
+
+    def __init__(
+        self,
+        tokens_per_minute: int,
+        requests_per_minute: int,
+        max_retries: int = 3,
+        base_backoff: float = 1.0,
+        max_backoff: float = 30.0
+    ):
+        self.tokens_per_minute = tokens_per_minute
+        self.requests_per_minute = requests_per_minute
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self._token_bucket = TokenBucket(tokens_per_minute, tokens_per_minute / 60.0)
+        self._request_bucket = TokenBucket(requests_per_minute, requests_per_minute / 60.0)
+
+        self._waiters: List[tuple] = []
+        self._sequence = itertools.count()
+        self._condition: Optional[asyncio.Condition] = None
+        self._condition_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._metrics = {
+            "requests_dispatched": 0,
+            "requests_rate_limited": 0,
+            "requests_retried": 0,
+            "estimated_tokens_reserved": 0,
+            "actual_tokens_used": 0,
+            "total_wait_seconds": 0.0,
+        }
+
+    def _get_condition(self) -> asyncio.Condition:
+        """Return a Condition bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._condition_loop is not loop:
+            self._condition = asyncio.Condition()
+            self._condition_loop = loop
+            self._waiters = []
+        return self._condition
+
+    async def acquire(
+        self,
+        estimated_tokens: int,
+        priority: Union[int, SharedPriority] = GPTPriority.DEFAULT
+    ) -> int:
+        """
+        Wait until the TPM / RPM budgets allow a request to be sent
+
+        Args:
+            estimated_tokens: Tokens to reserve (prompt estimate + max completion tokens)
+            priority: Request priority, lower values dispatch first. A SharedPriority
+                moves the queued request forward when a more urgent caller joins it.
+
+        Returns:
+            Number of tokens actually reserved
+        """
+        reserved = min(estimated_tokens, self.tokens_per_minute)
+        shared = priority if isinstance(priority, SharedPriority) else None
+        # Lists so a queued entry can be re-prioritized in place
+        entry = [shared.value if shared else int(priority), next(self._sequence)]
+        condition = self._get_condition()
+        started_at = time.monotonic()
+
+        async def reprioritize() -> None:
+            async with condition:
+                if entry in self._waiters and shared.value < entry[0]:
+                    entry[0] = shared.value
+                    heapq.heapify(self._waiters)
+                    condition.notify_all()
+
+        unsubscribe = shared.subscribe(reprioritize) if shared else None
+        try:
+            await self._wait_for_turn(entry, reserved, condition)
+        finally:
+            if unsubscribe:
+                unsubscribe()
+
+        self._metrics["requests_dispatched"] += 1
+        self._metrics["estimated_tokens_reserved"] += reserved
+        self._metrics["total_wait_seconds"] += time.monotonic() - started_at
+        return reserved
+
+    async def _wait_for_turn(self, entry: list, reserved: int, condition: asyncio.Condition) -> None:
+        """Queue `entry` and consume the budgets once it is first in line and they allow it"""
+        async with condition:
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    timeout = None
+                    if self._waiters[0] == entry:
+                        timeout = max(
+                            self._request_bucket.time_until(1),
+                            self._token_bucket.time_until(reserved)
+                        )
+                        if timeout <= 0:
+                            heapq.heappop(self._waiters)
+                            self._request_bucket.consume(1)
+                            self._token_bucket.consume(reserved)
+                            condition.notify_all()
+                            break
+                    try:
+                        await asyncio.wait_for(condition.wait(), timeout=timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            except BaseException:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+                    condition.notify_all()
+                raise
+
+    def record_usage(self, reserved_tokens: int, actual_tokens: Optional[int]) -> None:
+        """
+        Reconcile a reservation with the usage reported by the API
+
+        Args:
+            reserved_tokens: Tokens reserved by acquire()
+            actual_tokens: usage.total_tokens from the response (None if unknown)
+        """
+        if actual_tokens is None:
+            return
+        self._metrics["actual_tokens_used"] += actual_tokens
+        if actual_tokens < reserved_tokens:
+            self._token_bucket.refund(reserved_tokens - actual_tokens)
+        elif actual_tokens > reserved_tokens:
+            self._token_bucket.consume(actual_tokens - reserved_tokens)
+
+    def release(self, reserved_tokens: int) -> None:
+        """
+        Return the reservation of a request that failed before using any budget
+
+        Only called when the API definitely did not admit the request (429,
+        connection error) so a retried request is only charged once against
+        the TPM budget. Cancelled or timed-out requests keep their reservation.
+
+        Args:
+            reserved_tokens: Tokens reserved by acquire()
+        """
+        self._metrics["estimated_tokens_reserved"] -= reserved_tokens
+        self._token_bucket.refund(reserved_tokens)
+
+    def retry_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Compute the delay before retrying a rate-limited request
+
+        Uses the server's Retry-After value when present, otherwise
+        exponential backoff; full jitter is added in both cases so
+        concurrent retries do not fire together.
+
+        Args:
+            attempt: Zero-based retry attempt number
+            retry_after: Retry-After seconds reported by the API
+
+        Returns:
+            Delay in seconds
+        """
+        backoff = min(self.max_backoff, self.base_backoff * (2 ** attempt))
+        if retry_after is not None and retry_after > 0:
+            return retry_after + random.uniform(0, backoff)
+        return random.uniform(0, backoff)
+
+    def record_rate_limited(self, will_retry: bool) -> None:
+        """Count a 429 response (and whether it is retried)"""
+        self._metrics["requests_rate_limited"] += 1
+        if will_retry:
+            self._metrics["requests_retried"] += 1
+
+    def get_metrics(self) -> Dict:
+        """
+        Budget usage metrics
+
+        Returns:
+            Dictionary with current budgets, availability and counters
+        """
+        return {
+            "tokens_per_minute_limit": self.tokens_per_minute,
+            "requests_per_minute_limit": self.requests_per_minute,
+            "tokens_available": round(self._token_bucket.available, 1),
+            "requests_available": round(self._request_bucket.available, 2),
+            "queue_depth": len(self._waiters),
+            **self._metrics,
+            "total_wait_seconds": round(self._metrics["total_wait_seconds"], 3),
+        }
+
+
+def parse_retry_after(error: Exception) -> Optional[float]:
+    """
+    Read the Retry-After header (seconds) from an OpenAI API error
+
+    Args:
+        error: Exception raised by the OpenAI client
+
+    Returns:
+        Seconds to wait, or None if the header is missing or not numeric
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000.0
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            return None
+    return None
+
+
+# Shared scheduler instance (budgets are per API key, not per GPTService)
+gpt_scheduler = GPTRequestScheduler(
+    tokens_per_minute=settings.GPT_TOKENS_PER_MINUTE,
+    requests_per_minute=settings.GPT_REQUESTS_PER_MINUTE,
+    max_retries=settings.GPT_MAX_RETRIES
+)
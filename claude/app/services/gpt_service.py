@@ -4,9 +4,33 @@ OpenAI API integration for AI-powered brand recommendations and analysis
 """
 import os
 import json
+import asyncio
 from typing import List, Dict, Optional
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, APIConnectionError, APITimeoutError, RateLimitError
 from app.core.config import settings
+from app.services.gpt_scheduler import (
+    gpt_scheduler,
+    GPTPriority,
+    estimate_message_tokens,
+    parse_retry_after
+)
+from app.services.single_flight import coalesce
+from app.core.cache import cached
+
+
+def _is_success(result: Dict) -> bool:
+    """Only successful completions are cached"""
+    return bool(result and result.get("success"))
+
+
+def _market_analysis_fallback() -> Dict:
+    """analyze_market result when the completion fails"""
+    return {"summary": "분석 오류", "keywords": [], "market_data": {}, "recommendations": [], "items": []}
+
+
+def _is_market_analysis(result: Dict) -> bool:
+    """Market analyses are cached unless the error fallback was returned"""
+    return bool(result) and result != _market_analysis_fallback()
 
 
 class GPTService:
@@ -18,21 +42,92 @@ class GPTService:
     - Market analysis and insights
     - Keyword generation and clustering
     - Brand positioning suggestions
+
+    All completions go through the shared GPTRequestScheduler, which
+    enforces TPM/RPM budgets and owns retries on 429 responses.
+    Concurrent calls with identical arguments share one upstream request,
+    and successful results are cached across workers for GPT_CACHE_TTL.
     """
 
     def __init__(self):
         """Initialize GPT service with API key"""
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        # Retries are handled by the scheduler so they respect the shared budget
+        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY, max_retries=0)
         self.model = "gpt-4-turbo-preview"
         self.temperature = 0.7
         self.max_tokens = 2000
+        self.scheduler = gpt_scheduler
 
+    async def _create_completion(
+        self,
+        messages: List[Dict[str, str]],
+        priority: int = GPTPriority.DEFAULT,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None
+    ):
+        """
+        Send a JSON chat completion through the rate-limit scheduler
+
+        Args:
+            messages: Chat messages
+            priority: Scheduling priority (GPTPriority)
+            temperature: Sampling temperature (defaults to self.temperature)
+            max_tokens: Completion token limit (defaults to self.max_tokens)
+
+        Returns:
+            OpenAI chat completion response
+
+        Raises:
+            RateLimitError: If still rate limited after the configured retries
+        """
+        max_tokens = max_tokens or self.max_tokens
+        # OpenAI counts max_tokens against the TPM budget when the request is admitted
+        estimated_tokens = estimate_message_tokens(messages) + max_tokens
+
+        attempt = 0
+        while True:
+            reserved = await self.scheduler.acquire(estimated_tokens, priority)
+            # Only failures where the API did not admit the request give the reservation back;
+            # a cancelled, timed-out or 5xx request may still count against the TPM budget
+            try:
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=self.temperature if temperature is None else temperature,
+                    max_tokens=max_tokens,
+                    response_format={"type": "json_object"}
+                )
+            except RateLimitError as e:
+                # The rejected request used no budget; reserve again on the next attempt
+                self.scheduler.release(reserved)
+                will_retry = attempt < self.scheduler.max_retries
+                self.scheduler.record_rate_limited(will_retry)
+                if not will_retry:
+                    raise
+                await asyncio.sleep(self.scheduler.retry_delay(attempt, parse_retry_after(e)))
+                attempt += 1
+                continue
+            except APITimeoutError:
+                # The request may have been admitted and billed; keep the reservation
+                raise
+            except APIConnectionError:
+                # The connection failed before the request was admitted
+                self.scheduler.release(reserved)
+                raise
+
+            usage = getattr(response, "usage", None)
+            self.scheduler.record_usage(reserved, getattr(usage, "total_tokens", None))
+            return response
+
+    @cached("gpt", ttl=settings.GPT_CACHE_TTL, exclude=("priority",), cache_if=_is_success)
+    @coalesce("gpt", exclude=("priority",), priority="priority")
     async def recommend_brands(
         self,
         industry: str,
         target_audience: Optional[str] = None,
         keywords: Optional[List[str]] = None,
-        limit: int = 5
+        limit: int = 5,
+        priority: int = GPTPriority.DEFAULT
     ) -> Dict:
         """
         Generate AI-powered brand recommendations
@@ -42,6 +137,7 @@ class GPTService:
             target_audience: Target audience description (e.g., "20대 여성")
             keywords: Related keywords
             limit: Number of recommendations to generate
+            priority: Scheduling priority (GPTPriority)
 
         Returns:
             Dictionary containing brand recommendations and insights
@@ -84,15 +180,12 @@ JSON 형식으로 응답해주세요:
 """
 
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
+            response = await self._create_completion(
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-                response_format={"type": "json_object"}
+                priority=priority
             )
 
             content = response.choices[0].message.content
@@ -111,12 +204,15 @@ JSON 형식으로 응답해주세요:
                 "data": None
             }
 
+    @cached("gpt", ttl=settings.GPT_CACHE_TTL, exclude=("priority",), cache_if=_is_success)
+    @coalesce("gpt", exclude=("priority",), priority="priority")
     async def analyze_brand_positioning(
         self,
         brand_name: str,
         industry: str,
         mission: Optional[str] = None,
-        target_audience: Optional[str] = None
+        target_audience: Optional[str] = None,
+        priority: int = GPTPriority.DEFAULT
     ) -> Dict:
         """
         Analyze brand positioning and provide strategic recommendations
@@ -126,6 +222,7 @@ JSON 형식으로 응답해주세요:
             industry: Industry type
             mission: Brand mission statement
             target_audience: Target audience description
+            priority: Scheduling priority (GPTPriority)
 
         Returns:
             Brand positioning analysis and recommendations
@@ -169,15 +266,12 @@ JSON 형식으로 응답해주세요:
 """
 
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
+            response = await self._create_completion(
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-                response_format={"type": "json_object"}
+                priority=priority
             )
 
             content = response.choices[0].message.content
@@ -196,12 +290,15 @@ JSON 형식으로 응답해주세요:
                 "data": None
             }
 
+    @cached("gpt", ttl=settings.GPT_CACHE_TTL, exclude=("priority",), cache_if=_is_success)
+    @coalesce("gpt", exclude=("priority",), priority="priority")
     async def generate_keywords(
         self,
         brand_name: str,
         industry: str,
         description: Optional[str] = None,
-        limit: int = 20
+        limit: int = 20,
+        priority: int = GPTPriority.DEFAULT
     ) -> Dict:
         """
         Generate relevant keywords for brand
@@ -211,6 +308,7 @@ JSON 형식으로 응답해주세요:
             industry: Industry type
             description: Brand description
             limit: Number of keywords to generate
+            priority: Scheduling priority (GPTPriority)
 
         Returns:
             List of relevant keywords with categories
@@ -249,15 +347,12 @@ JSON 형식으로 응답해주세요:
 """
 
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
+            response = await self._create_completion(
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-                response_format={"type": "json_object"}
+                priority=priority
             )
 
             content = response.choices[0].message.content
@@ -276,9 +371,12 @@ JSON 형식으로 응답해주세요:
                 "data": None
             }
 
+    @cached("gpt", ttl=settings.GPT_CACHE_TTL, exclude=("priority",), cache_if=_is_success)
+    @coalesce("gpt", exclude=("priority",), priority="priority")
     async def generate_improvement_suggestions(
         self,
-        brand_data: Dict
+        brand_data: Dict,
+        priority: int = GPTPriority.DEFAULT
     ) -> Dict:
         """
         Generate AI-powered improvement suggestions for brand
@@ -289,6 +387,7 @@ JSON 형식으로 응답해주세요:
                 - category: str
                 - current_kpis: dict (optional)
                 - challenges: list (optional)
+            priority: Scheduling priority (GPTPriority)
 
         Returns:
             Improvement suggestions and action items
@@ -342,15 +441,12 @@ JSON 형식으로 응답해주세요:
 """
 
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
+            response = await self._create_completion(
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-                response_format={"type": "json_object"}
+                priority=priority
             )
 
             content = response.choices[0].message.content
@@ -369,10 +465,13 @@ JSON 형식으로 응답해주세요:
                 "data": None
             }
 
+    @cached("gpt", ttl=settings.GPT_CACHE_TTL, exclude=("priority",), cache_if=_is_market_analysis)
+    @coalesce("gpt", exclude=("priority",), priority="priority")
     async def analyze_market(
         self,
         prompt: str,
-        brand_id: Optional[int] = None
+        brand_id: Optional[int] = None,
+        priority: int = GPTPriority.DEFAULT
     ) -> Dict:
         """
         시장 분석 (Back2 Day 1 - GPT 기반 시장조사 로직)
@@ -380,6 +479,7 @@ JSON 형식으로 응답해주세요:
         Args:
             prompt: 사용자 프롬프트
             brand_id: 브랜드 ID (옵션)
+            priority: 스케줄링 우선순위 (GPTPriority)
 
         Returns:
             시장 분석 결과
@@ -400,15 +500,14 @@ JSON 형식으로 응답:
 }}"""
 
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
+            response = await self._create_completion(
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": analysis_prompt}
                 ],
+                priority=priority,
                 temperature=0.7,
-                max_tokens=2000,
-                response_format={"type": "json_object"}
+                max_tokens=2000
             )
 
             result = json.loads(response.choices[0].message.content)
@@ -416,7 +515,218 @@ JSON 형식으로 응답:
 
         except Exception as e:
             print(f"Error analyzing market: {str(e)}")
-            return {"summary": "분석 오류", "keywords": [], "market_data": {}, "recommendations": [], "items": []}
+            return _market_analysis_fallback()
+
+    @cached("gpt", ttl=settings.GPT_CACHE_TTL, exclude=("priority",), cache_if=_is_success)
+    @coalesce("gpt", exclude=("priority",), priority="priority")
+    async def narrate_campaign_forecast(
+        self,
+        campaign_name: str,
+        report_month: str,
+        predictions: Dict,
+        priority: int = GPTPriority.BACKGROUND
+    ) -> Dict:
+        """
+        Explain a precomputed campaign forecast
+
+        The numbers come from CampaignForecastService; the model only
+        describes them and must not produce figures of its own.
+
+        Args:
+            campaign_name: Campaign name
+            report_month: Report month the forecast follows (YYYY-MM)
+            predictions: CampaignReport.ai_predictions
+            priority: Scheduling priority (GPTPriority)
+
+        Returns:
+            Dictionary with "summary" and "recommendations"
+        """
+        # daily values are for charts; totals are enough for the narrative
+        figures = {
+            "horizon_start": predictions.get("horizon_start"),
+            "horizon_days": predictions.get("horizon_days"),
+            "roas": predictions.get("roas"),
+            "metrics": {
+                metric: {key: value for key, value in forecast.items() if key != "daily"}
+                for metric, forecast in predictions.get("metrics", {}).items()
+            }
+        }
+
+        system_prompt = """당신은 제조업 브랜드의 마케팅 성과 분석가입니다.
+주어진 예측 수치만 근거로 설명하고, 새로운 수치를 만들어내지 마세요.
+
+JSON 형식으로 응답해주세요:
+{
+    "summary": "예측 요약 (3~4문장)",
+    "recommendations": [{"title": "제안 제목", "description": "예측 수치에 근거한 설명"}]
+}
+"""
+        prompt = f"""캠페인 '{campaign_name}'의 {report_month} 이후 성과 예측입니다.
+(method: 예측 모델, total: 예측 합계, lower_total / upper_total: 95% 예측 구간)
+
+{json.dumps(figures, ensure_ascii=False)}"""
+
+        try:
+            response = await self._create_completion(
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt}
+                ],
+                priority=priority,
+                temperature=0.3,
+                max_tokens=800
+            )
+
+            result = json.loads(response.choices[0].message.content)
+
+            return {
+                "success": True,
+                "data": result,
+                "tokens_used": response.usage.total_tokens
+            }
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "data": None
+            }
+
+    @cached("gpt", ttl=settings.GPT_CACHE_TTL, exclude=("priority",), cache_if=_is_success)
+    @coalesce("gpt", exclude=("priority",), priority="priority")
+    async def analyze_diagnostic_section(
+        self,
+        brand_name: str,
+        category: Optional[str],
+        section: str,
+        questions_answers: Dict,
+        section_score: Optional[float],
+        max_tokens: int = 800,
+        priority: int = GPTPriority.DEFAULT
+    ) -> Dict:
+        """
+        Analyze one brand diagnostic section
+
+        Args:
+            brand_name: Brand name
+            category: Brand category
+            section: DiagnosticSection value (market, competitor, ...)
+            questions_answers: 5-point-scale answers for the section
+            section_score: Section score (0-100) from DiagnosticScoringService
+            max_tokens: Completion token limit
+            priority: Scheduling priority (GPTPriority)
+
+        Returns:
+            Dictionary with "analysis", "strengths" and "weaknesses"
+        """
+        system_prompt = """당신은 제조업 브랜드 진단 컨설턴트입니다.
+1~5점 척도 진단 응답을 근거로 한 섹션을 분석합니다.
+
+JSON 형식으로 응답해주세요:
+{
+    "analysis": "섹션 분석 (3~5문장)",
+    "strengths": ["강점1", "강점2"],
+    "weaknesses": ["약점1", "약점2"]
+}
+"""
+        score = f"{section_score:.1f}" if section_score is not None else "미산정"
+        prompt = f"""'{brand_name}' 브랜드 ({category or '카테고리 미지정'})의 '{section}' 진단 섹션입니다.
+섹션 점수: {score} / 100
+
+질문-응답:
+{json.dumps(questions_answers, ensure_ascii=False)}"""
+
+        try:
+            response = await self._create_completion(
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt}
+                ],
+                priority=priority,
+                temperature=0.5,
+                max_tokens=max_tokens
+            )
+
+            result = json.loads(response.choices[0].message.content)
+
+            return {
+                "success": True,
+                "data": result,
+                "tokens_used": response.usage.total_tokens
+            }
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "data": None
+            }
+
+    @cached("gpt", ttl=settings.GPT_CACHE_TTL, exclude=("priority",), cache_if=_is_success)
+    @coalesce("gpt", exclude=("priority",), priority="priority")
+    async def summarize_diagnostic_report(
+        self,
+        brand_name: str,
+        overall_score: Optional[float],
+        sections: Dict[str, Dict],
+        max_tokens: int = 1000,
+        priority: int = GPTPriority.DEFAULT
+    ) -> Dict:
+        """
+        Summarize per-section diagnostic analyses into a report summary
+
+        Args:
+            brand_name: Brand name
+            overall_score: Report overall score (0-100)
+            sections: {section: {"score", "analysis", "strengths", "weaknesses"}}
+            max_tokens: Completion token limit
+            priority: Scheduling priority (GPTPriority)
+
+        Returns:
+            Dictionary with "summary" and "recommendations"
+        """
+        system_prompt = """당신은 제조업 브랜드 진단 컨설턴트입니다.
+섹션별 진단 결과를 종합해 리포트 요약과 개선 제안을 작성합니다.
+
+JSON 형식으로 응답해주세요:
+{
+    "summary": "종합 요약 (4~6문장)",
+    "recommendations": [
+        {"title": "제안 제목", "description": "상세 설명", "priority": "high|medium|low"}
+    ]
+}
+"""
+        score = f"{overall_score:.1f}" if overall_score is not None else "미산정"
+        prompt = f"""'{brand_name}' 브랜드 진단 리포트 (종합 점수: {score} / 100)
+
+섹션별 결과:
+{json.dumps(sections, ensure_ascii=False)}"""
+
+        try:
+            response = await self._create_completion(
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt}
+                ],
+                priority=priority,
+                temperature=0.5,
+                max_tokens=max_tokens
+            )
+
+            result = json.loads(response.choices[0].message.content)
+
+            return {
+                "success": True,
+                "data": result,
+                "tokens_used": response.usage.total_tokens
+            }
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "data": None
+            }
 
 
 # Singleton instance
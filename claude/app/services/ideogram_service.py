@@ -6,6 +6,8 @@ import httpx
 import asyncio
 from typing import Dict, List, Optional
 from app.core.config import settings
+from app.services.registry import services
+from app.services.single_flight import coalesce
 import json
 
 
@@ -18,6 +20,8 @@ class IdeogramService:
     - 프롬프트 자동 생성
     - 스타일 적용
     - 컬러 팔레트 기반 이미지 생성
+    - 배색 생성 (color_palette_engine, 첫 호출 시 로드)
+    - 동일 인자 동시 요청 공유 (single-flight)
     """
 
     def __init__(self):
@@ -26,6 +30,7 @@ class IdeogramService:
         self.base_url = "https://api.ideogram.ai/v1"
         self.timeout = 60.0
 
+    @coalesce("ideogram")
     async def generate_image(
         self,
         prompt: str,
@@ -253,51 +258,27 @@ class IdeogramService:
         Returns:
             hex 색상 코드 리스트
         """
-        # 간단한 색상 팔레트 생성 (실제로는 color-thief나 colorthief 라이브러리 사용)
-        # 여기서는 Mock 데이터 반환
-        if scheme == "complementary":
-            return [
-                base_color,
-                self._adjust_hue(base_color, 180),
-                self._adjust_lightness(base_color, 20),
-                self._adjust_lightness(base_color, -20),
-                self._adjust_saturation(base_color, -30)
-            ][:num_colors]
-
-        elif scheme == "analogous":
-            return [
-                base_color,
-                self._adjust_hue(base_color, 30),
-                self._adjust_hue(base_color, -30),
-                self._adjust_lightness(base_color, 20),
-                self._adjust_lightness(base_color, -20)
-            ][:num_colors]
-
-        elif scheme == "triadic":
-            return [
-                base_color,
-                self._adjust_hue(base_color, 120),
-                self._adjust_hue(base_color, 240),
-                self._adjust_lightness(base_color, 20),
-                self._adjust_lightness(base_color, -20)
-            ][:num_colors]
-
-        return [base_color] * num_colors
+        engine = services.color_palette
+        if scheme not in engine.SCHEMES:
+            return [base_color] * num_colors
+        return engine.rgb_to_hex(engine.generate_schemes([base_color], scheme, num_colors))
 
     def _adjust_hue(self, hex_color: str, degrees: int) -> str:
-        """색조 조정 (간단한 버전)"""
-        # Mock implementation
-        return hex_color
+        """색조 회전 (도)"""
+        return self._adjust(hex_color, hue=degrees)
 
     def _adjust_lightness(self, hex_color: str, percent: int) -> str:
-        """명도 조정 (간단한 버전)"""
-        # Mock implementation
-        return hex_color
+        """명도 조정 (%p)"""
+        return self._adjust(hex_color, lightness=percent)
 
     def _adjust_saturation(self, hex_color: str, percent: int) -> str:
-        """채도 조정 (간단한 버전)"""
-        # Mock implementation
-        return hex_color
+        """채도 조정 (%p)"""
+        return self._adjust(hex_color, saturation=percent)
+
+    @staticmethod
+    def _adjust(hex_color: str, **changes) -> str:
+        engine = services.color_palette
+        return engine.rgb_to_hex(engine.adjust_hsl(engine.hex_to_rgb([hex_color]), **changes))[0]
 
 
 # Singleton instance
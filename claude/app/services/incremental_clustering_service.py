@@ -0,0 +1,309 @@
+"""
+Incremental Keyword Clustering Service (Back2)
+브랜드별 인사이트 이력 전체를 학습하는 온라인 K-Means 키워드 클러스터링
+"""
+import asyncio
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from sklearn.cluster import kmeans_plusplus
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.analytics_executor import analytics_executor
+from app.models.keyword import KeywordClusterModel
+from app.services.keyword_vectorizer import (
+    get_vectorizer,
+    keyword_vector_cache,
+    normalize_keyword,
+    KeywordVectorizer,
+    KeywordVectorCache
+)
+
+
+class OnlineKMeans:
+    """
+    온라인 (mini-batch) K-Means
+
+    MiniBatchKMeans와 같은 누적 평균 갱신 규칙을 사용하되, 상태가
+    중심점 행렬과 클러스터별 샘플 수뿐이라 그대로 DB에 저장/복원할 수 있습니다.
+    입력 벡터는 L2 정규화되어 있다고 가정하고 코사인 유사도로 할당합니다.
+    """
+
+    def __init__(
+        self,
+        n_clusters: int,
+        dim: int,
+        centroids: Optional[np.ndarray] = None,
+        counts: Optional[np.ndarray] = None
+    ):
+        self.n_clusters = n_clusters
+        self.dim = dim
+        self.centroids = centroids if centroids is not None else np.zeros((0, dim), dtype=np.float32)
+        self.counts = counts if counts is not None else np.zeros(0, dtype=np.int64)
+
+    def _normalized_centroids(self) -> np.ndarray:
+        norms = np.linalg.norm(self.centroids, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return self.centroids / norms
+
+    def predict(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        각 벡터의 클러스터 할당 (벡터당 O(k·d), 재학습 없음)
+
+        Args:
+            vectors: (n, dim) 정규화된 벡터
+
+        Returns:
+            (n,) 클러스터 ID 배열
+        """
+        if len(self.centroids) == 0:
+            raise ValueError("Model has no centroids yet")
+        return np.argmax(vectors @ self._normalized_centroids().T, axis=1)
+
+    def partial_fit(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        새 배치로 중심점 갱신
+
+        클러스터가 아직 n_clusters개 미만이면 배치에서 k-means++ 방식으로
+        새 중심점을 뽑아 채운 뒤, 배치 전체로 누적 평균을 갱신합니다.
+
+        Args:
+            vectors: (n, dim) 정규화된 벡터
+
+        Returns:
+            (n,) 배치의 클러스터 할당
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+
+        missing = self.n_clusters - len(self.centroids)
+        if missing > 0:
+            seeds = self._select_seeds(vectors, min(missing, len(vectors)))
+            self.centroids = np.vstack([self.centroids, seeds]).astype(np.float32)
+            self.counts = np.concatenate([self.counts, np.zeros(len(seeds), dtype=np.int64)])
+
+        labels = self.predict(vectors)
+
+        # 누적 평균 갱신: c_j <- c_j + (sum(x) - n_j * c_j) / (count_j + n_j)
+        batch_counts = np.bincount(labels, minlength=len(self.centroids))
+        batch_sums = np.zeros_like(self.centroids)
+        np.add.at(batch_sums, labels, vectors)
+
+        updated = batch_counts > 0
+        self.counts[updated] += batch_counts[updated]
+        self.centroids[updated] += (
+            batch_sums[updated] - batch_counts[updated, None] * self.centroids[updated]
+        ) / self.counts[updated, None]
+
+        return labels
+
+    def _select_seeds(self, vectors: np.ndarray, n_seeds: int) -> np.ndarray:
+        """기존 중심점과 멀리 떨어진 새 중심점 선택"""
+        if len(self.centroids) == 0:
+            seeds, _ = kmeans_plusplus(vectors, n_clusters=n_seeds, random_state=42)
+            return seeds
+
+        # 기존 중심점과의 최대 유사도가 낮은 벡터부터 새 중심점으로 사용
+        similarity = (vectors @ self._normalized_centroids().T).max(axis=1)
+        return vectors[np.argsort(similarity)[:n_seeds]]
+
+
+def partial_fit_task(model: OnlineKMeans, vectors: np.ndarray) -> Tuple[OnlineKMeans, np.ndarray]:
+    """분석 워커 작업: 모델 갱신 후 (모델, 배치 할당) 반환"""
+    labels = model.partial_fit(vectors)
+    return model, labels
+
+
+class IncrementalKeywordClusteringService:
+    """
+    브랜드별 증분 키워드 클러스터링 서비스
+
+    기능:
+    - 인사이트마다 새 키워드를 브랜드 모델에 흡수 (partial fit)
+    - 중심점/샘플 수를 `keyword_cluster_models` 테이블에 저장
+    - 임의 키워드의 클러스터를 O(k)로 조회 (재학습 없음)
+    - 브랜드 전체 키워드 맵을 재계산 없이 반환
+    """
+
+    def __init__(
+        self,
+        n_clusters: int = 8,
+        backend: Optional[str] = None,
+        vector_cache: Optional[KeywordVectorCache] = None
+    ):
+        self.n_clusters = n_clusters
+        self.backend = backend
+        self.vector_cache = vector_cache or keyword_vector_cache
+        self._locks: Dict[int, asyncio.Lock] = {}
+
+    @property
+    def supported(self) -> bool:
+        """설정된 벡터화 백엔드로 증분 클러스터링이 가능한지 (tfidf는 배치마다 벡터 공간이 달라 불가)"""
+        return get_vectorizer(self.backend).cacheable
+
+    def _vectorizer(self) -> KeywordVectorizer:
+        vectorizer = get_vectorizer(self.backend)
+        if not vectorizer.cacheable:
+            raise ValueError(f"Incremental clustering needs a stable vectorizer, got '{vectorizer.name}'")
+        return vectorizer
+
+    async def _get_model_row(
+        self,
+        db: AsyncSession,
+        brand_id: int,
+        for_update: bool = False
+    ) -> Optional[KeywordClusterModel]:
+        query = select(KeywordClusterModel).where(KeywordClusterModel.brand_id == brand_id)
+        if for_update:
+            query = query.with_for_update()
+        result = await db.execute(query)
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    def _to_model(row: KeywordClusterModel) -> OnlineKMeans:
+        centroids = None
+        counts = None
+        if row.centroids:
+            centroids = np.frombuffer(row.centroids, dtype="<f4").reshape(-1, row.dim).copy()
+            counts = np.frombuffer(row.counts, dtype="<i8").copy()
+        return OnlineKMeans(row.n_clusters, row.dim, centroids, counts)
+
+    async def _embed(self, db: AsyncSession, vectorizer: KeywordVectorizer, keywords: List[str]) -> np.ndarray:
+        await self.vector_cache.load(db, vectorizer, keywords)
+        return self.vector_cache.embed(vectorizer, keywords)
+
+    async def absorb(
+        self,
+        db: AsyncSession,
+        brand_id: int,
+        keywords: List[str]
+    ) -> Dict[str, int]:
+        """
+        새 키워드를 브랜드 모델에 흡수하고 저장
+
+        Args:
+            db: 데이터베이스 세션
+            brand_id: 브랜드 ID
+            keywords: 새 인사이트의 키워드 리스트
+
+        Returns:
+            {정규화 키워드: 클러스터 ID} (이번 배치)
+        """
+        normalized = list(dict.fromkeys(normalize_keyword(k) for k in keywords if k and k.strip()))
+        if not normalized:
+            return {}
+
+        lock = self._locks.setdefault(brand_id, asyncio.Lock())
+        async with lock:
+            vectorizer = self._vectorizer()
+            vectors = await self._embed(db, vectorizer, normalized)
+
+            row = await self._get_model_row(db, brand_id, for_update=True)
+            if row is None or row.backend != vectorizer.cache_key or row.dim != vectors.shape[1]:
+                if row is None:
+                    row = KeywordClusterModel(brand_id=brand_id)
+                    db.add(row)
+                # 백엔드나 설정(해시 차원, 임베딩 테이블)이 바뀌면 기존 중심점과 비교할 수 없으므로 새로 시작
+                row.backend = vectorizer.cache_key
+                row.n_clusters = self.n_clusters
+                row.dim = int(vectors.shape[1])
+                row.centroids = None
+                row.counts = None
+                row.n_samples = 0
+                row.keyword_map = {}
+
+            # 중심점 갱신은 분석 워커에서 실행 (이벤트 루프 비차단)
+            model, labels = await analytics_executor.run(
+                partial_fit_task, self._to_model(row), vectors
+            )
+
+            batch_map = {keyword: int(label) for keyword, label in zip(normalized, labels)}
+            row.centroids = model.centroids.astype("<f4").tobytes()
+            row.counts = model.counts.astype("<i8").tobytes()
+            row.n_samples = (row.n_samples or 0) + len(normalized)
+            # JSON 컬럼 변경 감지를 위해 새 dict 할당
+            row.keyword_map = {**(row.keyword_map or {}), **batch_map}
+
+            await self.vector_cache.persist(db)
+            await db.commit()
+
+        return batch_map
+
+    async def assign(
+        self,
+        db: AsyncSession,
+        brand_id: int,
+        keyword: str
+    ) -> Optional[Dict]:
+        """
+        키워드의 클러스터 조회 (알려진 키워드는 맵에서, 새 키워드는 O(k) 할당)
+
+        Args:
+            db: 데이터베이스 세션
+            brand_id: 브랜드 ID
+            keyword: 조회할 키워드
+
+        Returns:
+            {"keyword", "cluster_id", "known"} 또는 모델이 없으면 None
+        """
+        row = await self._get_model_row(db, brand_id)
+        if row is None or not row.centroids:
+            return None
+
+        normalized = normalize_keyword(keyword)
+        known_cluster = (row.keyword_map or {}).get(normalized)
+        if known_cluster is not None:
+            return {"keyword": normalized, "cluster_id": int(known_cluster), "known": True}
+
+        # 모델을 학습한 설정과 현재 벡터화기가 다르면 새 키워드를 할당할 수 없음 (다음 흡수 시 재시작)
+        vectorizer = get_vectorizer(row.backend.split(":", 1)[0])
+        if vectorizer.cache_key != row.backend:
+            return None
+        vector = await self._embed(db, vectorizer, [normalized])
+        cluster_id = int(self._to_model(row).predict(vector)[0])
+        return {"keyword": normalized, "cluster_id": cluster_id, "known": False}
+
+    async def get_keyword_map(
+        self,
+        db: AsyncSession,
+        brand_id: int
+    ) -> Optional[Dict]:
+        """
+        브랜드 전체 키워드 맵 (저장된 할당 그대로, 재계산 없음)
+
+        Args:
+            db: 데이터베이스 세션
+            brand_id: 브랜드 ID
+
+        Returns:
+            클러스터별 키워드 목록 또는 모델이 없으면 None
+        """
+        row = await self._get_model_row(db, brand_id)
+        if row is None:
+            return None
+
+        grouped: Dict[int, List[str]] = {}
+        for keyword, cluster_id in (row.keyword_map or {}).items():
+            grouped.setdefault(int(cluster_id), []).append(keyword)
+
+        counts = np.frombuffer(row.counts, dtype="<i8") if row.counts else np.zeros(0)
+        clusters = [
+            {
+                "cluster_id": cluster_id,
+                "keywords": sorted(keywords),
+                "size": len(keywords),
+                "total_samples": int(counts[cluster_id]) if cluster_id < len(counts) else 0
+            }
+            for cluster_id, keywords in sorted(grouped.items())
+        ]
+
+        return {
+            "brand_id": brand_id,
+            "backend": row.backend,
+            "n_clusters": len(counts),
+            "n_samples": row.n_samples,
+            "clusters": clusters,
+            "updated_at": row.updated_at or row.created_at
+        }
+
+
+# Singleton instance
+incremental_clustering_service = IncrementalKeywordClusteringService()
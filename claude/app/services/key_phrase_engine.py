@@ -0,0 +1,300 @@
+"""
+Key Phrase Engine (Back2)
+인사이트 / 리포트 / 숏폼 스크립트 전체 코퍼스의 IDF를 공유하는 핵심 구문 추출 엔진
+"""
+import argparse
+import asyncio
+import logging
+from typing import Dict, List, Tuple
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import CountVectorizer
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.analytics_executor import analytics_executor
+from app.models.keyword import KeyPhraseDocument, KeyPhraseTerm
+from app.models.insight import BrandInsight, BrandReport
+from app.models.design import ShortformProject
+
+logger = logging.getLogger(__name__)
+
+NGRAM_RANGE = (1, 2)
+
+
+def count_terms_task(texts: List[str], binary: bool = False) -> Tuple[List[str], csr_matrix]:
+    """
+    분석 워커 작업: 문서 배치의 1-gram/2-gram 빈도 행렬
+
+    Returns:
+        (배치 구문 목록, (문서 수, 구문 수) CSR 빈도 행렬)
+    """
+    vectorizer = CountVectorizer(ngram_range=NGRAM_RANGE, binary=binary, lowercase=True)
+    try:
+        counts = vectorizer.fit_transform(texts)
+    except ValueError:
+        # 모든 문서가 비어 있거나 토큰이 없음
+        return [], csr_matrix((len(texts), 0), dtype=np.int64)
+    return vectorizer.get_feature_names_out().tolist(), counts.tocsr()
+
+
+def insight_document(insight: BrandInsight) -> Dict:
+    """인사이트 → 코퍼스 문서"""
+    return {
+        "source": "insight",
+        "source_id": insight.id,
+        "text": "\n".join(filter(None, [insight.prompt, insight.analysis_summary]))
+    }
+
+
+def report_document(report: BrandReport) -> Dict:
+    """브랜드 리포트 → 코퍼스 문서 (AI 요약이 생성된 리포트만, 없으면 빈 문서)"""
+    return {
+        "source": "report",
+        "source_id": report.id,
+        "text": "\n".join(filter(None, [report.report_name, report.ai_summary])) if report.ai_summary else ""
+    }
+
+
+def shortform_document(project: ShortformProject) -> Dict:
+    """숏폼 프로젝트 스크립트 → 코퍼스 문서"""
+    return {
+        "source": "shortform",
+        "source_id": project.id,
+        "text": project.script_text or ""
+    }
+
+
+class KeyPhraseEngine:
+    """
+    코퍼스 기반 핵심 구문 추출 엔진
+
+    문서 빈도(DF)를 `key_phrase_terms`에 누적하고 모든 추출에서 같은 IDF를 사용합니다.
+    추출은 배치 단위로 한 번에 토큰화한 뒤, 문서별 비용이 희소 행 스케일링과
+    top-k 선택뿐이 되도록 벡터화되어 있습니다.
+
+    기능:
+    - 새 문서만 증분 반영 (출처/ID 기준 중복 방지)
+    - 배치 핵심 구문 추출 (sublinear TF × smooth IDF)
+    - 기존 인사이트 / 리포트 / 숏폼 스크립트로 코퍼스 재구성
+    """
+
+    def __init__(self):
+        self._df: Dict[str, int] = {}
+        self.n_docs = 0
+        self._loaded = False
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        """DB의 문서 수가 메모리와 다르면 DF 테이블 다시 로드"""
+        n_docs = await db.scalar(select(func.count()).select_from(KeyPhraseDocument)) or 0
+        if self._loaded and n_docs == self.n_docs:
+            return
+
+        result = await db.execute(select(KeyPhraseTerm.term, KeyPhraseTerm.doc_freq))
+        self._df = {term: doc_freq for term, doc_freq in result.all()}
+        self.n_docs = n_docs
+        self._loaded = True
+
+    async def add_documents(self, db: AsyncSession, documents: List[Dict]) -> int:
+        """
+        새 문서를 코퍼스 DF에 반영
+
+        Args:
+            db: 데이터베이스 세션
+            documents: {"source", "source_id", "text"} 리스트
+
+        Returns:
+            새로 반영된 문서 수
+        """
+        documents = [doc for doc in documents if doc.get("text")]
+        if not documents:
+            return 0
+
+        # 이미 반영된 문서 제외
+        existing = set()
+        for source in {doc["source"] for doc in documents}:
+            ids = [doc["source_id"] for doc in documents if doc["source"] == source]
+            result = await db.execute(
+                select(KeyPhraseDocument.source_id).where(
+                    KeyPhraseDocument.source == source,
+                    KeyPhraseDocument.source_id.in_(ids)
+                )
+            )
+            existing.update((source, source_id) for source_id in result.scalars())
+        new_documents = list({
+            (doc["source"], doc["source_id"]): doc
+            for doc in documents if (doc["source"], doc["source_id"]) not in existing
+        }.values())
+        if not new_documents:
+            return 0
+
+        await self.ensure_loaded(db)
+        terms, presence = await analytics_executor.run(
+            count_terms_task, [doc["text"] for doc in new_documents], True
+        )
+        doc_freq = np.asarray(presence.sum(axis=0)).ravel()
+        increments = {
+            term: int(freq) for term, freq in zip(terms, doc_freq) if freq and len(term) <= 200
+        }
+
+        insert = self._insert(db)
+        rows = [{"term": term, "doc_freq": freq} for term, freq in increments.items()]
+        for start in range(0, len(rows), 1000):
+            stmt = insert(KeyPhraseTerm).values(rows[start:start + 1000])
+            await db.execute(stmt.on_conflict_do_update(
+                index_elements=["term"],
+                set_={"doc_freq": KeyPhraseTerm.doc_freq + stmt.excluded.doc_freq}
+            ))
+        db.add_all([
+            KeyPhraseDocument(source=doc["source"], source_id=doc["source_id"])
+            for doc in new_documents
+        ])
+        await db.commit()
+
+        for term, freq in increments.items():
+            self._df[term] = self._df.get(term, 0) + freq
+        self.n_docs += len(new_documents)
+        return len(new_documents)
+
+    async def add_insight(self, db: AsyncSession, insight: BrandInsight) -> int:
+        """인사이트 1건을 코퍼스에 반영"""
+        return await self.add_documents(db, [insight_document(insight)])
+
+    async def add_report(self, db: AsyncSession, report: BrandReport) -> int:
+        """AI 요약이 생성된 브랜드 리포트 1건을 코퍼스에 반영"""
+        return await self.add_documents(db, [report_document(report)])
+
+    async def add_shortform(self, db: AsyncSession, project: ShortformProject) -> int:
+        """숏폼 프로젝트 스크립트 1건을 코퍼스에 반영"""
+        return await self.add_documents(db, [shortform_document(project)])
+
+    @staticmethod
+    def _insert(db: AsyncSession):
+        dialect = db.bind.dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            raise ValueError(f"Unsupported dialect for key phrase corpus: {dialect}")
+        return insert
+
+    def idf(self, terms: List[str]) -> np.ndarray:
+        """구문별 smooth IDF: log((1 + N) / (1 + df)) + 1"""
+        doc_freq = np.fromiter((self._df.get(term, 0) for term in terms), dtype=np.float64, count=len(terms))
+        return np.log((1 + self.n_docs) / (1 + doc_freq)) + 1
+
+    def score(
+        self,
+        terms: List[str],
+        counts: csr_matrix,
+        top_n: int = 10
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        빈도 행렬 → 문서별 상위 구문
+
+        Args:
+            terms: 행렬 열에 대응하는 구문
+            counts: (문서 수, 구문 수) 빈도 행렬
+            top_n: 문서별 반환 개수
+
+        Returns:
+            문서별 (구문, 점수) 리스트 (점수는 문서 내 L2 정규화)
+        """
+        weights = counts.astype(np.float64).tocsr(copy=True)
+        if weights.nnz:
+            weights.data = (1 + np.log(weights.data)) * self.idf(terms)[weights.indices]
+
+        results = []
+        for row in range(weights.shape[0]):
+            start, end = weights.indptr[row], weights.indptr[row + 1]
+            data = weights.data[start:end]
+            if not len(data):
+                results.append([])
+                continue
+            norm = np.linalg.norm(data)
+            k = min(top_n, len(data))
+            top = np.argpartition(-data, k - 1)[:k]
+            top = top[np.argsort(-data[top])]
+            indices = weights.indices[start:end]
+            results.append([(terms[indices[i]], round(float(data[i] / norm), 4)) for i in top])
+        return results
+
+    async def extract(
+        self,
+        db: AsyncSession,
+        texts: List[str],
+        top_n: int = 10
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        여러 문서의 핵심 구문을 한 번에 추출 (토큰화는 분석 워커에서 실행)
+
+        Args:
+            db: 데이터베이스 세션 (코퍼스 DF 로드용)
+            texts: 문서 리스트
+            top_n: 문서별 반환 개수
+
+        Returns:
+            문서별 (구문, 점수) 리스트
+        """
+        if not texts:
+            return []
+        await self.ensure_loaded(db)
+        terms, counts = await analytics_executor.run(count_terms_task, texts)
+        return await analytics_executor.run_local(self.score, terms, counts, top_n)
+
+    async def rebuild(self, db: AsyncSession, batch_size: int = 500) -> int:
+        """
+        기존 인사이트 / 리포트 / 숏폼 스크립트를 코퍼스에 반영 (이미 반영된 문서는 건너뜀)
+
+        Returns:
+            새로 반영된 문서 수
+        """
+        added = 0
+        sources = [
+            (BrandInsight, insight_document),
+            (BrandReport, report_document),
+            (ShortformProject, shortform_document),
+        ]
+        for model, to_document in sources:
+            last_id = 0
+            while True:
+                result = await db.execute(
+                    select(model).where(model.id > last_id).order_by(model.id).limit(batch_size)
+                )
+                rows = result.scalars().all()
+                if not rows:
+                    break
+                last_id = rows[-1].id
+                added += await self.add_documents(db, [to_document(row) for row in rows])
+        return added
+
+    def get_metrics(self) -> Dict:
+        """코퍼스 크기"""
+        return {"documents": self.n_docs, "terms": len(self._df), "loaded": self._loaded}
+
+
+# Singleton instance
+key_phrase_engine = KeyPhraseEngine()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="핵심 구문 코퍼스 재구성 (인사이트 / 리포트 / 숏폼 스크립트)")
+    parser.add_argument("--batch-size", type=int, default=500, help="한 번에 읽을 원본 행 수")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    async def run() -> int:
+        from app.core.database import AsyncSessionLocal, close_db
+        try:
+            async with AsyncSessionLocal() as db:
+                return await key_phrase_engine.rebuild(db, batch_size=args.batch_size)
+        finally:
+            await close_db()
+
+    added = asyncio.run(run())
+    logger.info(f"Key phrase corpus rebuilt: {added} new documents, {key_phrase_engine.n_docs} total")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,13 +3,45 @@ Keyword Clustering Service (Back2 Day 2)
 키워드 클러스터링 알고리즘 구현 (scipy 사용)
 """
 import numpy as np
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.cluster import KMeans
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.decomposition import TruncatedSVD
 from sklearn.metrics.pairwise import cosine_similarity
-from scipy.cluster.hierarchy import dendrogram, linkage
-from scipy.spatial.distance import pdist
-import json
+from scipy.cluster.hierarchy import fcluster, linkage
+from app.services.keyword_vectorizer import (
+    get_vectorizer,
+    keyword_vector_cache,
+    normalize_keyword,
+    KeywordVectorCache
+)
+from app.services.keyword_index import KeywordSimilarityIndex, keyword_corpus_index
+from app.core.analytics_executor import analytics_executor
+from app.core.config import settings
+import zlib
+
+
+def encode_linkage(linkage_matrix: np.ndarray) -> bytes:
+    """
+    scipy linkage 행렬을 압축 바이트로 인코딩
+
+    (m, 4) float64 행렬을 int32 자식 ID (m, 2) + float32 높이 (m) + int32 크기 (m)로
+    나눠 저장하고 zlib으로 압축합니다 (JSON 대비 수십 배 작음).
+    """
+    children = linkage_matrix[:, :2].astype("<i4")
+    heights = linkage_matrix[:, 2].astype("<f4")
+    counts = linkage_matrix[:, 3].astype("<i4")
+    return zlib.compress(children.tobytes() + heights.tobytes() + counts.tobytes())
+
+
+def decode_linkage(data: bytes, n_leaves: int) -> np.ndarray:
+    """`encode_linkage` 바이트를 scipy linkage 행렬 (n_leaves - 1, 4)로 복원"""
+    m = max(n_leaves - 1, 0)
+    raw = zlib.decompress(data)
+    children = np.frombuffer(raw, dtype="<i4", count=2 * m).reshape(m, 2)
+    heights = np.frombuffer(raw, dtype="<f4", count=m, offset=8 * m)
+    counts = np.frombuffer(raw, dtype="<i4", count=m, offset=12 * m)
+    return np.column_stack([children, heights, counts]).astype(np.float64)
 
 
 class KeywordClusteringService:
@@ -17,16 +49,38 @@ class KeywordClusteringService:
     키워드 클러스터링 서비스
 
     기능:
-    - TF-IDF 기반 키워드 벡터화
-    - K-Means 클러스터링
-    - 계층적 클러스터링 (scipy)
-    - 유사도 기반 키워드 그룹핑
+    - 교체 가능한 키워드 벡터화 (TF-IDF / 문자 n-gram 해싱 / 임베딩 테이블)
+    - 정규화 키워드 단위 벡터 캐시 재사용
+    - K-Means 클러스터링 (dense float32 행렬)
+    - 계층적 클러스터링 (scipy, SVD 축소 + 리프 수 제한, 압축 덴드로그램)
+    - 유사도 인덱스 기반 키워드 검색 (풀 / 플랫폼 코퍼스)
+    - `*_async` 메서드로 분석 워커에서 실행 (이벤트 루프 비차단)
     """
 
-    def __init__(self):
-        """Initialize clustering service"""
-        self.vectorizer = None
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        max_leaves: Optional[int] = None,
+        svd_components: Optional[int] = None
+    ):
+        """
+        Initialize clustering service
+
+        Args:
+            backend: 벡터화 백엔드 ("tfidf", "hashing", "embedding", 기본값: 설정값)
+            max_leaves: 계층적 클러스터링 덴드로그램 최대 리프 수 (기본값: 설정값)
+            svd_components: 계층적 클러스터링 전 TruncatedSVD 차원 (기본값: 설정값)
+        """
+        self.vectorizer = get_vectorizer(backend)
+        self.vector_cache = keyword_vector_cache
+        self.max_leaves = max_leaves or settings.KEYWORD_DENDROGRAM_MAX_LEAVES
+        self.svd_components = svd_components or settings.KEYWORD_SVD_COMPONENTS
         self.vectors = None
+        self.dendrogram = None
+
+    def _embed(self, keywords: List[str]) -> np.ndarray:
+        """키워드 벡터 행렬 (캐시된 키워드는 재계산하지 않음)"""
+        return self.vector_cache.embed(self.vectorizer, keywords)
 
     def cluster_keywords(
         self,
@@ -90,16 +144,8 @@ class KeywordClusteringService:
         Returns:
             클러스터링 결과
         """
-        # TF-IDF 벡터화
-        self.vectorizer = TfidfVectorizer(
-            max_features=100,
-            ngram_range=(1, 2),
-            stop_words=None
-        )
-
-        # 키워드를 문자열로 결합 (TF-IDF는 문장 단위로 분석)
-        keyword_texts = [kw.replace(" ", "_") for kw in keywords]
-        self.vectors = self.vectorizer.fit_transform(keyword_texts)
+        # 키워드 벡터화 (L2 정규화된 dense float32)
+        self.vectors = self._embed(keywords)
 
         # K-Means 클러스터링
         kmeans = KMeans(
@@ -147,12 +193,52 @@ class KeywordClusteringService:
 
         return {
             "method": "kmeans",
+            "vectorizer": self.vectorizer.name,
             "num_clusters": num_clusters,
             "num_keywords": len(keywords),
             "clusters": cluster_info,
             "success": True
         }
 
+    def _reduce_dimensions(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        TruncatedSVD 차원 축소 (희소/밀집 입력 모두 지원, 결과는 L2 정규화)
+
+        키워드 수나 차원이 목표 차원 이하이면 그대로 반환합니다.
+        """
+        n_components = self.svd_components
+        if len(vectors) <= n_components or vectors.shape[1] <= n_components:
+            return vectors
+
+        reduced = TruncatedSVD(n_components=n_components, random_state=42).fit_transform(vectors)
+        norms = np.linalg.norm(reduced, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (reduced / norms).astype(np.float32)
+
+    def _pre_cluster(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        덴드로그램 리프 수 제한을 위한 사전 클러스터링
+
+        Returns:
+            (리프 벡터 (L, d), 키워드별 리프 ID (n,))
+        """
+        if len(vectors) <= self.max_leaves:
+            return vectors, np.arange(len(vectors))
+
+        kmeans = MiniBatchKMeans(
+            n_clusters=self.max_leaves,
+            random_state=42,
+            n_init=3,
+            batch_size=1024
+        )
+        labels = kmeans.fit_predict(vectors)
+
+        # 빈 클러스터를 제외하고 리프 ID를 0부터 다시 매김
+        used = np.unique(labels)
+        remap = np.full(self.max_leaves, -1, dtype=np.int64)
+        remap[used] = np.arange(len(used))
+        return kmeans.cluster_centers_[used].astype(np.float32), remap[labels]
+
     def _hierarchical_clustering(
         self,
         keywords: List[str],
@@ -161,6 +247,10 @@ class KeywordClusteringService:
         """
         계층적 클러스터링 (scipy 사용)
 
+        키워드 수가 `max_leaves`를 넘으면 MiniBatchKMeans로 먼저 리프를 만든 뒤
+        리프에 대해서만 Ward linkage를 계산하므로 메모리는 O(max_leaves²)로 제한됩니다.
+        덴드로그램은 결과 JSON에 넣지 않고 `self.dendrogram`에 압축 형식으로 남깁니다.
+
         Args:
             keywords: 키워드 리스트
             num_clusters: 클러스터 개수
@@ -168,24 +258,36 @@ class KeywordClusteringService:
         Returns:
             클러스터링 결과
         """
-        # TF-IDF 벡터화
-        self.vectorizer = TfidfVectorizer(
-            max_features=100,
-            ngram_range=(1, 2)
-        )
+        # 키워드 벡터화 (L2 정규화된 dense float32) 및 차원 축소
+        self.vectors = self._embed(keywords)
+        reduced = self._reduce_dimensions(self.vectors)
 
-        keyword_texts = [kw.replace(" ", "_") for kw in keywords]
-        self.vectors = self.vectorizer.fit_transform(keyword_texts).toarray()
+        # 리프 구성 (키워드 수가 많으면 사전 클러스터링)
+        leaves, leaf_labels = self._pre_cluster(reduced)
+        leaf_sizes = np.bincount(leaf_labels, minlength=len(leaves))
 
-        # 거리 행렬 계산
-        distances = pdist(self.vectors, metric='cosine')
-
-        # 계층적 클러스터링 (Ward linkage)
-        linkage_matrix = linkage(distances, method='ward')
+        # 정규화 벡터의 유클리드 거리 기반 Ward linkage (코사인 거리와 단조 관계)
+        linkage_matrix = linkage(leaves, method='ward')
 
         # 클러스터 할당 (덴드로그램 기반)
-        from scipy.cluster.hierarchy import fcluster
-        cluster_labels = fcluster(linkage_matrix, num_clusters, criterion='maxclust')
+        leaf_clusters = fcluster(linkage_matrix, num_clusters, criterion='maxclust')
+        cluster_labels = leaf_clusters[leaf_labels]
+
+        # 리프 대표 키워드 (리프 중심에 가장 가까운 키워드)
+        leaf_similarity = np.einsum("ij,ij->i", reduced, leaves[leaf_labels])
+        leaf_representatives = {}
+        for idx in np.argsort(-leaf_similarity):
+            leaf_representatives.setdefault(int(leaf_labels[idx]), keywords[idx])
+
+        self.dendrogram = {
+            "method": "ward",
+            "num_keywords": len(keywords),
+            "leaves": [
+                {"label": leaf_representatives[leaf], "size": int(leaf_sizes[leaf])}
+                for leaf in range(len(leaves))
+            ],
+            "merges": encode_linkage(linkage_matrix)
+        }
 
         # 클러스터별로 키워드 그룹화
         clusters = {}
@@ -198,7 +300,7 @@ class KeywordClusteringService:
         cluster_info = []
         for cluster_id, cluster_keywords in clusters.items():
             # 클러스터 내 키워드 벡터들
-            indices = [i for i, label in enumerate(cluster_labels) if label == cluster_id]
+            indices = np.flatnonzero(cluster_labels == cluster_id)
             cluster_vectors = self.vectors[indices]
 
             # 클러스터 중심 계산
@@ -226,10 +328,11 @@ class KeywordClusteringService:
 
         return {
             "method": "hierarchical",
+            "vectorizer": self.vectorizer.name,
             "num_clusters": num_clusters,
             "num_keywords": len(keywords),
+            "num_leaves": len(leaves),
             "clusters": cluster_info,
-            "linkage_matrix": linkage_matrix.tolist(),  # 덴드로그램 데이터
             "success": True
         }
 
@@ -242,6 +345,9 @@ class KeywordClusteringService:
         """
         타겟 키워드와 유사한 키워드 찾기
 
+        키워드 풀 벡터는 캐시에서 재사용하고 (재학습 없음), 유사도 인덱스로
+        top-N만 선택합니다.
+
         Args:
             target_keyword: 기준 키워드
             keyword_pool: 검색할 키워드 풀
@@ -250,30 +356,52 @@ class KeywordClusteringService:
         Returns:
             (키워드, 유사도) 튜플 리스트
         """
-        if target_keyword not in keyword_pool:
-            keyword_pool = [target_keyword] + keyword_pool
+        pool = list(dict.fromkeys([target_keyword] + keyword_pool))
+        vectors = self._embed(pool)
 
-        # TF-IDF 벡터화
-        vectorizer = TfidfVectorizer()
-        vectors = vectorizer.fit_transform(keyword_pool).toarray()
+        index = KeywordSimilarityIndex(vectors.shape[1])
+        index.add(pool, vectors)
+        return index.query(vectors[:1], top_n=top_n, exclude=[target_keyword])[0]
 
-        # 타겟 키워드 벡터
-        target_idx = keyword_pool.index(target_keyword)
-        target_vector = vectors[target_idx].reshape(1, -1)
+    def index_keywords(self, keywords: List[str]) -> int:
+        """
+        키워드를 플랫폼 코퍼스 유사도 인덱스에 추가
 
-        # 코사인 유사도 계산
-        similarities = cosine_similarity(vectors, target_vector).flatten()
+        Args:
+            keywords: 키워드 리스트
 
-        # 유사도가 높은 순으로 정렬 (자기 자신 제외)
-        similar_indices = np.argsort(similarities)[::-1]
-        similar_indices = [idx for idx in similar_indices if idx != target_idx]
+        Returns:
+            새로 추가된 키워드 수
+        """
+        normalized = list(dict.fromkeys(normalize_keyword(k) for k in keywords if k and k.strip()))
+        if not normalized:
+            return 0
+        vectors = self._embed(normalized)
+        index = keyword_corpus_index.get(self.vectorizer.cache_key, vectors.shape[1])
+        return index.add(normalized, vectors)
+
+    def find_similar_in_corpus(
+        self,
+        keywords: List[str],
+        top_n: int = 5
+    ) -> Dict[str, List[Tuple[str, float]]]:
+        """
+        코퍼스 인덱스에서 여러 키워드의 유사 키워드를 한 번에 검색
 
-        # 상위 N개 반환
-        results = []
-        for idx in similar_indices[:top_n]:
-            results.append((keyword_pool[idx], float(similarities[idx])))
+        Args:
+            keywords: 기준 키워드 리스트
+            top_n: 키워드별 반환할 상위 N개
 
-        return results
+        Returns:
+            {정규화 키워드: (키워드, 유사도) 튜플 리스트}
+        """
+        normalized = list(dict.fromkeys(normalize_keyword(k) for k in keywords if k and k.strip()))
+        if not normalized:
+            return {}
+        vectors = self._embed(normalized)
+        index = keyword_corpus_index.get(self.vectorizer.cache_key, vectors.shape[1])
+        results = index.query(vectors, top_n=top_n, exclude=normalized)
+        return dict(zip(normalized, results))
 
     def extract_key_phrases(
         self,
@@ -283,6 +411,9 @@ class KeywordClusteringService:
         """
         텍스트에서 주요 구문 추출 (TF-IDF 기반)
 
+        단일 텍스트 기준이라 IDF가 의미 없습니다. 코퍼스 IDF를 쓰는 배치 추출은
+        `key_phrase_engine.extract`를 사용하세요.
+
         Args:
             text: 분석할 텍스트
             top_n: 반환할 상위 N개
@@ -313,6 +444,111 @@ class KeywordClusteringService:
 
         return results
 
+    def _options(self) -> Dict:
+        """워커 프로세스에서 같은 설정의 서비스를 만들기 위한 생성자 인자"""
+        return {
+            "backend": self.vectorizer.name,
+            "max_leaves": self.max_leaves,
+            "svd_components": self.svd_components
+        }
+
+    def _snapshot(self, keywords: List[str]) -> Dict[str, np.ndarray]:
+        """워커로 전달할 캐시 벡터 (워커는 캐시 미스만 벡터화)"""
+        normalized = [normalize_keyword(keyword) for keyword in keywords]
+        return self.vector_cache.snapshot(self.vectorizer.cache_key, normalized)
+
+    async def cluster_keywords_async(
+        self,
+        keywords: List[str],
+        num_clusters: int = 5,
+        method: str = "kmeans"
+    ) -> Dict[str, any]:
+        """
+        `cluster_keywords`를 분석 워커 프로세스에서 실행
+
+        워커가 새로 계산한 벡터는 이 프로세스의 캐시에 병합되어 다음 persist에 저장됩니다.
+        """
+        result, self.dendrogram, vectors = await analytics_executor.run(
+            cluster_keywords_task, self._options(), keywords, num_clusters, method,
+            self._snapshot(keywords)
+        )
+        self.vector_cache.update(self.vectorizer.cache_key, vectors)
+        return result
+
+    async def find_similar_keywords_async(
+        self,
+        target_keyword: str,
+        keyword_pool: List[str],
+        top_n: int = 5
+    ) -> List[Tuple[str, float]]:
+        """`find_similar_keywords`를 분석 워커 프로세스에서 실행"""
+        results, vectors = await analytics_executor.run(
+            find_similar_keywords_task, self._options(), target_keyword, keyword_pool, top_n,
+            self._snapshot([target_keyword] + keyword_pool)
+        )
+        self.vector_cache.update(self.vectorizer.cache_key, vectors)
+        return results
+
+    async def extract_key_phrases_async(self, text: str, top_n: int = 10) -> List[Tuple[str, float]]:
+        """`extract_key_phrases`를 분석 워커 프로세스에서 실행"""
+        return await analytics_executor.run(extract_key_phrases_task, self._options(), text, top_n)
+
+    async def index_keywords_async(self, keywords: List[str]) -> int:
+        """`index_keywords`를 분석 스레드에서 실행 (코퍼스 인덱스는 이 프로세스 상태)"""
+        return await analytics_executor.run_local(self.index_keywords, keywords)
+
+    async def find_similar_in_corpus_async(
+        self,
+        keywords: List[str],
+        top_n: int = 5
+    ) -> Dict[str, List[Tuple[str, float]]]:
+        """`find_similar_in_corpus`를 분석 스레드에서 실행"""
+        return await analytics_executor.run_local(self.find_similar_in_corpus, keywords, top_n)
+
+
+# ========================================
+# Analytics worker tasks (process pool)
+# ========================================
+
+def _worker_service(options: Dict, cached_vectors: Optional[Dict[str, np.ndarray]] = None) -> KeywordClusteringService:
+    """워커 프로세스용 서비스 (전달받은 캐시 벡터만 가진 독립 캐시 사용)"""
+    service = KeywordClusteringService(**options)
+    service.vector_cache = KeywordVectorCache()
+    if cached_vectors:
+        service.vector_cache.update(service.vectorizer.cache_key, cached_vectors, dirty=False)
+    return service
+
+
+def cluster_keywords_task(
+    options: Dict,
+    keywords: List[str],
+    num_clusters: int,
+    method: str,
+    cached_vectors: Dict[str, np.ndarray]
+) -> Tuple[Dict, Optional[Dict], Dict[str, np.ndarray]]:
+    """클러스터링 결과, 덴드로그램, 새로 계산한 벡터 반환"""
+    service = _worker_service(options, cached_vectors)
+    result = service.cluster_keywords(keywords, num_clusters, method)
+    return result, service.dendrogram, service.vector_cache.pending(service.vectorizer.cache_key)
+
+
+def find_similar_keywords_task(
+    options: Dict,
+    target_keyword: str,
+    keyword_pool: List[str],
+    top_n: int,
+    cached_vectors: Dict[str, np.ndarray]
+) -> Tuple[List[Tuple[str, float]], Dict[str, np.ndarray]]:
+    """유사 키워드와 새로 계산한 벡터 반환"""
+    service = _worker_service(options, cached_vectors)
+    results = service.find_similar_keywords(target_keyword, keyword_pool, top_n)
+    return results, service.vector_cache.pending(service.vectorizer.cache_key)
+
+
+def extract_key_phrases_task(options: Dict, text: str, top_n: int) -> List[Tuple[str, float]]:
+    """주요 구문 추출"""
+    return _worker_service(options).extract_key_phrases(text, top_n)
+
 
 # Singleton instance
 keyword_clustering_service = KeywordClusteringService()
@@ -0,0 +1,355 @@
+"""
+Keyword Similarity Index (Back2)
+키워드 유사도 검색 인덱스 (소규모: NumPy 전수 비교 / 대규모: 랜덤 프로젝션 LSH)
+"""
+import logging
+import os
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class KeywordSimilarityIndex:
+    """
+    키워드 코사인 유사도 인덱스
+
+    벡터는 L2 정규화되어 있다고 가정하므로 내적이 곧 코사인 유사도입니다.
+    키워드 수가 `lsh_threshold` 미만이면 전수 비교(행렬곱 + argpartition)를,
+    이상이면 랜덤 하이퍼플레인 LSH로 후보를 추린 뒤 정확한 유사도로 재정렬합니다.
+
+    기능:
+    - 증분 추가/삭제 (삭제된 슬롯은 재사용)
+    - 여러 키워드를 한 번에 조회하는 배치 top-k 검색
+    - 파일 저장/로드 (np.savez)
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        lsh_threshold: int = 20000,
+        n_tables: int = 10,
+        n_bits: int = 10,
+        seed: int = 42
+    ):
+        self.dim = dim
+        self.lsh_threshold = lsh_threshold
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+
+        rng = np.random.default_rng(seed)
+        self._planes = rng.standard_normal((dim, n_tables, n_bits)).astype(np.float32)
+        self._bit_weights = (1 << np.arange(n_bits, dtype=np.int64))
+
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._keywords: List[Optional[str]] = []
+        self._slots: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._codes: Optional[np.ndarray] = None  # (capacity, n_tables) 버킷 코드
+        self._buckets: Optional[List[Dict[int, Set[int]]]] = None
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, keyword: str) -> bool:
+        return keyword in self._slots
+
+    @property
+    def uses_lsh(self) -> bool:
+        return self._buckets is not None
+
+    def _hash(self, vectors: np.ndarray) -> np.ndarray:
+        """(n, dim) 벡터 → (n, n_tables) 버킷 코드"""
+        projections = vectors @ self._planes.reshape(self.dim, -1)
+        bits = projections.reshape(len(vectors), self.n_tables, self.n_bits) > 0
+        return bits.astype(np.int64) @ self._bit_weights
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self._vectors)
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2, 1024)
+        vectors = np.zeros((new_capacity, self.dim), dtype=np.float32)
+        vectors[:capacity] = self._vectors
+        alive = np.zeros(new_capacity, dtype=bool)
+        alive[:capacity] = self._alive
+        self._vectors, self._alive = vectors, alive
+        self._keywords.extend([None] * (new_capacity - capacity))
+        if self._codes is not None:
+            codes = np.zeros((new_capacity, self.n_tables), dtype=np.int64)
+            codes[:capacity] = self._codes
+            self._codes = codes
+
+    def _build_lsh(self) -> None:
+        """전체 벡터로 LSH 버킷 구성"""
+        self._codes = np.zeros((len(self._vectors), self.n_tables), dtype=np.int64)
+        self._buckets = [dict() for _ in range(self.n_tables)]
+        slots = np.flatnonzero(self._alive)
+        if len(slots):
+            self._codes[slots] = self._hash(self._vectors[slots])
+            self._bucket_insert(slots)
+
+    def _bucket_insert(self, slots: np.ndarray) -> None:
+        slots = np.asarray(slots, dtype=np.int64)
+        for table in range(self.n_tables):
+            codes = self._codes[slots, table]
+            order = np.argsort(codes, kind="stable")
+            unique, starts = np.unique(codes[order], return_index=True)
+            buckets = self._buckets[table]
+            for code, group in zip(unique.tolist(), np.split(slots[order], starts[1:])):
+                buckets.setdefault(code, set()).update(group.tolist())
+
+    def _bucket_remove(self, slot: int) -> None:
+        for table, code in enumerate(self._codes[slot]):
+            bucket = self._buckets[table].get(int(code))
+            if bucket is not None:
+                bucket.discard(slot)
+                if not bucket:
+                    del self._buckets[table][int(code)]
+
+    def add(self, keywords: List[str], vectors: np.ndarray) -> int:
+        """
+        키워드 벡터 추가 (이미 있는 키워드는 벡터 갱신)
+
+        Args:
+            keywords: 키워드 리스트
+            vectors: (len(keywords), dim) 정규화된 벡터
+
+        Returns:
+            새로 추가된 키워드 수
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of shape (n, {self.dim}), got {vectors.shape}")
+
+        slots = []
+        added = 0
+        for keyword in keywords:
+            slot = self._slots.get(keyword)
+            if slot is None:
+                if self._free:
+                    slot = self._free.pop()
+                else:
+                    slot = len(self._slots) + len(self._free)
+                    self._grow(slot + 1)
+                self._slots[keyword] = slot
+                self._keywords[slot] = keyword
+                added += 1
+            elif self._buckets is not None:
+                self._bucket_remove(slot)
+            slots.append(slot)
+
+        slots = np.asarray(slots, dtype=np.int64)
+        self._vectors[slots] = vectors
+        self._alive[slots] = True
+
+        if self._buckets is not None:
+            self._codes[slots] = self._hash(vectors)
+            self._bucket_insert(slots)
+        elif len(self._slots) >= self.lsh_threshold:
+            self._build_lsh()
+
+        return added
+
+    def remove(self, keywords: Iterable[str]) -> int:
+        """
+        키워드 삭제 (슬롯은 다음 추가 시 재사용)
+
+        Returns:
+            삭제된 키워드 수
+        """
+        removed = 0
+        for keyword in keywords:
+            slot = self._slots.pop(keyword, None)
+            if slot is None:
+                continue
+            if self._buckets is not None:
+                self._bucket_remove(slot)
+            self._alive[slot] = False
+            self._keywords[slot] = None
+            self._free.append(slot)
+            removed += 1
+        return removed
+
+    def get_vector(self, keyword: str) -> Optional[np.ndarray]:
+        """저장된 키워드 벡터 (없으면 None)"""
+        slot = self._slots.get(keyword)
+        return None if slot is None else self._vectors[slot]
+
+    def query(
+        self,
+        vectors: np.ndarray,
+        top_n: int = 5,
+        exclude: Optional[List[Optional[str]]] = None
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        배치 top-k 유사 키워드 검색
+
+        Args:
+            vectors: (n, dim) 질의 벡터
+            top_n: 질의별 반환 개수
+            exclude: 질의별로 결과에서 제외할 키워드 (예: 질의 키워드 자신)
+
+        Returns:
+            질의별 (키워드, 유사도) 리스트
+        """
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        exclude = exclude or [None] * len(vectors)
+        if not self._slots:
+            return [[] for _ in range(len(vectors))]
+
+        if self._buckets is None:
+            return self._query_brute(vectors, top_n, exclude)
+        return self._query_lsh(vectors, top_n, exclude)
+
+    def _top_k(
+        self,
+        scores: np.ndarray,
+        slots: np.ndarray,
+        top_n: int,
+        exclude: Optional[str]
+    ) -> List[Tuple[str, float]]:
+        excluded_slot = self._slots.get(exclude) if exclude is not None else None
+        if excluded_slot is not None:
+            scores = np.where(slots == excluded_slot, -np.inf, scores)
+
+        k = min(top_n, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            (self._keywords[slots[i]], float(scores[i]))
+            for i in top if np.isfinite(scores[i])
+        ]
+
+    def _query_brute(self, vectors, top_n, exclude):
+        used = len(self._slots) + len(self._free)
+        slots = np.arange(used)
+        scores = vectors @ self._vectors[:used].T
+        scores[:, ~self._alive[:used]] = -np.inf
+        return [
+            self._top_k(scores[row], slots, top_n, exclude[row])
+            for row in range(len(vectors))
+        ]
+
+    def _query_lsh(self, vectors, top_n, exclude):
+        codes = self._hash(vectors)
+        results = []
+        for row in range(len(vectors)):
+            candidates: Set[int] = set()
+            for table in range(self.n_tables):
+                candidates |= self._buckets[table].get(int(codes[row, table]), set())
+
+            # 후보가 부족하면 해밍 거리 1 버킷까지 탐색 (multi-probe)
+            if len(candidates) <= top_n:
+                for table in range(self.n_tables):
+                    for bit in range(self.n_bits):
+                        probe = int(codes[row, table]) ^ (1 << bit)
+                        candidates |= self._buckets[table].get(probe, set())
+
+            if not candidates:
+                results.append([])
+                continue
+
+            slots = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+            scores = self._vectors[slots] @ vectors[row]
+            results.append(self._top_k(scores, slots, top_n, exclude[row]))
+        return results
+
+    def save(self, path: str) -> None:
+        """인덱스를 파일로 저장 (LSH 버킷은 로드 시 재구성)"""
+        slots = np.flatnonzero(self._alive)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                keywords=np.array([self._keywords[s] for s in slots], dtype=str),
+                vectors=self._vectors[slots],
+                planes=self._planes,
+                config=np.array([self.lsh_threshold, self.n_tables, self.n_bits])
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "KeywordSimilarityIndex":
+        """저장된 인덱스 로드"""
+        data = np.load(path, allow_pickle=False)
+        lsh_threshold, n_tables, n_bits = (int(v) for v in data["config"])
+        index = cls(data["vectors"].shape[1], lsh_threshold, n_tables, n_bits)
+        index._planes = data["planes"]
+        if len(data["keywords"]):
+            index.add([str(k) for k in data["keywords"]], data["vectors"])
+        return index
+
+    def get_metrics(self) -> Dict:
+        """인덱스 상태"""
+        return {
+            "size": len(self._slots),
+            "capacity": len(self._vectors),
+            "free_slots": len(self._free),
+            "mode": "lsh" if self.uses_lsh else "brute_force",
+        }
+
+
+class KeywordCorpusIndex:
+    """
+    플랫폼 전체 키워드 코퍼스 인덱스 (벡터화 설정별)
+
+    인사이트에서 생성된 정규화 키워드를 누적하며, `KEYWORD_INDEX_DIR`이
+    설정되어 있으면 `<dir>/<벡터화기 cache_key>.npz`에서 로드하고 종료 시 저장합니다.
+    같은 백엔드라도 설정(해시 차원, 임베딩 테이블)이 바뀌면 다른 인덱스를 사용합니다.
+    """
+
+    def __init__(self, directory: Optional[str] = None, lsh_threshold: int = 20000):
+        self.directory = directory
+        self.lsh_threshold = lsh_threshold
+        self._indexes: Dict[str, KeywordSimilarityIndex] = {}
+
+    def _path(self, backend: str) -> Optional[str]:
+        if not self.directory:
+            return None
+        return os.path.join(self.directory, f"{backend.replace(':', '_')}.npz")
+
+    def get(self, backend: str, dim: int) -> KeywordSimilarityIndex:
+        """벡터화기 cache_key별 인덱스 조회 (없으면 파일에서 로드하거나 새로 생성)"""
+        index = self._indexes.get(backend)
+        if index is not None and index.dim == dim:
+            return index
+
+        path = self._path(backend)
+        index = None
+        if path and os.path.exists(path):
+            try:
+                index = KeywordSimilarityIndex.load(path)
+            except Exception as e:
+                logger.warning(f"Keyword index load failed, starting empty ({path}): {e}")
+        if index is None or index.dim != dim:
+            index = KeywordSimilarityIndex(dim, lsh_threshold=self.lsh_threshold)
+
+        self._indexes[backend] = index
+        return index
+
+    def save(self) -> int:
+        """로드된 인덱스를 모두 파일로 저장"""
+        saved = 0
+        for backend, index in self._indexes.items():
+            path = self._path(backend)
+            if path:
+                index.save(path)
+                saved += 1
+        return saved
+
+    def get_metrics(self) -> Dict:
+        """백엔드별 인덱스 상태"""
+        return {backend: index.get_metrics() for backend, index in self._indexes.items()}
+
+
+# Singleton instance
+keyword_corpus_index = KeywordCorpusIndex(
+    directory=settings.KEYWORD_INDEX_DIR,
+    lsh_threshold=settings.KEYWORD_INDEX_LSH_THRESHOLD
+)
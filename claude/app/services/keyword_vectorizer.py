@@ -0,0 +1,410 @@
+"""
+Keyword Vectorizer Service (Back2)
+키워드 벡터화 백엔드 (TF-IDF / 문자 n-gram 해싱 / 사전 계산 임베딩) 및 벡터 캐시
+"""
+import hashlib
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.models.keyword import KeywordVector
+
+
+def normalize_keyword(keyword: str) -> str:
+    """
+    키워드 정규화 (캐시 key)
+
+    NFKC 정규화, 소문자 변환, 공백 정리를 적용합니다.
+
+    Args:
+        keyword: 원본 키워드
+
+    Returns:
+        정규화된 키워드
+    """
+    keyword = unicodedata.normalize("NFKC", keyword or "")
+    return re.sub(r"\s+", " ", keyword).strip().lower()
+
+
+def _l2_normalize(matrix: np.ndarray) -> np.ndarray:
+    """행 단위 L2 정규화 (영벡터는 그대로 유지)"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32, copy=False)
+
+
+class KeywordVectorizer:
+    """
+    키워드 벡터화 백엔드 기본 클래스
+
+    모든 백엔드는 L2 정규화된 dense float32 행렬을 반환합니다.
+    `cacheable`이 True인 백엔드는 키워드 하나의 벡터가 다른 키워드에
+    의존하지 않으므로 벡터 캐시에 저장할 수 있습니다.
+    """
+
+    name: str = "base"
+    cacheable: bool = False
+
+    @property
+    def dim(self) -> Optional[int]:
+        """벡터 차원 (입력에 따라 달라지면 None)"""
+        return None
+
+    @property
+    def cache_key(self) -> str:
+        """벡터 캐시 / DB 저장 key (설정이 바뀌면 달라져 이전 벡터를 재사용하지 않음)"""
+        return self.name
+
+    def transform(self, keywords: List[str]) -> np.ndarray:
+        """
+        키워드 리스트를 벡터 행렬로 변환
+
+        Args:
+            keywords: 정규화된 키워드 리스트
+
+        Returns:
+            (len(keywords), dim) float32 행렬
+        """
+        raise NotImplementedError
+
+
+class TfidfKeywordVectorizer(KeywordVectorizer):
+    """
+    TF-IDF 백엔드 (호출마다 입력 키워드로 fit)
+
+    IDF가 입력 집합에 의존하므로 캐시하지 않습니다.
+    """
+
+    name = "tfidf"
+    cacheable = False
+
+    def __init__(self, max_features: int = 500):
+        self.max_features = max_features
+
+    def transform(self, keywords: List[str]) -> np.ndarray:
+        vectorizer = TfidfVectorizer(
+            analyzer="char_wb",
+            ngram_range=(2, 3),
+            max_features=self.max_features
+        )
+        vectors = vectorizer.fit_transform(keywords)
+        return vectors.toarray().astype(np.float32)
+
+
+class HashingKeywordVectorizer(KeywordVectorizer):
+    """
+    문자 n-gram 해싱 백엔드
+
+    학습이 필요 없고 키워드별 벡터가 고정되어 캐시 가능합니다.
+    공백 없는 한국어 복합어도 음절 n-gram으로 유사도를 잡아냅니다.
+    """
+
+    name = "hashing"
+    cacheable = True
+
+    def __init__(self, n_features: int = 512, ngram_range: Tuple[int, int] = (2, 3)):
+        self._vectorizer = HashingVectorizer(
+            analyzer="char_wb",
+            ngram_range=ngram_range,
+            n_features=n_features,
+            alternate_sign=False,
+            norm="l2"
+        )
+        self.n_features = n_features
+        self.ngram_range = ngram_range
+
+    @property
+    def dim(self) -> int:
+        return self.n_features
+
+    @property
+    def cache_key(self) -> str:
+        return f"{self.name}:{self.n_features}:{self.ngram_range[0]}-{self.ngram_range[1]}"
+
+    def transform(self, keywords: List[str]) -> np.ndarray:
+        return self._vectorizer.transform(keywords).toarray().astype(np.float32)
+
+
+class EmbeddingTableVectorizer(KeywordVectorizer):
+    """
+    사전 계산 임베딩 테이블 백엔드
+
+    `.npz` 파일(`words`: 단어 배열, `vectors`: float32 행렬)을 로드합니다.
+    키워드 전체가 테이블에 없으면 공백 단위 토큰 벡터의 평균을 사용하고,
+    모든 토큰이 OOV이면 영벡터를 반환합니다.
+    """
+
+    name = "embedding"
+    cacheable = True
+
+    def __init__(self, path: str):
+        table = np.load(path, allow_pickle=False)
+        words = [normalize_keyword(str(word)) for word in table["words"]]
+        self._vectors = _l2_normalize(np.asarray(table["vectors"], dtype=np.float32))
+        self._index: Dict[str, int] = {word: idx for idx, word in enumerate(words)}
+        # 같은 경로라도 테이블이 바뀌면 다른 key
+        digest = hashlib.sha256("\n".join(words).encode("utf-8"))
+        digest.update(self._vectors.tobytes())
+        self._fingerprint = digest.hexdigest()[:16]
+
+    @property
+    def dim(self) -> int:
+        return self._vectors.shape[1]
+
+    @property
+    def cache_key(self) -> str:
+        return f"{self.name}:{self._fingerprint}"
+
+    def transform(self, keywords: List[str]) -> np.ndarray:
+        result = np.zeros((len(keywords), self.dim), dtype=np.float32)
+        for row, keyword in enumerate(keywords):
+            idx = self._index.get(keyword)
+            if idx is not None:
+                result[row] = self._vectors[idx]
+                continue
+            token_ids = [self._index[t] for t in keyword.split(" ") if t in self._index]
+            if token_ids:
+                result[row] = self._vectors[token_ids].mean(axis=0)
+        return _l2_normalize(result)
+
+
+_vectorizers: Dict[str, KeywordVectorizer] = {}
+
+
+def get_vectorizer(backend: Optional[str] = None) -> KeywordVectorizer:
+    """
+    백엔드 이름으로 벡터화기 반환 (프로세스 내 재사용)
+
+    Args:
+        backend: "tfidf", "hashing", "embedding" (기본값: 설정값)
+
+    Returns:
+        KeywordVectorizer 인스턴스
+    """
+    backend = backend or settings.KEYWORD_VECTORIZER_BACKEND
+    if backend not in _vectorizers:
+        if backend == "tfidf":
+            _vectorizers[backend] = TfidfKeywordVectorizer()
+        elif backend == "hashing":
+            _vectorizers[backend] = HashingKeywordVectorizer()
+        elif backend == "embedding":
+            if not settings.KEYWORD_EMBEDDING_PATH:
+                raise ValueError("KEYWORD_EMBEDDING_PATH is required for the embedding backend")
+            _vectorizers[backend] = EmbeddingTableVectorizer(settings.KEYWORD_EMBEDDING_PATH)
+        else:
+            raise ValueError(f"Unknown vectorizer backend: {backend}")
+    return _vectorizers[backend]
+
+
+class KeywordVectorCache:
+    """
+    키워드 벡터 캐시
+
+    프로세스 내 LRU 캐시와 `keyword_vectors` 테이블을 함께 사용합니다.
+    한 번 임베딩한 키워드는 다시 계산하지 않습니다.
+
+    기능:
+    - (백엔드 설정 key, 정규화 키워드) 단위 벡터 조회/저장
+    - DB에서 필요한 키워드만 미리 로드 (load, 현재 차원과 같은 벡터만)
+    - 새로 계산된 벡터만 DB에 저장 (persist, 저장 대기 벡터 수 제한)
+
+    이벤트 루프(load / persist)와 분석 스레드(run_local 작업의 embed)가 함께 사용하므로
+    내부 딕셔너리 접근은 모두 잠금으로 보호합니다. 벡터화 계산은 잠금 밖에서 실행합니다.
+    """
+
+    def __init__(self, max_entries: int = 100_000, max_pending: int = 20_000):
+        self.max_entries = max_entries
+        self.max_pending = max_pending
+        self._entries: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._dirty: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.dropped = 0
+        self._lock = threading.RLock()
+
+    def get(self, backend: str, keyword: str) -> Optional[np.ndarray]:
+        """캐시된 벡터 반환 (없으면 None)"""
+        key = (backend, keyword)
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put(self, backend: str, keyword: str, vector: np.ndarray, dirty: bool = True) -> None:
+        """벡터 저장 (dirty=True면 다음 persist에서 DB에 기록)"""
+        key = (backend, keyword)
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            if dirty:
+                self._dirty[key] = vector
+                # persist가 오래 호출되지 않으면 가장 오래된 벡터부터 버림 (다시 계산 가능)
+                while len(self._dirty) > self.max_pending:
+                    self._dirty.popitem(last=False)
+                    self.dropped += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def snapshot(self, backend: str, keywords: List[str]) -> Dict[str, np.ndarray]:
+        """주어진 키워드 중 캐시에 있는 벡터들 (다른 프로세스로 전달용)"""
+        result = {}
+        with self._lock:
+            for keyword in keywords:
+                vector = self._entries.get((backend, keyword))
+                if vector is not None:
+                    result[keyword] = vector
+        return result
+
+    def update(self, backend: str, vectors: Dict[str, np.ndarray], dirty: bool = True) -> None:
+        """여러 벡터를 한 번에 저장"""
+        with self._lock:
+            for keyword, vector in vectors.items():
+                self.put(backend, keyword, vector, dirty=dirty)
+
+    def pending(self, backend: str) -> Dict[str, np.ndarray]:
+        """아직 DB에 저장되지 않은 벡터들 (다른 프로세스에서 계산한 벡터 회수용)"""
+        with self._lock:
+            return {keyword: vector for (name, keyword), vector in self._dirty.items() if name == backend}
+
+    def embed(self, vectorizer: KeywordVectorizer, keywords: List[str]) -> np.ndarray:
+        """
+        키워드 벡터 행렬 생성 (캐시 미스만 벡터화)
+
+        Args:
+            vectorizer: 벡터화 백엔드
+            keywords: 원본 키워드 리스트
+
+        Returns:
+            (len(keywords), dim) float32 행렬
+        """
+        normalized = [normalize_keyword(keyword) for keyword in keywords]
+
+        if not vectorizer.cacheable:
+            return vectorizer.transform(normalized)
+
+        vectors: Dict[str, np.ndarray] = {}
+        missing = []
+        for keyword in dict.fromkeys(normalized):
+            vector = self.get(vectorizer.cache_key, keyword)
+            if vector is None:
+                missing.append(keyword)
+            else:
+                vectors[keyword] = vector
+
+        if missing:
+            computed = vectorizer.transform(missing)
+            for keyword, vector in zip(missing, computed):
+                self.put(vectorizer.cache_key, keyword, vector)
+                vectors[keyword] = vector
+
+        return np.vstack([vectors[keyword] for keyword in normalized]).astype(np.float32, copy=False)
+
+    async def load(self, db: AsyncSession, vectorizer: KeywordVectorizer, keywords: List[str]) -> int:
+        """
+        DB에 저장된 벡터를 캐시로 로드 (현재 벡터화 설정 / 차원과 같은 벡터만)
+
+        Args:
+            db: 데이터베이스 세션
+            vectorizer: 벡터화 백엔드
+            keywords: 원본 키워드 리스트
+
+        Returns:
+            로드된 벡터 수
+        """
+        if not vectorizer.cacheable:
+            return 0
+
+        backend = vectorizer.cache_key
+        with self._lock:
+            wanted = [
+                keyword for keyword in dict.fromkeys(normalize_keyword(k) for k in keywords)
+                if (backend, keyword) not in self._entries
+            ]
+        if not wanted:
+            return 0
+
+        result = await db.execute(
+            select(KeywordVector.keyword, KeywordVector.vector).where(
+                KeywordVector.backend == backend,
+                KeywordVector.dim == vectorizer.dim,
+                KeywordVector.keyword.in_(wanted)
+            )
+        )
+        rows = result.all()
+        self.update(backend, {
+            keyword: np.frombuffer(vector_bytes, dtype="<f4") for keyword, vector_bytes in rows
+        }, dirty=False)
+        return len(rows)
+
+    async def persist(self, db: AsyncSession) -> int:
+        """
+        새로 계산된 벡터를 DB에 저장 (이미 있는 키워드는 무시)
+
+        Args:
+            db: 데이터베이스 세션
+
+        Returns:
+            저장 시도한 벡터 수
+        """
+        with self._lock:
+            pending = dict(self._dirty)
+        if not pending:
+            return 0
+
+        rows = [
+            {
+                "backend": backend,
+                "keyword": keyword,
+                "dim": int(vector.shape[0]),
+                "vector": np.asarray(vector, dtype="<f4").tobytes()
+            }
+            for (backend, keyword), vector in pending.items()
+        ]
+
+        dialect = db.bind.dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            raise ValueError(f"Unsupported dialect for vector cache: {dialect}")
+
+        # 파라미터 수 제한을 피하기 위해 나눠서 저장
+        for start in range(0, len(rows), 1000):
+            await db.execute(insert(KeywordVector).values(rows[start:start + 1000]).on_conflict_do_nothing(
+                index_elements=["backend", "keyword"]
+            ))
+        await db.commit()
+
+        # 저장하는 동안 새로 계산된 벡터는 다음 persist까지 남김
+        with self._lock:
+            for key, vector in pending.items():
+                if self._dirty.get(key) is vector:
+                    del self._dirty[key]
+        return len(rows)
+
+    def get_metrics(self) -> Dict:
+        """캐시 적중률 메트릭"""
+        with self._lock:
+            entries, pending = len(self._entries), len(self._dirty)
+        return {
+            "entries": entries,
+            "pending_persist": pending,
+            "pending_dropped": self.dropped,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Singleton instance
+keyword_vector_cache = KeywordVectorCache()
@@ -2,12 +2,22 @@
 KPI Service
 Brand KPI calculation and trend analysis
 """
+import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Literal
+from typing import Awaitable, Callable, List, Dict, Iterable, Optional, Literal
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, desc
+from sqlalchemy import select, func, desc, and_
+from app.core.cache import cache
+from app.core.config import settings
 from app.models.brand import BrandKPI
 
+# Per-brand entries are keyed by a generation ("gen:{brand_id}").
+# Writes replace the generation instead of deleting keys, so a summary computed
+# concurrently with a write is stored under the old generation and never read.
+# Generations are time-based rather than counters from 0: if one is evicted
+# the next value is new, so an entry from an earlier generation is never served again.
+kpi_cache = cache.namespaced("kpi")
+
 
 class KPIService:
     """
@@ -18,6 +28,7 @@ class KPIService:
     - Popularity index calculation
     - Performance comparison
     - Historical analysis
+    - Per-brand summary / snapshot caching, invalidated on every KPI write
     """
 
     @staticmethod
@@ -112,6 +123,19 @@ class KPIService:
         else:
             values = [kpi.value for kpi in kpis]
 
+        return KPIService.trend_direction(values)
+
+    @staticmethod
+    def trend_direction(values: List[float]) -> Literal["up", "down", "stable"]:
+        """
+        Trend direction of a chronologically ordered series
+
+        Args:
+            values: KPI values, oldest first
+
+        Returns:
+            Trend direction: "up", "down", or "stable"
+        """
         if not values or len(values) < 2:
             return "stable"
 
@@ -135,13 +159,77 @@ class KPIService:
         else:
             return "stable"
 
+    @staticmethod
+    async def _cached_per_brand(
+        kind: str,
+        brand_ids: Iterable[int],
+        compute: Callable[[List[int]], Awaitable[Dict[int, Dict]]]
+    ) -> Dict[int, Dict]:
+        """
+        Read per-brand entries from the cache, computing and storing the missing ones
+
+        Args:
+            kind: Entry kind ("summary", "snapshot")
+            brand_ids: Brand IDs
+            compute: Coroutine computing entries for the brands that missed
+
+        Returns:
+            Dictionary of brand ID to entry
+        """
+        brand_ids = list(dict.fromkeys(brand_ids))
+        if not brand_ids:
+            return {}
+
+        generations = await kpi_cache.get_many(f"gen:{brand_id}" for brand_id in brand_ids)
+        unseeded = {
+            f"gen:{brand_id}": KPIService._new_generation()
+            for brand_id in brand_ids if f"gen:{brand_id}" not in generations
+        }
+        if unseeded:
+            await kpi_cache.set_many(unseeded, ttl=0)
+            generations.update(unseeded)
+        keys = {
+            brand_id: f"{kind}:{brand_id}:{generations[f'gen:{brand_id}']}"
+            for brand_id in brand_ids
+        }
+        hits = await kpi_cache.get_many(keys.values())
+
+        entries = {brand_id: hits[key] for brand_id, key in keys.items() if key in hits}
+        missing = [brand_id for brand_id in brand_ids if brand_id not in entries]
+        if missing:
+            computed = await compute(missing)
+            await kpi_cache.set_many(
+                {keys[brand_id]: entry for brand_id, entry in computed.items()},
+                ttl=settings.KPI_CACHE_TTL
+            )
+            entries.update(computed)
+        return entries
+
+    @staticmethod
+    def _new_generation() -> int:
+        """Generation value that never repeats an earlier one"""
+        return time.time_ns()
+
+    @staticmethod
+    async def invalidate(brand_ids: Iterable[int]) -> None:
+        """
+        Invalidate cached summaries and snapshots after KPI writes
+
+        Args:
+            brand_ids: Brands whose KPIs changed
+        """
+        await kpi_cache.set_many(
+            {f"gen:{brand_id}": KPIService._new_generation() for brand_id in set(brand_ids)},
+            ttl=0
+        )
+
     @staticmethod
     async def get_kpi_summary(
         db: AsyncSession,
         brand_id: int
     ) -> Dict:
         """
-        Get comprehensive KPI summary for a brand
+        Get comprehensive KPI summary for a brand (cached)
 
         Args:
             db: Database session
@@ -150,6 +238,38 @@ class KPIService:
         Returns:
             Dictionary containing current KPIs, trends, and statistics
         """
+        summaries = await KPIService.get_kpi_summaries(db, [brand_id])
+        return summaries[brand_id]
+
+    @staticmethod
+    async def get_kpi_summaries(
+        db: AsyncSession,
+        brand_ids: List[int]
+    ) -> Dict[int, Dict]:
+        """
+        Get KPI summaries for several brands with one cache round trip
+
+        Args:
+            db: Database session
+            brand_ids: Brand IDs
+
+        Returns:
+            Dictionary of brand ID to KPI summary
+        """
+        async def compute(missing: List[int]) -> Dict[int, Dict]:
+            return {
+                brand_id: await KPIService._compute_kpi_summary(db, brand_id)
+                for brand_id in missing
+            }
+
+        return await KPIService._cached_per_brand("summary", brand_ids, compute)
+
+    @staticmethod
+    async def _compute_kpi_summary(
+        db: AsyncSession,
+        brand_id: int
+    ) -> Dict:
+        """Compute a KPI summary from the database (measurement_date as ISO string)"""
         # Get latest KPI
         latest_kpi_query = select(BrandKPI).where(
             BrandKPI.brand_id == brand_id
@@ -200,7 +320,7 @@ class KPIService:
                 "avg_views": latest_kpi.avg_views,
                 "avg_likes": latest_kpi.avg_likes,
                 "avg_comments": latest_kpi.avg_comments,
-                "measurement_date": latest_kpi.measurement_date
+                "measurement_date": latest_kpi.measurement_date.isoformat()
             },
             "trends": trends,
             "statistics": {
@@ -212,6 +332,60 @@ class KPIService:
             } if stats else None
         }
 
+    @staticmethod
+    async def get_brand_snapshots(
+        db: AsyncSession,
+        brand_ids: List[int]
+    ) -> Dict[int, Dict]:
+        """
+        Latest KPI value and 30-day popularity trend per brand (cached)
+
+        Used by dashboard cards, shortcuts and search results. Cache misses
+        are computed for all missing brands with two queries.
+
+        Args:
+            db: Database session
+            brand_ids: Brand IDs
+
+        Returns:
+            Dictionary of brand ID to {"latest_kpi": float | None, "kpi_trend": str}
+        """
+        async def compute(missing: List[int]) -> Dict[int, Dict]:
+            latest = select(
+                BrandKPI.brand_id,
+                func.max(BrandKPI.measurement_date).label("measurement_date")
+            ).where(BrandKPI.brand_id.in_(missing)).group_by(BrandKPI.brand_id).subquery()
+
+            latest_result = await db.execute(
+                select(BrandKPI.brand_id, BrandKPI.value).join(latest, and_(
+                    BrandKPI.brand_id == latest.c.brand_id,
+                    BrandKPI.measurement_date == latest.c.measurement_date
+                ))
+            )
+            latest_values = {brand_id: value for brand_id, value in latest_result.all()}
+
+            cutoff_date = datetime.utcnow() - timedelta(days=30)
+            series_result = await db.execute(
+                select(BrandKPI.brand_id, BrandKPI.popularity_index).where(
+                    BrandKPI.brand_id.in_(missing),
+                    BrandKPI.measurement_date >= cutoff_date,
+                    BrandKPI.popularity_index.is_not(None)
+                ).order_by(BrandKPI.brand_id, BrandKPI.measurement_date)
+            )
+            series: Dict[int, List[float]] = {}
+            for brand_id, value in series_result.all():
+                series.setdefault(brand_id, []).append(value)
+
+            return {
+                brand_id: {
+                    "latest_kpi": latest_values.get(brand_id),
+                    "kpi_trend": KPIService.trend_direction(series.get(brand_id, []))
+                }
+                for brand_id in missing
+            }
+
+        return await KPIService._cached_per_brand("snapshot", brand_ids, compute)
+
     @staticmethod
     async def update_kpi(
         db: AsyncSession,
@@ -269,9 +443,59 @@ class KPIService:
         db.add(new_kpi)
         await db.commit()
         await db.refresh(new_kpi)
+        await KPIService.invalidate([brand_id])
 
         return new_kpi
 
+    @staticmethod
+    async def bulk_insert_kpis(
+        db: AsyncSession,
+        measurements: List[Dict]
+    ) -> int:
+        """
+        Insert many KPI measurements (e.g. platform sync) in one transaction
+
+        Args:
+            db: Database session
+            measurements: Dictionaries with brand_id, the social media metrics
+                and optionally measurement_date / source / notes
+
+        Returns:
+            Number of inserted records
+        """
+        records = []
+        for measurement in measurements:
+            popularity_index = KPIService.calculate_popularity_index(
+                followers=measurement.get("followers") or 0,
+                engagement_rate=measurement.get("engagement_rate") or 0,
+                avg_views=measurement.get("avg_views") or 0,
+                avg_likes=measurement.get("avg_likes") or 0,
+                avg_comments=measurement.get("avg_comments") or 0
+            )
+            records.append(BrandKPI(
+                brand_id=measurement["brand_id"],
+                kpi_type="social_media",
+                value=popularity_index,
+                measurement_date=measurement.get("measurement_date") or datetime.utcnow(),
+                followers=measurement.get("followers"),
+                engagement_rate=measurement.get("engagement_rate"),
+                avg_views=measurement.get("avg_views"),
+                avg_likes=measurement.get("avg_likes"),
+                avg_comments=measurement.get("avg_comments"),
+                popularity_index=popularity_index,
+                source=measurement.get("source", "manual"),
+                notes=measurement.get("notes")
+            ))
+
+        if not records:
+            return 0
+
+        db.add_all(records)
+        await db.commit()
+        await KPIService.invalidate(record.brand_id for record in records)
+
+        return len(records)
+
     @staticmethod
     async def compare_brands(
         db: AsyncSession,
@@ -287,16 +511,12 @@ class KPIService:
         Returns:
             List of brand KPI comparisons
         """
-        comparisons = []
-
-        for brand_id in brand_ids:
-            summary = await KPIService.get_kpi_summary(db, brand_id)
-            comparisons.append({
-                "brand_id": brand_id,
-                "summary": summary
-            })
+        summaries = await KPIService.get_kpi_summaries(db, brand_ids)
 
-        return comparisons
+        return [
+            {"brand_id": brand_id, "summary": summaries[brand_id]}
+            for brand_id in brand_ids
+        ]
 
 
 # Singleton instance
@@ -0,0 +1,320 @@
+"""
+Mockup Service (Back3)
+디자인 결과 이미지를 산업별 템플릿(패키지 / 명함 / 포스터)에 합성 (Pillow, 분석 워커 프로세스)
+"""
+import asyncio
+import hashlib
+import io
+import logging
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+import httpx
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.analytics_executor import analytics_executor
+from app.core.cache import cache
+from app.models.design import DesignMockup, DesignResult
+from app.services.s3_service import s3_service
+from app.services.single_flight import get_group
+
+logger = logging.getLogger(__name__)
+
+mockup_cache = cache.namespaced("mockup")
+
+# 출력 크기 (긴 변 픽셀), 큰 것부터
+MOCKUP_SIZES = {"large": 1600, "medium": 800, "thumbnail": 320}
+
+# 템플릿: 캔버스 크기, 디자인이 들어갈 영역 (x, y, w, h)
+MOCKUP_TEMPLATES = {
+    "package": {"canvas": (1600, 1200), "area": (560, 300, 480, 600)},
+    "business_card": {"canvas": (1600, 1200), "area": (420, 380, 760, 440)},
+    "poster": {"canvas": (1200, 1600), "area": (260, 260, 680, 960)},
+}
+MOCKUP_TYPES = tuple(MOCKUP_TEMPLATES)
+
+# 산업별 탭: (배경색, 오브젝트 색)
+INDUSTRY_TABS = {
+    "beauty": ((246, 231, 225), (255, 250, 247)),
+    "food": ((250, 240, 214), (255, 253, 245)),
+    "fashion": ((226, 226, 232), (250, 250, 252)),
+    "tech": ((214, 222, 235), (244, 247, 252)),
+    "general": ((236, 236, 236), (252, 252, 252)),
+}
+
+JPEG_QUALITY = 88
+
+
+@lru_cache(maxsize=32)
+def _template(mockup_type: str, industry_tab: str):
+    """템플릿 배경 (워커 프로세스마다 한 번만 그림)"""
+    from PIL import Image, ImageDraw, ImageFilter
+
+    spec = MOCKUP_TEMPLATES[mockup_type]
+    background, surface = INDUSTRY_TABS.get(industry_tab, INDUSTRY_TABS["general"])
+    width, height = spec["canvas"]
+    x, y, w, h = spec["area"]
+    pad = max(w, h) // 20
+
+    canvas = Image.new("RGB", (width, height), background)
+
+    # 그림자
+    shadow = Image.new("L", (width, height), 0)
+    ImageDraw.Draw(shadow).rectangle((x - pad + 24, y - pad + 30, x + w + pad + 24, y + h + pad + 30), fill=110)
+    canvas.paste((0, 0, 0), mask=shadow.filter(ImageFilter.GaussianBlur(28)))
+
+    draw = ImageDraw.Draw(canvas)
+    if mockup_type == "package":
+        # 상자 옆면 / 윗면
+        depth = w // 4
+        side = tuple(int(c * 0.82) for c in surface)
+        top = tuple(int(c * 0.92) for c in surface)
+        draw.polygon([(x + w + pad, y - pad), (x + w + pad + depth, y - pad - depth // 2),
+                      (x + w + pad + depth, y + h + pad - depth // 2), (x + w + pad, y + h + pad)], fill=side)
+        draw.polygon([(x - pad, y - pad), (x - pad + depth, y - pad - depth // 2),
+                      (x + w + pad + depth, y - pad - depth // 2), (x + w + pad, y - pad)], fill=top)
+        draw.rectangle((x - pad, y - pad, x + w + pad, y + h + pad), fill=surface)
+    elif mockup_type == "business_card":
+        draw.rounded_rectangle((x - pad, y - pad, x + w + pad, y + h + pad), radius=pad, fill=surface)
+    else:
+        # 액자 테두리
+        draw.rectangle((x - 2 * pad, y - 2 * pad, x + w + 2 * pad, y + h + 2 * pad), fill=(40, 40, 40))
+        draw.rectangle((x - pad, y - pad, x + w + pad, y + h + pad), fill=surface)
+    return canvas
+
+
+def compose_mockups(
+    image_bytes: bytes,
+    mockup_types: Sequence[str],
+    industry_tab: str,
+    sizes: Dict[str, int] = MOCKUP_SIZES
+) -> Dict[str, Dict[str, bytes]]:
+    """
+    디자인 이미지를 템플릿에 합성하고 크기별 JPEG 생성 (분석 워커 프로세스에서 실행)
+
+    디자인 이미지는 한 번만 디코딩하며 (JPEG은 필요한 해상도로 축소 디코딩),
+    크기별 출력은 합성 결과를 큰 크기부터 차례로 줄여 만듭니다.
+
+    Returns:
+        {mockup_type: {size_name: JPEG 바이트}}
+    """
+    from PIL import Image, ImageOps
+
+    largest_area = (
+        max(MOCKUP_TEMPLATES[t]["area"][2] for t in mockup_types),
+        max(MOCKUP_TEMPLATES[t]["area"][3] for t in mockup_types),
+    )
+    source = Image.open(io.BytesIO(image_bytes))
+    source.draft("RGB", largest_area)
+    source = ImageOps.exif_transpose(source).convert("RGBA")
+
+    by_size = sorted(sizes.items(), key=lambda item: item[1], reverse=True)
+    outputs = {}
+    for mockup_type in mockup_types:
+        x, y, w, h = MOCKUP_TEMPLATES[mockup_type]["area"]
+        canvas = _template(mockup_type, industry_tab).copy()
+        design = ImageOps.contain(source, (w, h), Image.LANCZOS)
+        canvas.paste(design, (x + (w - design.width) // 2, y + (h - design.height) // 2), design)
+
+        rendered = {}
+        image = canvas
+        for name, long_edge in by_size:
+            if max(image.size) > long_edge:
+                image = image.copy()
+                image.thumbnail((long_edge, long_edge), Image.LANCZOS)
+            buffer = io.BytesIO()
+            image.save(buffer, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+            rendered[name] = buffer.getvalue()
+        outputs[mockup_type] = rendered
+    return outputs
+
+
+def image_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
+def output_key(digest: str, mockup_type: str, industry_tab: str, size: str) -> str:
+    """합성 결과 캐시 / S3 키 (디자인 이미지 해시, 템플릿, 크기)"""
+    return f"mockups/{digest}/{mockup_type}_{industry_tab}_{size}.jpg"
+
+
+class MockupService:
+    """
+    목업 합성 서비스
+
+    기능:
+    - 디자인 결과 이미지 → 패키지 / 명함 / 포스터 템플릿 합성 (산업별 탭 색상)
+    - 분석 워커 프로세스에서 한 번 디코딩으로 여러 템플릿 / 크기(대 / 중 / 썸네일) 생성
+    - (이미지 해시, 템플릿, 크기) 기준 캐시: 공유 캐시 → S3 객체 순으로 확인, 동시 요청 합치기
+    - DesignMockup 저장 (mockup_url + 크기별 thumbnail_urls). 갤러리는 저장된 URL만 조회하므로 재합성 없음
+    """
+
+    def __init__(self, render_timeout: float = 60.0, cache_ttl: float = 30 * 86400, fetch_timeout: float = 30.0):
+        self.render_timeout = render_timeout
+        self.cache_ttl = cache_ttl
+        self.fetch_timeout = fetch_timeout
+
+    async def fetch_image(self, url: str) -> bytes:
+        """디자인 이미지 다운로드"""
+        async with httpx.AsyncClient(timeout=self.fetch_timeout, follow_redirects=True) as client:
+            response = await client.get(url)
+            response.raise_for_status()
+            return response.content
+
+    @staticmethod
+    def _source_key(url: str) -> str:
+        return f"source:{hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]}"
+
+    async def _cached_outputs(
+        self,
+        digest: str,
+        mockup_types: Sequence[str],
+        industry_tab: str
+    ) -> Dict[str, Dict[str, str]]:
+        """이미 합성된 템플릿의 크기별 URL (공유 캐시 → S3 순, 모든 크기가 있는 템플릿만)"""
+        keys = {
+            (t, size): output_key(digest, t, industry_tab, size) for t in mockup_types for size in MOCKUP_SIZES
+        }
+        cached = await mockup_cache.get_many(keys.values())
+
+        found = {}
+        for mockup_type in mockup_types:
+            urls = {size: cached.get(keys[mockup_type, size]) for size in MOCKUP_SIZES}
+            if all(urls.values()):
+                found[mockup_type] = urls
+            # 가장 큰 크기를 마지막에 올리므로, 있으면 나머지 크기도 있음
+            elif await s3_service.object_exists(keys[mockup_type, "large"]):
+                urls = {size: s3_service.object_url(keys[mockup_type, size]) for size in MOCKUP_SIZES}
+                await mockup_cache.set_many(
+                    {keys[mockup_type, size]: url for size, url in urls.items()}, ttl=self.cache_ttl
+                )
+                found[mockup_type] = urls
+        return found
+
+    async def _upload(
+        self,
+        digest: str,
+        industry_tab: str,
+        outputs: Dict[str, Dict[str, bytes]]
+    ) -> Dict[str, Dict[str, str]]:
+        """크기별 JPEG 업로드 → URL 캐시"""
+        urls = {}
+        for mockup_type, rendered in outputs.items():
+            order = sorted(rendered, key=lambda size: MOCKUP_SIZES[size])
+            keys = {size: output_key(digest, mockup_type, industry_tab, size) for size in order}
+            # 작은 크기는 동시에, 가장 큰 크기는 마지막에 (존재 확인 기준)
+            uploads = await asyncio.gather(*(
+                s3_service.upload_stream(io.BytesIO(rendered[size]), keys[size], "image/jpeg")
+                for size in order[:-1]
+            ))
+            uploads.append(await s3_service.upload_stream(
+                io.BytesIO(rendered[order[-1]]), keys[order[-1]], "image/jpeg"
+            ))
+            for upload in uploads:
+                if not upload.get("success"):
+                    raise RuntimeError(upload.get("error", "Mockup upload failed"))
+            urls[mockup_type] = {size: upload["file_url"] for size, upload in zip(order, uploads)}
+            await mockup_cache.set_many(
+                {keys[size]: url for size, url in urls[mockup_type].items()}, ttl=self.cache_ttl
+            )
+        return urls
+
+    async def render(
+        self,
+        image_url: str,
+        mockup_types: Sequence[str],
+        industry_tab: str = "general"
+    ) -> Dict[str, Dict[str, str]]:
+        """
+        목업 합성 (캐시에 없는 템플릿만)
+
+        Args:
+            image_url: 디자인 이미지 URL
+            mockup_types: 템플릿 (package / business_card / poster)
+            industry_tab: 산업별 탭
+
+        Returns:
+            {mockup_type: {size_name: URL}}
+        """
+        unknown = [t for t in mockup_types if t not in MOCKUP_TEMPLATES]
+        if unknown:
+            raise ValueError(f"Unsupported mockup type: {', '.join(unknown)}")
+        mockup_types = list(dict.fromkeys(mockup_types))
+
+        # 같은 URL은 이미지 해시를 기억해 두어 다운로드 없이 캐시 확인
+        source_key = self._source_key(image_url)
+        digest = await mockup_cache.get(source_key)
+        results = await self._cached_outputs(digest, mockup_types, industry_tab) if digest else {}
+        missing = [t for t in mockup_types if t not in results]
+        if not missing:
+            return results
+
+        image_bytes = await self.fetch_image(image_url)
+        digest = image_hash(image_bytes)
+        await mockup_cache.set(source_key, digest, ttl=self.cache_ttl)
+        results.update(await self._cached_outputs(digest, missing, industry_tab))
+        missing = [t for t in missing if t not in results]
+        if not missing:
+            return results
+
+        async def run() -> Dict[str, Dict[str, str]]:
+            outputs = await analytics_executor.run(
+                compose_mockups, image_bytes, missing, industry_tab, timeout=self.render_timeout
+            )
+            return await self._upload(digest, industry_tab, outputs)
+
+        flight_key = f"{digest}:{industry_tab}:{','.join(sorted(missing))}"
+        results.update(await get_group("mockup").do(flight_key, run))
+        return results
+
+    async def create_mockups(
+        self,
+        db: AsyncSession,
+        design: DesignResult,
+        mockup_types: Sequence[str],
+        industry_tab: str = "general"
+    ) -> List[DesignMockup]:
+        """
+        디자인 결과의 목업 생성 / 교체 (템플릿 × 산업별 탭당 한 행)
+
+        Returns:
+            생성된 DesignMockup 리스트
+        """
+        rendered = await self.render(design.image_url, mockup_types, industry_tab)
+
+        await db.execute(delete(DesignMockup).where(
+            DesignMockup.design_result_id == design.id,
+            DesignMockup.industry_tab == industry_tab,
+            DesignMockup.mockup_type.in_(list(rendered))
+        ))
+        await db.execute(insert(DesignMockup), [
+            {
+                "design_result_id": design.id,
+                "mockup_type": mockup_type,
+                "industry_tab": industry_tab,
+                "mockup_url": urls["large"],
+                "thumbnail_urls": urls,
+            }
+            for mockup_type, urls in rendered.items()
+        ])
+        await db.commit()
+        return await self.list_mockups(db, [design.id], industry_tab, list(rendered))
+
+    @staticmethod
+    async def list_mockups(
+        db: AsyncSession,
+        design_result_ids: Sequence[int],
+        industry_tab: Optional[str] = None,
+        mockup_types: Optional[Sequence[str]] = None
+    ) -> List[DesignMockup]:
+        """저장된 목업 조회 (갤러리용, 합성하지 않음)"""
+        query = select(DesignMockup).where(DesignMockup.design_result_id.in_(design_result_ids))
+        if industry_tab is not None:
+            query = query.where(DesignMockup.industry_tab == industry_tab)
+        if mockup_types is not None:
+            query = query.where(DesignMockup.mockup_type.in_(mockup_types))
+        result = await db.execute(query.order_by(DesignMockup.design_result_id, DesignMockup.id))
+        return list(result.scalars().all())
+
+
+# Singleton instance
+mockup_service = MockupService()
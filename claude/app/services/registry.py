@@ -0,0 +1,112 @@
+"""
+Service Registry (Back2)
+무거운 분석 의존성(numpy / scikit-learn / scipy)을 쓰는 서비스 모듈의 지연 로딩
+"""
+import asyncio
+import importlib
+import logging
+import threading
+import time
+from types import ModuleType
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LazyServiceModule:
+    """
+    첫 속성 접근 시 import되는 서비스 모듈 프록시
+
+    `services.keyword_clustering.KeywordClusteringService`처럼 사용하며,
+    import 전까지는 모듈 경로만 가지고 있습니다.
+    """
+
+    def __init__(self, name: str, module_path: str, registry: "ServiceRegistry"):
+        self._name = name
+        self._module_path = module_path
+        self._registry = registry
+        self._module: Optional[ModuleType] = None
+
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            with self._registry._lock:
+                if self._module is None:
+                    started = time.perf_counter()
+                    module = importlib.import_module(self._module_path)
+                    self._registry._load_ms[self._name] = round((time.perf_counter() - started) * 1000, 1)
+                    self._module = module
+        return self._module
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+
+class ServiceRegistry:
+    """
+    지연 로딩 서비스 레지스트리
+
+    기능:
+    - 이름 → 모듈 경로 등록, 첫 사용 시 import
+    - 시작 후 백그라운드 워밍업 (스레드에서 import, 이벤트 루프 비차단)
+    - 로드 여부 / 로드 시간 메트릭
+    """
+
+    def __init__(self, modules: Dict[str, str]):
+        # import는 모듈 전역 잠금을 쓰지만, 로드 시간 기록과 중복 import 방지를 위해 별도 잠금 사용
+        self._lock = threading.RLock()
+        self._load_ms: Dict[str, float] = {}
+        self._modules = {
+            name: LazyServiceModule(name, module_path, self)
+            for name, module_path in modules.items()
+        }
+
+    def __getattr__(self, name: str) -> LazyServiceModule:
+        modules = self.__dict__.get("_modules", {})
+        if name not in modules:
+            raise AttributeError(f"Unknown service module: {name}")
+        return modules[name]
+
+    def is_loaded(self, name: str) -> bool:
+        """모듈이 이미 import되었는지 여부 (import를 일으키지 않음)"""
+        return self._modules[name].loaded
+
+    def load(self, name: str) -> ModuleType:
+        """모듈 즉시 import"""
+        return self._modules[name]._load()
+
+    async def warm_up(self, names: Optional[Iterable[str]] = None) -> None:
+        """
+        등록된 모듈을 백그라운드 스레드에서 미리 import
+
+        Args:
+            names: 워밍업할 모듈 이름 (기본값: 전체)
+        """
+        for name in names or list(self._modules):
+            try:
+                await asyncio.to_thread(self.load, name)
+            except Exception as e:
+                logger.warning(f"Service warm-up failed ({name}): {e}")
+        logger.info(f"🔥 Analytics services warmed up ({len(self._load_ms)} modules)")
+
+    def get_metrics(self) -> Dict:
+        """모듈별 로드 여부 및 import 시간"""
+        return {
+            name: {"loaded": module.loaded, "load_ms": self._load_ms.get(name)}
+            for name, module in self._modules.items()
+        }
+
+
+# Singleton instance
+services = ServiceRegistry({
+    "keyword_clustering": "app.services.keyword_clustering_service",
+    "incremental_clustering": "app.services.incremental_clustering_service",
+    "key_phrases": "app.services.key_phrase_engine",
+    "keyword_index": "app.services.keyword_index",
+    "campaign_forecast": "app.services.campaign_forecast_service",
+    "diagnostic_scoring": "app.services.diagnostic_scoring_service",
+    "color_palette": "app.services.color_palette_engine",
+})
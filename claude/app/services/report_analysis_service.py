@@ -0,0 +1,290 @@
+"""
+Report Analysis Service (Back2)
+브랜드 진단 리포트 AI 분석 (섹션별 GPT 분석 동시 실행 → 종합 요약, 리포트별 마감 시간 / 토큰 예산)
+"""
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import cache
+from app.core.config import settings
+from app.models.brand import Brand
+from app.models.insight import BrandDiagnostic, BrandReport
+from app.services.gpt_scheduler import GPTPriority, estimate_tokens
+from app.services.gpt_service import gpt_service
+from app.services.registry import services
+
+logger = logging.getLogger(__name__)
+
+analysis_cache = cache.namespaced("report_analysis")
+
+# 시스템 프롬프트 / 지시문 토큰 (응답 JSON 제외)
+PROMPT_OVERHEAD_TOKENS = 250
+# 이보다 적은 완성 토큰으로는 호출하지 않음
+MIN_COMPLETION_TOKENS = 150
+# 실행 잠금 여유 시간 (마감 시간 이후 채점 / 저장 몫)
+LOCK_GRACE_SECONDS = 30.0
+
+
+class ReportAnalysisService:
+    """
+    브랜드 진단 리포트 AI 분석 오케스트레이터
+
+    기능:
+    - 5개 섹션 분석 요청을 동시에 실행 (GPT 스케줄러가 TPM / RPM 예산 관리)
+    - 섹션 분석이 끝나는 대로 BrandDiagnostic에 저장 (부분 리포트 조회 가능)
+    - 섹션 결과를 모아 종합 요약 / 개선 제안 생성 → BrandReport.ai_summary / ai_recommendations
+      (요약은 핵심 구문 코퍼스에 반영)
+    - 리포트별 마감 시간: 기한 내 끝나지 않은 섹션은 취소하고 완료된 섹션으로 요약
+    - 리포트별 토큰 예산: 섹션 / 요약 완성 토큰 상한을 예산에서 나눠 배정
+    - 작업 상태 조회 (공유 캐시), 리포트별 실행 잠금 (마감 시간 + 여유 시간 후 만료)
+    """
+
+    def __init__(
+        self,
+        deadline_seconds: float = 90.0,
+        token_budget: int = 8000,
+        section_max_tokens: int = 800,
+        summary_max_tokens: int = 1000,
+        summary_reserve_seconds: float = 20.0,
+        status_ttl: float = 86400,
+        session_factory=None
+    ):
+        self.deadline_seconds = deadline_seconds
+        self.token_budget = token_budget
+        self.section_max_tokens = section_max_tokens
+        self.summary_max_tokens = summary_max_tokens
+        self.summary_reserve_seconds = summary_reserve_seconds
+        self.status_ttl = status_ttl
+        self.session_factory = session_factory
+        self._tasks: set = set()
+
+    def _sessions(self):
+        if self.session_factory is not None:
+            return self.session_factory
+        from app.core.database import AsyncSessionLocal
+        return AsyncSessionLocal
+
+    @staticmethod
+    def _status_key(report_id: int) -> str:
+        return f"status:{report_id}"
+
+    async def get_status(self, report_id: int) -> Optional[Dict]:
+        """분석 작업 상태 (없으면 None)"""
+        return await analysis_cache.get(self._status_key(report_id))
+
+    async def _set_status(self, report_id: int, status: Dict) -> None:
+        await analysis_cache.set(self._status_key(report_id), status, ttl=self.status_ttl)
+
+    def _section_max_tokens(self, diagnostic: BrandDiagnostic, sections: int) -> int:
+        """섹션 완성 토큰 상한 (요약 몫을 뺀 예산을 섹션 수로 나눈 뒤 프롬프트 토큰 제외)"""
+        allowance = (self.token_budget - self.summary_max_tokens - PROMPT_OVERHEAD_TOKENS) // max(sections, 1)
+        prompt_tokens = PROMPT_OVERHEAD_TOKENS + estimate_tokens(
+            json.dumps(diagnostic.questions_answers, ensure_ascii=False)
+        )
+        return min(self.section_max_tokens, allowance - prompt_tokens)
+
+    async def _load(self, db: AsyncSession, report_id: int):
+        report = await db.get(BrandReport, report_id)
+        if report is None:
+            raise ValueError(f"Brand report {report_id} not found")
+        brand = await db.get(Brand, report.brand_id)
+        diagnostics = (await db.execute(
+            select(BrandDiagnostic).where(BrandDiagnostic.report_id == report_id).order_by(BrandDiagnostic.id)
+        )).scalars().all()
+        return report, brand, diagnostics
+
+    async def analyze_report(self, report_id: int, priority: int = GPTPriority.DEFAULT) -> Dict:
+        """
+        리포트 AI 분석 실행
+
+        Args:
+            report_id: BrandReport ID
+            priority: GPT 스케줄링 우선순위
+
+        Returns:
+            최종 작업 상태 (done: 전체 완료, partial: 일부 섹션 / 요약 누락)
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.deadline_seconds
+        started_at = datetime.utcnow().isoformat()
+        status = {
+            "status": "running",
+            "started_at": started_at,
+            "completed_sections": [],
+            "failed_sections": {},
+            "tokens_used": 0,
+            "summary_generated": False,
+        }
+        await self._set_status(report_id, status)
+
+        async with self._sessions()() as db:
+            report, brand, diagnostics = await self._load(db, report_id)
+            if any(d.section_score is None for d in diagnostics):
+                await services.diagnostic_scoring.diagnostic_scoring_service.score_report(db, report_id)
+                db.expire_all()
+                report, brand, diagnostics = await self._load(db, report_id)
+
+            brand_name = brand.brand_name if brand else report.report_name
+            category = brand.category if brand else None
+
+            by_task: Dict[asyncio.Task, BrandDiagnostic] = {}
+            for diagnostic in diagnostics:
+                max_tokens = self._section_max_tokens(diagnostic, len(diagnostics))
+                if max_tokens < MIN_COMPLETION_TOKENS:
+                    status["failed_sections"][diagnostic.section.value] = "token budget exceeded"
+                    continue
+                task = asyncio.create_task(gpt_service.analyze_diagnostic_section(
+                    brand_name, category, diagnostic.section.value, diagnostic.questions_answers,
+                    diagnostic.section_score, max_tokens=max_tokens, priority=priority
+                ))
+                by_task[task] = diagnostic
+
+            # 섹션: 요약 몫을 남긴 시각까지, 끝나는 대로 저장
+            pending = set(by_task)
+            section_deadline = deadline - min(self.summary_reserve_seconds, self.deadline_seconds / 2)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=max(section_deadline - loop.time(), 0), return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    break
+                for task in done:
+                    await self._save_section(db, by_task[task], task.result(), status)
+                await self._set_status(report_id, status)
+
+            for task in pending:
+                task.cancel()
+                status["failed_sections"][by_task[task].section.value] = "deadline exceeded"
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+            await self._summarize(db, report, brand_name, diagnostics, status, deadline, priority)
+
+        status["status"] = "done" if not status["failed_sections"] and status["summary_generated"] else "partial"
+        status["finished_at"] = datetime.utcnow().isoformat()
+        await self._set_status(report_id, status)
+        return status
+
+    @staticmethod
+    async def _save_section(db: AsyncSession, diagnostic: BrandDiagnostic, result: Dict, status: Dict) -> None:
+        """섹션 분석 결과 저장 (즉시 커밋)"""
+        section = diagnostic.section.value
+        status["tokens_used"] += result.get("tokens_used") or 0
+        if not result.get("success"):
+            status["failed_sections"][section] = result.get("error", "analysis failed")
+            return
+
+        data = result["data"] or {}
+        values = {
+            "ai_analysis": data.get("analysis"),
+            "strengths": data.get("strengths") or [],
+            "weaknesses": data.get("weaknesses") or [],
+        }
+        await db.execute(update(BrandDiagnostic).where(BrandDiagnostic.id == diagnostic.id).values(**values))
+        await db.commit()
+        for name, value in values.items():
+            setattr(diagnostic, name, value)
+        status["completed_sections"].append(section)
+
+    async def _summarize(
+        self,
+        db: AsyncSession,
+        report: BrandReport,
+        brand_name: str,
+        diagnostics: List[BrandDiagnostic],
+        status: Dict,
+        deadline: float,
+        priority: int
+    ) -> None:
+        """완료된 섹션으로 종합 요약 (남은 예산 / 시간 안에서만)"""
+        sections = {
+            d.section.value: {
+                "score": d.section_score,
+                "analysis": d.ai_analysis,
+                "strengths": d.strengths,
+                "weaknesses": d.weaknesses,
+            }
+            for d in diagnostics if d.section.value in status["completed_sections"]
+        }
+        if not sections:
+            return
+
+        prompt_tokens = PROMPT_OVERHEAD_TOKENS + estimate_tokens(json.dumps(sections, ensure_ascii=False))
+        max_tokens = min(self.summary_max_tokens, self.token_budget - status["tokens_used"] - prompt_tokens)
+        remaining = deadline - asyncio.get_running_loop().time()
+        if max_tokens < MIN_COMPLETION_TOKENS or remaining <= 0:
+            return
+
+        try:
+            result = await asyncio.wait_for(
+                gpt_service.summarize_diagnostic_report(
+                    brand_name, report.overall_score, sections, max_tokens=max_tokens, priority=priority
+                ),
+                timeout=remaining
+            )
+        except asyncio.TimeoutError:
+            return
+        status["tokens_used"] += result.get("tokens_used") or 0
+        if not result.get("success"):
+            return
+
+        data = result["data"] or {}
+        values = {
+            "ai_summary": data.get("summary"),
+            "ai_recommendations": data.get("recommendations") or [],
+        }
+        await db.execute(update(BrandReport).where(BrandReport.id == report.id).values(**values))
+        await db.commit()
+        for name, value in values.items():
+            setattr(report, name, value)
+        status["summary_generated"] = True
+
+        # 핵심 구문 코퍼스 문서 빈도 반영 (실패해도 분석 결과는 유지)
+        try:
+            await services.key_phrases.key_phrase_engine.add_report(db, report)
+        except Exception as e:
+            logger.warning(f"Key phrase corpus update failed (report {report.id}): {e}")
+
+    async def _run(self, report_id: int, lock_token: bytes) -> None:
+        try:
+            await self.analyze_report(report_id)
+        except Exception as e:
+            logger.error(f"Report analysis failed (report {report_id}): {e}")
+            status = await self.get_status(report_id) or {}
+            await self._set_status(report_id, {**status, "status": "failed", "error": str(e)})
+        finally:
+            await analysis_cache.release_lock(self._status_key(report_id), lock_token)
+
+    async def start_analysis(self, report_id: int) -> Dict:
+        """
+        리포트 AI 분석 시작 (백그라운드, 이미 실행 중이면 현재 상태 반환)
+
+        실행 여부는 상태가 아니라 잠금으로 판단하므로, 워커 재시작 / 취소로 남은
+        "running" 상태는 잠금이 만료되면 새 분석으로 덮어씁니다.
+
+        Returns:
+            작업 상태
+        """
+        lock_token = await analysis_cache.acquire_lock(
+            self._status_key(report_id), ttl=self.deadline_seconds + LOCK_GRACE_SECONDS
+        )
+        if lock_token is None:
+            return await self.get_status(report_id) or {"status": "running"}
+
+        status = {"status": "running", "completed_sections": [], "failed_sections": {}, "tokens_used": 0}
+        await self._set_status(report_id, status)
+        task = asyncio.create_task(self._run(report_id, lock_token))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return status
+
+
+# Singleton instance
+report_analysis_service = ReportAnalysisService(
+    deadline_seconds=settings.REPORT_ANALYSIS_DEADLINE_SECONDS,
+    token_budget=settings.REPORT_ANALYSIS_TOKEN_BUDGET
+)
@@ -0,0 +1,497 @@
+"""
+Report PDF Service
+브랜드 진단 리포트 / 캠페인 리포트 PDF 렌더링 및 S3 업로드
+
+렌더링은 분석 워커에서 임시 파일로 수행하고, 결과 파일은 멀티파트 업로드로
+파트 단위 스트리밍합니다. 같은 내용의 리포트는 콘텐츠 해시로 한 번만 렌더링합니다.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from xml.sax.saxutils import escape
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.analytics_executor import analytics_executor
+from app.core.cache import cache
+from app.core.config import settings
+from app.models.campaign import Campaign, CampaignReport
+from app.models.insight import BrandDiagnostic, BrandReport, ReportSection
+from app.services.s3_service import s3_service
+from app.services.single_flight import get_group
+
+logger = logging.getLogger(__name__)
+
+pdf_cache = cache.namespaced("report_pdf")
+
+# 레이아웃이 바뀌면 올려서 기존 렌더 결과를 무효화
+RENDERER_VERSION = 1
+
+REPORT_KINDS = ("brand", "campaign")
+
+COLOR_SCHEMES = {
+    "default": "#1F3A93",
+    "green": "#1E824C",
+    "orange": "#D35400",
+    "purple": "#6C3483",
+    "gray": "#34495E",
+}
+
+LABELS = {
+    "ko": {
+        "overall_score": "종합 점수",
+        "summary": "AI 요약",
+        "kpis": "주요 지표",
+        "scores": "섹션별 점수",
+        "strengths": "강점",
+        "weaknesses": "약점",
+        "insights": "인사이트",
+        "recommendations": "개선 제안",
+    },
+    "en": {
+        "overall_score": "Overall score",
+        "summary": "AI summary",
+        "kpis": "Key metrics",
+        "scores": "Section scores",
+        "strengths": "Strengths",
+        "weaknesses": "Weaknesses",
+        "insights": "Insights",
+        "recommendations": "Recommendations",
+    },
+}
+
+
+def content_hash(payload: Dict) -> str:
+    """리포트 내용 + 렌더 옵션 + 렌더러 버전의 SHA-256"""
+    canonical = json.dumps(
+        {"renderer": RENDERER_VERSION, "payload": payload},
+        sort_keys=True, ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _scheme_color(name: Optional[str]) -> str:
+    if name and name.startswith("#") and len(name) == 7:
+        return name
+    return COLOR_SCHEMES.get(name or "default", COLOR_SCHEMES["default"])
+
+
+def _text(value: Any) -> str:
+    return escape(str(value)) if value is not None else ""
+
+
+def _item_text(item: Any) -> str:
+    """인사이트 / 제안 항목 (dict 또는 문자열) → 한 줄 텍스트"""
+    if isinstance(item, dict):
+        title = item.get("title") or item.get("name") or ""
+        description = item.get("description") or item.get("content") or ""
+        if title and description:
+            return f"<b>{_text(title)}</b> — {_text(description)}"
+        return _text(title or description or json.dumps(item, ensure_ascii=False))
+    return _text(item)
+
+
+def _chart_series(chart_data: Optional[Dict]) -> Optional[tuple]:
+    """chart_data → (labels, values) ({"labels", "values"} 또는 {"labels", "datasets": [{"data"}]})"""
+    if not isinstance(chart_data, dict):
+        return None
+    labels = chart_data.get("labels")
+    values = chart_data.get("values")
+    if values is None and chart_data.get("datasets"):
+        values = chart_data["datasets"][0].get("data")
+    if not labels or not values or len(labels) != len(values):
+        return None
+    try:
+        return [str(label) for label in labels], [float(value) for value in values]
+    except (TypeError, ValueError):
+        return None
+
+
+def render_report_pdf(payload: Dict, path: str) -> int:
+    """
+    리포트 PDF 렌더링 (분석 워커 프로세스에서 실행)
+
+    Args:
+        payload: brand_report_payload / campaign_report_payload 결과
+        path: 출력 파일 경로
+
+    Returns:
+        파일 크기 (bytes)
+    """
+    from reportlab.graphics.charts.barcharts import HorizontalBarChart
+    from reportlab.graphics.shapes import Drawing
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+    from reportlab.lib.units import mm
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+    from reportlab.platypus import ListFlowable, ListItem, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+    # 한글 CID 폰트 (폰트 파일 없이 사용 가능)
+    font = "HYSMyeongJo-Medium"
+    if font not in pdfmetrics.getRegisteredFontNames():
+        pdfmetrics.registerFont(UnicodeCIDFont(font))
+
+    labels = LABELS.get(payload.get("language"), LABELS["ko"])
+    accent = colors.HexColor(_scheme_color(payload.get("color_scheme")))
+    include_charts = payload.get("include_charts", True)
+
+    base = getSampleStyleSheet()
+    styles = {
+        "title": ParagraphStyle("title", parent=base["Title"], fontName=font, textColor=accent),
+        "subtitle": ParagraphStyle("subtitle", parent=base["Normal"], fontName=font, textColor=colors.grey),
+        "h2": ParagraphStyle("h2", parent=base["Heading2"], fontName=font, textColor=accent),
+        "h3": ParagraphStyle("h3", parent=base["Heading3"], fontName=font),
+        "body": ParagraphStyle("body", parent=base["BodyText"], fontName=font, leading=15),
+    }
+
+    def bullets(items: List[Any]) -> ListFlowable:
+        return ListFlowable(
+            [ListItem(Paragraph(_item_text(item), styles["body"])) for item in items],
+            bulletType="bullet", leftIndent=12
+        )
+
+    def table(rows: List[List[Any]], header: bool = True) -> Table:
+        data = [[Paragraph(_text(cell), styles["body"]) for cell in row] for row in rows]
+        result = Table(data, repeatRows=1 if header else 0, hAlign="LEFT")
+        commands = [
+            ("GRID", (0, 0), (-1, -1), 0.25, colors.lightgrey),
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ]
+        if header:
+            commands.append(("BACKGROUND", (0, 0), (-1, 0), colors.Color(accent.red, accent.green, accent.blue, 0.15)))
+        result.setStyle(TableStyle(commands))
+        return result
+
+    def bar_chart(chart_labels: List[str], values: List[float], max_value: Optional[float] = None) -> Drawing:
+        height = 18 * len(values) + 20
+        drawing = Drawing(160 * mm, height)
+        chart = HorizontalBarChart()
+        chart.x, chart.y = 45 * mm, 10
+        chart.width, chart.height = 105 * mm, height - 20
+        chart.data = [values]
+        chart.categoryAxis.categoryNames = chart_labels
+        chart.categoryAxis.labels.fontName = font
+        chart.valueAxis.valueMin = 0
+        if max_value is not None:
+            chart.valueAxis.valueMax = max_value
+        chart.bars[0].fillColor = accent
+        drawing.add(chart)
+        return drawing
+
+    def content_flowables(content: Any) -> List:
+        if isinstance(content, dict):
+            flowables = []
+            scalar_rows = [[key, value] for key, value in content.items() if not isinstance(value, (dict, list))]
+            if scalar_rows:
+                flowables.append(table(scalar_rows, header=False))
+            for key, value in content.items():
+                if isinstance(value, (dict, list)) and value:
+                    flowables.append(Paragraph(_text(key), styles["h3"]))
+                    flowables.extend(content_flowables(value))
+            return flowables
+        if isinstance(content, list):
+            return [bullets(content)] if content else []
+        return [Paragraph(_text(content), styles["body"])] if content not in (None, "") else []
+
+    story = [Paragraph(_text(payload.get("title")), styles["title"])]
+    if payload.get("subtitle"):
+        story.append(Paragraph(_text(payload["subtitle"]), styles["subtitle"]))
+    story.append(Spacer(1, 6 * mm))
+
+    if payload.get("score") is not None:
+        story.append(Paragraph(f"{labels['overall_score']}: <b>{payload['score']:.1f}</b> / 100", styles["h2"]))
+
+    if payload.get("include_ai_summary", True) and payload.get("summary"):
+        story += [Paragraph(labels["summary"], styles["h2"]), Paragraph(_text(payload["summary"]), styles["body"])]
+
+    if payload.get("kpis"):
+        story += [Paragraph(labels["kpis"], styles["h2"]), table([[k["label"], k["value"]] for k in payload["kpis"]], header=False)]
+
+    scores = [item for item in payload.get("scores", []) if item.get("score") is not None]
+    if scores:
+        story.append(Paragraph(labels["scores"], styles["h2"]))
+        if include_charts:
+            story.append(bar_chart([s["label"] for s in scores], [float(s["score"]) for s in scores], 100))
+        else:
+            story.append(table([[s["label"], f"{s['score']:.1f}"] for s in scores], header=False))
+
+    for diagnostic in payload.get("diagnostics", []):
+        heading = diagnostic["section"]
+        if diagnostic.get("score") is not None:
+            heading += f" ({diagnostic['score']:.1f})"
+        story.append(Paragraph(_text(heading), styles["h2"]))
+        if diagnostic.get("analysis"):
+            story.append(Paragraph(_text(diagnostic["analysis"]), styles["body"]))
+        for key in ("strengths", "weaknesses"):
+            if diagnostic.get(key):
+                story += [Paragraph(labels[key], styles["h3"]), bullets(diagnostic[key])]
+
+    for section in payload.get("sections", []):
+        story.append(Paragraph(_text(section["name"]), styles["h2"]))
+        story.extend(content_flowables(section.get("content")))
+        series = _chart_series(section.get("chart_data")) if include_charts else None
+        if series:
+            story.append(bar_chart(*series))
+        if section.get("insights"):
+            story += [Paragraph(labels["insights"], styles["h3"]), bullets(section["insights"])]
+
+    for extra in payload.get("tables", []):
+        if extra.get("rows"):
+            story += [Paragraph(_text(extra["title"]), styles["h2"]), table([extra["columns"], *extra["rows"]])]
+
+    if payload.get("recommendations"):
+        story += [Paragraph(labels["recommendations"], styles["h2"]), bullets(payload["recommendations"])]
+
+    document = SimpleDocTemplate(
+        path, pagesize=A4, title=str(payload.get("title") or ""),
+        leftMargin=18 * mm, rightMargin=18 * mm, topMargin=18 * mm, bottomMargin=18 * mm
+    )
+    document.build(story)
+    return os.path.getsize(path)
+
+
+def _options(options: Dict) -> Dict:
+    return {
+        "language": options.get("language", "ko"),
+        "color_scheme": options.get("color_scheme"),
+        "include_charts": options.get("include_charts", True),
+        "include_ai_summary": options.get("include_ai_summary", True),
+    }
+
+
+class ReportPdfService:
+    """
+    리포트 PDF 내보내기 서비스
+
+    기능:
+    - 리포트 데이터 스냅샷 (진단 점수 / 섹션 콘텐츠·차트 / AI 요약) 조회
+    - 분석 워커에서 렌더링 (요청 경로 밖, 백그라운드 작업)
+    - 임시 파일 → S3 멀티파트 스트리밍 업로드
+    - 콘텐츠 해시 기준 렌더 캐시 (내용이 같으면 재렌더링하지 않음), 동시 요청 합치기
+    - 작업 상태 조회 (공유 캐시)
+    """
+
+    def __init__(
+        self,
+        status_ttl: float = 86400,
+        render_ttl: float = 30 * 86400,
+        render_timeout: float = 120.0,
+        session_factory=None
+    ):
+        self.status_ttl = status_ttl
+        self.render_ttl = render_ttl
+        self.render_timeout = render_timeout
+        self.session_factory = session_factory
+        self._tasks: set = set()
+
+    @staticmethod
+    async def brand_report_payload(db: AsyncSession, report: BrandReport, options: Dict) -> Dict:
+        """브랜드 진단 리포트 → 렌더링 payload"""
+        diagnostics = (await db.execute(
+            select(BrandDiagnostic).where(BrandDiagnostic.report_id == report.id).order_by(BrandDiagnostic.id)
+        )).scalars().all()
+        sections = (await db.execute(
+            select(ReportSection).where(ReportSection.report_id == report.id)
+            .order_by(ReportSection.section_order, ReportSection.id)
+        )).scalars().all()
+
+        return {
+            "kind": "brand",
+            **_options(options),
+            "title": report.report_name,
+            "subtitle": report.report_type,
+            "score": report.overall_score,
+            "summary": report.ai_summary,
+            "recommendations": report.ai_recommendations or [],
+            "scores": [{"label": d.section.value, "score": d.section_score} for d in diagnostics],
+            "diagnostics": [
+                {
+                    "section": d.section.value,
+                    "score": d.section_score,
+                    "analysis": d.ai_analysis,
+                    "strengths": d.strengths or [],
+                    "weaknesses": d.weaknesses or [],
+                }
+                for d in diagnostics
+            ],
+            "sections": [
+                {"name": s.section_name, "content": s.content, "chart_data": s.chart_data, "insights": s.insights}
+                for s in sections
+            ],
+        }
+
+    @staticmethod
+    async def campaign_report_payload(db: AsyncSession, report: CampaignReport, options: Dict) -> Dict:
+        """캠페인 월간 리포트 → 렌더링 payload"""
+        campaign = await db.get(Campaign, report.campaign_id)
+        channel_rows = [
+            [channel, values.get("revenue"), values.get("cost"), values.get("roas"), values.get("revenue_share")]
+            for channel, values in (report.channel_performance or {}).items()
+        ]
+        top_rows = [
+            [c.get("rank"), c.get("campaign_name"), c.get("revenue"), c.get("cost"), c.get("roas")]
+            for c in report.top_campaigns or []
+        ]
+        forecast = (report.ai_predictions or {}).get("metrics", {})
+
+        return {
+            "kind": "campaign",
+            **_options(options),
+            "title": f"{campaign.campaign_name if campaign else report.campaign_id} — {report.report_month}",
+            "subtitle": f"{report.start_date:%Y-%m-%d} ~ {report.end_date:%Y-%m-%d}",
+            "score": None,
+            "summary": report.ai_summary,
+            "recommendations": report.ai_recommendations or [],
+            "kpis": [
+                {"label": "revenue", "value": report.total_revenue},
+                {"label": "cost", "value": report.total_cost},
+                {"label": "sales", "value": report.total_sales},
+                *(
+                    {"label": f"forecast {metric}", "value": values.get("total")}
+                    for metric, values in forecast.items()
+                ),
+            ],
+            "sections": [
+                {"name": "social", "content": report.social_performance, "chart_data": None, "insights": None}
+            ] if report.social_performance else [],
+            "tables": [
+                {"title": "top campaigns", "columns": ["rank", "campaign", "revenue", "cost", "roas"], "rows": top_rows},
+                {"title": "channels", "columns": ["channel", "revenue", "cost", "roas", "share"], "rows": channel_rows},
+            ],
+        }
+
+    @staticmethod
+    def _status_key(kind: str, report_id: int) -> str:
+        return f"status:{kind}:{report_id}"
+
+    async def get_status(self, kind: str, report_id: int) -> Optional[Dict]:
+        """내보내기 작업 상태 (없으면 None)"""
+        return await pdf_cache.get(self._status_key(kind, report_id))
+
+    async def _set_status(self, kind: str, report_id: int, status: Dict) -> None:
+        await pdf_cache.set(self._status_key(kind, report_id), status, ttl=self.status_ttl)
+
+    async def _cached_render(self, digest: str) -> Optional[Dict]:
+        """같은 해시의 렌더 결과 (공유 캐시 → S3 객체 순으로 확인)"""
+        rendered = await pdf_cache.get(f"pdf:{digest}")
+        if rendered is not None:
+            return rendered
+        s3_key = f"reports/pdf/{digest}.pdf"
+        if await s3_service.object_exists(s3_key):
+            rendered = {"pdf_url": s3_service.object_url(s3_key), "file_size": None}
+            await pdf_cache.set(f"pdf:{digest}", rendered, ttl=self.render_ttl)
+            return rendered
+        return None
+
+    async def render_and_upload(self, payload: Dict, digest: Optional[str] = None) -> Dict:
+        """
+        렌더링 + 업로드 (같은 해시는 캐시 재사용, 동시 요청은 한 번만 실행)
+
+        Returns:
+            {"pdf_url", "file_size", "content_hash", "cached"}
+        """
+        digest = digest or content_hash(payload)
+        rendered = await self._cached_render(digest)
+        if rendered is not None:
+            return {**rendered, "content_hash": digest, "cached": True}
+
+        async def run() -> Dict:
+            fd, path = tempfile.mkstemp(suffix=".pdf", prefix="report_")
+            os.close(fd)
+            try:
+                file_size = await analytics_executor.run(
+                    render_report_pdf, payload, path, timeout=self.render_timeout
+                )
+                with open(path, "rb") as stream:
+                    upload = await s3_service.upload_stream(stream, f"reports/pdf/{digest}.pdf", "application/pdf")
+            finally:
+                os.unlink(path)
+
+            if not upload.get("success"):
+                raise RuntimeError(upload.get("error", "PDF upload failed"))
+            result = {"pdf_url": upload["file_url"], "file_size": file_size}
+            await pdf_cache.set(f"pdf:{digest}", result, ttl=self.render_ttl)
+            return result
+
+        rendered = await get_group("report_pdf").do(digest, run)
+        return {**rendered, "content_hash": digest, "cached": False}
+
+    async def _export(self, kind: str, report_id: int, payload: Dict, digest: str) -> None:
+        """백그라운드 작업: 렌더링 → 업로드 → pdf_url 저장 → 상태 갱신"""
+        try:
+            result = await self.render_and_upload(payload, digest)
+            await self._save_url(kind, report_id, result["pdf_url"])
+            await self._set_status(kind, report_id, self._done(result))
+        except Exception as e:
+            logger.error(f"Report PDF export failed ({kind} {report_id}): {e}")
+            await self._set_status(kind, report_id, {"status": "failed", "content_hash": digest, "error": str(e)})
+
+    async def _save_url(self, kind: str, report_id: int, pdf_url: str) -> None:
+        session_factory = self.session_factory
+        if session_factory is None:
+            from app.core.database import AsyncSessionLocal
+            session_factory = AsyncSessionLocal
+
+        model = BrandReport if kind == "brand" else CampaignReport
+        async with session_factory() as db:
+            await db.execute(update(model).where(model.id == report_id).values(pdf_url=pdf_url))
+            await db.commit()
+
+    @staticmethod
+    def _done(result: Dict) -> Dict:
+        return {
+            "status": "done",
+            "pdf_url": result["pdf_url"],
+            "file_size": result.get("file_size"),
+            "content_hash": result["content_hash"],
+            "generated_at": datetime.utcnow().isoformat(),
+        }
+
+    async def start_export(self, db: AsyncSession, kind: str, report, options: Dict) -> Dict:
+        """
+        PDF 내보내기 시작 (요청 경로에서는 조회와 해시 계산만 수행)
+
+        Args:
+            db: 데이터베이스 세션
+            kind: "brand" / "campaign"
+            report: BrandReport / CampaignReport
+            options: ReportExportRequest 옵션
+
+        Returns:
+            작업 상태 ({"status": "done" | "rendering", ...})
+        """
+        if kind not in REPORT_KINDS:
+            raise ValueError(f"Unknown report kind: {kind}")
+
+        if kind == "brand":
+            payload = await self.brand_report_payload(db, report, options)
+        else:
+            payload = await self.campaign_report_payload(db, report, options)
+        digest = content_hash(payload)
+
+        rendered = await self._cached_render(digest)
+        if rendered is not None:
+            # 내용이 바뀌지 않았으면 렌더링 없이 완료
+            if report.pdf_url != rendered["pdf_url"]:
+                report.pdf_url = rendered["pdf_url"]
+                await db.commit()
+            status = self._done({**rendered, "content_hash": digest})
+            await self._set_status(kind, report.id, status)
+            return status
+
+        status = {"status": "rendering", "content_hash": digest}
+        await self._set_status(kind, report.id, status)
+        task = asyncio.create_task(self._export(kind, report.id, payload, digest))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return status
+
+
+# Singleton instance
+report_pdf_service = ReportPdfService(render_timeout=settings.REPORT_RENDER_TIMEOUT_SECONDS)
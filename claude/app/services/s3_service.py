@@ -2,6 +2,7 @@
 AWS S3 Service (Back1 Day 3)
 파일 업로드/다운로드 서비스
 """
+import asyncio
 import boto3
 from botocore.exceptions import ClientError
 from typing import Optional, BinaryIO
@@ -20,8 +21,12 @@ class S3Service:
     - 파일 다운로드 URL 생성
     - 파일 삭제
     - Presigned URL 생성
+    - 스트림 멀티파트 업로드 (파트 단위로 읽어 전체 파일을 메모리에 올리지 않음)
     """
 
+    # S3 멀티파트 최소 파트 크기 (마지막 파트 제외)
+    MIN_PART_SIZE = 5 * 1024 * 1024
+
     def __init__(self):
         """Initialize S3 client"""
         self.bucket_name = getattr(settings, 'AWS_S3_BUCKET', 'artnex-mvp-files')
@@ -128,6 +133,136 @@ class S3Service:
             "message": "AWS credentials가 없어 Mock 업로드를 사용합니다"
         }
 
+    def object_url(self, s3_key: str) -> str:
+        """S3 객체 URL"""
+        if self.mock_mode:
+            return f"https://mock-s3.artnex.com/{s3_key}"
+        return f"https://{self.bucket_name}.s3.{self.region}.amazonaws.com/{s3_key}"
+
+    async def object_exists(self, s3_key: str) -> bool:
+        """
+        S3 객체 존재 여부 (HEAD 요청)
+
+        Args:
+            s3_key: S3 객체 키
+
+        Returns:
+            존재 여부 (Mock 모드에서는 항상 False)
+        """
+        if self.mock_mode:
+            return False
+
+        try:
+            await asyncio.to_thread(self.s3_client.head_object, Bucket=self.bucket_name, Key=s3_key)
+            return True
+        except ClientError:
+            return False
+
+    async def upload_stream(
+        self,
+        stream: BinaryIO,
+        s3_key: str,
+        content_type: Optional[str] = None,
+        part_size: int = 8 * 1024 * 1024
+    ) -> dict:
+        """
+        파일 객체를 멀티파트 업로드로 스트리밍 (한 번에 파트 하나만 메모리에 유지)
+
+        Args:
+            stream: 읽기 가능한 바이너리 스트림
+            s3_key: S3 객체 키 (지정한 키 그대로 사용)
+            content_type: 파일 MIME 타입
+            part_size: 파트 크기 (최소 5MB)
+
+        Returns:
+            업로드 결과 딕셔너리
+        """
+        part_size = max(part_size, self.MIN_PART_SIZE)
+        content_type = content_type or self._guess_content_type(s3_key)
+
+        if self.mock_mode:
+            file_size = 0
+            while chunk := stream.read(part_size):
+                file_size += len(chunk)
+            return {
+                "success": True,
+                "file_url": self.object_url(s3_key),
+                "s3_key": s3_key,
+                "file_size": file_size,
+                "parts": max(1, -(-file_size // part_size)),
+                "uploaded_at": datetime.now().isoformat(),
+                "mock": True,
+                "message": "AWS credentials가 없어 Mock 업로드를 사용합니다"
+            }
+
+        upload_id = None
+        completed = False
+        try:
+            upload = await asyncio.to_thread(
+                self.s3_client.create_multipart_upload,
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                ContentType=content_type
+            )
+            upload_id = upload["UploadId"]
+
+            parts = []
+            file_size = 0
+            # 빈 스트림도 파트 하나로 업로드
+            chunk = stream.read(part_size)
+            while True:
+                response = await asyncio.to_thread(
+                    self.s3_client.upload_part,
+                    Bucket=self.bucket_name,
+                    Key=s3_key,
+                    UploadId=upload_id,
+                    PartNumber=len(parts) + 1,
+                    Body=chunk
+                )
+                parts.append({"PartNumber": len(parts) + 1, "ETag": response["ETag"]})
+                file_size += len(chunk)
+                chunk = stream.read(part_size)
+                if not chunk:
+                    break
+
+            await asyncio.to_thread(
+                self.s3_client.complete_multipart_upload,
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts}
+            )
+            completed = True
+
+            return {
+                "success": True,
+                "file_url": self.object_url(s3_key),
+                "s3_key": s3_key,
+                "file_size": file_size,
+                "parts": len(parts),
+                "uploaded_at": datetime.now().isoformat()
+            }
+
+        except ClientError as e:
+            print(f"S3 multipart upload error: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e),
+                "message": "파일 업로드 실패"
+            }
+        finally:
+            # 실패 / 취소 / 네트워크 오류 등 어떤 이유로든 완료되지 않은 업로드는 중단 (파트 저장 비용 방지)
+            if upload_id is not None and not completed:
+                try:
+                    await asyncio.to_thread(
+                        self.s3_client.abort_multipart_upload,
+                        Bucket=self.bucket_name,
+                        Key=s3_key,
+                        UploadId=upload_id
+                    )
+                except Exception as e:
+                    print(f"S3 multipart abort error: {str(e)}")
+
     def generate_presigned_url(
         self,
         s3_key: str,
@@ -0,0 +1,134 @@
+"""
+Search Suggestion Service
+AI brand suggestions for search queries, fetched separately from the search results
+"""
+import asyncio
+from typing import Dict, List, Optional
+from app.core.cache import cache
+from app.core.config import settings
+from app.services.gpt_service import gpt_service
+from app.services.gpt_scheduler import GPTPriority
+
+suggestion_cache = cache.namespaced("search_suggestions")
+
+
+def normalize_query(query: Optional[str]) -> str:
+    """Case- and whitespace-insensitive query used for cache keys and the GPT prompt"""
+    return " ".join((query or "").casefold().split())
+
+
+class SearchSuggestionService:
+    """
+    AI suggestions for brand search
+
+    Features:
+    - Per-query cache (normalized query + category), shared across workers
+    - Per-user debounce: while a user is still typing, superseded requests
+      return without calling GPT (sequence number in the shared cache)
+    - Fallback suggestion when GPT is unavailable (not cached)
+    """
+
+    def __init__(self, debounce_seconds: float = 0.3, ttl: float = 3600):
+        self.debounce_seconds = debounce_seconds
+        self.ttl = ttl
+
+    @staticmethod
+    def _cache_key(query: str, category: Optional[str]) -> str:
+        return f"{category or ''}:{query}"
+
+    @staticmethod
+    def fallback(query: str, category: Optional[str]) -> List[Dict]:
+        """Default suggestion when GPT returns nothing"""
+        return [{
+            "brand_name": f"{query} 관련 브랜드" if query else "추천 브랜드",
+            "category": category or "일반",
+            "reason": "검색어 기반 추천",
+            "confidence_score": 0.6
+        }]
+
+    async def generate(self, query: str, category: Optional[str]) -> List[Dict]:
+        """
+        Call GPT for suggestions (no cache lookup, no debounce)
+
+        Returns:
+            Suggestions, or an empty list if GPT failed
+        """
+        gpt_result = await gpt_service.recommend_brands(
+            industry=category or "일반",
+            keywords=[query] if query else None,
+            limit=3,
+            priority=GPTPriority.INTERACTIVE
+        )
+        if not gpt_result["success"] or not gpt_result["data"]:
+            return []
+
+        return [
+            {
+                "brand_name": rec.get("brand_name", "AI 추천 브랜드"),
+                "category": rec.get("target_audience", category or "일반"),
+                "reason": rec.get("concept", "AI 기반 추천"),
+                "confidence_score": 0.8
+            }
+            for rec in gpt_result["data"].get("recommendations", [])
+        ]
+
+    async def _debounce(self, user_id: int) -> bool:
+        """
+        Wait out the debounce window
+
+        Returns:
+            True if a newer request from the same user arrived meanwhile
+        """
+        if self.debounce_seconds <= 0:
+            return False
+        sequence = await suggestion_cache.incr(f"debounce:{user_id}")
+        await asyncio.sleep(self.debounce_seconds)
+        if sequence is None:
+            # shared cache unavailable: no debounce
+            return False
+        return await suggestion_cache.get(f"debounce:{user_id}") != sequence
+
+    async def suggest(
+        self,
+        user_id: int,
+        query: Optional[str],
+        category: Optional[str] = None,
+        debounce: bool = True
+    ) -> Dict:
+        """
+        AI suggestions for a search query
+
+        Args:
+            user_id: Requesting user (debounce scope)
+            query: Search query
+            category: Optional category filter
+            debounce: Wait for the user to stop typing before calling GPT
+
+        Returns:
+            {"suggestions": [...], "cached": bool, "superseded": bool}
+        """
+        query = normalize_query(query)
+        if not query and not category:
+            return {"suggestions": self.fallback(query, category), "cached": False, "superseded": False}
+
+        key = self._cache_key(query, category)
+        suggestions = await suggestion_cache.get(key)
+        if suggestions is not None:
+            return {"suggestions": suggestions, "cached": True, "superseded": False}
+
+        if debounce and await self._debounce(user_id):
+            return {"suggestions": [], "cached": False, "superseded": True}
+
+        suggestions = await self.generate(query, category)
+        if suggestions:
+            await suggestion_cache.set(key, suggestions, ttl=self.ttl)
+        else:
+            suggestions = self.fallback(query, category)
+        return {"suggestions": suggestions, "cached": False, "superseded": False}
+
+
+# Singleton instance
+search_suggestion_service = SearchSuggestionService(
+    debounce_seconds=settings.SEARCH_SUGGESTION_DEBOUNCE_MS / 1000,
+    ttl=settings.SEARCH_SUGGESTION_CACHE_TTL
+)
@@ -0,0 +1,164 @@
+"""
+Single-Flight Request Coalescing
+동일한 인자로 동시에 들어온 외부 API 호출을 하나의 upstream 요청으로 합침
+"""
+import asyncio
+import copy
+import functools
+import inspect
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+from app.core.cache import make_call_key
+from app.services.gpt_scheduler import SharedPriority
+
+
+class SingleFlight:
+    """
+    Single-flight 그룹
+
+    같은 key로 진행 중인 호출이 있으면 새 upstream 요청을 보내지 않고
+    진행 중인 요청의 결과를 함께 받습니다.
+
+    기능:
+    - key 단위 in-flight 요청 공유
+    - 호출자 한 명의 취소는 공유 요청을 취소하지 않음 (shield),
+      기다리는 호출자가 모두 취소되면 upstream 요청도 취소
+    - 코얼레싱 카운터 (호출 수, upstream 실행 수, 공유 수)
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._context: Dict[str, Any] = {}
+        self._waiters: Dict[asyncio.Future, int] = {}
+        self._metrics = {
+            "calls": 0,
+            "executions": 0,
+            "coalesced": 0,
+            "errors": 0,
+            "cancelled": 0,
+        }
+
+    def context(self, key: str) -> Any:
+        """진행 중인 key 요청을 시작한 호출자가 넘긴 context (없으면 None)"""
+        task = self._in_flight.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            return None
+        return self._context.get(key)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]], context: Any = None) -> Any:
+        """
+        key에 대한 호출 실행 (진행 중이면 결과 공유)
+
+        Args:
+            key: 요청 식별 키
+            fn: upstream 호출 코루틴 팩토리
+            context: upstream 요청을 시작할 때 함께 보관할 값 (나중 호출자가 context()로 조회)
+
+        Returns:
+            upstream 호출 결과 (공유받은 호출자는 deep copy)
+        """
+        self._metrics["calls"] += 1
+
+        task = self._in_flight.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            self._metrics["coalesced"] += 1
+            result = await self._wait(key, task)
+            # 호출자들이 결과 dict를 수정해도 서로 영향이 없도록 복사
+            return copy.deepcopy(result)
+
+        self._metrics["executions"] += 1
+        task = asyncio.ensure_future(fn())
+        self._in_flight[key] = task
+        self._context[key] = context
+        task.add_done_callback(lambda t: self._on_done(key, t))
+        return await self._wait(key, task)
+
+    async def _wait(self, key: str, task: asyncio.Future) -> Any:
+        """
+        공유 요청 결과 대기
+
+        취소된 호출자는 대기에서만 빠지고, 마지막 호출자까지 취소되면
+        결과를 받을 곳이 없으므로 upstream 요청을 취소합니다.
+        """
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                if not task.done():
+                    # 취소 중인 요청에 새 호출자가 합류하지 않도록 바로 제거
+                    if self._in_flight.get(key) is task:
+                        del self._in_flight[key]
+                        self._context.pop(key, None)
+                    task.cancel()
+                    self._metrics["cancelled"] += 1
+
+    def _on_done(self, key: str, task: asyncio.Future) -> None:
+        """완료된 요청을 in-flight 목록에서 제거"""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+            self._context.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            self._metrics["errors"] += 1
+
+    def get_metrics(self) -> Dict:
+        """코얼레싱 카운터"""
+        return {
+            **self._metrics,
+            "in_flight": len(self._in_flight),
+        }
+
+
+_groups: Dict[str, SingleFlight] = {}
+
+
+def get_group(name: str) -> SingleFlight:
+    """이름별 single-flight 그룹 반환 (없으면 생성)"""
+    if name not in _groups:
+        _groups[name] = SingleFlight(name)
+    return _groups[name]
+
+
+def get_all_metrics() -> Dict[str, Dict]:
+    """모든 single-flight 그룹의 카운터"""
+    return {name: group.get_metrics() for name, group in _groups.items()}
+
+
+def coalesce(group: str, exclude: Iterable[str] = (), priority: Optional[str] = None):
+    """
+    서비스 async 메서드용 single-flight 데코레이터
+
+    Args:
+        group: single-flight 그룹 이름 (예: "gpt", "ideogram")
+        exclude: key 계산에서 제외할 인자 (예: 스케줄링 우선순위)
+        priority: 스케줄링 우선순위 인자 이름. 지정하면 upstream 요청에 SharedPriority를 넘기고,
+            진행 중인 요청에 합류한 호출자가 더 급하면 대기 중인 요청의 우선순위를 올립니다.
+    """
+    exclude = tuple(exclude)
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = make_call_key(func, args, kwargs, exclude)
+            flight = get_group(group)
+            if priority is None:
+                return await flight.do(key, lambda: func(*args, **kwargs))
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            requested = bound.arguments[priority]
+            leader = flight.context(key)
+            if leader is not None:
+                await leader.raise_to(requested)
+
+            shared = SharedPriority(requested)
+            bound.arguments[priority] = shared
+            return await flight.do(key, lambda: func(*bound.args, **bound.kwargs), context=shared)
+
+        return wrapper
+
+    return decorator
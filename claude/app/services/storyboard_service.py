@@ -0,0 +1,287 @@
+"""
+Storyboard Service (Back3)
+숏폼 스토리보드 생성 (스크립트 → 컷 분할 → 프레임 프롬프트 → Ideogram 이미지 동시 생성)
+"""
+import asyncio
+import json
+import logging
+import re
+from typing import AsyncIterator, Dict, List, Optional, Sequence
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.models.brand import Brand
+from app.models.design import ShortformProject, StoryboardFrame
+from app.services.ideogram_service import ideogram_service
+from app.services.registry import services
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_NUM_CUTS = 6
+
+# 문장 경계: 종결 부호 뒤 공백 또는 줄바꿈
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?。…])\s+|\n+")
+
+
+def split_sentences(script_text: str) -> List[str]:
+    return [sentence.strip() for sentence in SENTENCE_BOUNDARY.split(script_text or "") if sentence.strip()]
+
+
+def split_script(script_text: str, num_cuts: int) -> List[str]:
+    """
+    스크립트 → `num_cuts`개 컷 대사
+
+    문장 순서를 유지하면서 컷마다 글자 수가 고르게 되도록 문장 경계에서 나눕니다.
+    문장이 컷 수보다 적으면 단어 단위로 나눕니다. 빈 스크립트는 빈 컷을 반환합니다.
+    """
+    units = split_sentences(script_text)
+    if len(units) < num_cuts:
+        units = (script_text or "").split()
+    if not units:
+        return [""] * num_cuts
+    if len(units) <= num_cuts:
+        return units + [""] * (num_cuts - len(units))
+
+    # 누적 글자 수가 k/num_cuts 지점에 가장 가까운 경계에서 자름 (컷마다 최소 1개 단위)
+    cumulative = []
+    total = 0
+    for unit in units:
+        total += len(unit)
+        cumulative.append(total)
+
+    cuts = []
+    start = 0
+    for k in range(1, num_cuts):
+        target = total * k / num_cuts
+        # 남은 컷마다 한 단위씩 남겨 둠
+        last_end = len(units) - (num_cuts - k)
+        end = min(
+            range(start + 1, last_end + 1),
+            key=lambda i: abs(cumulative[i - 1] - target)
+        )
+        cuts.append(" ".join(units[start:end]))
+        start = end
+    cuts.append(" ".join(units[start:]))
+    return cuts
+
+
+def shot_direction(frame_number: int, num_cuts: int) -> str:
+    """컷 위치별 기본 촬영 노트"""
+    if frame_number == 1:
+        return "와이드 샷 - 도입 (시선 끌기)"
+    if frame_number == num_cuts:
+        return "클로즈업 - 마무리 (브랜드 / CTA)"
+    return "미디엄 샷 - 전개" if frame_number % 2 == 0 else "클로즈업 - 전개 (제품 디테일)"
+
+
+SHOT_STYLES = {
+    "와이드": "wide establishing shot",
+    "미디엄": "medium shot",
+    "클로즈업": "close-up shot",
+}
+
+
+def build_frame_prompt(
+    dialogue: str,
+    frame_number: int,
+    num_cuts: int,
+    brand_name: Optional[str] = None,
+    industry: Optional[str] = None,
+    shooting_note: Optional[str] = None
+) -> str:
+    """프레임 이미지 프롬프트 (IdeogramService.build_design_prompt와 같은 형식)"""
+    prompt_parts = [f"Storyboard frame {frame_number} of {num_cuts} for a short-form video"]
+    if brand_name:
+        prompt_parts.append(f"for {brand_name}")
+    if industry:
+        prompt_parts.append(f"in the {industry} industry")
+
+    shot = next(
+        (style for keyword, style in SHOT_STYLES.items() if shooting_note and shooting_note.startswith(keyword)),
+        None
+    )
+    if shot:
+        prompt_parts.append(shot)
+    if dialogue:
+        prompt_parts.append(f"scene: {dialogue[:300]}")
+
+    prompt_parts.append("cinematic lighting, consistent characters, storyboard illustration, no text")
+    return ", ".join(prompt_parts)
+
+
+def plan_frames(project: ShortformProject, brand: Optional[Brand] = None) -> List[Dict]:
+    """프로젝트 → 프레임 행 (대사 / 촬영 노트 / 이미지 프롬프트)"""
+    num_cuts = project.num_cuts or DEFAULT_NUM_CUTS
+    frames = []
+    for frame_number, dialogue in enumerate(split_script(project.script_text, num_cuts), start=1):
+        note = shot_direction(frame_number, num_cuts)
+        frames.append({
+            "project_id": project.id,
+            "frame_number": frame_number,
+            "dialogue": dialogue,
+            "shooting_note": note,
+            "image_prompt": build_frame_prompt(
+                dialogue, frame_number, num_cuts,
+                brand.brand_name if brand else None,
+                (brand.industry or brand.category) if brand else None,
+                note
+            ),
+        })
+    return frames
+
+
+def _event(event: Dict) -> bytes:
+    """NDJSON 한 줄"""
+    return (json.dumps(event, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+
+
+class StoryboardService:
+    """
+    스토리보드 생성 서비스
+
+    기능:
+    - 스크립트를 컷 수만큼 분할 (문장 경계, 글자 수 균등) 및 프레임별 촬영 노트 / 이미지 프롬프트 생성
+    - StoryboardFrame 일괄 INSERT (재생성 시 기존 프레임 교체), 스크립트는 핵심 구문 코퍼스에 반영
+    - 프레임 이미지 동시 생성 (세마포어로 동시 요청 수 제한), 완료되는 대로 저장 및 스트리밍
+    - 실패한 프레임만 다시 생성 (image_url이 비어 있는 프레임)
+    """
+
+    def __init__(self, concurrency: int = 4, session_factory=None):
+        self.concurrency = concurrency
+        self.session_factory = session_factory
+
+    def _sessions(self):
+        if self.session_factory is not None:
+            return self.session_factory
+        from app.core.database import AsyncSessionLocal
+        return AsyncSessionLocal
+
+    async def create_frames(self, db: AsyncSession, project: ShortformProject) -> List[Dict]:
+        """
+        프레임 계획 후 일괄 저장 (기존 프레임은 삭제)
+
+        Returns:
+            저장된 프레임 (id 포함, frame_number 순)
+        """
+        brand = await db.get(Brand, project.brand_id)
+        rows = plan_frames(project, brand)
+
+        await db.execute(delete(StoryboardFrame).where(StoryboardFrame.project_id == project.id))
+        result = await db.execute(
+            insert(StoryboardFrame).returning(StoryboardFrame.id, StoryboardFrame.frame_number), rows
+        )
+        ids = {frame_number: frame_id for frame_id, frame_number in result.all()}
+        await db.commit()
+
+        # 핵심 구문 코퍼스 문서 빈도 반영 (실패해도 스토리보드 생성은 계속)
+        try:
+            await services.key_phrases.key_phrase_engine.add_shortform(db, project)
+        except Exception as e:
+            logger.warning(f"Key phrase corpus update failed (shortform {project.id}): {e}")
+        return [{"id": ids[row["frame_number"]], **row, "image_url": None} for row in rows]
+
+    async def _render_one(self, semaphore: asyncio.Semaphore, frame: Dict, aspect_ratio: str) -> Dict:
+        async with semaphore:
+            try:
+                result = await ideogram_service.generate_image(
+                    prompt=frame["image_prompt"],
+                    style="realistic",
+                    aspect_ratio=aspect_ratio,
+                    num_images=1
+                )
+            except Exception as e:
+                result = {"success": False, "error": str(e)}
+
+        images = result.get("images") or []
+        if result.get("success") and images:
+            return {"id": frame["id"], "frame_number": frame["frame_number"], "status": "done",
+                    "image_url": images[0]["url"]}
+        return {"id": frame["id"], "frame_number": frame["frame_number"], "status": "failed",
+                "error": result.get("error", "이미지 생성 실패")}
+
+    async def render_frames(
+        self,
+        db: AsyncSession,
+        frames: Sequence[Dict],
+        aspect_ratio: str
+    ) -> AsyncIterator[Dict]:
+        """
+        프레임 이미지 동시 생성 (최대 `concurrency`개), 완료 순서대로 저장 후 반환
+
+        Yields:
+            {"id", "frame_number", "status": "done" | "failed", "image_url" | "error"}
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = [asyncio.create_task(self._render_one(semaphore, frame, aspect_ratio)) for frame in frames]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                if result["status"] == "done":
+                    await db.execute(
+                        update(StoryboardFrame).where(StoryboardFrame.id == result["id"])
+                        .values(image_url=result["image_url"])
+                    )
+                    await db.commit()
+                yield result
+        finally:
+            # 클라이언트 연결이 끊기면 남은 생성 요청 취소
+            for task in tasks:
+                task.cancel()
+
+    async def _stream(self, project_id: int, retry_frame_ids: Optional[Sequence[int]]) -> AsyncIterator[bytes]:
+        async with self._sessions()() as db:
+            project = await db.get(ShortformProject, project_id)
+            if project is None:
+                yield _event({"event": "error", "error": "프로젝트를 찾을 수 없습니다"})
+                return
+
+            if retry_frame_ids is None:
+                frames = await self.create_frames(db, project)
+                yield _event({"event": "storyboard", "project_id": project_id, "frames": frames})
+            else:
+                query = select(StoryboardFrame).where(
+                    StoryboardFrame.project_id == project_id,
+                    StoryboardFrame.image_url.is_(None)
+                ).order_by(StoryboardFrame.frame_number)
+                if retry_frame_ids:
+                    query = query.where(StoryboardFrame.id.in_(retry_frame_ids))
+                frames = [
+                    {"id": f.id, "frame_number": f.frame_number, "image_prompt": f.image_prompt}
+                    for f in (await db.execute(query)).scalars()
+                ]
+                yield _event({"event": "retry", "project_id": project_id,
+                              "frame_ids": [frame["id"] for frame in frames]})
+
+            failed = []
+            async for result in self.render_frames(db, frames, project.aspect_ratio or "9:16"):
+                if result["status"] == "failed":
+                    failed.append(result["id"])
+                yield _event({"event": "frame", **result})
+
+            yield _event({
+                "event": "done",
+                "project_id": project_id,
+                "rendered": len(frames) - len(failed),
+                "failed_frame_ids": failed,
+            })
+
+    def generate_stream(self, project_id: int) -> AsyncIterator[bytes]:
+        """
+        스토리보드 생성 NDJSON 스트림
+
+        응답을 보내는 동안 요청 세션이 닫히므로 자체 세션을 사용합니다.
+        이벤트: storyboard (프레임 계획) → frame (완료 순) → done
+        """
+        return self._stream(project_id, None)
+
+    def retry_stream(self, project_id: int, frame_ids: Optional[Sequence[int]] = None) -> AsyncIterator[bytes]:
+        """
+        이미지가 없는 프레임만 다시 생성 (frame_ids 지정 시 그중에서만)
+
+        이벤트: retry (대상 프레임) → frame → done
+        """
+        return self._stream(project_id, list(frame_ids or []))
+
+
+# Singleton instance
+storyboard_service = StoryboardService(concurrency=settings.STORYBOARD_RENDER_CONCURRENCY)
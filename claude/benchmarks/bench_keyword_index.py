@@ -0,0 +1,74 @@
+"""
+Keyword Similarity Index Benchmark (Back2)
+전수 비교 vs LSH 인덱스 구축/검색 시간 및 recall 측정
+
+사용법:
+    python -m benchmarks.bench_keyword_index --sizes 10000 100000 1000000 --dim 128
+"""
+import argparse
+import time
+import numpy as np
+from app.services.keyword_index import KeywordSimilarityIndex
+
+
+def random_unit_vectors(n: int, dim: int, rng: np.random.Generator) -> np.ndarray:
+    vectors = rng.standard_normal((n, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def clustered_unit_vectors(n: int, dim: int, rng: np.random.Generator, n_topics: int = 1000) -> np.ndarray:
+    """실제 키워드처럼 주제별로 뭉친 벡터 (주제 중심 + 잡음)"""
+    topics = random_unit_vectors(n_topics, dim, rng)
+    vectors = topics[rng.integers(0, n_topics, n)] + 0.35 * random_unit_vectors(n, dim, rng)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.astype(np.float32)
+
+
+def bench(size: int, dim: int, n_queries: int, top_n: int, batch: int) -> None:
+    rng = np.random.default_rng(0)
+    vectors = clustered_unit_vectors(size, dim, rng)
+    keywords = [f"kw{i}" for i in range(size)]
+    queries = vectors[rng.choice(size, n_queries, replace=False)]
+
+    results = {}
+    for mode, threshold in (("brute_force", size + 1), ("lsh", 0)):
+        index = KeywordSimilarityIndex(dim, lsh_threshold=threshold)
+
+        start = time.perf_counter()
+        for offset in range(0, size, batch):
+            index.add(keywords[offset:offset + batch], vectors[offset:offset + batch])
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        found = index.query(queries, top_n=top_n)
+        query = time.perf_counter() - start
+
+        results[mode] = [{k for k, _ in row} for row in found]
+        print(
+            f"{size:>9,} {mode:<12} build {build:8.2f}s  "
+            f"query {query / n_queries * 1000:8.2f} ms/query"
+        )
+
+    recall = np.mean([
+        len(approx & exact) / max(len(exact), 1)
+        for approx, exact in zip(results["lsh"], results["brute_force"])
+    ])
+    print(f"{size:>9,} lsh recall@{top_n}: {recall:.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keyword similarity index benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--batch", type=int, default=10_000, help="add() 배치 크기")
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        bench(size, args.dim, args.queries, args.top_n, args.batch)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,18 @@
 Pytest Configuration and Fixtures
 테스트를 위한 공통 설정 및 픽스처
 """
+import os
 import pytest
+import pytest_asyncio
 import asyncio
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.pool import NullPool
 from httpx import AsyncClient
 
+# 테스트는 Redis 없이 프로세스 내 캐시 사용 (app 설정 로드 전에 지정)
+os.environ["CACHE_BACKEND"] = "memory"
+
 from app.main import app
 from app.core.database import Base, get_db
 from app.core.config import settings
@@ -62,6 +67,21 @@ async def test_db() -> AsyncGenerator[AsyncSession, None]:
     await engine.dispose()
 
 
+@pytest_asyncio.fixture
+async def session_factory() -> AsyncGenerator[async_sessionmaker, None]:
+    """
+    인메모리 SQLite 세션 팩토리 (서비스 session_factory 주입용)
+    테스트마다 새 DB에 전체 테이블 생성, 종료 시 엔진 정리
+    """
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    await engine.dispose()
+
+
 @pytest.fixture
 async def client(test_db: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
     """
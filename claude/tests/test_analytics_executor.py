@@ -0,0 +1,54 @@
+"""
+Analytics Executor Tests
+분석 작업 프로세스 풀 오프로드, 타임아웃, 큐 메트릭 테스트
+"""
+import math
+import time
+import pytest
+from app.core.analytics_executor import AnalyticsExecutor, AnalyticsTimeoutError
+from app.services import keyword_clustering_service as clustering_module
+from app.services.keyword_clustering_service import KeywordClusteringService
+from app.services.keyword_vectorizer import KeywordVectorCache
+
+
+@pytest.mark.asyncio
+async def test_process_pool_runs_task_and_times_out():
+    """프로세스 풀 실행, 타임아웃, 메트릭 테스트"""
+    executor = AnalyticsExecutor(max_workers=1, timeout=30)
+    try:
+        await executor.start()
+        assert await executor.run(math.factorial, 10) == 3628800
+
+        with pytest.raises(AnalyticsTimeoutError):
+            await executor.run(time.sleep, 2, timeout=0.2)
+
+        metrics = executor.get_metrics()
+        assert metrics["mode"] == "process"
+        assert metrics["completed"] == 1
+        assert metrics["timeouts"] == 1
+        assert metrics["in_flight"] == 0
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cluster_keywords_async_merges_worker_vectors(monkeypatch):
+    """워커에서 계산한 벡터가 호출 프로세스 캐시에 병합되는지 테스트"""
+    executor = AnalyticsExecutor(max_workers=0)
+    monkeypatch.setattr(clustering_module, "analytics_executor", executor)
+
+    service = KeywordClusteringService(backend="hashing")
+    service.vector_cache = KeywordVectorCache()
+    keywords = ["비건 화장품", "천연 화장품", "친환경 용기", "재활용 패키지"]
+
+    result = await service.cluster_keywords_async(keywords, num_clusters=2, method="hierarchical")
+
+    assert result["success"] is True
+    assert service.dendrogram["num_keywords"] == len(keywords)
+    assert service.vector_cache.get_metrics()["pending_persist"] == len(keywords)
+
+    assert await service.index_keywords_async(keywords) >= 0
+    similar = await service.find_similar_in_corpus_async(["비건 화장품"], top_n=2)
+    assert len(similar["비건 화장품"]) == 2
+    assert executor.get_metrics()["failed"] == 0
+    executor.shutdown()
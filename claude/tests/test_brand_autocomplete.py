@@ -0,0 +1,94 @@
+"""
+Brand Autocomplete Tests
+사용자별 접두사 / n-gram 자동완성 인덱스 및 브랜드 변경 시 무효화 테스트
+"""
+import time
+import pytest
+from app.models.brand import Brand
+from app.services.brand_autocomplete import BrandAutocompleteIndex, BrandAutocompleteService
+from app.services import brand_autocomplete as autocomplete_module
+
+
+def sample_index() -> BrandAutocompleteIndex:
+    return BrandAutocompleteIndex.from_brands([
+        (1, "그린비건 코스메틱", "뷰티", ["비건", "친환경"]),
+        (2, "코스모 베이커리", "식품", ["비건"]),
+        (3, "Daily Fit", "패션", None),
+    ])
+
+
+def test_index_prefix_word_and_infix_matches():
+    """전체 접두사 > 단어 접두사 > 중간 일치 순서 및 카테고리 / 키워드 중복 제거 테스트"""
+    index = sample_index()
+
+    results = index.lookup("코스")
+    assert [r["text"] for r in results] == ["코스모 베이커리", "그린비건 코스메틱"]
+
+    results = index.lookup("비건")
+    assert results[0] == {"text": "비건", "type": "keyword", "brand_id": None, "weight": 2}
+    assert results[1]["text"] == "그린비건 코스메틱"
+
+
+def test_lookup_normalizes_query():
+    """대소문자 / 공백 정규화, 일치 항목이 없으면 빈 목록"""
+    index = sample_index()
+
+    assert index.lookup("  daily   f")[0]["brand_id"] == 3
+    assert index.lookup("없는 브랜드") == []
+
+
+def test_lookup_is_fast_on_large_index():
+    """수천 개 항목에서도 조회는 1ms 미만"""
+    large = BrandAutocompleteIndex.from_brands([
+        (i, f"브랜드 {i:05d}", f"카테고리{i % 50}", [f"키워드{i % 300}"]) for i in range(5000)
+    ])
+    started = time.perf_counter()
+    for _ in range(100):
+        large.lookup("브랜드 0012")
+    assert (time.perf_counter() - started) / 100 < 0.001
+
+
+@pytest.fixture
+def service(monkeypatch) -> BrandAutocompleteService:
+    service = BrandAutocompleteService()
+    monkeypatch.setattr(autocomplete_module, "brand_autocomplete", service)
+    return service
+
+
+async def seed_brands(session_factory) -> None:
+    async with session_factory() as db:
+        db.add_all([
+            Brand(user_id=1, brand_name="그린비건", category="뷰티"),
+            Brand(user_id=2, brand_name="그린테이블", category="식품"),
+        ])
+        await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_index_is_built_once_per_user(service, session_factory):
+    """사용자별 인덱스를 한 번만 만들고 이후 조회는 캐시된 인덱스 사용"""
+    await seed_brands(session_factory)
+    async with session_factory() as db:
+        assert [r["text"] for r in await service.suggest(db, 1, "그린")] == ["그린비건"]
+        await service.suggest(db, 2, "그린")
+        assert service.get_metrics()["builds"] == 2
+
+        await service.suggest(db, 1, "뷰")
+        assert service.get_metrics()["builds"] == 2
+
+
+@pytest.mark.asyncio
+async def test_index_is_rebuilt_after_brand_writes(service, session_factory):
+    """브랜드 커밋 시 해당 사용자 인덱스만 무효화되는지 테스트"""
+    await seed_brands(session_factory)
+    async with session_factory() as db:
+        await service.suggest(db, 1, "그린")
+        await service.suggest(db, 2, "그린")
+
+        db.add(Brand(user_id=1, brand_name="그린마켓"))
+        await db.commit()
+
+        results = await service.suggest(db, 1, "그린")
+        assert [r["text"] for r in results] == ["그린마켓", "그린비건"]
+        await service.suggest(db, 2, "그린")
+        assert service.get_metrics()["builds"] == 3
@@ -0,0 +1,67 @@
+"""
+Brand Search Tests
+FTS5 기반 브랜드 검색 (관련도 정렬, 동일 쿼리 총 개수, 인덱스 동기화) 테스트
+"""
+import pytest
+from app.models.brand import Brand
+from app.services.brand_search_service import BrandSearchService
+
+
+BRANDS = [
+    {"brand_name": "그린비건 코스메틱", "category": "뷰티", "description": "친환경 화장품"},
+    {"brand_name": "데일리핏", "category": "패션", "description": "그린비건 가죽을 사용하는 라이프 브랜드"},
+    {"brand_name": "그린테이블", "category": "식품", "slogan": "매일의 채소", "keywords": ["샐러드", "그린"]},
+    {"brand_name": "그린비건 베이커리", "category": "식품", "description": "비건 빵"},
+]
+
+
+async def seed_brands(session_factory) -> None:
+    async with session_factory() as db:
+        db.add_all([Brand(user_id=1, **brand) for brand in BRANDS])
+        db.add(Brand(user_id=2, brand_name="그린비건 스토어"))
+        await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_name_matches_first(session_factory):
+    """다른 사용자의 브랜드 제외, 이름 일치가 설명 일치보다 높은 점수"""
+    await seed_brands(session_factory)
+    async with session_factory() as db:
+        results, total = await BrandSearchService.search(db, 1, "그린비건")
+        assert total == 3
+        assert results[-1][0].brand_name == "데일리핏"
+        assert results[0][1] > results[-1][1]
+
+
+@pytest.mark.asyncio
+async def test_category_filter_applies_to_total(session_factory):
+    """카테고리 필터는 총 개수에도 반영"""
+    await seed_brands(session_factory)
+    async with session_factory() as db:
+        results, total = await BrandSearchService.search(db, 1, "그린비건", category="식품", limit=1)
+        assert total == 1 and results[0][0].brand_name == "그린비건 베이커리"
+
+
+@pytest.mark.asyncio
+async def test_search_matches_keywords_and_short_terms(session_factory):
+    """키워드(JSON)와 트라이그램보다 짧은 검색어"""
+    await seed_brands(session_factory)
+    async with session_factory() as db:
+        results, _ = await BrandSearchService.search(db, 1, "샐러드")
+        assert [brand.brand_name for brand, _ in results] == ["그린테이블"]
+        assert (await BrandSearchService.search(db, 1, "채소"))[1] == 1
+
+
+@pytest.mark.asyncio
+async def test_index_follows_updates_and_deletes(session_factory):
+    """수정 / 삭제가 트리거로 인덱스에 반영"""
+    await seed_brands(session_factory)
+    async with session_factory() as db:
+        brand = (await BrandSearchService.search(db, 1, "샐러드"))[0][0][0]
+        brand.description = "유기농 비건 샐러드"
+        await db.commit()
+        assert (await BrandSearchService.search(db, 1, "유기농"))[1] == 1
+
+        await db.delete(brand)
+        await db.commit()
+        assert (await BrandSearchService.search(db, 1, "샐러드"))[1] == 0
@@ -0,0 +1,151 @@
+"""
+Cache Tests
+공유 캐시 계층 (TTL, 네임스페이스, 스탬피드 방지, 장애 시 우회) 테스트
+"""
+import asyncio
+import pytest
+from app.core import cache as cache_module
+from app.core.cache import Cache, CacheBackend, MemoryCacheBackend, cached
+
+
+@pytest.mark.asyncio
+async def test_get_set_namespace_and_ttl():
+    """기본 get/set, 네임스페이스 분리, TTL 만료 테스트"""
+    backend = MemoryCacheBackend()
+    root = Cache(backend, default_ttl=60)
+    gpt, kpi = root.namespaced("gpt"), root.namespaced("kpi")
+
+    await gpt.set("a", {"success": True, "items": [1, 2]})
+    await kpi.set("a", 1, ttl=0.05)
+
+    assert await gpt.get("a") == {"success": True, "items": [1, 2]}
+    assert await kpi.get_many(["a", "b"]) == {"a": 1}
+    assert "artnex:gpt:a" in backend._entries
+
+    await asyncio.sleep(0.06)
+    assert await kpi.get("a", default="expired") == "expired"
+    assert await kpi.incr("generation") == 1
+    assert await kpi.incr("generation") == 2
+    assert await kpi.get("generation") == 2
+
+    # 공유 메트릭
+    metrics = root.get_metrics()
+    assert metrics["backend"] == "memory"
+    assert metrics["hits"] == 3 and metrics["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_computes_once_under_concurrency():
+    """동시 미스에서 loader가 한 번만 실행되는지 테스트"""
+    cache = Cache(MemoryCacheBackend(), "test")
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.1)
+        return {"value": 42}
+
+    results = await asyncio.gather(*(cache.get_or_set("key", loader, beta=0) for _ in range(5)))
+
+    assert calls == 1
+    assert all(result == {"value": 42} for result in results)
+    assert cache.get_metrics()["lock_waits"] == 4
+
+
+@pytest.mark.asyncio
+async def test_cached_decorator_skips_failures(monkeypatch):
+    """데코레이터 key 생성, 제외 인자, cache_if 테스트"""
+    monkeypatch.setattr(cache_module, "cache", Cache(MemoryCacheBackend()))
+    calls = []
+
+    class Service:
+        @cached("svc", ttl=60, exclude=("priority",), cache_if=lambda r: r["success"])
+        async def run(self, prompt: str, priority: int = 0):
+            calls.append(prompt)
+            return {"success": prompt != "bad", "prompt": prompt}
+
+    service = Service()
+    assert await service.run("hello") == {"success": True, "prompt": "hello"}
+    assert await service.run(prompt="hello", priority=5) == {"success": True, "prompt": "hello"}
+    await service.run("bad")
+    await service.run("bad")
+
+    assert calls == ["hello", "bad", "bad"]
+
+
+class FailingBackend(CacheBackend):
+    name = "failing"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def get_many(self, keys):
+        self.calls += 1
+        raise ConnectionError("redis down")
+
+    async def set(self, key, value, ttl):
+        self.calls += 1
+        raise ConnectionError("redis down")
+
+    async def add(self, key, value, ttl):
+        self.calls += 1
+        raise ConnectionError("redis down")
+
+    async def delete(self, keys):
+        self.calls += 1
+        raise ConnectionError("redis down")
+
+
+@pytest.mark.asyncio
+async def test_backend_failure_degrades_to_miss():
+    """백엔드 장애 시 loader 직접 실행 및 retry_after 동안 백엔드 우회 테스트"""
+    backend = FailingBackend()
+    cache = Cache(backend, retry_after=60)
+
+    async def loader():
+        return "fresh"
+
+    assert await cache.get_or_set("key", loader) == "fresh"
+    assert await cache.get_or_set("key", loader) == "fresh"
+    assert await cache.get("key", default="none") == "none"
+
+    assert backend.calls == 1
+    metrics = cache.get_metrics()
+    assert metrics["available"] is False
+    assert metrics["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_lock_is_only_released_by_its_owner():
+    """다른 워커가 잡은 재계산 잠금은 대기 후 직접 계산해도 해제하지 않음"""
+    backend = MemoryCacheBackend()
+    cache = Cache(backend, "test")
+    await backend.add("artnex:test:key:lock", b"other-worker", 10)
+
+    async def loader():
+        return 1
+
+    assert await cache.get_or_set("key", loader, lock_wait=0.1) == 1
+    assert backend._entries["artnex:test:key:lock"][1] == b"other-worker"
+
+    # 자신이 잡은 잠금은 계산 후 해제
+    assert await cache.get_or_set("other", loader) == 1
+    assert "artnex:test:other:lock" not in backend._entries
+
+
+@pytest.mark.asyncio
+async def test_acquire_lock_is_exclusive_until_released_or_expired():
+    """잠금은 한 워커만 획득, 소유 토큰으로만 해제, TTL이 지나면 만료"""
+    cache = Cache(MemoryCacheBackend(), "test")
+    token = await cache.acquire_lock("job", ttl=10)
+    assert token is not None
+    assert await cache.acquire_lock("job", ttl=10) is None
+
+    await cache.release_lock("job", b"other-worker")
+    assert await cache.acquire_lock("job", ttl=10) is None
+    await cache.release_lock("job", token)
+
+    assert await cache.acquire_lock("expiring", ttl=0.05) is not None
+    await asyncio.sleep(0.1)
+    assert await cache.acquire_lock("expiring", ttl=10) is not None
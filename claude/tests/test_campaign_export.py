@@ -0,0 +1,156 @@
+"""
+Campaign Export Tests
+캠페인 추적 데이터 CSV / Excel 스트리밍 내보내기 및 백그라운드 S3 업로드 테스트
+"""
+import asyncio
+import csv
+import io
+from datetime import datetime, timedelta
+import pytest
+from openpyxl import load_workbook
+from app.core.cache import Cache, MemoryCacheBackend
+from app.models.campaign import Campaign, CampaignReport, CampaignType
+from app.services import campaign_export_service as export_module
+from app.services.campaign_export_service import EXPORT_HEADER, CampaignExportService
+from app.services.campaign_metrics_service import CampaignMetricsService
+from app.services.s3_service import S3Service
+
+FIRST_DAY = datetime(2023, 6, 1)
+START, END = datetime(2023, 6, 1), datetime(2024, 6, 1)
+
+
+@pytest.fixture
+def s3(monkeypatch) -> S3Service:
+    s3 = S3Service()
+    s3.mock_mode = True
+    monkeypatch.setattr(export_module, "s3_service", s3)
+    monkeypatch.setattr(export_module, "export_cache", Cache(MemoryCacheBackend(), "campaign_export"))
+    return s3
+
+
+async def seed_tracking(session_factory) -> None:
+    """캠페인 2개 × 250일 추적 데이터 + 2024-01 월간 리포트"""
+    async with session_factory() as db:
+        db.add_all([
+            Campaign(id=1, brand_id=1, user_id=1, campaign_name="봄 캠페인", campaign_type=CampaignType.SNS),
+            Campaign(id=2, brand_id=1, user_id=1, campaign_name="다른 캠페인", campaign_type=CampaignType.SNS),
+        ])
+        db.add(CampaignReport(
+            campaign_id=1, report_month="2024-01",
+            start_date=datetime(2024, 1, 1), end_date=datetime(2024, 2, 1)
+        ))
+        await db.commit()
+
+        await CampaignMetricsService().ingest(db, [
+            {"campaign_id": campaign_id, "tracking_date": FIRST_DAY + timedelta(days=d),
+             "impressions": 100, "clicks": d % 10, "revenue": 12.5, "cost": 5}
+            for campaign_id in (1, 2) for d in range(250)
+        ])
+
+
+@pytest.mark.asyncio
+async def test_csv_streams_in_batches(session_factory):
+    """헤더(BOM 포함) 후 `batch_size`행 단위 청크"""
+    await seed_tracking(session_factory)
+    service = CampaignExportService(batch_size=100, session_factory=session_factory)
+
+    chunks = [chunk async for chunk in service.stream_csv([1], START, END)]
+
+    # 헤더 + 100행 배치 3개
+    assert len(chunks) == 4
+    assert chunks[0].startswith("\ufeff".encode("utf-8"))
+    rows = list(csv.reader(io.StringIO(b"".join(chunks).decode("utf-8-sig"))))
+    assert rows[0] == EXPORT_HEADER
+    assert len(rows) == 251
+    assert rows[1][2] == "봄 캠페인" and float(rows[1][6]) == 12.5
+
+
+@pytest.mark.asyncio
+async def test_xlsx_file_contains_all_rows(session_factory, tmp_path):
+    """write-only 워크북에 여러 캠페인의 전체 행 기록"""
+    await seed_tracking(session_factory)
+    service = CampaignExportService(batch_size=100, session_factory=session_factory)
+
+    path = tmp_path / "tracking.xlsx"
+    async with session_factory() as db:
+        written = await service.write_file(db, [1, 2], START, END, "xlsx", str(path))
+
+    assert written == 500
+    values = list(load_workbook(path, read_only=True)["tracking"].values)
+    assert list(values[0]) == EXPORT_HEADER
+    assert len(values) == 501
+    assert values[1][0] == FIRST_DAY and values[1][7] == 5
+
+
+@pytest.mark.asyncio
+async def test_xlsx_download_streams_temp_file(session_factory):
+    """Excel 직접 다운로드는 임시 파일을 청크로 전송"""
+    await seed_tracking(session_factory)
+    service = CampaignExportService(batch_size=100, session_factory=session_factory)
+
+    downloaded = b"".join([chunk async for chunk in service.stream_file([2], START, END, "xlsx")])
+    assert downloaded.startswith(b"PK")
+
+
+@pytest.mark.asyncio
+async def test_xlsx_export_splits_sheets_at_row_limit(session_factory, tmp_path):
+    """시트 행 수 제한을 넘으면 헤더를 반복한 새 시트로 이어 쓰는지 테스트"""
+    service = CampaignExportService(batch_size=4, sheet_rows=10, session_factory=session_factory)
+
+    async with session_factory() as db:
+        db.add(Campaign(id=1, brand_id=1, user_id=1, campaign_name="봄 캠페인", campaign_type=CampaignType.SNS))
+        await db.commit()
+        await CampaignMetricsService().ingest(db, [
+            {"campaign_id": 1, "tracking_date": FIRST_DAY + timedelta(days=d), "impressions": d}
+            for d in range(25)
+        ])
+
+        path = tmp_path / "tracking.xlsx"
+        written = await service.write_file(db, [1], FIRST_DAY, FIRST_DAY + timedelta(days=30), "xlsx", str(path))
+
+    assert written == 25
+    workbook = load_workbook(path, read_only=True)
+    assert workbook.sheetnames == ["tracking", "tracking_2", "tracking_3"]
+    sheets = [list(workbook[name].values) for name in workbook.sheetnames]
+    assert [len(values) for values in sheets] == [11, 11, 6]
+    assert all(list(values[0]) == EXPORT_HEADER for values in sheets)
+    impressions = [row[3] for values in sheets for row in values[1:]]
+    assert impressions == list(range(25))
+
+
+@pytest.mark.asyncio
+async def test_report_export_uploads_in_background(s3, session_factory):
+    """리포트 기간(2024-01) 백그라운드 내보내기 → S3 업로드 → excel_url 저장 (xlsx만)"""
+    await seed_tracking(session_factory)
+    service = CampaignExportService(batch_size=100, session_factory=session_factory)
+
+    async with session_factory() as db:
+        report = await db.get(CampaignReport, 1)
+    assert (await service.start_report_export(report, "csv"))["status"] == "running"
+    await asyncio.gather(*list(service._tasks))
+
+    status = await service.get_status(report.id, "csv")
+    assert status["status"] == "done" and status["rows"] == 31
+    async with session_factory() as db:
+        assert (await db.get(CampaignReport, 1)).excel_url is None
+
+    await service.start_report_export(report, "xlsx")
+    await asyncio.gather(*list(service._tasks))
+
+    status = await service.get_status(report.id, "xlsx")
+    assert status["status"] == "done" and status["file_url"].endswith(".xlsx")
+    async with session_factory() as db:
+        assert (await db.get(CampaignReport, 1)).excel_url == status["file_url"]
+
+
+@pytest.mark.asyncio
+async def test_report_export_rejects_unknown_format(s3, session_factory):
+    """지원하지 않는 형식은 작업을 시작하지 않음"""
+    await seed_tracking(session_factory)
+    service = CampaignExportService(session_factory=session_factory)
+
+    async with session_factory() as db:
+        report = await db.get(CampaignReport, 1)
+    with pytest.raises(ValueError):
+        await service.start_report_export(report, "pdf")
+    assert not service._tasks
@@ -0,0 +1,120 @@
+"""
+Campaign Forecast Tests
+일괄 시계열 예측 (Holt / 추세 + 주간 계절성) 및 리포트 ai_predictions 갱신 테스트
+"""
+from datetime import datetime, timedelta
+import numpy as np
+import pytest
+from sqlalchemy import select
+from app.core.analytics_executor import AnalyticsExecutor
+from app.models.campaign import Campaign, CampaignReport, CampaignType
+from app.services import campaign_forecast_service as forecast_module
+from app.services.campaign_forecast_service import METHODS, CampaignForecastService, forecast_batch
+from app.services.campaign_metrics_service import CampaignMetricsService
+from app.services.campaign_report_service import CampaignReportService
+
+
+def sample_series() -> np.ndarray:
+    """주간 계절성 + 추세 / 추세 / 상수 시계열 (120일)"""
+    t = np.arange(120)
+    weekly = 100 + 0.5 * t + 30 * (t % 7 == 5) + 30 * (t % 7 == 6)
+    trend = 10 + 2.0 * t
+    flat = np.full(120, 50.0)
+    return np.vstack([weekly, trend, flat])
+
+
+def test_forecast_batch_selects_model_per_campaign():
+    """주간 계절성 / 추세 / 상수 시계열을 한 번에 예측하고 캠페인별로 모델 선택"""
+    result = forecast_batch(sample_series(), horizon=14, weekday_offset=0)
+    assert result["forecast"].shape == (3, 14)
+
+    future = np.arange(120, 134)
+    expected_weekly = 100 + 0.5 * future + 30 * (future % 7 == 5) + 30 * (future % 7 == 6)
+    assert METHODS[result["method"][0]] == "seasonal_trend"
+    np.testing.assert_allclose(result["forecast"][0], expected_weekly, rtol=1e-6)
+    np.testing.assert_allclose(result["forecast"][1], 10 + 2.0 * future, rtol=1e-3)
+    np.testing.assert_allclose(result["forecast"][2], 50.0)
+    assert np.all(result["lower"] <= result["forecast"])
+    assert np.all(result["forecast"] <= result["upper"])
+
+
+def test_forecast_batch_rows_are_independent():
+    """행 단위 결과는 일괄 처리 결과와 동일"""
+    Y = sample_series()
+    batch = forecast_batch(Y, horizon=14, weekday_offset=0)
+    single = forecast_batch(Y[1:2], horizon=14, weekday_offset=0)
+    np.testing.assert_allclose(single["forecast"][0], batch["forecast"][1])
+
+
+def test_forecast_batch_handles_short_history():
+    """짧은 / 빈 이력"""
+    assert forecast_batch(np.array([[3.0]]), horizon=2)["forecast"].tolist() == [[3.0, 3.0]]
+    assert forecast_batch(np.zeros((2, 0)), horizon=3)["forecast"].shape == (2, 3)
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    monkeypatch.setattr(forecast_module, "analytics_executor", AnalyticsExecutor(max_workers=0))
+
+
+async def seed_month(session_factory) -> None:
+    """상시 캠페인 (3개월 이력) + 1일 이력 캠페인, 2024-01 월간 배치 실행"""
+    async with session_factory() as db:
+        db.add_all([
+            Campaign(id=1, brand_id=10, user_id=1, campaign_name="상시 SNS", campaign_type=CampaignType.SNS),
+            Campaign(id=2, brand_id=10, user_id=1, campaign_name="신규 이메일", campaign_type=CampaignType.EMAIL),
+        ])
+        await db.commit()
+
+        start = datetime(2023, 11, 1)
+        await CampaignMetricsService().ingest(db, [
+            {"campaign_id": 1, "tracking_date": start + timedelta(days=d),
+             "revenue": 1000 + 10 * d, "cost": 200, "conversions": 5}
+            for d in range(92)
+        ] + [
+            {"campaign_id": 2, "tracking_date": datetime(2024, 1, 31), "revenue": 300, "cost": 100},
+        ])
+
+    summary = await CampaignReportService().generate_month("2024-01", session_factory)
+    assert summary["reports"] == 2 and not summary["failed"]
+
+
+async def reports_by_campaign(session_factory):
+    async with session_factory() as db:
+        return {r.campaign_id: r for r in (await db.execute(select(CampaignReport))).scalars()}
+
+
+@pytest.mark.asyncio
+async def test_predict_reports_fills_ai_predictions(executor, session_factory):
+    """월간 배치 후 다음 달 일별 예측이 리포트에 저장되는지 테스트"""
+    await seed_month(session_factory)
+
+    reports = await reports_by_campaign(session_factory)
+    predictions = reports[1].ai_predictions
+    assert predictions["horizon_start"] == "2024-02-01"
+    assert predictions["horizon_days"] == 29
+    revenue = predictions["metrics"]["revenue"]
+    assert len(revenue["daily"]) == 29
+    # 2024-02-01은 관측 시작 후 92일째: 1000 + 10 * 92
+    assert revenue["daily"][0] == pytest.approx(1920, rel=0.01)
+    assert revenue["lower_total"] <= revenue["total"] <= revenue["upper_total"]
+    assert predictions["roas"] == pytest.approx(revenue["total"] / predictions["metrics"]["cost"]["total"], rel=1e-3)
+
+
+@pytest.mark.asyncio
+async def test_short_history_campaign_gets_predictions(executor, session_factory):
+    """이력이 하루뿐인 캠페인도 음수가 아닌 예측 저장"""
+    await seed_month(session_factory)
+
+    reports = await reports_by_campaign(session_factory)
+    assert reports[2].ai_predictions["metrics"]["cost"]["total"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_predict_reports_for_selected_campaigns(executor, session_factory):
+    """특정 캠페인만 갱신"""
+    await seed_month(session_factory)
+
+    async with session_factory() as db:
+        updated = await CampaignForecastService().predict_reports(db, "2024-01", campaign_ids=[2])
+    assert updated == 1
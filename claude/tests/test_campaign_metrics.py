@@ -0,0 +1,156 @@
+"""
+Campaign Metrics Tests
+캠페인 추적 시계열 upsert 적재 및 일 / 주 / 월 다운샘플링 테스트
+"""
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import select
+from app.models.campaign import CampaignTracking
+from app.services.campaign_metrics_service import CampaignMetricsService
+
+DAY = datetime(2024, 1, 1)
+START, END = datetime(2024, 1, 1), datetime(2024, 3, 1)
+
+
+async def seed_tracking(session_factory, service: CampaignMetricsService) -> None:
+    async with session_factory() as db:
+        ingested = await service.ingest(db, [
+            {"campaign_id": 1, "tracking_date": DAY, "impressions": 1000, "clicks": 10, "revenue": 500, "cost": 100},
+            {"campaign_id": 1, "tracking_date": DAY + timedelta(days=1), "impressions": 0, "clicks": 0},
+            {"campaign_id": 2, "tracking_date": DAY, "impressions": 10, "clicks": 1, "cost": 3},
+        ])
+        assert ingested == 3
+
+
+async def tracking_rows(db):
+    return (await db.execute(
+        select(CampaignTracking).order_by(CampaignTracking.campaign_id, CampaignTracking.tracking_date)
+    )).scalars().all()
+
+
+@pytest.mark.asyncio
+async def test_ingest_computes_derived_metrics(session_factory):
+    """ctr / cpc / roas SQL 계산, 0으로 나누는 지표는 NULL"""
+    await seed_tracking(session_factory, CampaignMetricsService(chunk_size=2))
+
+    async with session_factory() as db:
+        first, empty, other = await tracking_rows(db)
+        assert first.ctr == pytest.approx(0.01)
+        assert float(first.cpc) == pytest.approx(10.0)
+        assert first.roas == pytest.approx(5.0)
+        assert (empty.ctr, empty.cpc, empty.roas) == (None, None, None)
+        assert float(other.cpc) == pytest.approx(3.0)
+
+
+@pytest.mark.asyncio
+async def test_reingest_overwrites_and_recomputes(session_factory):
+    """같은 캠페인 / 날짜 재적재 시 덮어쓰기 후 파생 지표 재계산"""
+    service = CampaignMetricsService(chunk_size=2)
+    await seed_tracking(session_factory, service)
+
+    async with session_factory() as db:
+        await service.ingest(db, [
+            {"campaign_id": 1, "tracking_date": DAY, "impressions": 2000, "clicks": 40, "revenue": 900, "cost": 300},
+        ])
+
+        rows = await tracking_rows(db)
+        assert len(rows) == 3
+        first = rows[0]
+        assert (first.impressions, first.clicks) == (2000, 40)
+        assert first.ctr == pytest.approx(0.02)
+        assert float(first.cpc) == pytest.approx(7.5)
+        assert first.roas == pytest.approx(3.0)
+
+
+@pytest.mark.asyncio
+async def test_ingest_dedupes_batch_and_normalizes_to_utc(session_factory):
+    """한 배치의 같은 캠페인 / 날짜는 마지막 값, naive / aware 시각 혼용 시 UTC 기준"""
+    service = CampaignMetricsService()
+    kst = timezone(timedelta(hours=9))
+    async with session_factory() as db:
+        ingested = await service.ingest(db, [
+            {"campaign_id": 1, "tracking_date": DAY, "impressions": 100, "clicks": 1},
+            {"campaign_id": 1, "tracking_date": DAY.replace(tzinfo=timezone.utc), "impressions": 200, "clicks": 4},
+            {"campaign_id": 1, "tracking_date": datetime(2024, 1, 2, 9, tzinfo=kst), "impressions": 50, "clicks": 5},
+        ])
+        assert ingested == 2
+
+        first, second = await tracking_rows(db)
+        assert (first.impressions, first.ctr) == (200, pytest.approx(0.02))
+        assert second.tracking_date.replace(tzinfo=None) == DAY + timedelta(days=1)
+        assert second.ctr == pytest.approx(0.1)
+
+
+def test_resolve_range_compares_in_utc():
+    """기간 파라미터는 UTC로 변환 후 비교, 기본 종료 시각은 현재 UTC"""
+    from fastapi import HTTPException
+    from app.api.v1.endpoints.campaigns import _resolve_range
+
+    kst_evening = datetime(2024, 1, 1, 18, tzinfo=timezone(timedelta(hours=9)))
+    start, end = _resolve_range(datetime(2024, 1, 1, 8), kst_evening)
+    assert (start, end) == (datetime(2024, 1, 1, 8, tzinfo=timezone.utc), datetime(2024, 1, 1, 9, tzinfo=timezone.utc))
+    with pytest.raises(HTTPException):
+        _resolve_range(datetime(2024, 1, 1, 10), kst_evening)
+
+    start, end = _resolve_range(None, None)
+    assert end.tzinfo is not None and end - start == timedelta(days=30)
+
+
+async def seed_series(session_factory, service: CampaignMetricsService) -> None:
+    async with session_factory() as db:
+        await service.ingest(db, [
+            {"campaign_id": 1, "tracking_date": DAY + timedelta(days=d),
+             "impressions": 100 * (d + 1), "clicks": 10, "revenue": 20, "cost": 10}
+            for d in range(14)
+        ] + [
+            {"campaign_id": 1, "tracking_date": datetime(2024, 2, 5), "impressions": 50, "clicks": 5},
+            {"campaign_id": 2, "tracking_date": DAY, "impressions": 999, "clicks": 999},
+        ])
+
+
+@pytest.mark.asyncio
+async def test_daily_series(session_factory):
+    """일 단위 구간은 데이터가 있는 날짜만"""
+    service = CampaignMetricsService()
+    await seed_series(session_factory, service)
+    async with session_factory() as db:
+        daily = await service.get_series(db, [1], START, END, "day")
+    assert len(daily) == 15
+    assert daily[0]["bucket"] == "2024-01-01"
+
+
+@pytest.mark.asyncio
+async def test_weekly_series_uses_ratio_of_sums(session_factory):
+    """주 구간 집계 및 합계 기준 CTR / ROAS"""
+    service = CampaignMetricsService()
+    await seed_series(session_factory, service)
+    async with session_factory() as db:
+        weekly = await service.get_series(db, [1], START, END, "week")
+    assert [b["bucket"] for b in weekly] == ["2024-01-01", "2024-01-08", "2024-02-05"]
+    # 첫 주: 노출 100..700 합 2800, 클릭 70
+    assert weekly[0]["impressions"] == 2800
+    assert weekly[0]["ctr"] == pytest.approx(70 / 2800)
+    assert weekly[0]["roas"] == pytest.approx(2.0)
+    assert weekly[2]["roas"] is None
+
+
+@pytest.mark.asyncio
+async def test_monthly_series_and_totals(session_factory):
+    """월 구간 집계 및 여러 캠페인 합계"""
+    service = CampaignMetricsService()
+    await seed_series(session_factory, service)
+    async with session_factory() as db:
+        monthly = await service.get_series(db, [1], START, END, "month")
+        assert [b["bucket"] for b in monthly] == ["2024-01-01", "2024-02-01"]
+        assert monthly[0]["clicks"] == 140
+
+        totals = await service.get_totals(db, [1, 2], START, END)
+        assert totals["clicks"] == 140 + 5 + 999
+
+
+@pytest.mark.asyncio
+async def test_unknown_granularity_is_rejected(session_factory):
+    """지원하지 않는 구간 단위는 ValueError"""
+    async with session_factory() as db:
+        with pytest.raises(ValueError):
+            await CampaignMetricsService().get_series(db, [1], START, END, "hour")
@@ -0,0 +1,110 @@
+"""
+Campaign Report Tests
+브랜드 × 월 SQL 집계 리포트 생성 및 월간 배치 테스트
+"""
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import select
+from app.models.campaign import Campaign, CampaignReport, CampaignType
+from app.services.campaign_metrics_service import CampaignMetricsService
+from app.services.campaign_report_service import CampaignReportService, month_range, previous_month
+
+JANUARY = datetime(2024, 1, 1)
+
+
+def test_month_helpers():
+    assert month_range("2024-12") == (datetime(2024, 12, 1), datetime(2025, 1, 1))
+    assert previous_month(datetime(2024, 1, 15)) == "2023-12"
+    assert previous_month(datetime(2024, 3, 2)) == "2024-02"
+
+
+async def seed_campaigns(session_factory) -> None:
+    """브랜드 10 (SNS 2개 + 인플루언서), 브랜드 20 (이메일)의 2024-01 추적 데이터"""
+    async with session_factory() as db:
+        db.add_all([
+            Campaign(id=1, brand_id=10, user_id=1, campaign_name="봄 SNS", campaign_type=CampaignType.SNS),
+            Campaign(id=2, brand_id=10, user_id=1, campaign_name="여름 SNS", campaign_type=CampaignType.SNS),
+            Campaign(id=3, brand_id=10, user_id=1, campaign_name="인플루언서", campaign_type=CampaignType.INFLUENCER),
+            Campaign(id=4, brand_id=20, user_id=2, campaign_name="뉴스레터", campaign_type=CampaignType.EMAIL),
+        ])
+        await db.commit()
+
+        await CampaignMetricsService().ingest(db, [
+            {"campaign_id": campaign_id, "tracking_date": JANUARY + timedelta(days=d),
+             "impressions": 1000, "clicks": 10 * campaign_id, "conversions": campaign_id,
+             "revenue": revenue, "cost": 100, "likes": 5, "shares": 1}
+            for campaign_id, revenue in ((1, 300), (2, 100), (3, 500), (4, 50))
+            for d in range(10)
+        ] + [
+            # 다른 달 데이터는 집계에서 제외
+            {"campaign_id": 1, "tracking_date": datetime(2024, 2, 1), "revenue": 99999},
+        ])
+
+
+async def generate_january(session_factory):
+    """월간 배치 실행 후 캠페인별 리포트"""
+    await seed_campaigns(session_factory)
+    service = CampaignReportService(concurrency=2, top_n=2)
+    summary = await service.generate_month("2024-01", session_factory, forecast=False)
+    assert summary == {"report_month": "2024-01", "brands": 2, "reports": 4, "failed": []}
+
+    async with session_factory() as db:
+        return {
+            r.campaign_id: r for r in
+            (await db.execute(select(CampaignReport).order_by(CampaignReport.campaign_id))).scalars()
+        }
+
+
+@pytest.mark.asyncio
+async def test_generate_month_totals_per_campaign(session_factory):
+    """캠페인별 월 합계 및 소셜 성과 (다른 달 데이터 제외)"""
+    reports = await generate_january(session_factory)
+    assert set(reports) == {1, 2, 3, 4}
+
+    first = reports[1]
+    assert float(first.total_revenue) == 3000
+    assert float(first.total_cost) == 1000
+    assert first.total_sales == 10
+    assert first.social_performance["engagements"] == 60
+    assert first.social_performance["brand_engagement_share"] == pytest.approx(1 / 3, abs=1e-4)
+
+
+@pytest.mark.asyncio
+async def test_generate_month_ranks_top_campaigns_per_brand(session_factory):
+    """브랜드 내 매출 순위 상위 2개 (같은 브랜드 리포트는 같은 순위)"""
+    reports = await generate_january(session_factory)
+
+    assert [c["campaign_id"] for c in reports[1].top_campaigns] == [3, 1]
+    assert reports[1].top_campaigns[0]["roas"] == pytest.approx(5.0)
+    assert reports[2].top_campaigns == reports[1].top_campaigns
+    assert [c["campaign_id"] for c in reports[4].top_campaigns] == [4]
+
+
+@pytest.mark.asyncio
+async def test_generate_month_channel_performance(session_factory):
+    """채널(캠페인 유형)별 매출 / ROAS / 매출 비중"""
+    reports = await generate_january(session_factory)
+
+    channels = reports[1].channel_performance
+    assert set(channels) == {"sns", "influencer"}
+    assert channels["sns"]["revenue"] == 4000
+    assert channels["sns"]["roas"] == pytest.approx(2.0)
+    assert channels["sns"]["revenue_share"] == pytest.approx(4000 / 9000, abs=1e-4)
+
+
+@pytest.mark.asyncio
+async def test_rebuild_overwrites_existing_reports(session_factory):
+    """재생성: 같은 캠페인 / 월 리포트는 덮어씀, 데이터 없는 달은 0건"""
+    await generate_january(session_factory)
+    service = CampaignReportService(concurrency=2, top_n=2)
+
+    async with session_factory() as db:
+        await CampaignMetricsService().ingest(db, [
+            {"campaign_id": 2, "tracking_date": JANUARY, "revenue": 5000, "cost": 100}
+        ])
+        assert await service.build_brand_month(db, 10, "2024-01") == 3
+        rows = (await db.execute(select(CampaignReport).where(CampaignReport.campaign_id == 2))).scalars().all()
+        assert len(rows) == 1
+        assert rows[0].top_campaigns[0]["campaign_id"] == 2
+
+        assert await service.build_brand_month(db, 10, "2023-12") == 0
@@ -0,0 +1,103 @@
+"""
+Color Palette Engine Tests
+색 공간 변환, 배색 생성, 대표색 추출, 대비 / 접근성 점수 테스트
+"""
+import io
+import numpy as np
+import pytest
+from PIL import Image
+from app.services.color_palette_engine import (
+    contrast_ratio, extract_palette, generate_schemes, hex_to_rgb, hsl_to_rgb,
+    rgb_to_hex, rgb_to_hsl, rgb_to_lab, score_palettes, suggest_palettes
+)
+from app.services.ideogram_service import IdeogramService
+
+
+def test_color_space_conversions():
+    """hex / HSL / LAB 변환 기준값 및 왕복 변환"""
+    rgb = hex_to_rgb(["#FF0000", "#fff", "000000", "#3357FF"])
+    assert rgb_to_hex(rgb) == ["#FF0000", "#FFFFFF", "#000000", "#3357FF"]
+    assert np.allclose(rgb_to_hsl(rgb[0]), [0, 1, 0.5])
+
+    lab = rgb_to_lab(rgb)
+    assert np.allclose(lab[0], [53.24, 80.09, 67.20], atol=0.05)
+    assert np.allclose(lab[1], [100, 0, 0], atol=0.05)
+
+    colors = np.random.default_rng(3).random((500, 3))
+    assert np.allclose(hsl_to_rgb(rgb_to_hsl(colors)), colors)
+
+    with pytest.raises(ValueError):
+        hex_to_rgb(["#12345G"])
+
+
+def test_generate_schemes_batches_base_colors():
+    """기준 색 여러 개의 배색을 한 번에 생성"""
+    palettes = generate_schemes(["#FF0000", "#3357FF", "#1E8449"], "complementary")
+
+    assert palettes.shape == (3, 5, 3)
+    assert rgb_to_hex(palettes[0])[:2] == ["#FF0000", "#00FFFF"]
+    hues = rgb_to_hsl(palettes[:, :2])[..., 0]
+    assert np.allclose((hues[:, 1] - hues[:, 0]) % 360, 180, atol=1)
+
+    triadic = generate_schemes(["#FF0000"], "triadic", num_colors=3)
+    assert rgb_to_hex(triadic) == ["#FF0000", "#00FF00", "#0000FF"]
+
+    # 기존 IdeogramService 인터페이스: 더 이상 같은 색을 반복하지 않음
+    palette = IdeogramService().generate_color_palette("#3357FF", scheme="analogous")
+    assert len(set(palette)) == 5 and palette[0] == "#3357FF"
+
+
+def test_contrast_and_accessibility_scores():
+    """WCAG 대비율 및 팔레트 점수"""
+    assert contrast_ratio(np.zeros(3), np.ones(3)) == pytest.approx(21)
+
+    readable = hex_to_rgb(["#000000", "#FFFFFF", "#0024CC"])
+    muddy = hex_to_rgb(["#777777", "#787878", "#797979"])
+    scores = score_palettes(np.stack([readable, muddy]))
+
+    assert scores["aa_pairs"].tolist() == [2, 0]
+    assert scores["text_color"][0].tolist() == [1, 0, 1]
+    assert scores["score"][0] > 80 > scores["score"][1]
+
+    suggestions = suggest_palettes(["#3357FF", "#F4D03F"])
+    assert [s["base_color"] for s in suggestions] == ["#3357FF"] * 3 + ["#F4D03F"] * 3
+    first = [s["accessibility_score"] for s in suggestions[:3]]
+    assert first == sorted(first, reverse=True)
+
+
+def test_extract_palette_from_image():
+    """이미지 대표색을 비중 순으로 추출 (투명 픽셀 제외)"""
+    image = Image.new("RGBA", (300, 200), (30, 60, 200, 255))
+    image.paste((240, 200, 40, 255), (0, 0, 90, 200))
+    image.paste((0, 0, 0, 0), (280, 0, 300, 200))
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG")
+
+    palette = extract_palette(buffer.getvalue(), num_colors=2)
+
+    # 축소 시 경계 픽셀이 섞이므로 근삿값 비교
+    extracted = hex_to_rgb([c["hex"] for c in palette["colors"]])
+    assert np.allclose(extracted, hex_to_rgb(["#1E3CC8", "#F0C828"]), atol=0.03)
+    assert [c["share"] for c in palette["colors"]] == pytest.approx([0.68, 0.32], abs=0.02)
+
+
+@pytest.mark.asyncio
+async def test_palette_upload_limit_and_timeout(monkeypatch):
+    """제한을 넘는 업로드는 413 (선언 크기 없이도), 추출 시간 초과는 504"""
+    from fastapi import HTTPException, UploadFile
+    from app.api.v1.endpoints import design
+    from app.core.analytics_executor import AnalyticsTimeoutError
+
+    assert await design._read_upload(UploadFile(io.BytesIO(b"x" * 10)), max_bytes=10) == b"x" * 10
+    for upload in (UploadFile(io.BytesIO(b"x" * 11)), UploadFile(io.BytesIO(b""), size=11)):
+        with pytest.raises(HTTPException) as error:
+            await design._read_upload(upload, max_bytes=10)
+        assert error.value.status_code == 413
+
+    async def timeout(*args, **kwargs):
+        raise AnalyticsTimeoutError("palette extraction timed out")
+
+    monkeypatch.setattr(design.analytics_executor, "run", timeout)
+    with pytest.raises(HTTPException) as error:
+        await design._extract_palette(b"image", 5)
+    assert error.value.status_code == 504
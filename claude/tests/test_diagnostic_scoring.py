@@ -0,0 +1,138 @@
+"""
+Diagnostic Scoring Tests
+브랜드 진단 섹션 / 종합 점수 일괄 채점 테스트
+"""
+import numpy as np
+import pytest
+from sqlalchemy import select
+from app.core.analytics_executor import AnalyticsExecutor
+from app.models.insight import BrandDiagnostic, BrandReport, DiagnosticSection, ReportSection
+from app.services import diagnostic_scoring_service as scoring_module
+from app.services.diagnostic_scoring_service import (
+    RADAR_SECTION_NAME, DiagnosticScoringService, parse_answers
+)
+
+
+def test_parse_answers_formats():
+    """숫자 / 문자열 / dict 응답, 척도 밖 값, 채점 불가 응답 처리"""
+    assert parse_answers({
+        "q1": 4, "q2": "5", "q3": {"answer": 2, "weight": 2}, "q4": {"score": 9},
+        "q5": "모름", "q6": None, "q7": {"value": 3, "weight": 0},
+    }) == [(4.0, 1.0), (5.0, 1.0), (2.0, 2.0), (5.0, 1.0)]
+    assert parse_answers(None) == []
+
+
+def test_score_batch_matches_per_report_loop():
+    """여러 리포트 일괄 채점 결과가 리포트별 계산과 같은지 테스트"""
+    rng = np.random.default_rng(7)
+    sections = list(DiagnosticSection)
+    reports = []
+    for _ in range(50):
+        reports.append({
+            section: {f"q{k}": int(rng.integers(1, 6)) for k in range(int(rng.integers(0, 8)))}
+            for section in sections
+        })
+    weights = {"market": 2.0, "marketing": 0.5}
+    service = DiagnosticScoringService(section_weights=weights)
+
+    section_scores, overall = service.score(reports)
+
+    for i, report in enumerate(reports):
+        expected_sections = []
+        for j, section in enumerate(sections):
+            answers = [value for value, _ in parse_answers(report[section])]
+            expected = np.mean([(a - 1) / 4 * 100 for a in answers]) if answers else np.nan
+            assert np.isclose(section_scores[i, j], expected, equal_nan=True)
+            expected_sections.append((expected, weights.get(section.value, 1.0)))
+        present = [(score, w) for score, w in expected_sections if not np.isnan(score)]
+        if present:
+            assert np.isclose(overall[i], sum(s * w for s, w in present) / sum(w for _, w in present))
+        else:
+            assert np.isnan(overall[i])
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    executor = AnalyticsExecutor(max_workers=0)
+    monkeypatch.setattr(scoring_module, "analytics_executor", executor)
+    yield executor
+    executor.shutdown()
+
+
+async def seed_reports(session_factory) -> list:
+    """시장 5/5, 브랜드 1/3 응답 리포트 3건"""
+    async with session_factory() as db:
+        reports = [BrandReport(brand_id=1, user_id=1, report_name=f"진단 {i}") for i in range(3)]
+        db.add_all(reports)
+        await db.flush()
+        for report in reports:
+            db.add_all([
+                BrandDiagnostic(report_id=report.id, section=DiagnosticSection.MARKET,
+                                questions_answers={"q1": 5, "q2": 5}),
+                BrandDiagnostic(report_id=report.id, section=DiagnosticSection.BRAND,
+                                questions_answers={"q1": 1, "q2": 3}),
+            ])
+        await db.commit()
+        return [report.id for report in reports]
+
+
+@pytest.mark.asyncio
+async def test_score_report_saves_scores_and_radar_chart(session_factory):
+    """채점 저장 (섹션 / 종합 / 레이더 차트)"""
+    report_ids = await seed_reports(session_factory)
+    async with session_factory() as db:
+        result = await DiagnosticScoringService().score_report(db, report_ids[0])
+
+        assert result["section_scores"]["market"] == 100.0
+        assert result["section_scores"]["brand"] == 25.0
+        assert result["section_scores"]["competitor"] is None
+        assert result["overall_score"] == 62.5
+        assert result["chart_data"]["datasets"][0]["data"] == [100.0, None, None, 25.0, None]
+        assert (await db.get(BrandReport, report_ids[0])).overall_score == 62.5
+
+
+@pytest.mark.asyncio
+async def test_rescore_all_applies_configured_weights(executor, session_factory):
+    """가중치 변경 후 배치 단위 일괄 재채점"""
+    report_ids = await seed_reports(session_factory)
+    service = DiagnosticScoringService(section_weights={"market": 3.0}, batch_size=2)
+
+    async with session_factory() as db:
+        assert await service.rescore_all(db) == 3
+
+        scores = (await db.execute(select(BrandReport.overall_score).order_by(BrandReport.id))).scalars().all()
+        assert scores == [81.2, 81.2, 81.2]
+        diagnostic_scores = (await db.execute(
+            select(BrandDiagnostic.section_score).where(BrandDiagnostic.report_id == report_ids[2])
+            .order_by(BrandDiagnostic.id)
+        )).scalars().all()
+        assert diagnostic_scores == [100.0, 25.0]
+    assert executor.completed == 2
+
+
+@pytest.mark.asyncio
+async def test_rescore_updates_existing_radar_sections(executor, session_factory):
+    """레이더 섹션은 리포트당 하나 (재채점 시 갱신)"""
+    report_ids = await seed_reports(session_factory)
+    service = DiagnosticScoringService(batch_size=2)
+
+    async with session_factory() as db:
+        await service.score_report(db, report_ids[0])
+        await service.rescore_all(db)
+
+        radar = (await db.execute(
+            select(ReportSection).where(ReportSection.section_name == RADAR_SECTION_NAME)
+        )).scalars().all()
+        assert len(radar) == 3
+        assert all(section.chart_data["type"] == "radar" for section in radar)
+
+
+@pytest.mark.asyncio
+async def test_rescore_selected_reports(executor, session_factory):
+    """지정한 리포트만 재채점"""
+    report_ids = await seed_reports(session_factory)
+
+    async with session_factory() as db:
+        assert await DiagnosticScoringService().rescore_all(db, report_ids=report_ids[1:]) == 2
+        scores = (await db.execute(select(BrandReport.overall_score).order_by(BrandReport.id))).scalars().all()
+        assert scores == [None, 62.5, 62.5]
@@ -0,0 +1,131 @@
+"""
+GPT Scheduler Tests
+GPT 요청 스케줄러 (TPM/RPM 예산, 우선순위) 단위 테스트
+"""
+import asyncio
+import pytest
+from app.services.gpt_scheduler import (
+    GPTRequestScheduler,
+    GPTPriority,
+    TokenBucket,
+    estimate_tokens,
+    estimate_message_tokens
+)
+
+
+def test_estimate_tokens():
+    """토큰 수 추정 테스트"""
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd" * 10) == 10
+    assert estimate_tokens("비건 화장품") == 6
+
+    messages = [{"role": "user", "content": "abcd"}]
+    assert estimate_message_tokens(messages) == 1 + 4 + 3
+
+
+def test_token_bucket_refill():
+    """토큰 버킷 소비 및 충전 대기 시간 테스트"""
+    bucket = TokenBucket(capacity=60, refill_per_second=1.0)
+
+    assert bucket.time_until(60) == 0
+    bucket.consume(60)
+    assert bucket.time_until(30) == pytest.approx(30, abs=0.1)
+
+    bucket.refund(10)
+    assert bucket.time_until(10) == 0
+
+
+@pytest.mark.asyncio
+async def test_scheduler_dispatches_interactive_first():
+    """예산 소진 시 대화형 요청이 백그라운드 요청보다 먼저 처리되는지 테스트"""
+    scheduler = GPTRequestScheduler(tokens_per_minute=6000, requests_per_minute=600)
+
+    # 요청 예산을 모두 소진 (초당 10건 충전)
+    scheduler._request_bucket.consume(600)
+
+    order = []
+
+    async def submit(name, priority):
+        await scheduler.acquire(10, priority)
+        order.append(name)
+
+    background = asyncio.create_task(submit("background", GPTPriority.BACKGROUND))
+    await asyncio.sleep(0)
+    interactive = asyncio.create_task(submit("interactive", GPTPriority.INTERACTIVE))
+
+    await asyncio.wait_for(asyncio.gather(background, interactive), timeout=2)
+
+    assert order == ["interactive", "background"]
+    assert scheduler.get_metrics()["requests_dispatched"] == 2
+
+
+def test_scheduler_usage_and_retry_delay():
+    """실제 사용량 정산 및 Retry-After 기반 지연 계산 테스트"""
+    scheduler = GPTRequestScheduler(tokens_per_minute=1000, requests_per_minute=10, base_backoff=1.0)
+    scheduler._token_bucket.consume(500)
+
+    scheduler.record_usage(reserved_tokens=500, actual_tokens=200)
+    metrics = scheduler.get_metrics()
+    assert metrics["actual_tokens_used"] == 200
+    assert metrics["tokens_available"] == pytest.approx(800, abs=5)
+
+    delay = scheduler.retry_delay(attempt=0, retry_after=5)
+    assert 5 <= delay <= 6
+    assert 0 <= scheduler.retry_delay(attempt=2) <= 4
+
+
+@pytest.mark.asyncio
+async def test_failed_attempts_release_reservation():
+    """429 재시도 시 실패한 시도의 예약 토큰이 반환되는지 테스트"""
+    from unittest.mock import AsyncMock, MagicMock
+    from openai import RateLimitError
+    from app.services.gpt_service import GPTService
+
+    scheduler = GPTRequestScheduler(tokens_per_minute=10000, requests_per_minute=600, base_backoff=0.0)
+    service = GPTService()
+    service.scheduler = scheduler
+
+    rate_limited = RateLimitError(
+        "rate limited", response=MagicMock(status_code=429, headers={}), body=None
+    )
+    response = MagicMock()
+    response.usage.total_tokens = 300
+    service.client = MagicMock()
+    service.client.chat.completions.create = AsyncMock(side_effect=[rate_limited, rate_limited, response])
+
+    await service._create_completion([{"role": "user", "content": "abcd"}], max_tokens=1000)
+
+    metrics = scheduler.get_metrics()
+    assert metrics["requests_retried"] == 2
+    # 세 번 시도했지만 성공한 한 번의 실제 사용량만 차감
+    assert metrics["tokens_available"] == pytest.approx(10000 - 300, abs=5)
+    assert metrics["estimated_tokens_reserved"] < 2 * 1000
+
+
+@pytest.mark.asyncio
+async def test_only_unadmitted_requests_release_reservation():
+    """연결 실패만 예약을 반환, 타임아웃 / 취소된 요청은 API가 처리 중일 수 있어 예약 유지"""
+    from unittest.mock import AsyncMock, MagicMock
+    from openai import APIConnectionError, APITimeoutError
+    from app.services.gpt_service import GPTService
+
+    request = MagicMock()
+    for error, released in [
+        (APIConnectionError(request=request), True),
+        (APITimeoutError(request=request), False),
+        (asyncio.CancelledError(), False),
+    ]:
+        scheduler = GPTRequestScheduler(tokens_per_minute=10000, requests_per_minute=600)
+        service = GPTService()
+        service.scheduler = scheduler
+        service.client = MagicMock()
+        service.client.chat.completions.create = AsyncMock(side_effect=error)
+
+        with pytest.raises(type(error)):
+            await service._create_completion([{"role": "user", "content": "abcd"}], max_tokens=1000)
+
+        available = scheduler.get_metrics()["tokens_available"]
+        if released:
+            assert available == pytest.approx(10000, abs=5)
+        else:
+            assert available < 10000 - 1000
@@ -64,3 +64,11 @@ async def test_analyze_market():
     assert "summary" in result
     assert "keywords" in result
     assert "market_data" in result
+
+
+def test_market_analysis_fallback_is_not_cached():
+    """시장 분석은 오류 기본값만 캐시하지 않음 (결과에 success 키가 없음)"""
+    from app.services.gpt_service import _is_market_analysis, _market_analysis_fallback
+
+    assert _is_market_analysis({"summary": "비건 화장품 시장 성장", "keywords": ["비건"]})
+    assert not _is_market_analysis(_market_analysis_fallback())
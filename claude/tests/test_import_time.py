@@ -0,0 +1,41 @@
+"""
+Import Time Tests
+API 콜드 스타트 예산 검사 (python -X importtime)
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+
+HEAVY_MODULES = {"numpy", "scipy", "sklearn", "pandas"}
+
+# 느린 CI 환경에서는 IMPORT_TIME_BUDGET_MS로 조정
+IMPORT_TIME_BUDGET_MS = float(os.environ.get("IMPORT_TIME_BUDGET_MS", 2500))
+
+
+def _import_times(module: str) -> dict:
+    """`python -X importtime -c "import <module>"` 결과 → {모듈: 누적 import 시간(us)}"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=Path(__file__).resolve().parent.parent,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split(":", 1)[1].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_app_main_does_not_import_scientific_stack():
+    """app.main import 시 numpy / scikit-learn / scipy가 로드되지 않는지 테스트"""
+    times = _import_times("app.main")
+
+    loaded = {name.split(".")[0] for name in times} & HEAVY_MODULES
+    assert not loaded, f"heavy modules imported at startup: {sorted(loaded)}"
+    assert times["app.main"] / 1000 < IMPORT_TIME_BUDGET_MS
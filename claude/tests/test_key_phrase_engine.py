@@ -0,0 +1,103 @@
+"""
+Key Phrase Engine Tests
+코퍼스 문서 빈도 누적 및 배치 핵심 구문 추출 테스트
+"""
+import pytest
+from app.core.analytics_executor import AnalyticsExecutor
+from app.services import key_phrase_engine as engine_module
+from app.services.key_phrase_engine import KeyPhraseEngine
+
+
+DOCUMENTS = [
+    {"source": "insight", "source_id": 1, "text": "비건 화장품 브랜드 시장 분석"},
+    {"source": "insight", "source_id": 2, "text": "친환경 패키지 브랜드 시장 분석"},
+    {"source": "report", "source_id": 1, "text": "20대 여성 타겟 브랜드 마케팅 전략"},
+]
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    executor = AnalyticsExecutor(max_workers=0)
+    monkeypatch.setattr(engine_module, "analytics_executor", executor)
+    yield executor
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_add_documents_skips_known_documents(executor, session_factory):
+    """문서 빈도 증분 반영, 이미 반영된 문서는 건너뜀"""
+    writer = KeyPhraseEngine()
+    async with session_factory() as db:
+        assert await writer.add_documents(db, DOCUMENTS[:2]) == 2
+        assert await writer.add_documents(db, DOCUMENTS) == 1
+    assert writer.n_docs == 3
+
+
+@pytest.mark.asyncio
+async def test_corpus_idf_is_shared_across_engines(executor, session_factory):
+    """다른 프로세스의 엔진도 DB에서 같은 IDF를 로드"""
+    writer = KeyPhraseEngine()
+    async with session_factory() as db:
+        await writer.add_documents(db, DOCUMENTS)
+
+    reader = KeyPhraseEngine()
+    async with session_factory() as db:
+        await reader.extract(db, ["브랜드"], top_n=1)
+
+    assert reader.n_docs == 3
+    assert reader.get_metrics()["terms"] == len(writer._df)
+
+
+@pytest.mark.asyncio
+async def test_extract_ranks_common_phrases_lower(executor, session_factory):
+    """모든 문서에 등장하는 "브랜드"는 드문 구문보다 낮은 점수, 빈 문서는 빈 결과"""
+    engine = KeyPhraseEngine()
+    async with session_factory() as db:
+        await engine.add_documents(db, DOCUMENTS)
+        results = await engine.extract(db, [
+            "브랜드 비건 화장품",
+            "브랜드 브랜드 마케팅",
+            "",
+        ], top_n=10)
+
+    scores = dict(results[0])
+    assert scores["브랜드"] < scores["비건"] < scores["브랜드 비건"]
+    assert dict(results[1])["브랜드"] < dict(results[1])["브랜드 브랜드"]
+    assert results[2] == []
+
+
+def test_score_uses_sublinear_tf_and_idf():
+    """sublinear TF × IDF 점수 및 문서별 top-k 테스트"""
+    from scipy.sparse import csr_matrix
+
+    engine = KeyPhraseEngine()
+    engine.n_docs, engine._df = 10, {"흔한": 10, "드문": 1}
+    counts = csr_matrix([[4, 1], [0, 0]])
+
+    results = engine.score(["흔한", "드문"], counts, top_n=1)
+
+    assert results[0][0][0] == "드문"
+    assert results[1] == []
+
+
+def test_report_document_requires_summary():
+    """AI 요약이 없는 리포트는 코퍼스에 반영하지 않음 (요약 생성 후 반영)"""
+    from app.models.insight import BrandReport
+    from app.services.key_phrase_engine import report_document
+
+    assert report_document(BrandReport(id=1, report_name="브랜드 진단"))["text"] == ""
+    summarized = BrandReport(id=1, report_name="브랜드 진단", ai_summary="비건 화장품 시장 성장")
+    assert report_document(summarized)["text"] == "브랜드 진단\n비건 화장품 시장 성장"
+
+
+@pytest.mark.asyncio
+async def test_insight_corpus_update_failure_does_not_fail_insight(monkeypatch):
+    """코퍼스 반영 실패는 로그만 남김 (인사이트는 이미 커밋됨)"""
+    from app.api.v1.endpoints import insights
+    from app.models.insight import BrandInsight
+
+    async def failing_add_insight(db, insight):
+        raise RuntimeError("corpus table locked")
+
+    monkeypatch.setattr(engine_module.key_phrase_engine, "add_insight", failing_add_insight)
+    await insights._add_to_key_phrase_corpus(None, BrandInsight(id=1))
@@ -0,0 +1,408 @@
+"""
+Keyword Clustering Tests
+키워드 벡터화 백엔드, 벡터 캐시, 클러스터링 단위 테스트
+"""
+import numpy as np
+import pytest
+from app.models.keyword import KeywordVector  # noqa: F401 (테이블 등록)
+from app.services.keyword_clustering_service import KeywordClusteringService, decode_linkage
+from app.services.keyword_index import KeywordCorpusIndex, KeywordSimilarityIndex
+from app.services.incremental_clustering_service import (
+    IncrementalKeywordClusteringService,
+    OnlineKMeans
+)
+from app.services.keyword_vectorizer import (
+    HashingKeywordVectorizer,
+    EmbeddingTableVectorizer,
+    KeywordVectorCache,
+    normalize_keyword
+)
+
+
+KEYWORDS = [
+    "비건 화장품", "비건 스킨케어", "천연 화장품", "유기농 화장품",
+    "친환경 패키지", "친환경 용기", "재활용 패키지", "제로웨이스트 용기",
+    "20대 여성", "30대 여성", "MZ세대 여성", "직장인 여성"
+]
+
+
+def test_normalize_keyword():
+    """키워드 정규화 테스트"""
+    assert normalize_keyword("  비건   Skincare ") == "비건 skincare"
+    assert normalize_keyword("ＡＢＣ") == "abc"
+
+
+def test_hashing_vectors_are_dense_float32_and_similar():
+    """해싱 백엔드가 한국어 유사 키워드에 의미 있는 유사도를 주는지 테스트"""
+    vectorizer = HashingKeywordVectorizer()
+    vectors = vectorizer.transform(["비건 화장품", "천연 화장품", "친환경 용기"])
+
+    assert vectors.dtype == np.float32
+    assert vectors.shape == (3, vectorizer.dim)
+    assert vectors[0] @ vectors[1] > vectors[0] @ vectors[2]
+
+
+def test_embedding_table_backend(tmp_path):
+    """임베딩 테이블 백엔드 조회 및 토큰 평균 테스트"""
+    path = tmp_path / "embeddings.npz"
+    np.savez(
+        path,
+        words=np.array(["비건", "화장품"]),
+        vectors=np.array([[1, 0, 0], [0, 1, 0]], dtype=np.float32)
+    )
+    vectorizer = EmbeddingTableVectorizer(str(path))
+
+    vectors = vectorizer.transform(["비건", "비건 화장품", "없는키워드"])
+
+    assert np.allclose(vectors[0], [1, 0, 0])
+    assert np.allclose(vectors[1], [np.sqrt(0.5), np.sqrt(0.5), 0], atol=1e-6)
+    assert np.allclose(vectors[2], 0)
+
+
+def test_vector_cache_never_reembeds_known_keywords():
+    """캐시된 키워드는 다시 벡터화하지 않는지 테스트"""
+    calls = []
+
+    class CountingVectorizer(HashingKeywordVectorizer):
+        def transform(self, keywords):
+            calls.append(list(keywords))
+            return super().transform(keywords)
+
+    cache = KeywordVectorCache()
+    vectorizer = CountingVectorizer()
+
+    cache.embed(vectorizer, ["비건 화장품", "천연 화장품"])
+    matrix = cache.embed(vectorizer, ["비건  화장품", "친환경 용기", "천연 화장품"])
+
+    assert calls == [["비건 화장품", "천연 화장품"], ["친환경 용기"]]
+    assert matrix.shape == (3, vectorizer.dim)
+    assert cache.get_metrics()["pending_persist"] == 3
+
+
+def test_kmeans_clustering_groups_related_keywords():
+    """해싱 백엔드 기반 K-Means 클러스터링 테스트"""
+    service = KeywordClusteringService(backend="hashing")
+
+    result = service.cluster_keywords(KEYWORDS, num_clusters=3, method="kmeans")
+
+    assert result["success"] is True
+    assert result["vectorizer"] == "hashing"
+    assert sum(cluster["size"] for cluster in result["clusters"]) == len(KEYWORDS)
+    assert service.vectors.dtype == np.float32
+
+
+def test_hierarchical_clustering_caps_leaves_and_stores_compact_dendrogram():
+    """계층적 클러스터링 리프 수 제한 및 압축 덴드로그램 테스트"""
+    keywords = [f"{base} {i}" for base in KEYWORDS for i in range(10)]
+    service = KeywordClusteringService(backend="hashing", max_leaves=30, svd_components=16)
+
+    result = service.cluster_keywords(keywords, num_clusters=4, method="hierarchical")
+
+    assert result["success"] is True
+    assert "linkage_matrix" not in result
+    assert result["num_leaves"] <= 30
+    assert sum(cluster["size"] for cluster in result["clusters"]) == len(keywords)
+
+    dendrogram = service.dendrogram
+    assert isinstance(dendrogram["merges"], bytes)
+    assert sum(leaf["size"] for leaf in dendrogram["leaves"]) == len(keywords)
+    merges = decode_linkage(dendrogram["merges"], len(dendrogram["leaves"]))
+    assert merges.shape == (len(dendrogram["leaves"]) - 1, 4)
+    assert merges[-1, 3] == len(dendrogram["leaves"])
+
+
+def test_hierarchical_clustering_without_pre_clustering():
+    """리프 수 이하에서는 키워드가 그대로 리프가 되는지 테스트"""
+    service = KeywordClusteringService(backend="hashing")
+
+    result = service.cluster_keywords(KEYWORDS, num_clusters=3, method="hierarchical")
+
+    assert result["num_leaves"] == len(KEYWORDS)
+    assert [leaf["label"] for leaf in service.dendrogram["leaves"]] == KEYWORDS
+
+
+def test_find_similar_keywords_uses_index():
+    """유사 키워드 검색 (자기 자신 제외, 유사도 내림차순) 테스트"""
+    service = KeywordClusteringService(backend="hashing")
+
+    results = service.find_similar_keywords("비건 화장품", KEYWORDS, top_n=3)
+
+    assert len(results) == 3
+    assert "비건 화장품" not in [keyword for keyword, _ in results]
+    assert results[0][0] in ("비건 스킨케어", "천연 화장품", "유기농 화장품")
+    assert [score for _, score in results] == sorted((score for _, score in results), reverse=True)
+
+
+def random_unit_vectors(n: int = 2000, dim: int = 32) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def build_indexes(vectors: np.ndarray):
+    """같은 벡터를 두 번에 나눠 추가하고 kw0, kw1을 삭제한 정확 / LSH 인덱스"""
+    keywords = [f"kw{i}" for i in range(len(vectors))]
+    brute = KeywordSimilarityIndex(vectors.shape[1], lsh_threshold=10_000)
+    lsh = KeywordSimilarityIndex(vectors.shape[1], lsh_threshold=1000)
+    for index in (brute, lsh):
+        index.add(keywords[:1500], vectors[:1500])
+        index.add(keywords[1500:], vectors[1500:])
+        assert index.remove(["kw0", "kw1", "없는 키워드"]) == 2
+    return brute, lsh
+
+
+def test_similarity_index_lsh_matches_brute_force():
+    """유사도 인덱스 증분 추가/삭제, LSH 근사 검색이 정확 검색과 같은 최근접 반환"""
+    vectors = random_unit_vectors()
+    brute, lsh = build_indexes(vectors)
+    assert lsh.uses_lsh and not brute.uses_lsh
+
+    queries = vectors[[0, 10, 20]]
+    exact = brute.query(queries, top_n=5)
+    approx = lsh.query(queries, top_n=5)
+    assert all("kw0" not in dict(row) for row in exact + approx)
+    assert exact[1][0][0] == "kw10"
+    assert approx[1][0][0] == "kw10"
+
+
+def test_similarity_index_reuses_removed_slots():
+    """삭제된 슬롯 재사용"""
+    vectors = random_unit_vectors()
+    _, lsh = build_indexes(vectors)
+
+    lsh.add(["new"], vectors[:1])
+    assert len(lsh) == 1999 and lsh.get_metrics()["free_slots"] == 1
+
+
+def test_similarity_index_save_and_load(tmp_path):
+    """저장 후 로드한 인덱스가 같은 결과 반환"""
+    vectors = random_unit_vectors()
+    _, lsh = build_indexes(vectors)
+
+    path = tmp_path / "index.npz"
+    lsh.save(str(path))
+    loaded = KeywordSimilarityIndex.load(str(path))
+    assert len(loaded) == len(lsh) and loaded.uses_lsh
+    assert loaded.query(vectors[10:11], top_n=5) == lsh.query(vectors[10:11], top_n=5)
+
+
+def test_corpus_index_is_keyed_by_vectorizer_configuration(tmp_path, caplog):
+    """코퍼스 인덱스는 벡터화 설정별로 분리 저장, 손상된 파일은 경고 후 빈 인덱스"""
+    small, large = HashingKeywordVectorizer(n_features=256), HashingKeywordVectorizer(n_features=512)
+    corpus = KeywordCorpusIndex(directory=str(tmp_path))
+    corpus.get(small.cache_key, 256).add(["비건 화장품"], small.transform(["비건 화장품"]))
+    corpus.get(large.cache_key, 512)
+    assert corpus.save() == 2
+
+    reloaded = KeywordCorpusIndex(directory=str(tmp_path))
+    assert len(reloaded.get(small.cache_key, 256)) == 1
+    assert len(reloaded.get(large.cache_key, 512)) == 0
+
+    (tmp_path / "broken.npz").write_bytes(b"not an index")
+    assert len(reloaded.get("broken", 256)) == 0
+    assert "Keyword index load failed" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_vector_cache_persist_skips_stored_keywords(session_factory):
+    """벡터 캐시 DB 저장, 이미 저장된 키워드는 충돌 없이 무시"""
+    vectorizer = HashingKeywordVectorizer()
+    writer = KeywordVectorCache()
+    expected = writer.embed(vectorizer, ["비건 화장품", "친환경 용기"])
+
+    async with session_factory() as db:
+        assert await writer.persist(db) == 2
+        writer.put(vectorizer.cache_key, "비건 화장품", expected[0])
+        assert await writer.persist(db) == 1
+
+
+@pytest.mark.asyncio
+async def test_vector_cache_load(session_factory):
+    """저장된 벡터만 재로드"""
+    vectorizer = HashingKeywordVectorizer()
+    writer = KeywordVectorCache()
+    expected = writer.embed(vectorizer, ["비건 화장품", "친환경 용기"])
+    async with session_factory() as db:
+        await writer.persist(db)
+
+    reader = KeywordVectorCache()
+    async with session_factory() as db:
+        assert await reader.load(db, vectorizer, ["비건 화장품", "친환경 용기", "새 키워드"]) == 2
+    assert np.allclose(reader.get(vectorizer.cache_key, "친환경 용기"), expected[1])
+
+
+@pytest.mark.asyncio
+async def test_vector_cache_ignores_vectors_from_other_configuration(session_factory):
+    """설정(차원)이 바뀐 벡터화기는 이전 벡터를 로드하지 않음"""
+    vectorizer = HashingKeywordVectorizer()
+    writer = KeywordVectorCache()
+    writer.embed(vectorizer, ["비건 화장품"])
+    async with session_factory() as db:
+        await writer.persist(db)
+
+        resized = HashingKeywordVectorizer(n_features=256)
+        assert resized.cache_key != vectorizer.cache_key
+        assert await KeywordVectorCache().load(db, resized, ["비건 화장품"]) == 0
+
+
+def test_vector_cache_bounds_pending_writes():
+    """저장 대기 벡터 수가 제한을 넘으면 오래된 것부터 버리는지 테스트"""
+    cache = KeywordVectorCache(max_pending=2)
+    for keyword in ["a", "b", "c"]:
+        cache.put("hashing:512:2-3", keyword, np.ones(4, dtype=np.float32))
+
+    assert list(cache.pending("hashing:512:2-3")) == ["b", "c"]
+    assert cache.get_metrics()["pending_dropped"] == 1
+
+
+def test_online_kmeans_partial_fit_matches_batch_mean():
+    """온라인 K-Means 누적 평균 갱신 및 O(k) 할당 테스트"""
+    model = OnlineKMeans(n_clusters=2, dim=2)
+    first = np.array([[1, 0], [0, 1]], dtype=np.float32)
+    second = np.array([[0.8, 0.6], [0.6, 0.8], [1, 0]], dtype=np.float32)
+
+    model.partial_fit(first)
+    labels = model.partial_fit(second)
+
+    assert model.counts.sum() == 5
+    x_cluster = model.predict(np.array([[1, 0]], dtype=np.float32))[0]
+    members = np.vstack([first, second])[np.concatenate([model.predict(first), labels]) == x_cluster]
+    assert np.allclose(model.centroids[x_cluster], members.mean(axis=0), atol=1e-6)
+
+
+async def absorbed_service(session_factory) -> IncrementalKeywordClusteringService:
+    """브랜드 1의 인사이트 키워드를 두 번에 나눠 반영한 증분 클러스터링 서비스"""
+    service = IncrementalKeywordClusteringService(
+        n_clusters=3, backend="hashing", vector_cache=KeywordVectorCache()
+    )
+    async with session_factory() as db:
+        await service.absorb(db, brand_id=1, keywords=KEYWORDS[:6])
+        batch = await service.absorb(db, brand_id=1, keywords=KEYWORDS[6:])
+        assert len(batch) == 6
+    return service
+
+
+@pytest.mark.asyncio
+async def test_incremental_clustering_absorbs_insight_history(session_factory):
+    """브랜드 증분 클러스터링 모델 저장/조회 테스트"""
+    service = await absorbed_service(session_factory)
+
+    async with session_factory() as db:
+        keyword_map = await service.get_keyword_map(db, brand_id=1)
+        assert keyword_map["n_samples"] == len(KEYWORDS)
+        assert sum(cluster["size"] for cluster in keyword_map["clusters"]) == len(KEYWORDS)
+        assert await service.get_keyword_map(db, brand_id=2) is None
+
+
+@pytest.mark.asyncio
+async def test_incremental_clustering_assigns_known_and_new_keywords(session_factory):
+    """기존 키워드는 저장된 할당, 새 키워드는 가장 가까운 클러스터"""
+    service = await absorbed_service(session_factory)
+
+    async with session_factory() as db:
+        known = await service.assign(db, brand_id=1, keyword="비건 화장품")
+        assert known["known"] is True
+        new = await service.assign(db, brand_id=1, keyword="비건 립밤")
+        assert new["known"] is False
+        assert 0 <= new["cluster_id"] < 3
+
+
+@pytest.mark.asyncio
+async def test_insight_for_unowned_brand_is_rejected(monkeypatch, session_factory):
+    """다른 사용자의 브랜드로 인사이트를 만들면 404, 클러스터 모델은 건드리지 않음"""
+    from fastapi import HTTPException
+    from app.api.v1.endpoints import insights
+    from app.models.brand import Brand
+    from app.models.user import User
+    from app.schemas.insight import BrandInsightCreate
+
+    class FailingService:
+        async def absorb(self, *args, **kwargs):
+            raise AssertionError("absorb must not run for an unowned brand")
+
+    monkeypatch.setattr(
+        "app.services.incremental_clustering_service.incremental_clustering_service", FailingService()
+    )
+
+    async with session_factory() as db:
+        owner = User(email="owner@example.com", password_hash="x", name="Owner")
+        intruder = User(email="intruder@example.com", password_hash="x", name="Intruder")
+        db.add_all([owner, intruder])
+        await db.flush()
+        brand = Brand(user_id=owner.id, brand_name="그린비건", category="뷰티")
+        db.add(brand)
+        await db.commit()
+
+        request = BrandInsightCreate(brand_id=brand.id, prompt="비건 화장품 시장을 분석해 주세요")
+        with pytest.raises(HTTPException) as error:
+            await insights.create_brand_insight(request, db=db, current_user=intruder)
+        assert error.value.status_code == 404
+
+
+def test_vector_cache_is_safe_across_threads():
+    """분석 스레드가 벡터를 추가하는 동안 다른 스레드가 저장 대기 목록을 순회해도 안전한지 테스트"""
+    import threading
+
+    cache = KeywordVectorCache(max_entries=500, max_pending=400)
+    stop = threading.Event()
+    errors = []
+
+    def writer():
+        i = 0
+        while not stop.is_set():
+            cache.put("hashing:512:2-3", f"keyword {i}", np.ones(4, dtype=np.float32))
+            i += 1
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        for _ in range(2000):
+            try:
+                cache.pending("hashing:512:2-3")
+                cache.snapshot("hashing:512:2-3", [f"keyword {i}" for i in range(50)])
+            except RuntimeError as e:
+                errors.append(e)
+    finally:
+        stop.set()
+        thread.join()
+
+    assert not errors
+    assert cache.get_metrics()["pending_persist"] <= 400
+
+
+@pytest.mark.asyncio
+async def test_keyword_absorb_failure_does_not_fail_insight(monkeypatch):
+    """tfidf 백엔드는 증분 흡수를 건너뛰고, 흡수 실패는 로그만 남김 (인사이트는 이미 저장됨)"""
+    from app.api.v1.endpoints import insights
+
+    class FailingService:
+        supported = True
+
+        async def absorb(self, *args, **kwargs):
+            raise RuntimeError("vector store unavailable")
+
+    tfidf = IncrementalKeywordClusteringService(backend="tfidf")
+    assert not tfidf.supported
+    monkeypatch.setattr("app.services.incremental_clustering_service.incremental_clustering_service", tfidf)
+    await insights._absorb_keywords(None, 1, ["비건 화장품"], index=False)
+
+    monkeypatch.setattr(
+        "app.services.incremental_clustering_service.incremental_clustering_service", FailingService()
+    )
+    await insights._absorb_keywords(None, 1, ["비건 화장품"], index=False)
+
+
+@pytest.mark.asyncio
+async def test_incremental_model_is_tied_to_vectorizer_configuration(session_factory):
+    """해시 차원이 같아도 설정이 바뀐 벡터화기로는 새 키워드를 할당하지 않고, 다음 흡수 시 새로 시작"""
+    service = await absorbed_service(session_factory)
+    async with session_factory() as db:
+        row = await service._get_model_row(db, 1)
+        assert row.backend == HashingKeywordVectorizer().cache_key
+        row.backend = "hashing:512:1-2"
+        await db.commit()
+
+        assert await service.assign(db, brand_id=1, keyword="비건 립밤") is None
+        await service.absorb(db, brand_id=1, keywords=["비건 립밤"])
+        keyword_map = await service.get_keyword_map(db, brand_id=1)
+        assert keyword_map["n_samples"] == 1
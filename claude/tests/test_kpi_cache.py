@@ -0,0 +1,101 @@
+"""
+KPI Cache Tests
+브랜드별 KPI 요약 / 스냅샷 캐시 및 쓰기 시 무효화 테스트
+"""
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import Cache, MemoryCacheBackend
+from app.models.brand import BrandKPI
+from app.services import kpi_service as kpi_module
+from app.services.kpi_service import KPIService
+
+
+@pytest.fixture
+def kpi_cache(monkeypatch):
+    monkeypatch.setattr(kpi_module, "kpi_cache", Cache(MemoryCacheBackend(), "kpi"))
+
+
+async def seed_kpis(db: AsyncSession) -> None:
+    now = datetime.utcnow()
+    inserted = await KPIService.bulk_insert_kpis(db, [
+        {"brand_id": 1, "followers": 1000, "measurement_date": now - timedelta(days=3)},
+        {"brand_id": 1, "followers": 5000, "measurement_date": now - timedelta(days=1)},
+        {"brand_id": 2, "followers": 2000, "measurement_date": now - timedelta(days=2)},
+    ])
+    assert inserted == 3
+
+
+@pytest.mark.asyncio
+async def test_snapshots_include_latest_kpi_and_trend(kpi_cache, session_factory):
+    """브랜드별 최신 KPI / 추세, 데이터 없는 브랜드는 기본값"""
+    async with session_factory() as db:
+        await seed_kpis(db)
+
+        snapshots = await KPIService.get_brand_snapshots(db, [1, 2, 3])
+        assert snapshots[1] == {"latest_kpi": pytest.approx(1.5), "kpi_trend": "up"}
+        assert snapshots[2]["kpi_trend"] == "stable"
+        assert snapshots[3] == {"latest_kpi": None, "kpi_trend": "stable"}
+
+
+@pytest.mark.asyncio
+async def test_cached_snapshots_skip_the_database(kpi_cache, session_factory):
+    """캐시 적중 시 DB 미조회 (캐시를 우회한 쓰기는 반영되지 않음)"""
+    async with session_factory() as db:
+        await seed_kpis(db)
+        await KPIService.get_brand_snapshots(db, [2])
+
+        db.add(BrandKPI(brand_id=2, kpi_type="social_media", value=99.0, popularity_index=99.0))
+        await db.commit()
+        assert (await KPIService.get_brand_snapshots(db, [2]))[2]["latest_kpi"] == pytest.approx(0.6)
+
+
+@pytest.mark.asyncio
+async def test_update_kpi_invalidates_only_that_brand(kpi_cache, session_factory):
+    """update_kpi 후 해당 브랜드의 스냅샷 / 요약만 갱신"""
+    async with session_factory() as db:
+        await seed_kpis(db)
+        await KPIService.get_brand_snapshots(db, [1, 2])
+        summary = await KPIService.get_kpi_summary(db, 2)
+
+        await KPIService.update_kpi(db, brand_id=2, followers=10000)
+
+        snapshots = await KPIService.get_brand_snapshots(db, [1, 2])
+        assert snapshots[2]["latest_kpi"] == pytest.approx(3.0)
+        assert snapshots[1]["latest_kpi"] == pytest.approx(1.5)
+        assert (await KPIService.get_kpi_summary(db, 2)) != summary
+
+
+@pytest.mark.asyncio
+async def test_compare_brands_keeps_requested_order(kpi_cache, session_factory):
+    """비교 결과는 요청한 브랜드 순서, 무효화된 최신 요약 사용"""
+    async with session_factory() as db:
+        await seed_kpis(db)
+        await KPIService.compare_brands(db, [2, 1])
+        await KPIService.update_kpi(db, brand_id=2, followers=10000)
+
+        comparison = await KPIService.compare_brands(db, [2, 1])
+        assert [item["brand_id"] for item in comparison] == [2, 1]
+        assert comparison[0]["summary"]["current"]["followers"] == 10000
+
+
+@pytest.mark.asyncio
+async def test_evicted_generation_does_not_revive_old_entries(monkeypatch):
+    """세대 값이 LRU에서 밀려나도 무효화 전 요약을 다시 반환하지 않음"""
+    backend = MemoryCacheBackend()
+    monkeypatch.setattr(kpi_module, "kpi_cache", Cache(backend, "kpi"))
+    computed = []
+
+    async def compute(brand_ids):
+        computed.append(list(brand_ids))
+        return {brand_id: {"version": len(computed)} for brand_id in brand_ids}
+
+    assert (await KPIService._cached_per_brand("summary", [1], compute))[1] == {"version": 1}
+    assert (await KPIService._cached_per_brand("summary", [1], compute))[1] == {"version": 1}
+
+    await KPIService.invalidate([1])
+    assert (await KPIService._cached_per_brand("summary", [1], compute))[1] == {"version": 2}
+
+    # 세대 값만 제거 (LRU 제거) → 새 세대로 다시 계산
+    await backend.delete(["artnex:kpi:gen:1"])
+    assert (await KPIService._cached_per_brand("summary", [1], compute))[1] == {"version": 3}
@@ -0,0 +1,134 @@
+"""
+Mockup Tests
+목업 합성 (한 번 디코딩, 크기별 출력) 및 (이미지 해시, 템플릿, 크기) 캐시 테스트
+"""
+import io
+import pytest
+from PIL import Image
+from app.core.analytics_executor import AnalyticsExecutor
+from app.core.cache import Cache, MemoryCacheBackend
+from app.models.design import DesignInputType, DesignProject, DesignResult
+from app.services import mockup_service as mockup_module
+from app.services.mockup_service import MOCKUP_SIZES, MockupService, compose_mockups
+from app.services.s3_service import S3Service
+
+
+def design_image(fmt: str = "PNG") -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (900, 600), (20, 120, 80)).save(buffer, fmt)
+    return buffer.getvalue()
+
+
+def test_compose_mockups_all_sizes():
+    """템플릿별 크기(대 / 중 / 썸네일) JPEG 생성"""
+    outputs = compose_mockups(design_image("JPEG"), ["package", "poster"], "beauty")
+
+    assert set(outputs) == {"package", "poster"}
+    for mockup_type, rendered in outputs.items():
+        assert set(rendered) == set(MOCKUP_SIZES)
+        for size, data in rendered.items():
+            image = Image.open(io.BytesIO(data))
+            assert image.format == "JPEG"
+            assert max(image.size) == MOCKUP_SIZES[size]
+
+
+def test_compose_mockups_places_design_in_template():
+    """디자인 영역 중앙에 디자인 색상이 합성됨"""
+    outputs = compose_mockups(design_image("JPEG"), ["poster"], "beauty")
+
+    poster = Image.open(io.BytesIO(outputs["poster"]["large"])).convert("RGB")
+    r, g, b = poster.getpixel((600, 740))
+    assert g > r and g > b
+
+
+class MockupHarness:
+    """분석 실행기 / S3 / 캐시를 바꾼 MockupService와 이미지 다운로드 기록"""
+
+    def __init__(self, monkeypatch):
+        self.executor = AnalyticsExecutor(max_workers=0)
+        s3 = S3Service()
+        s3.mock_mode = True
+        monkeypatch.setattr(mockup_module, "analytics_executor", self.executor)
+        monkeypatch.setattr(mockup_module, "s3_service", s3)
+        monkeypatch.setattr(mockup_module, "mockup_cache", Cache(MemoryCacheBackend(), "mockup"))
+
+        self.service = MockupService()
+        self.fetched = []
+        monkeypatch.setattr(self.service, "fetch_image", self.fetch_image)
+
+    async def fetch_image(self, url):
+        self.fetched.append(url)
+        return design_image()
+
+
+@pytest.fixture
+def harness(monkeypatch):
+    harness = MockupHarness(monkeypatch)
+    yield harness
+    harness.executor.shutdown()
+
+
+async def create_designs(db):
+    """같은 이미지를 가리키는 URL이 다른 디자인 결과 2개"""
+    project = DesignProject(brand_id=1, user_id=1, project_name="로고", input_type=DesignInputType.BLANK)
+    db.add(project)
+    await db.flush()
+    design = DesignResult(project_id=project.id, image_url="https://img.example.com/logo.png")
+    other = DesignResult(project_id=project.id, image_url="https://img.example.com/logo-copy.png")
+    db.add_all([design, other])
+    await db.commit()
+    return design, other
+
+
+@pytest.mark.asyncio
+async def test_create_mockups_uploads_every_size(harness, session_factory):
+    """템플릿마다 크기별 URL 저장, 대표 URL은 large"""
+    async with session_factory() as db:
+        design, _ = await create_designs(db)
+        mockups = await harness.service.create_mockups(db, design, ["package", "business_card"], "food")
+
+    assert [m.mockup_type for m in mockups] == ["package", "business_card"]
+    assert all(set(m.thumbnail_urls) == set(MOCKUP_SIZES) for m in mockups)
+    assert all(m.mockup_url == m.thumbnail_urls["large"] for m in mockups)
+    assert harness.executor.completed == 1 and len(harness.fetched) == 1
+
+
+@pytest.mark.asyncio
+async def test_repeated_request_is_served_from_cache(harness, session_factory):
+    """같은 디자인 재요청: 다운로드 / 합성 없이 캐시, 행은 교체"""
+    async with session_factory() as db:
+        design, _ = await create_designs(db)
+        mockups = await harness.service.create_mockups(db, design, ["package", "business_card"], "food")
+        again = await harness.service.create_mockups(db, design, ["package", "business_card"], "food")
+
+        assert [m.mockup_url for m in again] == [m.mockup_url for m in mockups]
+        assert len(await harness.service.list_mockups(db, [design.id])) == 2
+    assert harness.executor.completed == 1 and len(harness.fetched) == 1
+
+
+@pytest.mark.asyncio
+async def test_same_image_at_another_url_is_not_recomposed(harness, session_factory):
+    """같은 이미지의 다른 URL: 다운로드 후 해시가 같으므로 합성 없음"""
+    async with session_factory() as db:
+        design, other = await create_designs(db)
+        await harness.service.create_mockups(db, design, ["package"], "food")
+        await harness.service.create_mockups(db, other, ["package"], "food")
+
+    assert harness.executor.completed == 1 and len(harness.fetched) == 2
+
+
+@pytest.mark.asyncio
+async def test_only_new_templates_are_composed(harness, session_factory):
+    """캐시에 없는 템플릿만 합성, 갤러리 조회는 합성하지 않음"""
+    async with session_factory() as db:
+        design, other = await create_designs(db)
+        await harness.service.create_mockups(db, design, ["package", "business_card"], "food")
+        await harness.service.create_mockups(db, other, ["package"], "food")
+        await harness.service.create_mockups(db, design, ["package", "poster"], "food")
+        assert harness.executor.completed == 2
+
+        gallery = await harness.service.list_mockups(db, [design.id, other.id])
+        assert sorted((m.design_result_id, m.mockup_type) for m in gallery) == sorted([
+            (design.id, "package"), (design.id, "business_card"), (design.id, "poster"), (other.id, "package")
+        ])
+    assert harness.executor.completed == 2
@@ -0,0 +1,172 @@
+"""
+Query Plan Regression Tests
+핫 쿼리(서비스 / 엔드포인트)가 실제로 실행하는 SQL의 EXPLAIN QUERY PLAN 검사
+
+시드 데이터 + ANALYZE 후 각 호출이 실행한 SELECT를 캡처하여,
+테이블 전체 스캔이나 ORDER BY용 임시 정렬이 생기면 실패합니다.
+"""
+import re
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from app.api.v1.endpoints import dashboard, design, insights
+from app.core.cache import Cache, MemoryCacheBackend
+from app.core.database import Base
+from app.models.brand import Brand, BrandKPI
+from app.models.design import DesignProject, DesignInputType
+from app.models.insight import BrandInsight, InsightType
+from app.models.user import User
+from app.schemas.dashboard import BrandSearchRequest
+from app.services import kpi_service as kpi_module
+from app.services.brand_autocomplete import BrandAutocompleteService
+from app.services.kpi_service import KPIService
+
+TABLES = set(Base.metadata.tables)
+FULL_SCAN = re.compile(r"^SCAN (\w+)(?! VIRTUAL TABLE)")
+
+
+class FakeGPTService:
+    async def recommend_brands(self, **kwargs):
+        return {"success": False, "error": "disabled in plan tests"}
+
+
+async def seed(db: AsyncSession) -> User:
+    now = datetime.utcnow()
+    users = [User(email=f"user{u}@artnex.test", password_hash="x", name=f"user{u}") for u in range(20)]
+    db.add_all(users)
+    await db.flush()
+
+    brands = [
+        Brand(
+            user_id=user.id,
+            brand_name=f"브랜드 {user.id:02d}{b:02d}",
+            category=f"카테고리{b % 4}",
+            description="친환경 비건 라이프스타일",
+            keywords=["비건", f"키워드{b}"],
+            status="active" if b % 5 else "archived",
+            updated_at=now - timedelta(hours=b)
+        )
+        for user in users for b in range(10)
+    ]
+    db.add_all(brands)
+    await db.flush()
+
+    db.add_all([
+        BrandKPI(
+            brand_id=brand.id, kpi_type="social_media", value=float(d), popularity_index=float(d),
+            followers=1000 + d, measurement_date=now - timedelta(days=d)
+        )
+        for brand in brands for d in range(0, 60, 3)
+    ])
+    db.add_all([
+        BrandInsight(
+            user_id=user.id, brand_id=brands[i].id, prompt="시장 분석",
+            insight_type=InsightType.MARKET_ANALYSIS
+        )
+        for i, user in enumerate(users) for _ in range(5)
+    ])
+    db.add_all([
+        DesignProject(
+            user_id=user.id, brand_id=brands[i].id, project_name="패키지",
+            input_type=DesignInputType.BLANK
+        )
+        for i, user in enumerate(users) for _ in range(3)
+    ])
+    await db.commit()
+    await db.execute(text("ANALYZE"))
+    return users[3]
+
+
+@asynccontextmanager
+async def captured_selects(engine):
+    """블록 안에서 실행된 SELECT 문과 파라미터 캡처"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+
+async def plan_problems(engine, statements, allow_sort: bool = False):
+    """전체 스캔 / 임시 정렬이 있는 계획 목록"""
+    problems = []
+    async with engine.connect() as conn:
+        for statement, parameters in statements:
+            result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            details = [row[3] for row in result.all()]
+            for detail in details:
+                scan = FULL_SCAN.match(detail)
+                if scan and scan.group(1) in TABLES:
+                    problems.append((statement, detail))
+                if not allow_sort and "USE TEMP B-TREE FOR ORDER BY" in detail:
+                    problems.append((statement, detail))
+    return problems
+
+
+# (이름, 호출, 정렬 허용 여부) — 검색 결과 정렬(관련도순)은 인덱스로 대체할 수 없으며
+# 사용자의 일치 행만 정렬하므로 허용
+HOT_QUERIES = [
+    ("dashboard", lambda db, user: dashboard.get_dashboard(current_user=user, db=db), False),
+    ("shortcuts", lambda db, user: dashboard.get_brand_shortcuts(current_user=user, db=db, limit=10), False),
+    ("user_status", lambda db, user: dashboard.get_user_status(current_user=user, db=db), False),
+    ("search", lambda db, user: dashboard.search_brands(
+        BrandSearchRequest(query="브랜드 03"), current_user=user, db=db), True),
+    ("search_short", lambda db, user: dashboard.search_brands(
+        BrandSearchRequest(query="03"), current_user=user, db=db), True),
+    ("autocomplete", lambda db, user: BrandAutocompleteService().suggest(db, user.id, "브랜"), False),
+    ("kpi_trend", lambda db, user: KPIService.get_kpi_trend(db, 42), False),
+    ("kpi_summary", lambda db, user: KPIService.get_kpi_summary(db, 42), False),
+    ("kpi_snapshots", lambda db, user: KPIService.get_brand_snapshots(db, [41, 42, 43]), False),
+    ("insights", lambda db, user: insights.list_insights(
+        brand_id=None, page=1, page_size=10, db=db, current_user=user), False),
+    ("insights_by_brand", lambda db, user: insights.list_insights(
+        brand_id=31, page=1, page_size=10, db=db, current_user=user), False),
+    ("design_projects", lambda db, user: design.list_design_projects(db=db, current_user=user), False),
+]
+
+
+@pytest_asyncio.fixture(scope="module")
+async def seeded():
+    """시드 + ANALYZE는 모듈에서 한 번만 (모든 핫 쿼리를 같은 데이터로 검사)
+
+    Returns:
+        (엔진, 세션 팩토리, 조회 사용자)
+    """
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as db:
+        user = await seed(db)
+
+    yield engine, session_factory, user
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("call, allow_sort", [
+    pytest.param(call, allow_sort, id=name) for name, call, allow_sort in HOT_QUERIES
+])
+async def test_hot_query_uses_indexes(monkeypatch, seeded, call, allow_sort):
+    """대시보드 / 검색 / KPI / 인사이트 / 디자인 핫 쿼리의 인덱스 사용 검사"""
+    monkeypatch.setattr(kpi_module, "kpi_cache", Cache(MemoryCacheBackend(), "kpi"))
+    monkeypatch.setattr(dashboard, "gpt_service", FakeGPTService())
+    engine, session_factory, user = seeded
+
+    async with session_factory() as db:
+        async with captured_selects(engine) as statements:
+            await call(db, user)
+    assert statements, "no queries captured"
+
+    problems = await plan_problems(engine, statements, allow_sort)
+    assert not problems, "\n".join(f"{detail}\n    {statement}" for statement, detail in problems)
@@ -0,0 +1,213 @@
+"""
+Report Analysis Tests
+섹션별 GPT 분석 동시 실행, 부분 저장, 마감 시간 / 토큰 예산 테스트
+"""
+import asyncio
+import pytest
+from sqlalchemy import select
+from app.core.analytics_executor import AnalyticsExecutor
+from app.core.cache import Cache, MemoryCacheBackend
+from app.models.brand import Brand
+from app.models.insight import BrandDiagnostic, BrandReport, DiagnosticSection
+from app.models.keyword import KeyPhraseDocument
+from app.models.user import User
+from app.services import key_phrase_engine as engine_module
+from app.services import report_analysis_service as analysis_module
+from app.services.report_analysis_service import ReportAnalysisService
+
+
+class FakeGPTService:
+    """섹션 분석 / 요약 호출 기록용 GPT 서비스"""
+
+    def __init__(self, slow_sections=()):
+        self.slow_sections = set(slow_sections)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.section_max_tokens = {}
+        self.summary_sections = None
+
+    async def analyze_diagnostic_section(self, brand_name, category, section, questions_answers,
+                                         section_score, max_tokens=800, priority=None):
+        self.section_max_tokens[section] = max_tokens
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(10 if section in self.slow_sections else 0.01)
+        finally:
+            self.in_flight -= 1
+        return {
+            "success": True,
+            "data": {"analysis": f"{section} 분석", "strengths": [f"{section} 강점"], "weaknesses": []},
+            "tokens_used": 300,
+        }
+
+    async def summarize_diagnostic_report(self, brand_name, overall_score, sections, max_tokens=1000, priority=None):
+        self.summary_sections = sorted(sections)
+        return {
+            "success": True,
+            "data": {"summary": "종합 요약", "recommendations": [{"title": "제안"}]},
+            "tokens_used": 500,
+        }
+
+
+@pytest.fixture(autouse=True)
+def analysis_state(monkeypatch):
+    """분석 상태 캐시 + 핵심 구문 코퍼스"""
+    monkeypatch.setattr(analysis_module, "analysis_cache", Cache(MemoryCacheBackend(), "report_analysis"))
+    executor = AnalyticsExecutor(max_workers=0)
+    monkeypatch.setattr(engine_module, "analytics_executor", executor)
+    monkeypatch.setattr(engine_module, "key_phrase_engine", engine_module.KeyPhraseEngine())
+    yield
+    executor.shutdown()
+
+
+async def create_report(session_factory) -> int:
+    async with session_factory() as db:
+        user = User(email="owner@example.com", password_hash="x", name="Owner")
+        db.add(user)
+        await db.flush()
+        brand = Brand(user_id=user.id, brand_name="그린비건", category="뷰티")
+        db.add(brand)
+        await db.flush()
+        report = BrandReport(brand_id=brand.id, user_id=user.id, report_name="브랜드 진단")
+        db.add(report)
+        await db.flush()
+        db.add_all([
+            BrandDiagnostic(report_id=report.id, section=section, questions_answers={"q1": 4, "q2": 3})
+            for section in DiagnosticSection
+        ])
+        await db.commit()
+        return report.id
+
+
+@pytest.mark.asyncio
+async def test_sections_run_concurrently_then_summary(monkeypatch, session_factory):
+    """섹션 분석 동시 실행 → 저장 → 종합 요약, 점수가 없으면 먼저 채점"""
+    gpt = FakeGPTService()
+    monkeypatch.setattr(analysis_module, "gpt_service", gpt)
+    report_id = await create_report(session_factory)
+    service = ReportAnalysisService(session_factory=session_factory)
+
+    status = await service.analyze_report(report_id)
+
+    assert status["status"] == "done"
+    assert sorted(status["completed_sections"]) == sorted(s.value for s in DiagnosticSection)
+    assert status["tokens_used"] == 5 * 300 + 500
+    assert gpt.max_in_flight == 5
+    assert len(gpt.summary_sections) == 5
+
+    async with session_factory() as db:
+        report = await db.get(BrandReport, report_id)
+        assert report.ai_summary == "종합 요약"
+        assert report.overall_score == 62.5
+        diagnostics = (await db.execute(select(BrandDiagnostic))).scalars().all()
+        assert all(d.ai_analysis == f"{d.section.value} 분석" for d in diagnostics)
+        assert all(d.section_score == 62.5 for d in diagnostics)
+        # 요약이 생성된 리포트는 핵심 구문 코퍼스에 반영
+        documents = (await db.execute(select(KeyPhraseDocument.source, KeyPhraseDocument.source_id))).all()
+        assert documents == [("report", report_id)]
+
+
+@pytest.mark.asyncio
+async def test_deadline_keeps_completed_sections(monkeypatch, session_factory):
+    """마감 시간 초과 섹션은 취소하고 완료된 섹션만으로 요약 (partial)"""
+    gpt = FakeGPTService(slow_sections={"marketing"})
+    monkeypatch.setattr(analysis_module, "gpt_service", gpt)
+    report_id = await create_report(session_factory)
+    service = ReportAnalysisService(deadline_seconds=0.5, summary_reserve_seconds=0.2, session_factory=session_factory)
+
+    status = await asyncio.wait_for(service.analyze_report(report_id), timeout=2)
+
+    assert status["status"] == "partial"
+    assert status["failed_sections"] == {"marketing": "deadline exceeded"}
+    assert status["summary_generated"]
+    assert "marketing" not in gpt.summary_sections and len(gpt.summary_sections) == 4
+    assert (await service.get_status(report_id))["status"] == "partial"
+
+    async with session_factory() as db:
+        marketing = (await db.execute(
+            select(BrandDiagnostic).where(BrandDiagnostic.section == DiagnosticSection.MARKETING)
+        )).scalar_one()
+        assert marketing.ai_analysis is None
+
+
+@pytest.mark.asyncio
+async def test_start_analysis_runs_once_and_replaces_stale_status(monkeypatch, session_factory):
+    """동시 시작은 한 번만 실행, 잠금 없이 남은 running 상태(재시작 / 취소)는 새 분석으로 대체"""
+    monkeypatch.setattr(analysis_module, "gpt_service", FakeGPTService())
+    report_id = await create_report(session_factory)
+    service = ReportAnalysisService(session_factory=session_factory)
+
+    await service._set_status(report_id, {"status": "running", "completed_sections": []})
+    first, second = await asyncio.gather(service.start_analysis(report_id), service.start_analysis(report_id))
+    assert first["status"] == second["status"] == "running"
+    assert len(service._tasks) == 1
+
+    await asyncio.gather(*list(service._tasks))
+    assert (await service.get_status(report_id))["status"] == "done"
+    # 실행이 끝나면 잠금 해제 → 다시 시작 가능
+    await service.start_analysis(report_id)
+    assert len(service._tasks) == 1
+    await asyncio.gather(*list(service._tasks))
+
+
+@pytest.mark.asyncio
+async def test_token_budget_limits_completions(monkeypatch, session_factory):
+    """토큰 예산을 섹션 / 요약에 나눠 배정하고, 부족하면 호출하지 않음"""
+    gpt = FakeGPTService()
+    monkeypatch.setattr(analysis_module, "gpt_service", gpt)
+    report_id = await create_report(session_factory)
+
+    service = ReportAnalysisService(token_budget=4000, session_factory=session_factory)
+    await service.analyze_report(report_id)
+    assert all(tokens <= (4000 - 1000 - 250) // 5 for tokens in gpt.section_max_tokens.values())
+
+    starved = ReportAnalysisService(token_budget=1500, session_factory=session_factory)
+    status = await starved.analyze_report(report_id)
+    assert status["status"] == "partial"
+    assert set(status["failed_sections"].values()) == {"token budget exceeded"}
+    assert not status["summary_generated"]
+
+
+@pytest.mark.asyncio
+async def test_deadline_cancels_upstream_completion(monkeypatch, session_factory):
+    """마감 시간에 취소한 섹션의 GPT 요청이 실제로 중단되는지 테스트 (코얼레싱 / 캐시 경유)"""
+    from unittest.mock import MagicMock
+    from app.services.gpt_scheduler import GPTRequestScheduler
+    from app.services.gpt_service import GPTService
+    from app.services.single_flight import get_group
+
+    cancelled = []
+
+    async def create(messages, **kwargs):
+        prompt = messages[-1]["content"]
+        if "'marketing'" in prompt:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append("marketing")
+                raise
+        response = MagicMock()
+        response.choices[0].message.content = '{"analysis": "분석", "strengths": [], "weaknesses": [], "summary": "요약"}'
+        response.usage.total_tokens = 100
+        return response
+
+    gpt = GPTService()
+    gpt.scheduler = GPTRequestScheduler(tokens_per_minute=100000, requests_per_minute=600)
+    released = []
+    release = gpt.scheduler.release
+    gpt.scheduler.release = lambda reserved: (released.append(reserved), release(reserved))
+    gpt.client = MagicMock()
+    gpt.client.chat.completions.create = create
+    monkeypatch.setattr(analysis_module, "gpt_service", gpt)
+
+    report_id = await create_report(session_factory)
+    service = ReportAnalysisService(deadline_seconds=0.5, summary_reserve_seconds=0.2, session_factory=session_factory)
+
+    status = await asyncio.wait_for(service.analyze_report(report_id), timeout=2)
+
+    assert status["failed_sections"] == {"marketing": "deadline exceeded"}
+    assert cancelled == ["marketing"]
+    assert get_group("gpt").get_metrics()["in_flight"] == 0
+    # 취소된 요청은 API가 이미 처리 중일 수 있으므로 예약 토큰을 반환하지 않음
+    assert released == []
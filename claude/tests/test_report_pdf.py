@@ -0,0 +1,183 @@
+"""
+Report PDF Tests
+리포트 PDF 렌더링, 콘텐츠 해시 캐시, 멀티파트 스트리밍 업로드 테스트
+"""
+import asyncio
+import io
+import pytest
+from botocore.exceptions import ClientError, EndpointConnectionError
+from app.core.analytics_executor import AnalyticsExecutor
+from app.core.cache import Cache, MemoryCacheBackend
+from app.models.insight import BrandDiagnostic, BrandReport, DiagnosticSection, ReportSection
+from app.services import report_pdf_service as pdf_module
+from app.services.report_pdf_service import ReportPdfService, render_report_pdf
+from app.services.s3_service import S3Service
+
+
+class RecordingS3Client:
+    """멀티파트 호출 기록용 클라이언트"""
+
+    def __init__(self, fail_on_part=None, error=None):
+        self.parts = []
+        self.completed = None
+        self.aborted = []
+        self.fail_on_part = fail_on_part
+        self.error = error
+
+    def create_multipart_upload(self, **kwargs):
+        return {"UploadId": "upload-1"}
+
+    def upload_part(self, **kwargs):
+        if kwargs["PartNumber"] == self.fail_on_part:
+            raise self.error
+        self.parts.append((kwargs["PartNumber"], len(kwargs["Body"])))
+        return {"ETag": f"etag-{kwargs['PartNumber']}"}
+
+    def complete_multipart_upload(self, **kwargs):
+        self.completed = kwargs["MultipartUpload"]["Parts"]
+
+    def abort_multipart_upload(self, **kwargs):
+        self.aborted.append(kwargs["UploadId"])
+
+
+@pytest.mark.asyncio
+async def test_upload_stream_sends_bounded_parts():
+    """스트림을 파트 크기 단위로 나누어 업로드하는지 테스트"""
+    s3 = S3Service()
+    s3.mock_mode = False
+    s3.s3_client = RecordingS3Client()
+    data = io.BytesIO(b"x" * (S3Service.MIN_PART_SIZE * 2 + 10))
+
+    result = await s3.upload_stream(data, "reports/pdf/abc.pdf", part_size=1)
+
+    assert result["success"] and result["parts"] == 3
+    assert s3.s3_client.parts == [(1, S3Service.MIN_PART_SIZE), (2, S3Service.MIN_PART_SIZE), (3, 10)]
+    assert [p["PartNumber"] for p in s3.s3_client.completed] == [1, 2, 3]
+    assert result["file_url"].endswith("/reports/pdf/abc.pdf")
+    assert s3.s3_client.aborted == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error", [
+    ClientError({"Error": {"Code": "InternalError", "Message": "boom"}}, "UploadPart"),
+    EndpointConnectionError(endpoint_url="https://s3.amazonaws.com"),
+    asyncio.CancelledError(),
+])
+async def test_upload_stream_aborts_incomplete_upload(error):
+    """파트 업로드 중 어떤 예외(클라이언트 오류 / 연결 오류 / 취소)가 나도 멀티파트 업로드 중단"""
+    s3 = S3Service()
+    s3.mock_mode = False
+    s3.s3_client = RecordingS3Client(fail_on_part=2, error=error)
+    data = io.BytesIO(b"x" * (S3Service.MIN_PART_SIZE + 10))
+
+    if isinstance(error, ClientError):
+        assert not (await s3.upload_stream(data, "reports/pdf/abc.pdf", part_size=1))["success"]
+    else:
+        with pytest.raises(type(error)):
+            await s3.upload_stream(data, "reports/pdf/abc.pdf", part_size=1)
+    assert s3.s3_client.aborted == ["upload-1"]
+    assert s3.s3_client.completed is None
+
+
+def test_render_report_pdf_with_korean_text(tmp_path):
+    """한글 텍스트 / 차트 / 표가 포함된 PDF 렌더링 테스트"""
+    path = tmp_path / "report.pdf"
+    size = render_report_pdf({
+        "title": "그린비건 브랜드 진단",
+        "score": 72.5,
+        "summary": "친환경 포지셔닝이 강점입니다.",
+        "scores": [{"label": "market", "score": 80.0}, {"label": "brand", "score": 65.0}],
+        "diagnostics": [{"section": "market", "score": 80.0, "analysis": "시장 분석", "strengths": ["성장"], "weaknesses": []}],
+        "sections": [{
+            "name": "타겟", "content": {"연령": "20-30대", "채널": ["인스타그램", "유튜브"]},
+            "chart_data": {"labels": ["A", "B"], "values": [3, 5]},
+            "insights": [{"title": "핵심", "description": "재구매율 높음"}],
+        }],
+        "tables": [{"title": "channels", "columns": ["channel", "revenue"], "rows": [["sns", 100]]}],
+        "recommendations": ["<script> 태그도 이스케이프"],
+    }, str(path))
+
+    assert size == path.stat().st_size > 0
+    assert path.read_bytes().startswith(b"%PDF")
+
+
+OPTIONS = {"language": "ko", "include_charts": True, "include_ai_summary": True}
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    executor = AnalyticsExecutor(max_workers=0)
+    s3 = S3Service()
+    s3.mock_mode = True
+    monkeypatch.setattr(pdf_module, "analytics_executor", executor)
+    monkeypatch.setattr(pdf_module, "s3_service", s3)
+    monkeypatch.setattr(pdf_module, "pdf_cache", Cache(MemoryCacheBackend(), "report_pdf"))
+    yield executor
+    executor.shutdown()
+
+
+async def create_report(db) -> BrandReport:
+    report = BrandReport(brand_id=1, user_id=1, report_name="브랜드 진단", overall_score=70.0, ai_summary="요약")
+    db.add(report)
+    await db.flush()
+    db.add_all([
+        BrandDiagnostic(report_id=report.id, section=DiagnosticSection.MARKET,
+                        questions_answers={"q1": 4}, section_score=75.0),
+        ReportSection(report_id=report.id, section_name="타겟", content={"연령": "20대"}),
+    ])
+    await db.commit()
+    return report
+
+
+async def export_and_wait(service: ReportPdfService, db, report: BrandReport) -> dict:
+    status = await service.start_export(db, "brand", report, OPTIONS)
+    await asyncio.gather(*list(service._tasks))
+    return status
+
+
+@pytest.mark.asyncio
+async def test_export_renders_in_background_and_saves_url(executor, session_factory):
+    """백그라운드 렌더링 → 업로드 → pdf_url 저장"""
+    service = ReportPdfService(session_factory=session_factory)
+    async with session_factory() as db:
+        report = await create_report(db)
+
+        status = await export_and_wait(service, db, report)
+        assert status["status"] == "rendering"
+
+        done = await service.get_status("brand", report.id)
+        assert done["status"] == "done"
+        assert done["pdf_url"].endswith(f"{status['content_hash']}.pdf")
+        assert done["file_size"] > 0
+        await db.refresh(report)
+        assert report.pdf_url == done["pdf_url"]
+    assert executor.completed == 1
+
+
+@pytest.mark.asyncio
+async def test_unchanged_content_is_not_rendered_again(executor, session_factory):
+    """내용이 같으면 즉시 완료, 렌더링 없음"""
+    service = ReportPdfService(session_factory=session_factory)
+    async with session_factory() as db:
+        report = await create_report(db)
+        status = await export_and_wait(service, db, report)
+
+        again = await service.start_export(db, "brand", report, OPTIONS)
+        assert again["status"] == "done" and again["content_hash"] == status["content_hash"]
+    assert executor.completed == 1
+
+
+@pytest.mark.asyncio
+async def test_changed_content_is_rendered_again(executor, session_factory):
+    """내용이 바뀌면 새 해시로 다시 렌더링"""
+    service = ReportPdfService(session_factory=session_factory)
+    async with session_factory() as db:
+        report = await create_report(db)
+        status = await export_and_wait(service, db, report)
+
+        report.ai_summary = "새 요약"
+        await db.commit()
+        changed = await export_and_wait(service, db, report)
+        assert changed["status"] == "rendering"
+        assert changed["content_hash"] != status["content_hash"]
+    assert executor.completed == 2
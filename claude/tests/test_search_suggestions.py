@@ -0,0 +1,66 @@
+"""
+Search Suggestion Tests
+검색 결과와 분리된 AI 추천 (쿼리별 캐시, 사용자별 디바운스, 실패 시 기본 추천) 테스트
+"""
+import asyncio
+import pytest
+from app.core.cache import Cache, MemoryCacheBackend
+from app.services import search_suggestion_service as suggestion_module
+from app.services.search_suggestion_service import SearchSuggestionService
+
+
+class FakeGPTService:
+    def __init__(self, success: bool = True):
+        self.success = success
+        self.calls = []
+
+    async def recommend_brands(self, industry, keywords=None, limit=5, priority=0, target_audience=None):
+        self.calls.append(keywords)
+        if not self.success:
+            return {"success": False, "error": "rate limited"}
+        return {"success": True, "data": {"recommendations": [
+            {"brand_name": "비건랩", "target_audience": "20대 여성", "concept": "클린 뷰티"}
+        ]}}
+
+
+@pytest.fixture
+def fake_gpt(monkeypatch):
+    monkeypatch.setattr(suggestion_module, "suggestion_cache", Cache(MemoryCacheBackend(), "search_suggestions"))
+    gpt = FakeGPTService()
+    monkeypatch.setattr(suggestion_module, "gpt_service", gpt)
+    return gpt
+
+
+@pytest.mark.asyncio
+async def test_suggestions_are_cached_per_normalized_query(fake_gpt):
+    """정규화된 쿼리 단위 캐시 및 GPT 실패 결과 미캐시 테스트"""
+    service = SearchSuggestionService(debounce_seconds=0)
+
+    first = await service.suggest(1, "비건  화장품", "뷰티")
+    second = await service.suggest(2, " 비건 화장품 ", "뷰티")
+
+    assert first["suggestions"][0]["brand_name"] == "비건랩"
+    assert not first["cached"] and second["cached"]
+    assert fake_gpt.calls == [["비건 화장품"]]
+
+    fake_gpt.success = False
+    result = await service.suggest(1, "친환경", None)
+    assert result["suggestions"][0]["reason"] == "검색어 기반 추천"
+    await service.suggest(1, "친환경", None)
+    assert len(fake_gpt.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_superseded_keystrokes_skip_gpt(fake_gpt):
+    """같은 사용자의 연속 입력 중 마지막 요청만 GPT 호출 테스트"""
+    service = SearchSuggestionService(debounce_seconds=0.05)
+
+    results = await asyncio.gather(
+        service.suggest(1, "비"),
+        service.suggest(1, "비건"),
+        service.suggest(2, "패션"),
+    )
+
+    assert results[0] == {"suggestions": [], "cached": False, "superseded": True}
+    assert not results[1]["superseded"] and not results[2]["superseded"]
+    assert fake_gpt.calls == [["비건"], ["패션"]]
@@ -0,0 +1,133 @@
+"""
+Single-Flight Tests
+동일 요청 코얼레싱 단위 테스트
+"""
+import asyncio
+import pytest
+from app.services.single_flight import SingleFlight, coalesce, get_group, make_call_key
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_share_one_request():
+    """동시에 들어온 동일 호출이 upstream 요청 하나를 공유하는지 테스트"""
+    group = SingleFlight("test")
+    upstream_calls = 0
+
+    async def upstream():
+        nonlocal upstream_calls
+        upstream_calls += 1
+        await asyncio.sleep(0.05)
+        return {"success": True, "data": {"items": [1, 2]}}
+
+    results = await asyncio.gather(*[group.do("same-key", upstream) for _ in range(5)])
+
+    assert upstream_calls == 1
+    assert all(result == results[0] for result in results)
+    # 공유받은 결과는 서로 독립된 복사본
+    results[1]["data"]["items"].append(3)
+    assert results[0]["data"]["items"] == [1, 2]
+
+    metrics = group.get_metrics()
+    assert metrics["calls"] == 5
+    assert metrics["executions"] == 1
+    assert metrics["coalesced"] == 4
+    assert metrics["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_coalesce_decorator_normalizes_arguments():
+    """위치/키워드 인자 차이와 무관하게 같은 호출이 합쳐지는지 테스트"""
+
+    class FakeService:
+        calls = 0
+
+        @coalesce("test-decorator", exclude=("priority",))
+        async def recommend(self, industry, limit=5, priority=0):
+            FakeService.calls += 1
+            await asyncio.sleep(0.05)
+            return {"industry": industry, "limit": limit}
+
+    first, second = FakeService(), FakeService()
+    await asyncio.gather(
+        first.recommend("뷰티", 1),
+        second.recommend(industry="뷰티", limit=1, priority=10),
+        first.recommend("식품", 1)
+    )
+
+    assert FakeService.calls == 2
+    assert get_group("test-decorator").get_metrics()["coalesced"] == 1
+
+
+def test_make_call_key_excludes_self():
+    """key 생성 시 self와 제외 인자가 빠지는지 테스트"""
+
+    async def method(self, prompt, priority=0):
+        return prompt
+
+    key_a = make_call_key(method, (object(), "prompt"), {"priority": 1}, exclude=("priority",))
+    key_b = make_call_key(method, (object(),), {"prompt": "prompt"}, exclude=("priority",))
+
+    assert key_a == key_b
+
+
+@pytest.mark.asyncio
+async def test_joining_caller_raises_pending_priority():
+    """대화형 호출자가 백그라운드 요청에 합류하면 대기 중인 요청의 우선순위가 올라가는지 테스트"""
+    from app.services.gpt_scheduler import GPTPriority, GPTRequestScheduler
+
+    scheduler = GPTRequestScheduler(tokens_per_minute=6000, requests_per_minute=600)
+    # 요청 예산을 모두 소진 (초당 10건 충전)
+    scheduler._request_bucket.consume(600)
+    order = []
+
+    class FakeService:
+        @coalesce("test-priority", exclude=("priority",), priority="priority")
+        async def complete(self, prompt, priority=GPTPriority.DEFAULT):
+            await scheduler.acquire(10, priority)
+            order.append(prompt)
+            return {"prompt": prompt}
+
+    service = FakeService()
+    background = asyncio.create_task(service.complete("shared", priority=GPTPriority.BACKGROUND))
+    await asyncio.sleep(0)
+    other = asyncio.create_task(service.complete("other", priority=GPTPriority.DEFAULT))
+    await asyncio.sleep(0)
+    interactive = asyncio.create_task(service.complete("shared", priority=GPTPriority.INTERACTIVE))
+
+    results = await asyncio.wait_for(asyncio.gather(background, other, interactive), timeout=2)
+
+    assert order == ["shared", "other"]
+    assert results[0] == results[2] == {"prompt": "shared"}
+
+
+@pytest.mark.asyncio
+async def test_last_cancelled_caller_cancels_upstream():
+    """호출자 일부의 취소는 공유 요청을 유지하고, 모두 취소되면 upstream 요청도 취소되는지 테스트"""
+    group = SingleFlight("test-cancel")
+    started = asyncio.Event()
+    upstream_cancelled = asyncio.Event()
+
+    async def upstream():
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            upstream_cancelled.set()
+            raise
+
+    first = asyncio.create_task(group.do("key", upstream))
+    second = asyncio.create_task(group.do("key", upstream))
+    await started.wait()
+
+    first.cancel()
+    await asyncio.sleep(0.01)
+    assert not upstream_cancelled.is_set()
+    assert group.get_metrics()["in_flight"] == 1
+
+    second.cancel()
+    await asyncio.wait_for(upstream_cancelled.wait(), timeout=1)
+    await asyncio.gather(first, second, return_exceptions=True)
+
+    metrics = group.get_metrics()
+    assert metrics["cancelled"] == 1
+    assert metrics["in_flight"] == 0
@@ -0,0 +1,204 @@
+"""
+Storyboard Tests
+스크립트 컷 분할, 프레임 이미지 동시 생성 / 스트리밍, 실패 프레임 재시도 테스트
+"""
+import asyncio
+import json
+import pytest
+from sqlalchemy import select
+from app.core.analytics_executor import AnalyticsExecutor
+from app.models.brand import Brand
+from app.models.design import DesignInputType, ShortformProject, StoryboardFrame
+from app.models.keyword import KeyPhraseDocument
+from app.models.user import User
+from app.services import key_phrase_engine as engine_module
+from app.services import storyboard_service as storyboard_module
+from app.services.storyboard_service import StoryboardService, split_script
+
+SCRIPT = (
+    "아침 햇살이 들어오는 욕실. 주인공이 거울을 봅니다. 피부가 건조해 보입니다.\n"
+    "그린비건 토너를 꺼냅니다. 한 번 바르니 촉촉해집니다! 친구가 비결을 묻습니다. "
+    "주인공이 웃으며 제품을 보여줍니다. 지금 그린비건을 만나보세요."
+)
+
+
+class FakeIdeogram:
+    """프레임별 호출 기록 / 지정 프롬프트 실패"""
+
+    def __init__(self, fail_frames=()):
+        self.fail_frames = set(fail_frames)
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate_image(self, prompt, style="design", aspect_ratio="1:1", num_images=1, color_palette=None):
+        frame_number = int(prompt.split("Storyboard frame ")[1].split(" ")[0])
+        self.calls.append(frame_number)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01 * (10 - frame_number))
+        finally:
+            self.in_flight -= 1
+        if frame_number in self.fail_frames:
+            return {"success": False, "error": "API Error: 500"}
+        return {"success": True, "images": [{"url": f"https://img.example.com/{frame_number}.png"}]}
+
+
+def test_split_script_keeps_order_and_balances():
+    """문장 순서 유지, 컷 수 일치, 컷별 길이 균등"""
+    cuts = split_script(SCRIPT, 4)
+
+    assert len(cuts) == 4 and all(cuts)
+    assert " ".join(cuts).split() == SCRIPT.split()
+    lengths = [len(cut) for cut in cuts]
+    assert max(lengths) < 2.5 * min(lengths)
+
+
+def test_split_script_short_input():
+    """문장보다 컷이 많으면 단어 단위로 분할, 빈 스크립트는 빈 컷"""
+    assert split_script("짧은 문장 하나", 3) == ["짧은", "문장", "하나"]
+    assert split_script("", 2) == ["", ""]
+
+
+async def read_events(stream):
+    return [json.loads(line) async for line in stream]
+
+
+@pytest.fixture
+def ideogram(monkeypatch) -> FakeIdeogram:
+    """3번 프레임이 실패하는 이미지 생성 + 핵심 구문 코퍼스"""
+    ideogram = FakeIdeogram(fail_frames={3})
+    monkeypatch.setattr(storyboard_module, "ideogram_service", ideogram)
+    executor = AnalyticsExecutor(max_workers=0)
+    monkeypatch.setattr(engine_module, "analytics_executor", executor)
+    monkeypatch.setattr(engine_module, "key_phrase_engine", engine_module.KeyPhraseEngine())
+    yield ideogram
+    executor.shutdown()
+
+
+async def create_project(session_factory) -> int:
+    async with session_factory() as db:
+        user = User(email="owner@example.com", password_hash="x", name="Owner")
+        db.add(user)
+        await db.flush()
+        brand = Brand(user_id=user.id, brand_name="그린비건", category="뷰티")
+        db.add(brand)
+        await db.flush()
+        project = ShortformProject(
+            brand_id=brand.id, user_id=user.id, project_name="토너 숏폼",
+            input_type=DesignInputType.SCRIPT, script_text=SCRIPT, num_cuts=5
+        )
+        db.add(project)
+        await db.commit()
+        return project.id
+
+
+async def saved_frames(session_factory):
+    async with session_factory() as db:
+        return (await db.execute(
+            select(StoryboardFrame).order_by(StoryboardFrame.frame_number)
+        )).scalars().all()
+
+
+@pytest.mark.asyncio
+async def test_storyboard_streams_frames_as_they_finish(ideogram, session_factory):
+    """프레임 일괄 저장 → 완료 순 스트리밍 (동시 실행 제한)"""
+    project_id = await create_project(session_factory)
+    service = StoryboardService(concurrency=2, session_factory=session_factory)
+
+    events = await read_events(service.generate_stream(project_id))
+
+    assert [e["event"] for e in events] == ["storyboard"] + ["frame"] * 5 + ["done"]
+    planned = events[0]["frames"]
+    assert [f["frame_number"] for f in planned] == [1, 2, 3, 4, 5]
+    assert "그린비건" in planned[0]["image_prompt"]
+    # 완료 순서대로 전송 (뒤 프레임일수록 빨리 끝남)
+    finished = [e["frame_number"] for e in events[1:-1]]
+    assert finished != sorted(finished)
+    assert ideogram.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_frames_are_reported_and_kept_empty(ideogram, session_factory):
+    """실패 프레임은 done 이벤트에 보고하고 이미지 없이 저장"""
+    project_id = await create_project(session_factory)
+    service = StoryboardService(concurrency=2, session_factory=session_factory)
+
+    events = await read_events(service.generate_stream(project_id))
+
+    failed_id = next(f["id"] for f in events[0]["frames"] if f["frame_number"] == 3)
+    assert events[-1] == {"event": "done", "project_id": project_id, "rendered": 4, "failed_frame_ids": [failed_id]}
+    frames = await saved_frames(session_factory)
+    assert [f.image_url is None for f in frames] == [False, False, True, False, False]
+
+
+@pytest.mark.asyncio
+async def test_storyboard_script_enters_key_phrase_corpus(ideogram, session_factory):
+    """스크립트는 핵심 구문 코퍼스에 반영"""
+    project_id = await create_project(session_factory)
+    service = StoryboardService(concurrency=2, session_factory=session_factory)
+
+    await read_events(service.generate_stream(project_id))
+
+    async with session_factory() as db:
+        documents = (await db.execute(select(KeyPhraseDocument.source, KeyPhraseDocument.source_id))).all()
+    assert documents == [("shortform", project_id)]
+
+
+@pytest.mark.asyncio
+async def test_retry_regenerates_only_failed_frames(ideogram, session_factory):
+    """실패 프레임만 재생성"""
+    project_id = await create_project(session_factory)
+    service = StoryboardService(concurrency=2, session_factory=session_factory)
+    events = await read_events(service.generate_stream(project_id))
+    failed_id = events[-1]["failed_frame_ids"][0]
+
+    ideogram.fail_frames.clear()
+    ideogram.calls.clear()
+    retry = await read_events(service.retry_stream(project_id))
+
+    assert ideogram.calls == [3]
+    assert retry[0] == {"event": "retry", "project_id": project_id, "frame_ids": [failed_id]}
+    assert retry[1]["status"] == "done" and retry[1]["image_url"].endswith("/3.png")
+    assert retry[-1]["failed_frame_ids"] == []
+
+
+@pytest.mark.asyncio
+async def test_regenerating_replaces_frames(ideogram, session_factory):
+    """재생성 시 기존 프레임 교체"""
+    project_id = await create_project(session_factory)
+    service = StoryboardService(concurrency=2, session_factory=session_factory)
+
+    await read_events(service.generate_stream(project_id))
+    await read_events(service.generate_stream(project_id))
+
+    assert len(await saved_frames(session_factory)) == 5
+
+
+@pytest.mark.asyncio
+async def test_shortform_project_for_unowned_brand_is_rejected(session_factory):
+    """다른 사용자의 브랜드로 숏폼 프로젝트를 만들면 404"""
+    from fastapi import HTTPException
+    from app.api.v1.endpoints import design
+    from app.schemas.design import ShortformProjectCreate
+
+    async with session_factory() as db:
+        owner = User(email="owner@example.com", password_hash="x", name="Owner")
+        intruder = User(email="intruder@example.com", password_hash="x", name="Intruder")
+        db.add_all([owner, intruder])
+        await db.flush()
+        brand = Brand(user_id=owner.id, brand_name="그린비건", category="뷰티")
+        db.add(brand)
+        await db.commit()
+
+        request = ShortformProjectCreate(
+            brand_id=brand.id, project_name="봄 숏폼", input_type=DesignInputType.SCRIPT, script_text=SCRIPT
+        )
+        with pytest.raises(HTTPException) as error:
+            await design.create_shortform_project(request, db=db, current_user=intruder)
+        assert error.value.status_code == 404
+        assert (await db.execute(select(ShortformProject))).scalars().all() == []
+
+        project = await design.create_shortform_project(request, db=db, current_user=owner)
+        assert project.brand_id == brand.id